@@ -1,9 +1,25 @@
 """Application package initialization.
 
 This package contains the main Flask application and its components.
+
+The Flask application (app.app) is imported lazily on first access of
+``app`` / ``socketio`` so that importing a subpackage (e.g. in fetch pool
+worker processes) does not create tables, partitions or the write spool.
 """
 
-from .app import app, socketio
+import importlib
+from typing import Any
 
 
 __all__ = ["app", "socketio"]
+
+
+def __getattr__(name: str) -> Any:
+    """Import app.app on first access of the Flask application objects."""
+    if name in __all__:
+        module = importlib.import_module(".app", __name__)
+        value = getattr(module, name)
+        # Replace the submodule attribute set by import_module
+        globals()[name] = value
+        return value
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -30,9 +30,16 @@ JOBS: Dict[str, Dict[str, Any]] = {}
 ENABLE_PHASE2 = os.getenv("ENABLE_PHASE2", "true").lower() == "true"
 
 
-def get_bulk_service() -> BulkDataService:
-    """BulkDataServiceのインスタンスを取得（テストでモック可能）."""
-    return BulkDataService()
+def get_bulk_service(job_id: Optional[str] = None) -> BulkDataService:
+    """BulkDataServiceのインスタンスを取得（テストでモック可能）.
+
+    Args:
+        job_id: ジョブID（フェッチゲートウェイでのジョブ間の公平性に使用）
+
+    Returns:
+        BulkDataService インスタンス。
+    """
+    return BulkDataService(batch_id=job_id)
 
 
 def _client_key() -> str:
@@ -342,6 +349,7 @@ def _run_job(
     interval: str,
     period: Optional[str],
     batch_db_id: Optional[int] = None,
+    incremental: bool = False,
 ):
     """バッチ処理を実行.
 
@@ -351,14 +359,15 @@ def _run_job(
         symbols: 銘柄コードのリスト
         interval: 時間軸
         period: 取得期間
-        batch_db_id: Phase 2のバッチDB ID（データベース永続化用）。
+        batch_db_id: Phase 2のバッチDB ID（データベース永続化用）
+        incremental: 差分取得を行うか。
     """
     with app.app_context():
         logger.info(
             f"[_run_job] ジョブ実行開始: job_id={job_id}, symbols_count={len(symbols)}, interval={interval}, period={period}"
         )
 
-        service = get_bulk_service()
+        service = get_bulk_service(job_id)
         try:
             logger.info(
                 "[_run_job] BulkDataService.fetch_multiple_stocks 呼び出し開始"
@@ -368,6 +377,7 @@ def _run_job(
                 interval=interval,
                 period=period,
                 progress_callback=_make_progress_callback(job_id, batch_db_id),
+                incremental=incremental,
             )
 
             logger.info(
@@ -412,9 +422,10 @@ def start_bulk_fetch():
         symbols = data.get("symbols")
         interval = data.get("interval", "1d")
         period = data.get("period")
+        incremental = bool(data.get("incremental", False))
 
         logger.info(
-            f"[bulk_data] リクエストパラメータ: symbols_count={len(symbols) if symbols else 0}, interval={interval}, period={period}"
+            f"[bulk_data] リクエストパラメータ: symbols_count={len(symbols) if symbols else 0}, interval={interval}, period={period}, incremental={incremental}"
         )
 
         # 入力検証
@@ -490,7 +501,15 @@ def start_bulk_fetch():
         app = current_app._get_current_object()
         thread = threading.Thread(
             target=_run_job,
-            args=(app, job_id, symbols, interval, period, batch_db_id),
+            args=(
+                app,
+                job_id,
+                symbols,
+                interval,
+                period,
+                batch_db_id,
+                incremental,
+            ),
             daemon=True,
         )
         thread.start()
@@ -762,7 +781,10 @@ def get_jpx_symbols():
 
 
 def _process_single_interval(
-    service, symbols: List[str], interval_config: dict
+    service,
+    symbols: List[str],
+    interval_config: dict,
+    incremental: bool = False,
 ) -> dict:
     """単一時間軸のバッチ処理を実行.
 
@@ -770,6 +792,7 @@ def _process_single_interval(
         service: BulkDataServiceインスタンス
         symbols: 銘柄コードのリスト
         interval_config: 時間軸設定
+        incremental: 差分取得を行うか
 
     Returns:
         処理結果の辞書
@@ -785,6 +808,7 @@ def _process_single_interval(
             interval=interval,
             period=period,
             progress_callback=None,
+            incremental=incremental,
         )
         duration = time.time() - start_time
 
@@ -802,6 +826,8 @@ def _process_single_interval(
                 "duration_seconds": round(duration, 2),
             },
         }
+        if "incremental" in summary:
+            result["summary"]["incremental"] = summary["incremental"]
 
         logger.info(
             f"[jpx-sequential] 時間軸処理完了: {name} - 成功: {result['summary']['successful']}"
@@ -876,7 +902,11 @@ def _send_jpx_complete_notification(
 
 
 def _run_jpx_sequential_job(
-    app, job_id: str, symbols: List[str], batch_db_id: Optional[int] = None
+    app,
+    job_id: str,
+    symbols: List[str],
+    batch_db_id: Optional[int] = None,
+    incremental: bool = False,
 ):
     """JPX全銘柄順次取得ジョブを実行.
 
@@ -884,14 +914,15 @@ def _run_jpx_sequential_job(
         app: Flaskアプリケーションインスタンス
         job_id: ジョブID
         symbols: 銘柄コードのリスト
-        batch_db_id: バッチDB ID（オプション）。
+        batch_db_id: バッチDB ID（オプション）
+        incremental: 差分取得を行うか。
     """
     with app.app_context():
         logger.info(
             f"[jpx-sequential] ジョブ実行開始: job_id={job_id}, symbols_count={len(symbols)}"
         )
 
-        service = get_bulk_service()
+        service = get_bulk_service(job_id)
         job = JOBS.get(job_id)
 
         if not job:
@@ -913,7 +944,7 @@ def _run_jpx_sequential_job(
 
                 # 単一時間軸の処理を実行
                 interval_result = _process_single_interval(
-                    service, symbols, interval_config
+                    service, symbols, interval_config, incremental
                 )
 
                 # 結果を記録
@@ -971,7 +1002,8 @@ def start_jpx_sequential():
 
     Request Body:
         {
-            "symbols": ["7203.T", "6758.T", ...]
+            "symbols": ["7203.T", "6758.T", ...],
+            "incremental": false
         }
 
     Returns:
@@ -982,6 +1014,7 @@ def start_jpx_sequential():
 
         data = request.get_json(silent=True) or {}
         symbols = data.get("symbols")
+        incremental = bool(data.get("incremental", False))
 
         # 入力検証
         if (
@@ -1056,7 +1089,7 @@ def start_jpx_sequential():
         app = current_app._get_current_object()
         thread = threading.Thread(
             target=_run_jpx_sequential_job,
-            args=(app, job_id, symbols, batch_db_id),
+            args=(app, job_id, symbols, batch_db_id, incremental),
             daemon=True,
         )
         thread.start()
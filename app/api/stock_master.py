@@ -64,7 +64,8 @@ def update_stock_master():
 
     Request Body (JSON):
         {
-            "update_type": "manual" | "scheduled"  // 更新タイプ（オプション、デフォルト: "manual"）
+            "update_type": "manual" | "scheduled",  // 更新タイプ（オプション、デフォルト: "manual"）
+            "force": false  // JPXのファイルが前回と同じでも反映するか（オプション、デフォルト: false）
         }
 
     Response:
@@ -76,9 +77,10 @@ def update_stock_master():
                 "update_type": "manual",
                 "total_stocks": 3800,
                 "added_stocks": 50,
-                "updated_stocks": 3700,
+                "updated_stocks": 42,
                 "removed_stocks": 10,
-                "status": "success"
+                "field_changes": {"market_category": 40, "is_active": 2},
+                "status": "success"  // ファイルが前回と同じ場合は "unchanged"
             }
         }
 
@@ -95,6 +97,7 @@ def update_stock_master():
         # リクエストボディを取得
         data = request.get_json() or {}
         update_type = data.get("update_type", "manual")
+        force = bool(data.get("force", False))
 
         # 更新タイプの検証
         if update_type not in ["manual", "scheduled"]:
@@ -109,7 +112,9 @@ def update_stock_master():
 
         # JPX銘柄サービスを使用して更新
         service = JPXStockService()
-        result = service.update_stock_master(update_type=update_type)
+        result = service.update_stock_master(
+            update_type=update_type, force=force
+        )
 
         logger.info(f"銘柄マスタ更新完了: {result}")
 
@@ -4,7 +4,7 @@ This module initializes and configures the Flask application,
 including WebSocket support, database setup, and API blueprints.
 """
 
-from datetime import date, datetime
+from datetime import date, datetime, timedelta
 import os
 
 from dotenv import load_dotenv
@@ -42,11 +42,20 @@ from app.models import (
     engine,
     get_db_session,
 )
+from app.services.stock_data import archive, coverage
+from app.services.stock_data.bar_batch import time_keys
 from app.services.stock_data.orchestrator import StockDataOrchestrator
+from app.services.stock_data.partitions import (
+    TimeValue,
+    day_range,
+    get_partition_manager,
+)
+from app.services.stock_data.write_spool import get_write_spool
 from app.utils.api_response import APIResponse, ErrorCode
 from app.utils.timeframe_utils import (
     get_model_for_interval,
     get_table_name,
+    is_intraday_interval,
     validate_interval,
 )
 
@@ -70,6 +79,12 @@ versioning_middleware = APIVersioningMiddleware(app)
 # テーブル作成
 Base.metadata.create_all(bind=engine)
 
+# 分足・時間足の当月以降のパーティションを事前作成
+get_partition_manager().ensure_upcoming(engine)
+
+# 書き込みスプールの未確認セグメントを再生（有効時はライターを起動）
+get_write_spool()
+
 # 既存Blueprint登録（後方互換性のため保持）
 app.register_blueprint(bulk_api)
 app.register_blueprint(stock_master_api)
@@ -237,7 +252,10 @@ def fetch_data():
                     },
                 },
                 message="データを正常に取得し、データベースに保存しました",
-                meta={"table_name": get_table_name(interval)},
+                meta={
+                    "table_name": get_table_name(interval),
+                    "coalesced": result.get("coalesced", False),
+                },
                 status_code=200,
             )
         else:
@@ -332,6 +350,12 @@ def create_stock():
 
         with get_db_session() as session:
             stock_data = StockDailyCRUD.create(session, **data)
+            coverage.record_saved(
+                session,
+                "1d",
+                {stock_data.symbol: (1, (stock_data.date, stock_data.date))},
+                fetched=False,
+            )
             return (
                 jsonify(
                     {
@@ -490,7 +514,7 @@ def _build_stock_query(
         model_class: モデルクラス
         symbol: 銘柄コード（オプション）
         start_date: 開始日（オプション）
-        end_date: 終了日（オプション）
+        end_date: 終了日（オプション、分足・時間足は当日の全データを含む）
 
     Returns:
         構築されたクエリオブジェクト
@@ -510,6 +534,15 @@ def _build_stock_query(
         query = query.filter(model_class.symbol == symbol)
 
     # 日付範囲フィルタ
+    if hasattr(model_class, "datetime"):
+        # 日時で比較し、対象期間の月のパーティションだけを参照させる
+        start_at, end_before = day_range(start_date, end_date)
+        if start_at:
+            query = query.filter(time_column >= start_at)
+        if end_before:
+            query = query.filter(time_column < end_before)
+        return query, time_column
+
     if start_date:
         query = query.filter(time_column >= start_date)
     if end_date:
@@ -518,6 +551,61 @@ def _build_stock_query(
     return query, time_column
 
 
+def _stock_page_with_archive(
+    session,
+    query,
+    time_column,
+    interval: str,
+    symbol: str | None,
+    start_date: date | None,
+    end_date: date | None,
+    limit: int,
+    offset: int,
+):
+    """株価データの1ページを圧縮保存済みの足と統合して取得.
+
+    圧縮保存済みの足がない場合は時間軸テーブルだけを参照する。ある場合は
+    時間軸テーブルの先頭 offset + limit 件と、ページに必要な新しい月の
+    圧縮データだけを復元して日時の降順で統合する。
+
+    Args:
+        session: データベースセッション
+        query: _build_stock_query で構築したクエリ
+        time_column: 日時カラム
+        interval: 時間軸
+        symbol: 銘柄コード（オプション）
+        start_date: 開始日（オプション）
+        end_date: 終了日（オプション）
+        limit: 取得件数
+        offset: 取得開始位置
+
+    Returns:
+        (ページの辞書の一覧, 圧縮保存済みの足の件数) のタプル
+    """
+    start: TimeValue | None
+    end_before: TimeValue | None
+    if is_intraday_interval(interval):
+        start, end_before = day_range(start_date, end_date)
+    else:
+        start = start_date
+        end_before = end_date + timedelta(days=1) if end_date else None
+    chunks = archive.list_chunks(session, interval, symbol, start, end_before)
+
+    ordered = query.order_by(time_column.desc())
+    if not chunks:
+        stocks = ordered.limit(limit).offset(offset).all()
+        return [stock.to_dict() for stock in stocks], 0
+
+    stocks = ordered.limit(offset + limit).all()
+    keys = time_keys([getattr(stock, time_column.key) for stock in stocks])
+    live = [(key, stock.to_dict()) for key, stock in zip(keys, stocks)]
+    archived, archived_count = archive.read_archived_page(
+        session, interval, chunks, live, offset + limit, start, end_before
+    )
+    data = archive.merge_page(live, archived, limit, offset)
+    return data, archived_count
+
+
 @app.route("/api/stocks", methods=["GET"])
 def get_stocks():
     """株価データを取得（クエリパラメータに応じて）."""
@@ -599,16 +687,22 @@ def get_stocks():
             # 総件数取得
             total_count = query.count()
 
-            # 並び替えとページネーション
-            stocks = (
-                query.order_by(time_column.desc())
-                .limit(limit)
-                .offset(offset)
-                .all()
+            # 圧縮保存済みの足（bar_chunks）と統合してページを作成
+            data, archived_count = _stock_page_with_archive(
+                session,
+                query,
+                time_column,
+                interval,
+                symbol,
+                parsed_start_date,
+                parsed_end_date,
+                limit,
+                offset,
             )
+            total_count += archived_count
 
             return APIResponse.paginated(
-                data=[stock.to_dict() for stock in stocks],
+                data=data,
                 total=total_count,
                 limit=limit,
                 offset=offset,
@@ -632,6 +726,81 @@ def get_stocks():
         )
 
 
+@app.route("/api/stocks/coverage", methods=["GET"])
+def get_stock_coverage():
+    """銘柄・時間軸ごとのデータ範囲（件数・期間・取得日時）を取得.
+
+    時間軸テーブルは集計せず、bar_coverage を1回のクエリで参照する。
+    """
+    try:
+        symbol = request.args.get("symbol")
+        interval = request.args.get("interval")
+        limit = request.args.get("limit", 100, type=int)
+        offset = request.args.get("offset", 0, type=int)
+
+        if interval and not validate_interval(interval):
+            return APIResponse.error(
+                error_code=ErrorCode.VALIDATION_ERROR,
+                message=f"無効な時間軸です: {interval}",
+                details={"interval": interval},
+                status_code=400,
+            )
+
+        valid, error_response = _validate_pagination_params(limit, offset)
+        if not valid:
+            return APIResponse.error(
+                error_code=ErrorCode.VALIDATION_ERROR,
+                message=error_response.get("message", "パラメータが無効です"),
+                details=error_response.get("details", {}),
+                status_code=400,
+            )
+
+        with get_db_session() as session:
+            rows, total_count = coverage.get_coverage(
+                session,
+                symbols=[symbol] if symbol else None,
+                intervals=[interval] if interval else None,
+                limit=limit,
+                offset=offset,
+            )
+
+        return APIResponse.paginated(
+            data=[
+                {
+                    **row,
+                    "first": (
+                        row["first"].isoformat() if row["first"] else None
+                    ),
+                    "latest": (
+                        row["latest"].isoformat() if row["latest"] else None
+                    ),
+                    "last_fetched_at": (
+                        row["last_fetched_at"].isoformat()
+                        if row["last_fetched_at"]
+                        else None
+                    ),
+                }
+                for row in rows
+            ],
+            total=total_count,
+            limit=limit,
+            offset=offset,
+        )
+
+    except DatabaseError as e:
+        return APIResponse.error(
+            error_code=ErrorCode.DATABASE_ERROR,
+            message=str(e),
+            status_code=500,
+        )
+    except Exception as e:
+        return APIResponse.error(
+            error_code=ErrorCode.INTERNAL_SERVER_ERROR,
+            message=f"予期しないエラーが発生しました: {str(e)}",
+            status_code=500,
+        )
+
+
 @app.route("/api/stocks/<int:stock_id>", methods=["PUT"])
 def update_stock(stock_id):
     """株価データを更新."""
@@ -718,7 +887,9 @@ def delete_stock(stock_id):
     """株価データを削除."""
     try:
         with get_db_session() as session:
-            if StockDailyCRUD.delete(session, stock_id):
+            stock_data = StockDailyCRUD.get_by_id(session, stock_id)
+            if stock_data and StockDailyCRUD.delete(session, stock_id):
+                coverage.record_removed(session, "1d", {stock_data.symbol: 1})
                 return jsonify(
                     {
                         "success": True,
@@ -797,6 +968,18 @@ def create_test_data():
 
         with get_db_session() as session:
             created_stocks = StockDailyCRUD.bulk_create(session, test_data)
+            created: dict[str, list[date]] = {}
+            for stock in created_stocks:
+                created.setdefault(stock.symbol, []).append(stock.date)
+            coverage.record_saved(
+                session,
+                "1d",
+                {
+                    symbol: (len(days), (min(days), max(days)))
+                    for symbol, days in created.items()
+                },
+                fetched=False,
+            )
             return (
                 jsonify(
                     {
@@ -300,6 +300,66 @@ class JPXStockServiceError(APIException):
         )
 
 
+class MarketDataProviderError(APIException):
+    """市場データプロバイダーエラー."""
+
+    def __init__(self, message: str, details: Optional[Dict[str, Any]] = None):
+        """市場データプロバイダーエラーを初期化します."""
+        super().__init__(
+            message=message,
+            error_code=ErrorCode.API_CONNECTION,
+            details=details,
+        )
+
+    def __reduce__(self):
+        """Pickle用に初期化引数（メッセージと詳細情報）を返します."""
+        return (self.__class__, (self.message, self.details))
+
+    def __str__(self) -> str:
+        """文字列表現を返す."""
+        return self.message
+
+
+class MarketDataRateLimitError(APIException):
+    """市場データプロバイダーのレート制限エラー（HTTP 429）."""
+
+    def __init__(self, message: str, details: Optional[Dict[str, Any]] = None):
+        """レート制限エラーを初期化します."""
+        super().__init__(
+            message=message,
+            error_code=ErrorCode.API_RATE_LIMIT,
+            details=details,
+        )
+
+    def __reduce__(self):
+        """Pickle用に初期化引数（メッセージと詳細情報）を返します."""
+        return (self.__class__, (self.message, self.details))
+
+    def __str__(self) -> str:
+        """文字列表現を返す."""
+        return self.message
+
+
+class CircuitOpenError(APIException):
+    """サーキットブレーカー作動中のため上流へのリクエストを拒否したエラー."""
+
+    def __init__(self, message: str, details: Optional[Dict[str, Any]] = None):
+        """サーキットブレーカー拒否エラーを初期化します."""
+        super().__init__(
+            message=message,
+            error_code=ErrorCode.API_CONNECTION,
+            details=details,
+        )
+
+    def __reduce__(self):
+        """Pickle用に初期化引数（メッセージと詳細情報）を返します."""
+        return (self.__class__, (self.message, self.details))
+
+    def __str__(self) -> str:
+        """文字列表現を返す."""
+        return self.message
+
+
 class StockDataOrchestrationError(SystemException):
     """株価データオーケストレーションエラー."""
 
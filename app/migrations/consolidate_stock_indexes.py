@@ -0,0 +1,230 @@
+"""時間軸テーブルのインデックス整理マイグレーション.
+
+8つの時間軸テーブル（stocks_1m 〜 stocks_1mo）は (symbol, datetime|date)
+の一意制約に加えて、同じカラムを対象とする以下のB-treeインデックスを
+持っており、一括挿入のたびに4つのB-treeを更新していました。
+
+- idx_<table>_symbol: 一意制約のインデックスの先頭カラムと重複
+- idx_<table>_<time>: 銘柄横断の期間検索用
+- idx_<table>_symbol_<time>_desc: 一意制約のインデックスと同じカラム
+  （降順の走査は一意制約のインデックスの逆順走査で代替できる）
+- idx_stocks_1d_date_desc: create_tables.sql で作成される降順インデックス
+
+upgrade はこれらを削除し、銘柄横断の期間検索用に時間カラムのBRIN
+インデックス（idx_<table>_<time>_brin）を作成します。downgrade は元の
+構成に戻します。テーブルごとに1トランザクションで実行します。
+
+使用法:
+    python app/migrations/consolidate_stock_indexes.py [upgrade|downgrade|audit]
+"""
+
+import logging
+import os
+from pathlib import Path
+import sys
+from typing import Any, Dict, List, Tuple
+
+from dotenv import load_dotenv
+from sqlalchemy import create_engine, text
+
+
+# プロジェクトルートをパスに追加
+project_root = Path(__file__).parent.parent.parent
+sys.path.insert(0, str(project_root))
+
+from app.utils.timeframe_utils import TIMEFRAME_MODEL_MAP  # noqa: E402
+
+
+# .envを読み込み
+load_dotenv()
+
+# データベース接続設定
+DATABASE_URL = f"postgresql://{os.getenv('DB_USER')}:{os.getenv('DB_PASSWORD')}@{os.getenv('DB_HOST')}:{os.getenv('DB_PORT')}/{os.getenv('DB_NAME')}"
+
+logger = logging.getLogger(__name__)
+
+
+def timeframe_tables() -> List[Tuple[str, str]]:
+    """時間軸テーブルと時間カラムの一覧を取得."""
+    return [
+        (
+            model.__tablename__,
+            "datetime" if hasattr(model, "datetime") else "date",
+        )
+        for model in TIMEFRAME_MODEL_MAP.values()
+    ]
+
+
+def redundant_indexes(table: str, column: str) -> Dict[str, str]:
+    """削除対象のB-treeインデックスと、downgrade で再作成する定義."""
+    indexes = {
+        f"idx_{table}_symbol": "(symbol)",
+        f"idx_{table}_{column}": f"({column})",
+        f"idx_{table}_symbol_{column}_desc": f"(symbol, {column} DESC)",
+    }
+    if table == "stocks_1d":
+        indexes["idx_stocks_1d_date_desc"] = "(date DESC)"
+    return indexes
+
+
+def brin_index_name(table: str, column: str) -> str:
+    """時間カラムのBRINインデックス名を取得."""
+    return f"idx_{table}_{column}_brin"
+
+
+def table_exists(conn: Any, table: str) -> bool:
+    """テーブルが存在するか確認."""
+    return (
+        conn.execute(
+            text("SELECT to_regclass(:table) IS NOT NULL"), {"table": table}
+        ).scalar()
+        is True
+    )
+
+
+def consolidate_table(conn: Any, table: str, column: str) -> List[str]:
+    """1テーブルの冗長なインデックスを削除し、BRINインデックスを作成.
+
+    Args:
+        conn: 接続（呼び出し元のトランザクション内で実行）
+        table: テーブル名
+        column: 時間カラム名
+
+    Returns:
+        削除したインデックス名の一覧。
+    """
+    dropped = []
+    for name in redundant_indexes(table, column):
+        if conn.execute(
+            text("SELECT to_regclass(:name) IS NOT NULL"), {"name": name}
+        ).scalar():
+            conn.execute(text(f"DROP INDEX {name}"))
+            dropped.append(name)
+    conn.execute(
+        text(
+            f"CREATE INDEX IF NOT EXISTS {brin_index_name(table, column)} "
+            f"ON {table} USING brin ({column})"
+        )
+    )
+    return dropped
+
+
+def restore_table(conn: Any, table: str, column: str) -> None:
+    """1テーブルのインデックスを整理前の構成に戻す."""
+    conn.execute(
+        text(f"DROP INDEX IF EXISTS {brin_index_name(table, column)}")
+    )
+    for name, columns in redundant_indexes(table, column).items():
+        conn.execute(
+            text(f"CREATE INDEX IF NOT EXISTS {name} ON {table} {columns}")
+        )
+
+
+def audit(conn: Any, table: str) -> List[Dict[str, Any]]:
+    """テーブルのインデックスの定義・サイズ・使用回数を取得.
+
+    パーティション化テーブルのインデックスは、全パーティションの
+    インデックスの合計で集計する。
+
+    Returns:
+        name、definition、size（バイト）、scans を持つ辞書の一覧。
+    """
+    rows = conn.execute(
+        text(
+            """
+            SELECT i.indexrelid::regclass::text AS name,
+                   pg_get_indexdef(i.indexrelid) AS definition,
+                   (SELECT COALESCE(sum(pg_relation_size(t.relid)), 0)
+                      FROM pg_partition_tree(i.indexrelid) AS t) AS size,
+                   (SELECT COALESCE(sum(s.idx_scan), 0)
+                      FROM pg_partition_tree(i.indexrelid) AS t
+                      JOIN pg_stat_user_indexes AS s
+                        ON s.indexrelid = t.relid) AS scans
+              FROM pg_index AS i
+             WHERE i.indrelid = to_regclass(:table)
+             ORDER BY name
+            """
+        ),
+        {"table": table},
+    )
+    return [dict(row._mapping) for row in rows]
+
+
+def upgrade(engine: Any = None) -> None:
+    """全時間軸テーブルのインデックスを整理."""
+    engine = engine or create_engine(DATABASE_URL)
+    logger.info("時間軸テーブルのインデックス整理を開始します...")
+
+    try:
+        for table, column in timeframe_tables():
+            with engine.begin() as conn:
+                if not table_exists(conn, table):
+                    logger.info(
+                        f"{table}テーブルが存在しないためスキップします。"
+                    )
+                    continue
+                dropped = consolidate_table(conn, table, column)
+            logger.info(
+                f"{table}: 削除 {', '.join(dropped) or 'なし'}, "
+                f"作成 {brin_index_name(table, column)}"
+            )
+        logger.info("時間軸テーブルのインデックス整理が完了しました。")
+
+    except Exception as e:
+        logger.error(f"マイグレーションエラー: {e}")
+        raise
+
+
+def downgrade(engine: Any = None) -> None:
+    """全時間軸テーブルのインデックスを整理前の構成に戻す."""
+    engine = engine or create_engine(DATABASE_URL)
+    logger.info("時間軸テーブルのインデックスを整理前の構成に戻します...")
+
+    try:
+        for table, column in timeframe_tables():
+            with engine.begin() as conn:
+                if not table_exists(conn, table):
+                    continue
+                restore_table(conn, table, column)
+            logger.info(f"{table}: インデックスを整理前の構成に戻しました。")
+        logger.info("インデックスのダウングレードが完了しました。")
+
+    except Exception as e:
+        logger.error(f"マイグレーションのダウングレードエラー: {e}")
+        raise
+
+
+def print_audit(engine: Any = None) -> None:
+    """全時間軸テーブルのインデックスの一覧を表示."""
+    engine = engine or create_engine(DATABASE_URL)
+    with engine.connect() as conn:
+        for table, _ in timeframe_tables():
+            if not table_exists(conn, table):
+                continue
+            print(f"\n{table}")
+            for index in audit(conn, table):
+                print(
+                    f"  {index['name']:<40} {index['size'] / 1024 / 1024:>9.1f} MB "
+                    f"{index['scans']:>10} scans  {index['definition']}"
+                )
+
+
+if __name__ == "__main__":
+    logging.basicConfig(
+        level=logging.INFO,
+        format="%(asctime)s - %(name)s - %(levelname)s - %(message)s",
+    )
+
+    commands = {
+        "upgrade": upgrade,
+        "downgrade": downgrade,
+        "audit": print_audit,
+    }
+    if len(sys.argv) < 2 or sys.argv[1].lower() not in commands:
+        print(
+            "使用法: python consolidate_stock_indexes.py "
+            "[upgrade|downgrade|audit]"
+        )
+        sys.exit(1)
+
+    commands[sys.argv[1].lower()]()
@@ -0,0 +1,121 @@
+"""bar_chunks テーブル作成マイグレーション.
+
+古い株価データを銘柄・時間軸・月ごとに圧縮して保持する bar_chunks
+テーブルを作成します。data 列は既に圧縮済みのため、TOAST の再圧縮を
+行わないよう STORAGE EXTERNAL とします。
+
+テーブル作成後の移動は圧縮保存ジョブ（ArchiveCompactor）が行います。
+compact は同じ処理を手動で実行します（導入直後に過去データをまとめて
+移す場合など）。
+
+使用法:
+    python app/migrations/create_bar_chunks_table.py [upgrade|downgrade|compact] [時間軸...]
+"""
+
+import logging
+import os
+from pathlib import Path
+import sys
+from typing import Any, List, Optional
+
+from dotenv import load_dotenv
+from sqlalchemy import create_engine, text
+
+
+# プロジェクトルートをパスに追加
+project_root = Path(__file__).parent.parent.parent
+sys.path.insert(0, str(project_root))
+
+from app.models import BarChunk  # noqa: E402
+from app.services.stock_data.archive import (  # noqa: E402
+    ArchiveCompactor,
+    ArchiveConfig,
+)
+
+
+# .envを読み込み
+load_dotenv()
+
+# データベース接続設定
+DATABASE_URL = f"postgresql://{os.getenv('DB_USER')}:{os.getenv('DB_PASSWORD')}@{os.getenv('DB_HOST')}:{os.getenv('DB_PORT')}/{os.getenv('DB_NAME')}"
+
+logger = logging.getLogger(__name__)
+
+
+def upgrade(engine: Any = None) -> None:
+    """bar_chunks テーブルを作成."""
+    engine = engine or create_engine(DATABASE_URL)
+    logger.info("bar_chunksテーブルの作成を開始します...")
+
+    try:
+        with engine.begin() as conn:
+            BarChunk.__table__.create(conn, checkfirst=True)
+            conn.execute(
+                text(
+                    "ALTER TABLE bar_chunks ALTER COLUMN data "
+                    "SET STORAGE EXTERNAL"
+                )
+            )
+        logger.info("bar_chunksテーブルの作成が完了しました。")
+
+    except Exception as e:
+        logger.error(f"マイグレーションエラー: {e}")
+        raise
+
+
+def downgrade(engine: Any = None) -> None:
+    """bar_chunks テーブルを削除.
+
+    圧縮保存した足も削除されるため、必要な場合は事前に時間軸テーブルへ
+    戻してください。
+    """
+    engine = engine or create_engine(DATABASE_URL)
+    logger.info("bar_chunksテーブルを削除します...")
+
+    try:
+        with engine.begin() as conn:
+            BarChunk.__table__.drop(conn, checkfirst=True)
+        logger.info("bar_chunksテーブルの削除が完了しました。")
+
+    except Exception as e:
+        logger.error(f"マイグレーションのダウングレードエラー: {e}")
+        raise
+
+
+def compact(engine: Any = None, intervals: Optional[List[str]] = None) -> None:
+    """境界より前の月の足を bar_chunks に移す.
+
+    Args:
+        engine: 接続先のエンジン（Noneの場合は .env の接続先）
+        intervals: 対象の時間軸（Noneの場合は ARCHIVE_INTERVALS）
+    """
+    engine = engine or create_engine(DATABASE_URL)
+    config = ArchiveConfig.from_env()
+    if intervals:
+        config.intervals = intervals
+    result = ArchiveCompactor(config, engine=engine).run()
+    logger.info(
+        f"圧縮保存が完了しました: {result['archived_rows']}件 "
+        f"({result['chunks']}チャンク)"
+    )
+
+
+if __name__ == "__main__":
+    logging.basicConfig(
+        level=logging.INFO,
+        format="%(asctime)s - %(name)s - %(levelname)s - %(message)s",
+    )
+
+    command = sys.argv[1].lower() if len(sys.argv) > 1 else None
+    if command == "upgrade":
+        upgrade()
+    elif command == "downgrade":
+        downgrade()
+    elif command == "compact":
+        compact(intervals=sys.argv[2:] or None)
+    else:
+        print(
+            "使用法: python create_bar_chunks_table.py "
+            "[upgrade|downgrade|compact] [時間軸...]"
+        )
+        sys.exit(1)
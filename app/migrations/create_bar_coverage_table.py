@@ -0,0 +1,123 @@
+"""bar_coverage テーブル作成マイグレーション.
+
+銘柄・時間軸ごとの保存件数、最初・最後の足の日時、最後の取得日時を
+保持する bar_coverage テーブルを作成し、既存の時間軸テーブルを集計して
+初期データを作成します。以降は株価データの保存・データ保持ジョブが
+同じトランザクションで更新します。
+
+rebuild は時間軸テーブルを集計して作り直します（手動でのデータ削除・
+復元の後など、bar_coverage と実データがずれた場合の修復用）。集計中は
+時間軸テーブルへの保存が待機するため、時間軸ごとに1トランザクション
+で実行します。
+
+使用法:
+    python app/migrations/create_bar_coverage_table.py [upgrade|downgrade|rebuild] [時間軸...]
+"""
+
+import logging
+import os
+from pathlib import Path
+import sys
+from typing import Any, List, Optional
+
+from dotenv import load_dotenv
+from sqlalchemy import create_engine, text
+
+
+# プロジェクトルートをパスに追加
+project_root = Path(__file__).parent.parent.parent
+sys.path.insert(0, str(project_root))
+
+from app.models import BarCoverage  # noqa: E402
+from app.services.stock_data import coverage  # noqa: E402
+from app.utils.timeframe_utils import (  # noqa: E402
+    get_all_intervals,
+    get_table_name,
+    validate_interval,
+)
+
+
+# .envを読み込み
+load_dotenv()
+
+# データベース接続設定
+DATABASE_URL = f"postgresql://{os.getenv('DB_USER')}:{os.getenv('DB_PASSWORD')}@{os.getenv('DB_HOST')}:{os.getenv('DB_PORT')}/{os.getenv('DB_NAME')}"
+
+logger = logging.getLogger(__name__)
+
+
+def rebuild(engine: Any = None, intervals: Optional[List[str]] = None) -> None:
+    """時間軸テーブルを集計して bar_coverage を作り直す.
+
+    Args:
+        engine: 接続先のエンジン（Noneの場合は .env の接続先）
+        intervals: 対象の時間軸（Noneの場合は全時間軸）
+    """
+    engine = engine or create_engine(DATABASE_URL)
+    for interval in intervals or get_all_intervals():
+        if not validate_interval(interval):
+            raise ValueError(f"サポートされていない時間軸: {interval}")
+        with engine.begin() as conn:
+            exists = conn.execute(
+                text("SELECT to_regclass(:table) IS NOT NULL"),
+                {"table": get_table_name(interval)},
+            ).scalar()
+            if not exists:
+                logger.info(
+                    f"{get_table_name(interval)}テーブルが存在しないため"
+                    "スキップします。"
+                )
+                continue
+            coverage.rebuild(conn, interval)
+
+
+def upgrade(engine: Any = None) -> None:
+    """bar_coverage テーブルを作成し、全時間軸のデータ範囲を集計."""
+    engine = engine or create_engine(DATABASE_URL)
+    logger.info("bar_coverageテーブルの作成を開始します...")
+
+    try:
+        with engine.begin() as conn:
+            BarCoverage.__table__.create(conn, checkfirst=True)
+        rebuild(engine)
+        logger.info("bar_coverageテーブルの作成が完了しました。")
+
+    except Exception as e:
+        logger.error(f"マイグレーションエラー: {e}")
+        raise
+
+
+def downgrade(engine: Any = None) -> None:
+    """bar_coverage テーブルを削除."""
+    engine = engine or create_engine(DATABASE_URL)
+    logger.info("bar_coverageテーブルを削除します...")
+
+    try:
+        with engine.begin() as conn:
+            BarCoverage.__table__.drop(conn, checkfirst=True)
+        logger.info("bar_coverageテーブルの削除が完了しました。")
+
+    except Exception as e:
+        logger.error(f"マイグレーションのダウングレードエラー: {e}")
+        raise
+
+
+if __name__ == "__main__":
+    logging.basicConfig(
+        level=logging.INFO,
+        format="%(asctime)s - %(name)s - %(levelname)s - %(message)s",
+    )
+
+    command = sys.argv[1].lower() if len(sys.argv) > 1 else None
+    if command == "upgrade":
+        upgrade()
+    elif command == "downgrade":
+        downgrade()
+    elif command == "rebuild":
+        rebuild(intervals=sys.argv[2:] or None)
+    else:
+        print(
+            "使用法: python create_bar_coverage_table.py "
+            "[upgrade|downgrade|rebuild] [時間軸...]"
+        )
+        sys.exit(1)
@@ -49,6 +49,17 @@ def get_db_session():
 logger = logging.getLogger(__name__)
 
 
+def add_summary_column(session):
+    """既存のbatch_executionsテーブルに処理結果の集計カラムを追加."""
+    session.execute(
+        text(
+            "ALTER TABLE batch_executions "
+            "ADD COLUMN IF NOT EXISTS summary JSONB"
+        )
+    )
+    logger.info("batch_executions.summaryカラムを確認しました。")
+
+
 def upgrade():
     """batch_executionsとbatch_execution_detailsテーブルを作成."""
     logger.info("Phase 2バッチ実行テーブルの作成を開始します...")
@@ -85,6 +96,7 @@ def upgrade():
                 logger.info(
                     "batch_executionsとbatch_execution_detailsテーブルは既に存在します。"
                 )
+                add_summary_column(session)
                 return
 
             # batch_executionsテーブル作成
@@ -103,6 +115,7 @@ def upgrade():
                         start_time TIMESTAMP WITH TIME ZONE DEFAULT CURRENT_TIMESTAMP,
                         end_time TIMESTAMP WITH TIME ZONE,
                         error_message TEXT,
+                        summary JSONB,
                         created_at TIMESTAMP WITH TIME ZONE DEFAULT CURRENT_TIMESTAMP
                     )
                 """
@@ -126,6 +139,8 @@ def upgrade():
                     )
                 )
                 logger.info("batch_executionsテーブルの作成が完了しました。")
+            else:
+                add_summary_column(session)
 
             # batch_execution_detailsテーブル作成
             if not batch_execution_details_exists:
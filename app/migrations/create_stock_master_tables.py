@@ -46,7 +46,7 @@ def create_stock_master_tables():
     try:
         with engine.begin() as conn:
             # 1. Create stock_master table
-            print("\n[1/4] Creating table: stock_master ...")
+            print("\n[1/5] Creating table: stock_master ...")
             conn.execute(
                 text(
                     """
@@ -80,7 +80,7 @@ def create_stock_master_tables():
             print("Done: created table stock_master")
 
             # 2. Create indexes for stock_master
-            print("\n[2/4] Creating indexes for stock_master ...")
+            print("\n[2/5] Creating indexes for stock_master ...")
             conn.execute(
                 text(
                     "CREATE INDEX IF NOT EXISTS idx_stock_master_code ON stock_master(stock_code)"
@@ -104,7 +104,7 @@ def create_stock_master_tables():
             print("Done: created indexes for stock_master")
 
             # 3. Create stock_master_updates table
-            print("\n[3/4] Creating table: stock_master_updates ...")
+            print("\n[3/5] Creating table: stock_master_updates ...")
             conn.execute(
                 text(
                     """
@@ -115,6 +115,7 @@ def create_stock_master_tables():
                     added_stocks INTEGER DEFAULT 0,
                     updated_stocks INTEGER DEFAULT 0,
                     removed_stocks INTEGER DEFAULT 0,
+                    field_changes JSONB,
                     status VARCHAR(20) NOT NULL,
                     error_message TEXT,
                     started_at TIMESTAMP WITH TIME ZONE DEFAULT CURRENT_TIMESTAMP,
@@ -125,8 +126,18 @@ def create_stock_master_tables():
             )
             print("Done: created table stock_master_updates")
 
-            # 4. Verify created tables
-            print("\n[4/4] Verifying created tables ...")
+            # 4. Add columns introduced after the initial release
+            print("\n[4/5] Adding missing columns to stock_master_updates ...")
+            conn.execute(
+                text(
+                    "ALTER TABLE stock_master_updates "
+                    "ADD COLUMN IF NOT EXISTS field_changes JSONB"
+                )
+            )
+            print("Done: added column field_changes")
+
+            # 5. Verify created tables
+            print("\n[5/5] Verifying created tables ...")
             result = conn.execute(
                 text(
                     """
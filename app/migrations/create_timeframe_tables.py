@@ -8,6 +8,11 @@ Tables created if missing:
 If legacy table `stocks_daily` exists, it will be renamed to `stocks_1d`
 with related constraints and indexes renamed accordingly.
 
+Intraday tables (stocks_1m/5m/15m/30m/1h) are range-partitioned by month on
+`datetime`. Existing non-partitioned intraday tables are converted in place
+(rows, ids and the updated_at trigger are preserved), and partitions from the
+current month up to PARTITION_MONTHS_AHEAD months ahead are created.
+
 Usage:
     python app/migrations/create_timeframe_tables.py
 """
@@ -31,6 +36,7 @@ from app.models import (
     Stocks15m,
     Stocks30m,
 )
+from app.services.stock_data.partitions import PartitionManager
 
 
 # Make project root importable
@@ -161,6 +167,141 @@ def create_timeframe_tables(engine) -> None:
         raise
 
 
+def is_partitioned(engine, table_name: str) -> bool:
+    """Return True if `table_name` is a partitioned (parent) table."""
+    with engine.connect() as conn:
+        return (
+            conn.execute(
+                text(
+                    "SELECT 1 FROM pg_partitioned_table "
+                    "WHERE partrelid = to_regclass(:table)"
+                ),
+                {"table": table_name},
+            ).first()
+            is not None
+        )
+
+
+def convert_to_partitioned_table(engine, table_name: str, model_class) -> int:
+    """Convert a plain intraday table into a monthly partitioned table.
+
+    Runs in a single transaction: the legacy table (and its indexes and id
+    sequence) is renamed aside, the partitioned table is created from the
+    model, monthly partitions covering the existing rows are created, rows
+    are copied with their ids, the id sequence is advanced and the legacy
+    table is dropped. Returns the number of rows copied.
+    """
+    legacy = f"{table_name}_unpartitioned"
+    columns = ", ".join(
+        column.name for column in model_class.__table__.columns
+    )
+    manager = PartitionManager()
+
+    with engine.begin() as conn:
+        has_trigger = (
+            conn.execute(
+                text(
+                    "SELECT 1 FROM pg_trigger WHERE tgname = :name "
+                    "AND tgrelid = to_regclass(:table)"
+                ),
+                {
+                    "name": f"trigger_update_{table_name}_updated_at",
+                    "table": table_name,
+                },
+            ).first()
+            is not None
+        )
+        sequence = conn.execute(
+            text("SELECT pg_get_serial_sequence(:table, 'id')"),
+            {"table": table_name},
+        ).scalar()
+        indexes = conn.execute(
+            text("SELECT indexname FROM pg_indexes WHERE tablename = :table"),
+            {"table": table_name},
+        ).scalars()
+
+        # Move the legacy table and its schema-wide names out of the way
+        conn.execute(text(f"ALTER TABLE {table_name} RENAME TO {legacy}"))
+        for index in list(indexes):
+            conn.execute(
+                text(f"ALTER INDEX {index} RENAME TO {index}_unpartitioned")
+            )
+        if sequence:
+            conn.execute(
+                text(f"ALTER SEQUENCE {sequence} RENAME TO {legacy}_id_seq")
+            )
+
+        model_class.__table__.create(conn)
+        first, last = conn.execute(
+            text(f"SELECT min(datetime), max(datetime) FROM {legacy}")
+        ).one()
+        created = manager.ensure_range(conn, table_name, first, last)
+
+        copied = conn.execute(
+            text(
+                f"INSERT INTO {table_name} ({columns}) "
+                f"SELECT {columns} FROM {legacy}"
+            )
+        ).rowcount
+        conn.execute(
+            text(
+                "SELECT setval(pg_get_serial_sequence(:table, 'id'), "
+                f"COALESCE((SELECT max(id) FROM {table_name}), 1), "
+                f"(SELECT max(id) FROM {table_name}) IS NOT NULL)"
+            ),
+            {"table": table_name},
+        )
+        if has_trigger:
+            conn.execute(
+                text(
+                    f"CREATE TRIGGER trigger_update_{table_name}_updated_at "
+                    f"BEFORE UPDATE ON {table_name} FOR EACH ROW "
+                    "EXECUTE FUNCTION update_updated_at_column()"
+                )
+            )
+        conn.execute(text(f"DROP TABLE {legacy}"))
+
+    logger.info(
+        f"Converted {table_name} to a partitioned table: "
+        f"{copied} rows copied into {len(created)} monthly partitions."
+    )
+    return copied
+
+
+def migrate_to_partitioned_tables(engine) -> None:
+    """Convert existing non-partitioned intraday tables to partitioned ones."""
+    try:
+        for model_class in (
+            Stocks1m,
+            Stocks5m,
+            Stocks15m,
+            Stocks30m,
+            Stocks1h,
+        ):
+            table_name = model_class.__tablename__
+            if not check_table_exists(engine, table_name):
+                continue
+            if is_partitioned(engine, table_name):
+                logger.info(f"Table is partitioned: {table_name}. Skipping.")
+                continue
+            logger.info(f"Converting {table_name} to a partitioned table ...")
+            convert_to_partitioned_table(engine, table_name, model_class)
+
+    except SQLAlchemyError as e:
+        logger.error(f"Error converting to partitioned tables: {str(e)}")
+        raise
+
+
+def create_upcoming_partitions(engine) -> None:
+    """Create monthly partitions from the current month onward."""
+    created = PartitionManager().ensure_upcoming(engine)
+    for table_name, partitions in created.items():
+        logger.info(
+            f"Partitions ready: {table_name} "
+            f"({len(partitions)} created: {', '.join(partitions) or '-'})"
+        )
+
+
 def verify_tables(engine) -> None:
     """Log presence and basic metadata of expected timeframe tables."""
     try:
@@ -214,7 +355,13 @@ def main() -> None:
         # 2. Create timeframe tables
         create_timeframe_tables(engine)
 
-        # 3. Verify tables
+        # 3. Convert existing intraday tables to monthly partitions
+        migrate_to_partitioned_tables(engine)
+
+        # 4. Create upcoming monthly partitions
+        create_upcoming_partitions(engine)
+
+        # 5. Verify tables
         verify_tables(engine)
 
         logger.info("Timeframe table migration completed successfully")
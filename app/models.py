@@ -12,18 +12,22 @@ from typing import Any, Dict, List, Optional
 
 from dotenv import load_dotenv
 from sqlalchemy import (
+    JSON,
     BigInteger,
     CheckConstraint,
     Date,
     DateTime,
     Index,
     Integer,
+    LargeBinary,
     Numeric,
+    PrimaryKeyConstraint,
     String,
     UniqueConstraint,
     create_engine,
 )
 from sqlalchemy.exc import IntegrityError, SQLAlchemyError
+from sqlalchemy.ext.compiler import compiles
 from sqlalchemy.orm import (
     DeclarativeBase,
     Mapped,
@@ -129,6 +133,48 @@ class StockDataBase:
         return result
 
 
+# 分足・時間足テーブルの月単位レンジパーティション（PostgreSQLのみ）
+# パーティションの作成・削除は app.services.stock_data.partitions が行う
+PARTITIONED_BY_MONTH: Dict[str, Any] = {
+    "postgresql_partition_by": "RANGE (datetime)",
+    "info": {"partition_key": "datetime"},
+}
+
+
+def time_brin_index(table_name: str, column: str) -> Index:
+    """時間カラムのBRINインデックス（PostgreSQLのみ作成）.
+
+    銘柄・銘柄+日時の検索は (symbol, datetime|date) の一意制約の
+    インデックスが兼ねるため、B-treeの補助インデックスは作成しない。
+    時間順に追記されるテーブルの銘柄横断の期間検索用に、数ページ分の
+    範囲ごとの最小・最大値だけを持つBRINインデックスを作成する。
+    """
+    return Index(
+        f"idx_{table_name}_{column}_brin", column, postgresql_using="brin"
+    ).ddl_if(dialect="postgresql")
+
+
+@compiles(PrimaryKeyConstraint, "postgresql")
+def _compile_partitioned_primary_key(constraint, compiler, **kw):
+    """パーティション化テーブルの主キーにパーティションキーを含める.
+
+    PostgreSQLではパーティション化テーブルの一意制約にパーティション
+    キーを含める必要があるため、主キーを (id, datetime) として作成する。
+    ORM上の主キーは id のままとし、SQLiteなどでは従来どおり id のみの
+    自動採番の主キーとなる。
+    """
+    key = constraint.table.info.get("partition_key")
+    if key is None or key in constraint.columns:
+        return compiler.visit_primary_key_constraint(constraint, **kw)
+    columns = [column.name for column in constraint.columns] + [key]
+    ddl = ""
+    if constraint.name is not None:
+        ddl += f"CONSTRAINT {compiler.preparer.format_constraint(constraint)} "
+    return ddl + "PRIMARY KEY ({})".format(
+        ", ".join(compiler.preparer.quote(column) for column in columns)
+    )
+
+
 # 1分足データテーブル
 class Stocks1m(Base, StockDataBase):
     """1分足株価データモデル.
@@ -155,9 +201,8 @@ class Stocks1m(Base, StockDataBase):
             "high >= low AND high >= open AND high >= close AND low <= open AND low <= close",
             name="ck_stocks_1m_price_logic",
         ),
-        Index("idx_stocks_1m_symbol", "symbol"),
-        Index("idx_stocks_1m_datetime", "datetime"),
-        Index("idx_stocks_1m_symbol_datetime_desc", "symbol", "datetime"),
+        time_brin_index("stocks_1m", "datetime"),
+        PARTITIONED_BY_MONTH,
     )
 
     def __repr__(self):
@@ -195,9 +240,8 @@ class Stocks5m(Base, StockDataBase):
             "high >= low AND high >= open AND high >= close AND low <= open AND low <= close",
             name="ck_stocks_5m_price_logic",
         ),
-        Index("idx_stocks_5m_symbol", "symbol"),
-        Index("idx_stocks_5m_datetime", "datetime"),
-        Index("idx_stocks_5m_symbol_datetime_desc", "symbol", "datetime"),
+        time_brin_index("stocks_5m", "datetime"),
+        PARTITIONED_BY_MONTH,
     )
 
     def __repr__(self):
@@ -235,9 +279,8 @@ class Stocks15m(Base, StockDataBase):
             "high >= low AND high >= open AND high >= close AND low <= open AND low <= close",
             name="ck_stocks_15m_price_logic",
         ),
-        Index("idx_stocks_15m_symbol", "symbol"),
-        Index("idx_stocks_15m_datetime", "datetime"),
-        Index("idx_stocks_15m_symbol_datetime_desc", "symbol", "datetime"),
+        time_brin_index("stocks_15m", "datetime"),
+        PARTITIONED_BY_MONTH,
     )
 
     def __repr__(self):
@@ -275,9 +318,8 @@ class Stocks30m(Base, StockDataBase):
             "high >= low AND high >= open AND high >= close AND low <= open AND low <= close",
             name="ck_stocks_30m_price_logic",
         ),
-        Index("idx_stocks_30m_symbol", "symbol"),
-        Index("idx_stocks_30m_datetime", "datetime"),
-        Index("idx_stocks_30m_symbol_datetime_desc", "symbol", "datetime"),
+        time_brin_index("stocks_30m", "datetime"),
+        PARTITIONED_BY_MONTH,
     )
 
     def __repr__(self):
@@ -315,9 +357,8 @@ class Stocks1h(Base, StockDataBase):
             "high >= low AND high >= open AND high >= close AND low <= open AND low <= close",
             name="ck_stocks_1h_price_logic",
         ),
-        Index("idx_stocks_1h_symbol", "symbol"),
-        Index("idx_stocks_1h_datetime", "datetime"),
-        Index("idx_stocks_1h_symbol_datetime_desc", "symbol", "datetime"),
+        time_brin_index("stocks_1h", "datetime"),
+        PARTITIONED_BY_MONTH,
     )
 
     def __repr__(self):
@@ -351,9 +392,7 @@ class Stocks1d(Base, StockDataBase):
             "high >= low AND high >= open AND high >= close AND low <= open AND low <= close",
             name="ck_stocks_1d_price_logic",
         ),
-        Index("idx_stocks_1d_symbol", "symbol"),
-        Index("idx_stocks_1d_date", "date"),
-        Index("idx_stocks_1d_symbol_date_desc", "symbol", "date"),
+        time_brin_index("stocks_1d", "date"),
     )
 
     def __repr__(self):
@@ -387,9 +426,7 @@ class Stocks1wk(Base, StockDataBase):
             "high >= low AND high >= open AND high >= close AND low <= open AND low <= close",
             name="ck_stocks_1wk_price_logic",
         ),
-        Index("idx_stocks_1wk_symbol", "symbol"),
-        Index("idx_stocks_1wk_date", "date"),
-        Index("idx_stocks_1wk_symbol_date_desc", "symbol", "date"),
+        time_brin_index("stocks_1wk", "date"),
     )
 
     def __repr__(self):
@@ -423,9 +460,7 @@ class Stocks1mo(Base, StockDataBase):
             "high >= low AND high >= open AND high >= close AND low <= open AND low <= close",
             name="ck_stocks_1mo_price_logic",
         ),
-        Index("idx_stocks_1mo_symbol", "symbol"),
-        Index("idx_stocks_1mo_date", "date"),
-        Index("idx_stocks_1mo_symbol_date_desc", "symbol", "date"),
+        time_brin_index("stocks_1mo", "date"),
     )
 
     def __repr__(self):
@@ -569,9 +604,12 @@ class StockMasterUpdate(Base):
     removed_stocks: Mapped[Optional[int]] = mapped_column(
         Integer, default=0
     )  # 削除（無効化）銘柄数
+    field_changes: Mapped[Optional[Dict[str, int]]] = mapped_column(
+        JSON
+    )  # 項目別の変更銘柄数（例: {"market_category": 12}）
     status: Mapped[str] = mapped_column(
         String(20), nullable=False
-    )  # 'success', 'failed'
+    )  # 'success', 'failed', 'unchanged'
     error_message: Mapped[Optional[str]] = mapped_column(String)  # エラーメッセージ
     started_at: Mapped[Optional[datetime]] = mapped_column(
         DateTime(timezone=True), server_default=func.now()
@@ -601,6 +639,7 @@ class StockMasterUpdate(Base):
             "added_stocks": self.added_stocks,
             "updated_stocks": self.updated_stocks,
             "removed_stocks": self.removed_stocks,
+            "field_changes": self.field_changes,
             "status": self.status,
             "error_message": self.error_message,
             "started_at": (
@@ -627,7 +666,7 @@ class BatchExecution(Base):
     )
     batch_type: Mapped[str] = mapped_column(
         String(50), nullable=False
-    )  # 'all_stocks', 'partial', etc.
+    )  # 'all_stocks', 'partial', 'retention', etc.
     status: Mapped[str] = mapped_column(
         String(20), nullable=False
     )  # 'running', 'completed', 'failed', 'paused'
@@ -648,6 +687,9 @@ class BatchExecution(Base):
         DateTime(timezone=True)
     )
     error_message: Mapped[Optional[str]] = mapped_column(String)  # エラーメッセージ
+    summary: Mapped[Optional[Dict[str, Any]]] = mapped_column(
+        JSON
+    )  # 処理結果の集計（データ保持ジョブの削除件数など）
     created_at: Mapped[Optional[datetime]] = mapped_column(
         DateTime(timezone=True), server_default=func.now()
     )
@@ -685,6 +727,7 @@ class BatchExecution(Base):
             ),
             "end_time": self.end_time.isoformat() if self.end_time else None,
             "error_message": self.error_message,
+            "summary": self.summary,
             "created_at": (
                 self.created_at.isoformat() if self.created_at else None
             ),
@@ -805,6 +848,102 @@ class BatchExecutionDetail(Base):
         return (end_time - self.start_time).total_seconds()
 
 
+# 銘柄・時間軸ごとのデータ範囲テーブル
+class BarCoverage(Base):
+    """銘柄・時間軸ごとの保存件数と期間の集計テーブル.
+
+    株価データの保存と同じトランザクションで更新し、データ状態の
+    確認や差分取得の計画で時間軸テーブルを集計せずに参照します。
+    日足・週足・月足の期間は Asia/Tokyo の日付の0時として格納します。
+    """
+
+    __tablename__ = "bar_coverage"
+
+    symbol: Mapped[str] = mapped_column(
+        String(20), primary_key=True
+    )  # 銘柄コード
+    interval: Mapped[str] = mapped_column(
+        String(10), primary_key=True
+    )  # 時間軸（1m, 1d など）
+    row_count: Mapped[int] = mapped_column(
+        BigInteger, nullable=False, default=0
+    )  # 保存件数
+    first_at: Mapped[Optional[datetime]] = mapped_column(
+        DateTime(timezone=True)
+    )  # 最初の足の日時
+    last_at: Mapped[Optional[datetime]] = mapped_column(
+        DateTime(timezone=True)
+    )  # 最後の足の日時
+    last_fetched_at: Mapped[Optional[datetime]] = mapped_column(
+        DateTime(timezone=True)
+    )  # 最後に取得データを保存した日時
+    updated_at: Mapped[Optional[datetime]] = mapped_column(
+        DateTime(timezone=True), server_default=func.now()
+    )
+
+    __table_args__ = (
+        CheckConstraint("row_count >= 0", name="ck_bar_coverage_row_count"),
+        Index("idx_bar_coverage_interval_last_at", "interval", "last_at"),
+    )
+
+    def __repr__(self):
+        """オブジェクトの文字列表現を返す.
+
+        Returns:
+            str: オブジェクトの文字列表現
+        """
+        return f"<BarCoverage(symbol='{self.symbol}', interval='{self.interval}', row_count={self.row_count})>"
+
+
+class BarChunk(Base):
+    """古い株価データを銘柄・時間軸・月ごとに圧縮して保持するテーブル.
+
+    参照の少ない過去データを、行ごとのタイムスタンプ・IDを持つ時間軸
+    テーブルから、列ごとに差分符号化・圧縮した1つのデータに移します。
+    形式と圧縮・参照処理は app.services.stock_data.archive を参照。
+    """
+
+    __tablename__ = "bar_chunks"
+
+    symbol: Mapped[str] = mapped_column(
+        String(20), primary_key=True
+    )  # 銘柄コード
+    interval: Mapped[str] = mapped_column(
+        String(10), primary_key=True
+    )  # 時間軸（1m, 1d など）
+    month: Mapped[date] = mapped_column(
+        Date, primary_key=True
+    )  # 対象月（Asia/Tokyo の月初日）
+    row_count: Mapped[int] = mapped_column(
+        Integer, nullable=False
+    )  # 格納している足の数
+    first_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True), nullable=False
+    )  # 最初の足の日時
+    last_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True), nullable=False
+    )  # 最後の足の日時
+    data: Mapped[bytes] = mapped_column(
+        LargeBinary, nullable=False
+    )  # 差分符号化・圧縮した列データ
+    updated_at: Mapped[Optional[datetime]] = mapped_column(
+        DateTime(timezone=True), server_default=func.now()
+    )
+
+    __table_args__ = (
+        CheckConstraint("row_count > 0", name="ck_bar_chunks_row_count"),
+        Index("idx_bar_chunks_interval_month", "interval", "month"),
+    )
+
+    def __repr__(self):
+        """オブジェクトの文字列表現を返す.
+
+        Returns:
+            str: オブジェクトの文字列表現
+        """
+        return f"<BarChunk(symbol='{self.symbol}', interval='{self.interval}', month={self.month}, row_count={self.row_count})>"
+
+
 # データベース設定
 DATABASE_URL = f"postgresql://{os.getenv('DB_USER')}:{os.getenv('DB_PASSWORD')}@{os.getenv('DB_HOST')}:{os.getenv('DB_PORT')}/{os.getenv('DB_NAME')}"
 
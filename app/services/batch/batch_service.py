@@ -149,6 +149,7 @@ class BatchService:
         status: str = "completed",
         error_message: Optional[str] = None,
         session: Optional[Session] = None,
+        summary: Optional[Dict[str, Any]] = None,
     ) -> Optional[Dict[str, Any]]:
         """バッチを完了状態にする.
 
@@ -157,6 +158,7 @@ class BatchService:
             status: 完了ステータス ('completed', 'failed', 'paused')
             error_message: エラーメッセージ（失敗時）
             session: SQLAlchemyセッション（省略時は自動生成）
+            summary: 処理結果の集計（省略時は変更しない）
 
         Returns:
             更新されたバッチ情報の辞書、見つからない場合はNone
@@ -179,6 +181,8 @@ class BatchService:
                 batch.end_time = datetime.now()
                 if error_message:
                     batch.error_message = error_message
+                if summary is not None:
+                    batch.summary = summary
                 s.flush()
                 return batch.to_dict()
 
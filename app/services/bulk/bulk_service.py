@@ -3,17 +3,58 @@
 全銘柄の株価データを並列処理で効率的に一括取得します。
 """
 
-from concurrent.futures import ThreadPoolExecutor, as_completed
-from datetime import datetime
+from collections import deque
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from datetime import date, datetime
 import logging
 import time
-from typing import Any, Callable, Dict, List, Optional
+from typing import (
+    Any,
+    Callable,
+    Deque,
+    Dict,
+    Iterator,
+    List,
+    Optional,
+    Union,
+)
 
-from app.services.bulk.stock_batch_processor import StockBatchProcessor
-from app.services.common.error_handler import ErrorAction, ErrorHandler
+from app.services.bulk.pipeline import (
+    BatchPipeline,
+    PipelineConfig,
+    PipelineItem,
+)
+from app.services.bulk.retry_queue import DeferredRetryQueue, RetryEntry
+from app.services.bulk.stock_batch_processor import (
+    BATCH_DOWNLOAD_ERROR_PREFIX,
+    StockBatchProcessor,
+)
+from app.services.common.circuit_breaker import (
+    CircuitBreaker,
+    get_circuit_breaker,
+    is_circuit_open_message,
+)
+from app.services.common.error_handler import (
+    ErrorAction,
+    ErrorHandler,
+    ErrorType,
+)
+from app.services.common.fetch_gateway import (
+    FetchContext,
+    FetchGateway,
+    FetchPriority,
+    get_fetch_gateway,
+)
+from app.services.common.rate_controller import is_throttle_message
 from app.services.stock_data.converter import StockDataConverter
 from app.services.stock_data.fetcher import StockDataFetcher
-from app.services.stock_data.saver import StockDataSaver
+from app.services.stock_data.incremental import IncrementalFetchPlanner
+from app.services.stock_data.saver import StockData, StockDataSaver
+from app.services.stock_data.upsert import (
+    ON_CONFLICT_NOTHING,
+    ON_CONFLICT_RECONCILE,
+)
+from app.services.stock_data.write_spool import WriteSpool, get_write_spool
 from app.utils.structured_logger import (
     get_batch_logger,
     setup_structured_logging,
@@ -34,6 +75,10 @@ except Exception as e:
     logger.warning(f"構造化ログ設定に失敗しました: {e}")
 
 
+# 並列処理モードでリトライをまとめて一括ダウンロードする最大銘柄数
+RETRY_BATCH_SIZE = 50
+
+
 class BulkDataServiceError(Exception):
     """一括データ取得エラー."""
 
@@ -64,6 +109,8 @@ class ProgressTracker:
         self.processing_times: List[float] = []  # 各銘柄の処理時間（ミリ秒）
         self.records_fetched_list: List[int] = []  # 各銘柄の取得レコード数
         self.records_saved_list: List[int] = []  # 各銘柄の保存レコード数
+        # 進捗に含める追加計測値の取得関数（パイプライン・流量制御等）
+        self.metric_sources: Dict[str, Callable[[], Dict[str, Any]]] = {}
 
     def update(
         self,
@@ -150,7 +197,7 @@ class ProgressTracker:
             else 0
         )
 
-        return {
+        progress = {
             "total": self.total,
             "processed": self.processed,
             "successful": self.successful,
@@ -177,6 +224,9 @@ class ProgressTracker:
                 "total_records_saved": total_records_saved,
             },
         }
+        for name, source in self.metric_sources.items():
+            progress[name] = source()
+        return progress
 
     def get_summary(self) -> Dict[str, Any]:
         """処理完了後のサマリーを取得.
@@ -201,46 +251,78 @@ class BulkDataService:
         max_workers: int = 3,
         retry_count: int = 5,
         batch_id: Optional[str] = None,
+        pipeline_config: Optional[PipelineConfig] = None,
+        gateway: Optional[FetchGateway] = None,
+        circuit_breaker: Optional[CircuitBreaker] = None,
+        write_spool: Optional[WriteSpool] = None,
     ):
         """初期化.
 
         Args:
             max_workers: 最大並列ワーカー数（レート制限対策で3に削減）
             retry_count: リトライ回数（デフォルト5回に増加）
-            batch_id: バッチID（構造化ログ用）。
+            batch_id: バッチID（構造化ログ・ゲートウェイのジョブ識別用）
+            pipeline_config: バッチモードのパイプライン設定
+                （Noneの場合は環境変数の設定に従う）
+            gateway: 上流リクエストの窓口
+                （Noneの場合はプロセス共有のゲートウェイ）
+            circuit_breaker: 上流APIのサーキットブレーカー
+                （Noneの場合はプロセス共有のブレーカー）
+            write_spool: バッチモードの保存に使用する書き込みスプール
+                （Noneの場合はプロセス共有のスプール）。
         """
-        self.fetcher = StockDataFetcher()
-        self.batch_processor = StockBatchProcessor()
+        self.circuit_breaker = circuit_breaker or get_circuit_breaker()
+        self.gateway = gateway or get_fetch_gateway()
+        # 一括取得はバックフィルとして、ジョブ単位で公平に枠を受け取る
+        self.fetch_context = FetchContext(
+            FetchPriority.BACKFILL, job_id=batch_id or f"bulk-{id(self):x}"
+        )
+        self.fetcher = StockDataFetcher(
+            circuit_breaker=self.circuit_breaker,
+            gateway=self.gateway,
+            fetch_context=self.fetch_context,
+        )
+        self.batch_processor = StockBatchProcessor(
+            circuit_breaker=self.circuit_breaker,
+            gateway=self.gateway,
+            fetch_context=self.fetch_context,
+        )
         self.saver = StockDataSaver()
+        self.write_spool = write_spool or get_write_spool()
         self.converter = StockDataConverter()
         self.max_workers = max_workers
         self.retry_count = retry_count
+        self.pipeline_config = pipeline_config or PipelineConfig.from_env()
+        self.rate_controller = self.gateway.rate_controller
         self.logger = logger
         # 構造化ログ用ロガー
         self.batch_logger = get_batch_logger(batch_id=batch_id)
-        # ErrorHandlerを初期化（リトライ設定を強化）
-        self.error_handler = ErrorHandler(
-            max_retries=retry_count,
-            retry_delay=5,  # 初期遅延を5秒に増加（レート制限対策）
-            backoff_multiplier=3,  # バックオフ倍率を3に増加
-        )
+        # ErrorHandlerを初期化
+        # リトライ間隔は固定バックオフではなく、ゲートウェイの
+        # rate_controller が429・タイムアウト検知時のクールダウンとして制御する
+        self.error_handler = ErrorHandler(max_retries=retry_count)
 
     def _fetch_and_convert_data(
-        self, symbol: str, interval: str, period: Optional[str]
-    ) -> tuple[bool, list, int]:
+        self,
+        symbol: str,
+        interval: str,
+        period: Optional[str],
+        start: Optional[datetime | date] = None,
+    ) -> tuple[bool, StockData, int]:
         """データの取得と変換.
 
         Args:
             symbol: 銘柄コード
             interval: 時間軸
             period: 取得期間
+            start: 取得開始日時（差分取得時）
 
         Returns:
-            (成功フラグ, 変換済みデータリスト, 処理時間(ms))
+            (成功フラグ, 変換済みデータ(BarBatch), 処理時間(ms))
         """
         fetch_start = time.time()
         df = self.fetcher.fetch_stock_data(
-            symbol=symbol, interval=interval, period=period
+            symbol=symbol, interval=interval, period=period, start=start
         )
         fetch_duration = int((time.time() - fetch_start) * 1000)
 
@@ -255,7 +337,7 @@ class BulkDataService:
 
         # データ変換
         try:
-            data_list = self.converter.convert_to_dict(df, interval)
+            data_list = self.converter.convert_to_batch(df, interval)
             if not data_list:
                 self.logger.warning(f"変換後のデータが空です: {symbol}")
                 return False, [], fetch_duration
@@ -301,7 +383,13 @@ class BulkDataService:
             ) from error
 
     def fetch_single_stock(
-        self, symbol: str, interval: str = "1d", period: Optional[str] = None
+        self,
+        symbol: str,
+        interval: str = "1d",
+        period: Optional[str] = None,
+        start: Optional[datetime | date] = None,
+        max_attempts: Optional[int] = None,
+        first_attempt: int = 1,
     ) -> Dict[str, Any]:
         """単一銘柄のデータを取得・保存（ErrorHandlerによるリトライ機能付き).
 
@@ -309,29 +397,44 @@ class BulkDataService:
             symbol: 銘柄コード
             interval: 時間軸
             period: 取得期間
+            start: 取得開始日時（差分取得時、指定時はperiodより優先）
+            max_attempts: この呼び出しでの最大試行回数
+                （Noneの場合は retry_count 回、1の場合はリトライを
+                呼び出し元の遅延リトライキューに任せる）
+            first_attempt: 今回の試行が通算何回目か（遅延リトライ時）
 
         Returns:
-            処理結果。
+            処理結果（失敗時の retryable はリトライ可能かどうか）。
         """
         last_error = None
+        last_action: Optional[ErrorAction] = None
         start_time = time.time()
-        retry_count_for_handler = 0
+        retry_count_for_handler = first_attempt - 1
 
-        for _ in range(self.retry_count):
+        for _ in range(max_attempts or self.retry_count):
             try:
                 # データ取得と変換
                 (
                     success,
                     data_list,
                     fetch_duration,
-                ) = self._fetch_and_convert_data(symbol, interval, period)
+                ) = self._fetch_and_convert_data(
+                    symbol, interval, period, start
+                )
 
                 if not success:
                     continue
 
-                # データ保存
+                # データ保存（差分取得の重複期間は修正された足だけ更新）
                 save_result = self.saver.save_stock_data(
-                    symbol, interval, data_list
+                    symbol,
+                    interval,
+                    data_list,
+                    on_conflict=(
+                        ON_CONFLICT_RECONCILE
+                        if start is not None
+                        else ON_CONFLICT_NOTHING
+                    ),
                 )
 
                 # 成功ログ
@@ -348,6 +451,7 @@ class BulkDataService:
                     "interval": interval,
                     "records_fetched": len(data_list),
                     "records_saved": save_result.get("saved", 0),
+                    **self._reconcile_counts(save_result),
                     "duration_ms": total_duration,
                     "attempt": retry_count_for_handler + 1,
                 }
@@ -356,6 +460,10 @@ class BulkDataService:
                 last_error = e
                 self.logger.error(f"データ処理エラー: {symbol}: {e}")
 
+                # ブレーカー作動中は即座に諦め、呼び出し元に保留を任せる
+                if is_circuit_open_message(str(e)):
+                    break
+
                 # エラーハンドラーでアクションを決定
                 action = self.error_handler.handle_error(
                     e, symbol, {"retry_count": retry_count_for_handler}
@@ -365,6 +473,7 @@ class BulkDataService:
                 retry_count_for_handler += 1
 
                 # アクション処理
+                last_action = action
                 should_continue = self._handle_retry_action(
                     action, symbol, e, retry_count_for_handler - 1
                 )
@@ -390,6 +499,10 @@ class BulkDataService:
             "attempts": retry_count_for_handler,
             "retry_count": retry_count_for_handler - 1,
             "duration_ms": total_duration,
+            "retryable": (
+                last_action == ErrorAction.RETRY
+                and retry_count_for_handler < self.retry_count
+            ),
         }
 
     def fetch_multiple_stocks(
@@ -400,6 +513,7 @@ class BulkDataService:
         progress_callback: Optional[Callable[[Dict[str, Any]], None]] = None,
         use_batch: bool = True,
         batch_size: int = 100,
+        incremental: bool = False,
     ) -> Dict[str, Any]:
         """複数銘柄のデータを取得・保存（バッチ処理対応）.
 
@@ -410,19 +524,84 @@ class BulkDataService:
             progress_callback: 進捗通知用コールバック関数
             use_batch: バッチ処理を使用するか（デフォルト: True）
             batch_size: バッチサイズ（デフォルト: 100銘柄）
+            incremental: 差分取得を行うか（保存済みの最新データ以降のみ取得）
 
         Returns:
             処理結果のサマリー。
         """
         if use_batch:
             return self._fetch_multiple_stocks_batch(
-                symbols, interval, period, progress_callback, batch_size
+                symbols,
+                interval,
+                period,
+                progress_callback,
+                batch_size,
+                incremental=incremental,
             )
         else:
             return self._fetch_multiple_stocks_parallel(
-                symbols, interval, period, progress_callback
+                symbols,
+                interval,
+                period,
+                progress_callback,
+                incremental=incremental,
             )
 
+    def _fetch_batch_data(
+        self,
+        batch_symbols: List[str],
+        interval: str,
+        period: Optional[str],
+        planner: Optional[IncrementalFetchPlanner] = None,
+    ) -> Dict[str, Dict[str, Any]]:
+        """バッチ単位でデータを一括取得（差分取得対応）.
+
+        差分取得時は、保存済みデータがない銘柄（全期間取得）と
+        保存済みデータがある銘柄（差分取得）に分けてダウンロードする。
+        差分取得する銘柄は開始日時が同じ銘柄ごとにまとめて取得する。
+
+        Args:
+            batch_symbols: バッチ内の銘柄コードのリスト
+            interval: 時間軸
+            period: 取得期間
+            planner: 差分取得プランナー（Noneの場合は通常取得）
+
+        Returns:
+            {銘柄コード: 結果} の辞書。
+        """
+        if planner is None:
+            return self.batch_processor.fetch_batch_stock_data(
+                symbols=batch_symbols, interval=interval, period=period
+            )
+
+        starts = planner.plan(batch_symbols, interval)
+        full_symbols = [s for s in batch_symbols if starts.get(s) is None]
+        incremental_symbols = [
+            s for s in batch_symbols if starts.get(s) is not None
+        ]
+
+        batch_data: Dict[str, Dict[str, Any]] = {}
+        if full_symbols:
+            batch_data.update(
+                self.batch_processor.fetch_batch_stock_data(
+                    symbols=full_symbols, interval=interval, period=period
+                )
+            )
+        # 開始日時が同じ銘柄ごとにまとめて取得（保存済みの足は再取得しない）
+        groups: Dict[Any, List[str]] = {}
+        for symbol in incremental_symbols:
+            groups.setdefault(starts[symbol], []).append(symbol)
+        for start, group in groups.items():
+            batch_data.update(
+                self.batch_processor.fetch_batch_stock_data(
+                    symbols=group,
+                    interval=interval,
+                    period=period,
+                    start=start,
+                )
+            )
+        return batch_data
+
     def _process_batch_data_conversion(
         self, batch_data: dict, interval: str
     ) -> tuple[dict, list]:
@@ -472,14 +651,20 @@ class BulkDataService:
         return symbols_data, conversion_errors
 
     def _save_batch_if_data_exists(
-        self, symbols_data: dict, interval: str, batch_index: int
+        self,
+        symbols_data: dict,
+        interval: str,
+        batch_index: Union[int, str],
+        on_conflict: str = ON_CONFLICT_NOTHING,
     ) -> tuple[dict, int]:
         """データが存在する場合の保存処理.
 
         Args:
             symbols_data: 変換済みデータ
             interval: 時間軸
-            batch_index: バッチインデックス
+            batch_index: バッチインデックス（ログ表示用。リトライのまとめ
+                取得は "retry"）
+            on_conflict: 保存済みの行と重複した場合の動作
 
         Returns:
             (保存結果辞書, 処理時間(ms))
@@ -493,42 +678,91 @@ class BulkDataService:
             }, 0
 
         save_start = time.time()
-        save_result = self.saver.save_batch_stock_data(
-            symbols_data=symbols_data, interval=interval
-        )
+        save_result = None
+        if self.write_spool.enabled:
+            save_result = self._spool_batch(
+                symbols_data, interval, on_conflict
+            )
+        if save_result is None:
+            save_result = self.saver.save_batch_stock_data(
+                symbols_data=symbols_data,
+                interval=interval,
+                on_conflict=on_conflict,
+            )
         save_duration = int((time.time() - save_start) * 1000)
         self.logger.debug(
             f"バッチ保存完了: {len(symbols_data)}銘柄 - {save_duration}ms"
         )
         return save_result, save_duration
 
-    def _record_batch_result(
+    def _spool_batch(
+        self,
+        symbols_data: Dict[str, StockData],
+        interval: str,
+        on_conflict: str,
+    ) -> Optional[Dict[str, Any]]:
+        """変換済みデータを書き込みスプールへ追記.
+
+        DBへの保存はスプールのライターが行うため、DBの遅延・停止中も
+        待たずに次のバッチへ進める。
+
+        Args:
+            symbols_data: 変換済みデータ
+            interval: 時間軸
+            on_conflict: 保存済みの行と重複した場合の動作
+
+        Returns:
+            保存結果と同じ形式の辞書（銘柄ごとに "spooled" を含む）。
+            スプールへの書き出しに失敗した場合はNone（同期保存に切り替える）。
+        """
+        try:
+            spooled = self.write_spool.append(
+                symbols_data, interval, on_conflict
+            )
+        except OSError as e:
+            self.logger.warning(
+                f"書き込みスプールへの追記に失敗、同期保存します: {e}"
+            )
+            return None
+
+        return {
+            "total_symbols": len(spooled),
+            "total_saved": 0,
+            "total_spooled": sum(spooled.values()),
+            "results_by_symbol": {
+                symbol: {"saved": 0, "spooled": rows}
+                for symbol, rows in spooled.items()
+            },
+        }
+
+    def _build_batch_symbol_result(
         self,
         symbol: str,
         interval: str,
-        symbols_data: dict,
-        save_result: dict,
+        context: Dict[str, Any],
         batch_duration: int,
         batch_size: int,
-        tracker,
-        all_results: list,
-    ) -> None:
-        """バッチ処理結果の記録.
+    ) -> Dict[str, Any]:
+        """バッチ処理結果から銘柄ごとの結果を作成.
 
         Args:
             symbol: 銘柄コード
             interval: 時間軸
-            symbols_data: 変換済みデータ
-            save_result: 保存結果
+            context: バッチのコンテキスト
+                （symbols_data / save_result / fetch_errors を含む）
             batch_duration: バッチ処理時間(ms)
             batch_size: バッチサイズ
-            tracker: 進捗トラッカー
-            all_results: 全結果リスト
+
+        Returns:
+            銘柄ごとの処理結果（失敗時は retryable を含む）。
         """
+        symbols_data = context["symbols_data"]
         if symbol in symbols_data and len(symbols_data[symbol]) > 0:
             data_list = symbols_data[symbol]
-            symbol_save_result = save_result.get("results_by_symbol", {}).get(
-                symbol, {}
+            symbol_save_result = (
+                context["save_result"]
+                .get("results_by_symbol", {})
+                .get(symbol, {})
             )
 
             self.logger.info(
@@ -542,32 +776,299 @@ class BulkDataService:
                 "interval": interval,
                 "records_fetched": len(data_list),
                 "records_saved": symbol_save_result.get("saved", 0),
+                **self._reconcile_counts(symbol_save_result),
                 "duration_ms": batch_duration // batch_size,
             }
-            all_results.append(result)
-
-            tracker.update(
-                symbol=symbol,
-                success=True,
-                duration_ms=batch_duration // batch_size,
-                records_fetched=len(data_list),
-                records_saved=symbol_save_result.get("saved", 0),
+            if "spooled" in symbol_save_result:
+                result["records_spooled"] = symbol_save_result["spooled"]
+            return result
+
+        # データ取得失敗（一括ダウンロード自体の失敗・429はリトライ対象）
+        fetch_error = context.get("fetch_errors", {}).get(symbol)
+        return {
+            "success": False,
+            "symbol": symbol,
+            "interval": interval,
+            "error": fetch_error or "データ取得失敗",
+            "retryable": self._is_retryable_batch_error(fetch_error),
+        }
+
+    def _reconcile_counts(self, save_result: Dict[str, Any]) -> Dict[str, int]:
+        """重複期間の照合結果（更新・変更なし件数）を処理結果用に取得."""
+        if "unchanged" not in save_result:
+            return {}
+        return {
+            "records_updated": save_result.get("updated", 0),
+            "records_unchanged": save_result["unchanged"],
+        }
+
+    def _is_retryable_batch_error(self, error: Optional[str]) -> bool:
+        """一括取得の銘柄別エラーがリトライ対象か判定."""
+        if not error:
+            return False
+        return error.startswith(
+            BATCH_DOWNLOAD_ERROR_PREFIX
+        ) or is_throttle_message(error)
+
+    def _settle_result(
+        self,
+        result: Dict[str, Any],
+        attempts: Dict[str, int],
+        retry_queue: DeferredRetryQueue,
+        tracker: ProgressTracker,
+        all_results: list,
+    ) -> bool:
+        """試行結果を確定するかリトライキューへ回す.
+
+        Args:
+            result: 1回の試行の処理結果
+            attempts: {銘柄コード: 試行済み回数}
+            retry_queue: 遅延リトライキュー
+            tracker: 進捗トラッカー
+            all_results: 全結果リスト
+
+        Returns:
+            結果を確定した場合True（リトライ予約時はFalse）。
+        """
+        symbol = result.get("symbol")
+
+        # ブレーカー作動中の拒否は試行回数に数えず、再開見込みまで保留する
+        if not result.get("success", False) and is_circuit_open_message(
+            result.get("error")
+        ):
+            retry_queue.push(
+                symbol,
+                attempts.get(symbol, 0) + 1,
+                result.get("error"),
+                delay=self.circuit_breaker.retry_after(),
+            )
+            return False
+
+        attempts[symbol] = attempts.get(symbol, 0) + 1
+
+        if (
+            not result.get("success", False)
+            and result.get("retryable")
+            and attempts[symbol] < self.retry_count
+        ):
+            retry_queue.push(symbol, attempts[symbol] + 1, result.get("error"))
+            return False
+
+        result.pop("retryable", None)
+        result["attempts"] = attempts[symbol]
+        all_results.append(result)
+        tracker.update(
+            symbol=symbol,
+            success=result.get("success", False),
+            error_message=result.get("error"),
+            duration_ms=result.get("duration_ms"),
+            records_fetched=result.get("records_fetched", 0),
+            records_saved=result.get("records_saved", 0),
+        )
+        return True
+
+    def _create_batch_pipeline(
+        self,
+        interval: str,
+        period: Optional[str],
+        planner: Optional[IncrementalFetchPlanner],
+    ) -> BatchPipeline:
+        """取得・変換・保存ステージのパイプラインを作成.
+
+        Args:
+            interval: 時間軸
+            period: 取得期間
+            planner: 差分取得プランナー（Noneの場合は通常取得）
+
+        Returns:
+            (バッチ名, 銘柄リスト) を入力とするパイプライン。
+        """
+
+        def fetch_stage(batch: tuple) -> Dict[str, Any]:
+            batch_label, batch_symbols = batch
+            self.logger.info(
+                f"バッチ {batch_label} 処理開始: {len(batch_symbols)}銘柄"
+            )
+            context = {
+                "batch_index": batch_label,
+                "start_time": time.time(),
+            }
+            batch_data = self._fetch_batch_data(
+                batch_symbols, interval, period, planner
             )
-        else:
-            # データ取得失敗
-            result = {
-                "success": False,
-                "symbol": symbol,
-                "interval": interval,
-                "error": "データ取得失敗",
+            context["batch_data"] = batch_data
+            context["fetch_errors"] = {
+                symbol: result.get("error")
+                for symbol, result in batch_data.items()
+                if isinstance(result, dict) and not result.get("success")
             }
-            all_results.append(result)
-            tracker.update(
-                symbol=symbol,
-                success=False,
-                error_message="データ取得失敗",
+            fetch_duration = int((time.time() - context["start_time"]) * 1000)
+            self.logger.debug(
+                f"バッチフェッチ完了: {len(batch_symbols)}銘柄 - {fetch_duration}ms"
+            )
+            return context
+
+        def convert_stage(context: Dict[str, Any]) -> Dict[str, Any]:
+            context["symbols_data"], _ = self._process_batch_data_conversion(
+                context.pop("batch_data"), interval
+            )
+            return context
+
+        # 差分取得では重複期間の足を照合し、修正された足だけ更新する
+        on_conflict = (
+            ON_CONFLICT_RECONCILE
+            if planner is not None
+            else ON_CONFLICT_NOTHING
+        )
+
+        def save_stage(context: Dict[str, Any]) -> Dict[str, Any]:
+            context["save_result"], _ = self._save_batch_if_data_exists(
+                context["symbols_data"],
+                interval,
+                context["batch_index"],
+                on_conflict,
+            )
+            return context
+
+        config = self.pipeline_config
+        return BatchPipeline(
+            [
+                ("fetch", fetch_stage, config.fetch_workers),
+                ("convert", convert_stage, config.convert_workers),
+                ("save", save_stage, config.save_workers),
+            ],
+            queue_depth=config.queue_depth,
+        )
+
+    def _record_pipeline_result(
+        self,
+        item: PipelineItem,
+        interval: str,
+        attempts: Dict[str, int],
+        retry_queue: DeferredRetryQueue,
+        tracker: ProgressTracker,
+        all_results: list,
+        progress_callback: Optional[Callable[[Dict[str, Any]], None]],
+    ) -> None:
+        """パイプラインを通過したバッチの結果を記録.
+
+        Args:
+            item: パイプラインの作業単位
+            interval: 時間軸
+            attempts: {銘柄コード: 試行済み回数}
+            retry_queue: 遅延リトライキュー
+            tracker: 進捗トラッカー
+            all_results: 全結果リスト
+            progress_callback: 進捗通知用コールバック関数
+        """
+        _, batch_symbols = item.source
+
+        if item.error is not None:
+            self.logger.error(f"バッチ処理エラー: {item.error}")
+            # バッチ全体が失敗した場合（一時的エラーはリトライ対象）
+            retryable = (
+                self.error_handler.classify_error(item.error)
+                == ErrorType.TEMPORARY
+            )
+            results = [
+                {
+                    "success": False,
+                    "symbol": symbol,
+                    "interval": interval,
+                    "error": str(item.error),
+                    "retryable": retryable,
+                }
+                for symbol in batch_symbols
+            ]
+        else:
+            context = item.payload
+            batch_duration = int((time.time() - context["start_time"]) * 1000)
+            results = [
+                self._build_batch_symbol_result(
+                    symbol,
+                    interval,
+                    context,
+                    batch_duration,
+                    len(batch_symbols),
+                )
+                for symbol in batch_symbols
+            ]
+
+        # 結果を記録（リトライ対象はキューへ）
+        for result in results:
+            self._settle_result(
+                result, attempts, retry_queue, tracker, all_results
+            )
+
+        # 進捗コールバック実行
+        if progress_callback:
+            try:
+                progress_callback(tracker.get_progress())
+            except Exception as e:
+                self.logger.error(f"進捗コールバックエラー: {e}")
+
+        # 進捗ログ出力
+        progress = tracker.get_progress()
+        self.logger.info(
+            f"バッチ処理完了: {progress['processed']}/{progress['total']} "
+            f"({progress['progress_percentage']}%) - "
+            f"成功: {progress['successful']}, 失敗: {progress['failed']}"
+        )
+
+    def _iter_batches_with_retries(
+        self,
+        batches: List[tuple],
+        retry_queue: DeferredRetryQueue,
+        outstanding: Callable[[], int],
+        batch_size: int,
+    ) -> Iterator[tuple]:
+        """通常バッチとリトライバッチを順に生成.
+
+        通常バッチの合間に実行可能時刻に達したリトライをまとめて
+        投入し、通常バッチの投入後は処理中のバッチとリトライ待ちが
+        なくなるまでリトライバッチを生成する。待機するのはパイプラインの
+        入力スレッドのみで、ステージのワーカーは占有しない。
+
+        Args:
+            batches: (バッチ名, 銘柄リスト) のリスト
+            retry_queue: 遅延リトライキュー
+            outstanding: 投入済みで結果未確定のバッチ数を返す関数
+            batch_size: リトライバッチの最大銘柄数
+
+        Yields:
+            (バッチ名, 銘柄リスト)。
+        """
+        retry_batch_count = 0
+
+        def ready_retry_batch() -> Optional[tuple]:
+            nonlocal retry_batch_count
+            ready = retry_queue.pop_ready(limit=batch_size)
+            if not ready:
+                return None
+            retry_batch_count += 1
+            return (
+                f"retry-{retry_batch_count}",
+                [entry.symbol for entry in ready],
             )
 
+        for batch in batches:
+            yield batch
+            retry_batch = ready_retry_batch()
+            if retry_batch:
+                yield retry_batch
+
+        while True:
+            retry_batch = ready_retry_batch()
+            if retry_batch:
+                yield retry_batch
+            elif len(retry_queue) == 0 and outstanding() == 0:
+                return
+            else:
+                wait_seconds = retry_queue.next_ready_in()
+                time.sleep(
+                    min(wait_seconds, 0.5) if wait_seconds is not None else 0.1
+                )
+
     def _fetch_multiple_stocks_batch(
         self,
         symbols: List[str],
@@ -575,15 +1076,23 @@ class BulkDataService:
         period: Optional[str] = None,
         progress_callback: Optional[Callable[[Dict[str, Any]], None]] = None,
         batch_size: int = 100,
+        incremental: bool = False,
     ) -> Dict[str, Any]:
         """複数銘柄のデータをバッチ処理で取得・保存.
 
+        取得・変換・保存の各ステージは有界キューで接続したパイプラインで
+        実行し、前のバッチの保存中に次のバッチのダウンロードを進める。
+        進捗情報の "pipeline" にステージごとの稼働率とキュー長を含める。
+        一時的エラーで失敗した銘柄は遅延リトライキューに積み、実行可能
+        時刻に達したものをまとめて再度一括ダウンロードする。
+
         Args:
             symbols: 銘柄コードのリスト
             interval: 時間軸
             period: 取得期間
             progress_callback: 進捗通知用コールバック関数
             batch_size: バッチサイズ
+            incremental: 差分取得を行うか
 
         Returns:
             処理結果のサマリー。
@@ -595,83 +1104,62 @@ class BulkDataService:
 
         tracker = ProgressTracker(total=len(symbols))
         all_results: List[Dict[str, Any]] = []
+        planner = IncrementalFetchPlanner(self.saver) if incremental else None
+        total_batches = (len(symbols) + batch_size - 1) // batch_size
+        retry_queue = DeferredRetryQueue.from_env()
+        attempts: Dict[str, int] = {}
 
         # 銘柄をバッチサイズごとに分割
-        for i in range(0, len(symbols), batch_size):
-            batch_symbols = symbols[i : i + batch_size]
-            batch_start_time = time.time()
-            batch_index = i // batch_size + 1
-
-            self.logger.info(
-                f"バッチ {batch_index}/{(len(symbols) + batch_size - 1) // batch_size} 処理開始: "
-                f"{len(batch_symbols)}銘柄"
+        batches = [
+            (
+                f"{i // batch_size + 1}/{total_batches}",
+                symbols[i : i + batch_size],
             )
-
+            for i in range(0, len(symbols), batch_size)
+        ]
+
+        pipeline = self._create_batch_pipeline(interval, period, planner)
+        tracker.metric_sources["pipeline"] = pipeline.get_metrics
+        tracker.metric_sources["rate_control"] = self.rate_controller.get_state
+        tracker.metric_sources["fetch_gateway"] = self.gateway.get_stats
+        tracker.metric_sources["circuit_breaker"] = (
+            self.circuit_breaker.get_state
+        )
+        tracker.metric_sources["retry_queue"] = retry_queue.get_stats
+        if self.write_spool.enabled:
+            tracker.metric_sources["write_spool"] = self.write_spool.get_stats
+
+        # 投入済みで結果未確定のバッチ数（リトライ生成の終了判定に使用）
+        counters = {"fed": 0, "done": 0}
+
+        def source() -> Iterator[tuple]:
+            for batch in self._iter_batches_with_retries(
+                batches,
+                retry_queue,
+                lambda: counters["fed"] - counters["done"],
+                batch_size,
+            ):
+                counters["fed"] += 1
+                yield batch
+
+        def on_result(item: PipelineItem) -> None:
             try:
-                # バッチダウンロード
-                fetch_start = time.time()
-                batch_data = self.batch_processor.fetch_batch_stock_data(
-                    symbols=batch_symbols, interval=interval, period=period
-                )
-                fetch_duration = int((time.time() - fetch_start) * 1000)
-                self.logger.debug(
-                    f"バッチフェッチ完了: {len(batch_symbols)}銘柄 - {fetch_duration}ms"
+                self._record_pipeline_result(
+                    item,
+                    interval,
+                    attempts,
+                    retry_queue,
+                    tracker,
+                    all_results,
+                    progress_callback,
                 )
+            finally:
+                counters["done"] += 1
 
-                # データ変換
-                symbols_data, _ = self._process_batch_data_conversion(
-                    batch_data, interval
-                )
-
-                # バッチ保存
-                save_result, _ = self._save_batch_if_data_exists(
-                    symbols_data, interval, batch_index
-                )
-
-                batch_duration = int((time.time() - batch_start_time) * 1000)
-
-                # 結果を記録
-                for symbol in batch_symbols:
-                    self._record_batch_result(
-                        symbol,
-                        interval,
-                        symbols_data,
-                        save_result,
-                        batch_duration,
-                        len(batch_symbols),
-                        tracker,
-                        all_results,
-                    )
-
-                # 進捗コールバック実行
-                if progress_callback:
-                    try:
-                        progress_callback(tracker.get_progress())
-                    except Exception as e:
-                        self.logger.error(f"進捗コールバックエラー: {e}")
-
-                # 進捗ログ出力
-                progress = tracker.get_progress()
-                self.logger.info(
-                    f"バッチ処理完了: {progress['processed']}/{progress['total']} "
-                    f"({progress['progress_percentage']}%) - "
-                    f"成功: {progress['successful']}, 失敗: {progress['failed']}"
-                )
-
-            except Exception as e:
-                self.logger.error(f"バッチ処理エラー: {e}")
-                # バッチ全体が失敗した場合
-                for symbol in batch_symbols:
-                    result = {
-                        "success": False,
-                        "symbol": symbol,
-                        "interval": interval,
-                        "error": str(e),
-                    }
-                    all_results.append(result)
-                    tracker.update(
-                        symbol=symbol, success=False, error_message=str(e)
-                    )
+        # バッチNの保存中にバッチN+1のダウンロードを進める
+        pipeline.run(source(), on_result)
+        if self.write_spool.enabled:
+            self._flush_write_spool()
 
         # サマリー作成
         summary = tracker.get_summary()
@@ -688,12 +1176,22 @@ class BulkDataService:
             for r in all_results
             if r.get("success")
         )
-        total_skipped = total_downloaded - total_saved
+        total_spooled = sum(
+            int(r.get("records_spooled", 0))
+            for r in all_results
+            if r.get("success")
+        )
+        total_skipped = total_downloaded - total_saved - total_spooled
 
         summary["total_downloaded"] = total_downloaded
         summary["total_saved"] = total_saved
         summary["total_skipped"] = total_skipped
         summary["errors"] = tracker.error_details[:100]
+        if self.write_spool.enabled:
+            summary["total_spooled"] = total_spooled
+            summary["write_spool"] = self.write_spool.get_stats()
+        if planner is not None:
+            summary["incremental"] = planner.summarize(all_results)
 
         self.logger.info(
             f"全銘柄バッチ取得完了: "
@@ -706,93 +1204,285 @@ class BulkDataService:
 
         return summary
 
+    def _flush_write_spool(self) -> None:
+        """ジョブで追記したセグメントのDB保存を一定時間待つ.
+
+        時間内に保存できなかったセグメントはスプールに残り、ライターが
+        再試行する（プロセスが終了した場合は次回起動時に再生される）。
+        """
+        timeout = self.write_spool.config.flush_timeout
+        if not self.write_spool.flush(timeout=timeout):
+            stats = self.write_spool.get_stats()
+            self.logger.warning(
+                f"書き込みスプールの保存待ちがタイムアウト: "
+                f"未保存 {stats['pending_rows']}行 "
+                f"(最終エラー: {stats['last_error']})"
+            )
+
+    def _fetch_and_save_batch(
+        self,
+        batch_symbols: List[str],
+        interval: str,
+        period: Optional[str],
+        planner: Optional[IncrementalFetchPlanner],
+    ) -> List[Dict[str, Any]]:
+        """複数銘柄を一括ダウンロードして保存（リトライのまとめ取得用）.
+
+        Args:
+            batch_symbols: 銘柄コードのリスト
+            interval: 時間軸
+            period: 取得期間
+            planner: 差分取得プランナー（Noneの場合は通常取得）
+
+        Returns:
+            銘柄ごとの処理結果のリスト。
+        """
+        start_time = time.time()
+        batch_data = self._fetch_batch_data(
+            batch_symbols, interval, period, planner
+        )
+        context: Dict[str, Any] = {
+            "fetch_errors": {
+                symbol: result.get("error")
+                for symbol, result in batch_data.items()
+                if isinstance(result, dict) and not result.get("success")
+            }
+        }
+        context["symbols_data"], _ = self._process_batch_data_conversion(
+            batch_data, interval
+        )
+        # 差分取得では重複期間の足を照合し、修正された足だけ更新する
+        on_conflict = (
+            ON_CONFLICT_RECONCILE
+            if planner is not None
+            else ON_CONFLICT_NOTHING
+        )
+        context["save_result"], _ = self._save_batch_if_data_exists(
+            context["symbols_data"], interval, "retry", on_conflict
+        )
+        batch_duration = int((time.time() - start_time) * 1000)
+        return [
+            self._build_batch_symbol_result(
+                symbol, interval, context, batch_duration, len(batch_symbols)
+            )
+            for symbol in batch_symbols
+        ]
+
+    def _submit_next_task(
+        self,
+        executor: ThreadPoolExecutor,
+        pending: Deque[str],
+        retry_queue: DeferredRetryQueue,
+        starts: Dict[str, Optional[datetime | date]],
+        interval: str,
+        period: Optional[str],
+        planner: Optional[IncrementalFetchPlanner],
+    ) -> Optional[tuple]:
+        """空きワーカーに実行可能な作業を1件割り当てる.
+
+        未処理の銘柄を優先し、実行可能時刻に達したリトライは未処理の銘柄が
+        なくなった後、または一括ダウンロード1回分たまった時点で割り当てる。
+        複数のリトライはまとめて一括ダウンロードする。
+
+        Args:
+            executor: ワーカーのExecutor
+            pending: 未処理の銘柄コード
+            retry_queue: 遅延リトライキュー
+            starts: {銘柄コード: 取得開始日時}（差分取得時）
+            interval: 時間軸
+            period: 取得期間
+            planner: 差分取得プランナー（Noneの場合は通常取得）
+
+        Returns:
+            (Future, 銘柄コードのリスト)。割り当てる作業がない場合はNone。
+        """
+        ready: List[RetryEntry] = []
+        if not pending or retry_queue.ready_count() >= RETRY_BATCH_SIZE:
+            ready = retry_queue.pop_ready(limit=RETRY_BATCH_SIZE)
+
+        if len(ready) > 1:
+            batch_symbols = [entry.symbol for entry in ready]
+            batch_future = executor.submit(
+                self._fetch_and_save_batch,
+                batch_symbols,
+                interval,
+                period,
+                planner,
+            )
+            return batch_future, batch_symbols
+
+        if ready:
+            symbol, first_attempt = ready[0].symbol, ready[0].attempt
+        elif pending:
+            symbol, first_attempt = pending.popleft(), 1
+        else:
+            return None
+
+        future = executor.submit(
+            self.fetch_single_stock,
+            symbol,
+            interval,
+            period,
+            starts.get(symbol),
+            max_attempts=1,
+            first_attempt=first_attempt,
+        )
+        return future, [symbol]
+
+    def _handle_parallel_task_result(
+        self,
+        future: Any,
+        task_symbols: List[str],
+        attempts: Dict[str, int],
+        retry_queue: DeferredRetryQueue,
+        tracker: ProgressTracker,
+        results: list,
+        progress_callback: Optional[Callable[[Dict[str, Any]], None]],
+    ) -> None:
+        """並列処理で完了したタスクの結果を記録.
+
+        Args:
+            future: 完了したFuture
+            task_symbols: タスクの銘柄コードのリスト
+            attempts: {銘柄コード: 試行済み回数}
+            retry_queue: 遅延リトライキュー
+            tracker: 進捗トラッカー
+            results: 全結果リスト
+            progress_callback: 進捗通知用コールバック関数
+        """
+        try:
+            outcome = future.result()
+            task_results = outcome if isinstance(outcome, list) else [outcome]
+        except Exception as e:
+            self.logger.error(
+                f"タスク実行エラー ({', '.join(task_symbols)}): {e}"
+            )
+            task_results = [
+                {"success": False, "symbol": symbol, "error": str(e)}
+                for symbol in task_symbols
+            ]
+
+        for result in task_results:
+            if not self._settle_result(
+                result, attempts, retry_queue, tracker, results
+            ):
+                continue
+
+            # 進捗コールバック実行
+            if progress_callback:
+                try:
+                    progress_callback(tracker.get_progress())
+                except Exception as e:
+                    self.logger.error(f"進捗コールバックエラー: {e}")
+
+            # 進捗ログ出力（10件ごと）
+            if (
+                tracker.processed % 10 == 0
+                or tracker.processed == tracker.total
+            ):
+                progress = tracker.get_progress()
+                self.logger.info(
+                    f"進捗: {progress['processed']}/{progress['total']} "
+                    f"({progress['progress_percentage']}%) - "
+                    f"成功: {progress['successful']}, "
+                    f"失敗: {progress['failed']}, "
+                    f"速度: {progress['stocks_per_second']}銘柄/秒"
+                )
+
     def _fetch_multiple_stocks_parallel(
         self,
         symbols: List[str],
         interval: str = "1d",
         period: Optional[str] = None,
         progress_callback: Optional[Callable[[Dict[str, Any]], None]] = None,
+        incremental: bool = False,
     ) -> Dict[str, Any]:
         """複数銘柄のデータを並列取得・保存（旧実装）.
 
+        各銘柄は1回ずつ試行し、一時的エラーの銘柄は遅延リトライキューに
+        積む。ワーカーはリトライ待ちの間スリープせず、空きが出るたびに
+        実行可能なリトライ（複数あれば一括ダウンロード）または未処理の
+        銘柄を割り当てる。
+
         Args:
             symbols: 銘柄コードのリスト
             interval: 時間軸
             period: 取得期間
             progress_callback: 進捗通知用コールバック関数
+            incremental: 差分取得を行うか
 
         Returns:
             処理結果のサマリー。
         """
+        # 実効的な同時実行数は rate_controller が増減させる
+        workers = max(self.max_workers, self.rate_controller.max_concurrency)
         self.logger.info(
             f"全銘柄一括取得開始: {len(symbols)}銘柄 "
-            f"(時間軸: {interval}, 並列数: {self.max_workers})"
+            f"(時間軸: {interval}, 最大並列数: {workers})"
         )
 
         # 進捗トラッカー初期化
         tracker = ProgressTracker(total=len(symbols))
-        results = []
-
-        # ThreadPoolExecutorで並列処理
-        with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
-            # 全銘柄のタスクを送信
-            future_to_symbol = {
-                executor.submit(
-                    self.fetch_single_stock, symbol, interval, period
-                ): symbol
-                for symbol in symbols
-            }
+        retry_queue = DeferredRetryQueue.from_env()
+        tracker.metric_sources["rate_control"] = self.rate_controller.get_state
+        tracker.metric_sources["fetch_gateway"] = self.gateway.get_stats
+        tracker.metric_sources["circuit_breaker"] = (
+            self.circuit_breaker.get_state
+        )
+        tracker.metric_sources["retry_queue"] = retry_queue.get_stats
+        results: List[Dict[str, Any]] = []
+        attempts: Dict[str, int] = {}
+        pending = deque(symbols)
+
+        # 差分取得時は全銘柄の開始日時を一括で決定
+        planner = IncrementalFetchPlanner(self.saver) if incremental else None
+        starts = planner.plan(symbols, interval) if planner else {}
+
+        def submit_next(executor: ThreadPoolExecutor) -> Optional[tuple]:
+            return self._submit_next_task(
+                executor,
+                pending,
+                retry_queue,
+                starts,
+                interval,
+                period,
+                planner,
+            )
 
-            # 完了したタスクから順次処理
-            for future in as_completed(future_to_symbol):
-                symbol = future_to_symbol[future]
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            in_flight: Dict[Any, List[str]] = {}
 
-                try:
-                    result = future.result()
-                    results.append(result)
-
-                    # 進捗更新（メトリクス含む）
-                    tracker.update(
-                        symbol=symbol,
-                        success=result.get("success", False),
-                        error_message=result.get("error"),
-                        duration_ms=result.get("duration_ms"),
-                        records_fetched=result.get("records_fetched", 0),
-                        records_saved=result.get("records_saved", 0),
-                    )
+            while pending or in_flight or len(retry_queue):
+                while len(in_flight) < workers:
+                    submitted = submit_next(executor)
+                    if submitted is None:
+                        break
+                    in_flight[submitted[0]] = submitted[1]
 
-                    # 進捗コールバック実行
-                    if progress_callback:
-                        try:
-                            progress_callback(tracker.get_progress())
-                        except Exception as e:
-                            self.logger.error(f"進捗コールバックエラー: {e}")
-
-                    # 進捗ログ出力（10件ごと）
-                    if (
-                        tracker.processed % 10 == 0
-                        or tracker.processed == tracker.total
-                    ):
-                        progress = tracker.get_progress()
-                        self.logger.info(
-                            f"進捗: {progress['processed']}/{progress['total']} "
-                            f"({progress['progress_percentage']}%) - "
-                            f"成功: {progress['successful']}, "
-                            f"失敗: {progress['failed']}, "
-                            f"速度: {progress['stocks_per_second']}銘柄/秒"
-                        )
-
-                    # レート制限対策：リクエスト間隔制御
-                    if tracker.processed < tracker.total:
-                        time.sleep(1.0)  # 1秒間隔でリクエスト制御
+                if not in_flight:
+                    # 実行可能時刻前のリトライのみ残っている
+                    time.sleep(retry_queue.next_ready_in() or 0)
+                    continue
 
-                except Exception as e:
-                    self.logger.error(f"タスク実行エラー ({symbol}): {e}")
-                    tracker.update(
-                        symbol=symbol, success=False, error_message=str(e)
-                    )
-                    results.append(
-                        {"success": False, "symbol": symbol, "error": str(e)}
+                # 完了したタスク、または（空きがあれば）リトライの実行可能時刻を待つ
+                timeout = (
+                    retry_queue.next_ready_in()
+                    if len(in_flight) < workers
+                    else None
+                )
+                done, _ = wait(
+                    in_flight, timeout=timeout, return_when=FIRST_COMPLETED
+                )
+
+                for future in done:
+                    self._handle_parallel_task_result(
+                        future,
+                        in_flight.pop(future),
+                        attempts,
+                        retry_queue,
+                        tracker,
+                        results,
+                        progress_callback,
                     )
 
         # サマリー作成
@@ -812,6 +1502,8 @@ class BulkDataService:
         summary["total_saved"] = total_saved
         summary["total_skipped"] = total_skipped
         summary["errors"] = tracker.error_details[:100]  # エラー詳細（最大100件）
+        if planner is not None:
+            summary["incremental"] = planner.summarize(results)
 
         # エラーハンドラーからエラーレポートを生成
         error_report = self.error_handler.generate_error_report()
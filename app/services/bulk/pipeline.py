@@ -0,0 +1,327 @@
+"""バッチ処理パイプライン.
+
+取得・変換・DB保存の各ステージを有界キューで接続し、ステージごとに
+指定した並列度のワーカースレッドで実行します。バッチNのDB保存中に
+バッチN+1のダウンロードを進められるため、ネットワークとデータベースの
+待ち時間が重なり合い、全体のスループットが向上します。
+"""
+
+from dataclasses import dataclass
+import logging
+import os
+import queue
+import threading
+import time
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple
+
+
+logger = logging.getLogger(__name__)
+
+# キュー待機のポーリング間隔（秒）。停止要求の検知に使用する
+_POLL_INTERVAL = 0.1
+
+
+class PipelineError(Exception):
+    """パイプライン処理エラー."""
+
+    pass
+
+
+@dataclass
+class PipelineConfig:
+    """パイプライン設定.
+
+    Attributes:
+        queue_depth: ステージ間キューの最大長
+        fetch_workers: 取得ステージの並列度
+        convert_workers: 変換ステージの並列度
+        save_workers: DB保存ステージの並列度
+    """
+
+    queue_depth: int = 2
+    fetch_workers: int = 1
+    convert_workers: int = 1
+    save_workers: int = 1
+
+    @classmethod
+    def from_env(cls) -> "PipelineConfig":
+        """環境変数から設定を作成.
+
+        Returns:
+            BULK_PIPELINE_* 環境変数を反映した設定。
+        """
+        return cls(
+            queue_depth=int(os.getenv("BULK_PIPELINE_QUEUE_DEPTH", "2")),
+            fetch_workers=int(os.getenv("BULK_PIPELINE_FETCH_WORKERS", "1")),
+            convert_workers=int(
+                os.getenv("BULK_PIPELINE_CONVERT_WORKERS", "1")
+            ),
+            save_workers=int(os.getenv("BULK_PIPELINE_SAVE_WORKERS", "1")),
+        )
+
+
+@dataclass
+class PipelineItem:
+    """パイプラインを流れる作業単位.
+
+    Attributes:
+        index: 投入順の連番
+        payload: 各ステージの入出力
+        source: 最初のステージへの入力
+        error: 途中のステージで発生した例外（以降のステージはスキップ）
+        failed_stage: 例外が発生したステージ名
+    """
+
+    index: int
+    payload: Any
+    source: Any = None
+    error: Optional[Exception] = None
+    failed_stage: Optional[str] = None
+
+
+class _Stage:
+    """パイプラインの1ステージ（ワーカー群と計測値）."""
+
+    def __init__(
+        self,
+        name: str,
+        func: Callable[[Any], Any],
+        workers: int,
+        input_queue: "queue.Queue[Any]",
+    ):
+        self.name = name
+        self.func = func
+        self.workers = workers
+        self.input_queue = input_queue
+        self.processed = 0
+        self.errors = 0
+        self.busy_seconds = 0.0
+        self.active = 0
+        self.workers_done = 0
+        self.lock = threading.Lock()
+
+
+class BatchPipeline:
+    """有界キューで接続された多段パイプライン.
+
+    ステージ関数はワーカースレッドで実行され、最終結果は run() を
+    呼び出したスレッドで on_result に渡される。ステージ関数の例外は
+    作業単位に記録され、後続ステージをスキップして on_result に届く。
+    """
+
+    _SENTINEL = object()
+
+    def __init__(
+        self,
+        stages: List[Tuple[str, Callable[[Any], Any], int]],
+        queue_depth: int = 2,
+    ):
+        """初期化.
+
+        Args:
+            stages: (ステージ名, 関数, 並列度) のリスト
+            queue_depth: ステージ間キューの最大長
+
+        Raises:
+            PipelineError: 設定が不正な場合
+        """
+        if not stages:
+            raise PipelineError("ステージが指定されていません")
+        if queue_depth < 1:
+            raise PipelineError(
+                f"キュー長は1以上を指定してください: {queue_depth}"
+            )
+
+        self.logger = logger
+        self.queue_depth = queue_depth
+        self._stages: List[_Stage] = []
+        for name, func, workers in stages:
+            if workers < 1:
+                raise PipelineError(
+                    f"並列度は1以上を指定してください: {name}={workers}"
+                )
+            self._stages.append(
+                _Stage(name, func, workers, queue.Queue(maxsize=queue_depth))
+            )
+        self._output_queue: "queue.Queue[Any]" = queue.Queue(
+            maxsize=queue_depth
+        )
+        self._stop = threading.Event()
+        self._start_time: Optional[float] = None
+        self._end_time: Optional[float] = None
+
+    def run(
+        self,
+        items: Iterable[Any],
+        on_result: Callable[[PipelineItem], None],
+    ) -> None:
+        """パイプラインを実行.
+
+        Args:
+            items: 最初のステージへの入力
+            on_result: 最終ステージを通過した作業単位を受け取る関数
+                （run() の呼び出しスレッドで実行される）
+        """
+        self._stop.clear()
+        self._start_time = time.monotonic()
+        self._end_time = None
+        for stage in self._stages:
+            stage.workers_done = 0
+
+        threads = [
+            threading.Thread(
+                target=self._feed,
+                args=(items,),
+                name="pipeline-feeder",
+                daemon=True,
+            )
+        ]
+        for position, stage in enumerate(self._stages):
+            for worker_id in range(stage.workers):
+                threads.append(
+                    threading.Thread(
+                        target=self._work,
+                        args=(position,),
+                        name=f"pipeline-{stage.name}-{worker_id}",
+                        daemon=True,
+                    )
+                )
+        for thread in threads:
+            thread.start()
+
+        try:
+            while True:
+                item = self._output_queue.get()
+                if item is self._SENTINEL:
+                    break
+                on_result(item)
+        finally:
+            # on_result の例外時もワーカーを停止させる
+            self._stop.set()
+            for thread in threads:
+                thread.join(timeout=_POLL_INTERVAL * 10)
+            self._end_time = time.monotonic()
+
+    def get_metrics(self) -> Dict[str, Any]:
+        """ステージごとの稼働率・キュー長を取得.
+
+        Returns:
+            パイプラインの計測値の辞書。
+        """
+        if self._start_time is None:
+            elapsed = 0.0
+        else:
+            elapsed = (self._end_time or time.monotonic()) - self._start_time
+
+        stages: Dict[str, Any] = {}
+        for stage in self._stages:
+            with stage.lock:
+                capacity = elapsed * stage.workers
+                utilization = (
+                    min(stage.busy_seconds / capacity, 1.0)
+                    if capacity > 0
+                    else 0.0
+                )
+                stages[stage.name] = {
+                    "workers": stage.workers,
+                    "active": stage.active,
+                    "processed": stage.processed,
+                    "errors": stage.errors,
+                    "busy_seconds": round(stage.busy_seconds, 3),
+                    "utilization": round(utilization, 3),
+                    "queue_depth": stage.input_queue.qsize(),
+                }
+
+        return {
+            "queue_capacity": self.queue_depth,
+            "elapsed_seconds": round(elapsed, 3),
+            "stages": stages,
+        }
+
+    def _put(self, target: "queue.Queue[Any]", item: Any) -> bool:
+        """停止要求を確認しながらキューへ投入."""
+        while not self._stop.is_set():
+            try:
+                target.put(item, timeout=_POLL_INTERVAL)
+                return True
+            except queue.Full:
+                continue
+        return False
+
+    def _get(self, source: "queue.Queue[Any]") -> Any:
+        """停止要求を確認しながらキューから取得."""
+        while not self._stop.is_set():
+            try:
+                return source.get(timeout=_POLL_INTERVAL)
+            except queue.Empty:
+                continue
+        return self._SENTINEL
+
+    def _feed(self, items: Iterable[Any]) -> None:
+        """最初のステージへ入力を投入."""
+        first = self._stages[0]
+        try:
+            for index, payload in enumerate(items):
+                item = PipelineItem(index, payload, source=payload)
+                if not self._put(first.input_queue, item):
+                    return
+        except Exception as e:
+            self.logger.error(f"パイプライン入力エラー: {e}")
+        finally:
+            for _ in range(first.workers):
+                self._put(first.input_queue, self._SENTINEL)
+
+    def _work(self, position: int) -> None:
+        """ステージのワーカーループ."""
+        stage = self._stages[position]
+        is_last = position == len(self._stages) - 1
+        next_queue = (
+            self._output_queue
+            if is_last
+            else self._stages[position + 1].input_queue
+        )
+
+        while True:
+            item = self._get(stage.input_queue)
+            if item is self._SENTINEL:
+                break
+
+            if item.error is None:
+                started = time.monotonic()
+                with stage.lock:
+                    stage.active += 1
+                try:
+                    item.payload = stage.func(item.payload)
+                except Exception as e:
+                    self.logger.error(
+                        f"パイプラインステージエラー: {stage.name}: {e}"
+                    )
+                    item.error = e
+                    item.failed_stage = stage.name
+                finally:
+                    with stage.lock:
+                        stage.active -= 1
+                        stage.busy_seconds += time.monotonic() - started
+                        stage.processed += 1
+                        if item.error is not None:
+                            stage.errors += 1
+
+            if not self._put(next_queue, item):
+                return
+
+        self._finish_worker(position, next_queue, is_last)
+
+    def _finish_worker(
+        self, position: int, next_queue: "queue.Queue[Any]", is_last: bool
+    ) -> None:
+        """ステージ最後のワーカー終了時に後続へ終了を伝播."""
+        stage = self._stages[position]
+        with stage.lock:
+            stage.workers_done += 1
+            last_worker = stage.workers_done == stage.workers
+        if not last_worker:
+            return
+
+        downstream = 1 if is_last else self._stages[position + 1].workers
+        for _ in range(downstream):
+            self._put(next_queue, self._SENTINEL)
@@ -0,0 +1,175 @@
+"""遅延リトライキュー.
+
+一時的エラーで失敗した銘柄を、実行可能時刻（not-before）付きでキューに
+積みます。ワーカーはリトライ待ちの間スリープせずに他の銘柄を処理し、
+実行可能時刻に達した銘柄はまとめて取り出して一括ダウンロードできます。
+"""
+
+from dataclasses import dataclass, field
+import heapq
+import logging
+import os
+import random
+import threading
+import time
+from typing import Any, Callable, Dict, List, Optional
+
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass(order=True)
+class RetryEntry:
+    """リトライ待ちの銘柄.
+
+    Attributes:
+        not_before: 実行可能時刻（time.monotonic() 基準）
+        symbol: 銘柄コード
+        attempt: 次に実行する試行回数（1始まり）
+        last_error: 直前のエラーメッセージ
+    """
+
+    not_before: float
+    symbol: str = field(compare=False)
+    attempt: int = field(compare=False)
+    last_error: str = field(default="", compare=False)
+
+
+class DeferredRetryQueue:
+    """実行可能時刻付きのリトライキュー（スレッドセーフ）."""
+
+    def __init__(
+        self,
+        base_delay: float = 2.0,
+        multiplier: float = 2.0,
+        max_delay: float = 60.0,
+        jitter: float = 0.25,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        """初期化.
+
+        Args:
+            base_delay: 1回目のリトライまでの待機時間（秒）
+            multiplier: 試行ごとの待機時間の倍率
+            max_delay: 待機時間の上限（秒）
+            jitter: 待機時間に加える揺らぎの割合（0.25なら±25%）
+            clock: 現在時刻の取得関数
+        """
+        self.logger = logger
+        self.base_delay = base_delay
+        self.multiplier = multiplier
+        self.max_delay = max_delay
+        self.jitter = jitter
+        self._clock = clock
+        self._heap: List[RetryEntry] = []
+        self._lock = threading.Lock()
+        self._scheduled_total = 0
+
+    @classmethod
+    def from_env(cls) -> "DeferredRetryQueue":
+        """環境変数の設定からキューを作成.
+
+        Returns:
+            BULK_RETRY_* 環境変数を反映したキュー。
+        """
+        return cls(
+            base_delay=float(os.getenv("BULK_RETRY_BASE_DELAY", "2.0")),
+            multiplier=float(os.getenv("BULK_RETRY_MULTIPLIER", "2.0")),
+            max_delay=float(os.getenv("BULK_RETRY_MAX_DELAY", "60.0")),
+        )
+
+    def push(
+        self,
+        symbol: str,
+        attempt: int,
+        error: Optional[str] = None,
+        delay: Optional[float] = None,
+    ) -> RetryEntry:
+        """銘柄をリトライ待ちに追加.
+
+        Args:
+            symbol: 銘柄コード
+            attempt: 次に実行する試行回数（2以上）
+            error: 直前のエラーメッセージ
+            delay: 待機時間（Noneの場合は試行回数から算出）
+
+        Returns:
+            追加したエントリ。
+        """
+        if delay is None:
+            delay = min(
+                self.base_delay * (self.multiplier ** max(attempt - 2, 0)),
+                self.max_delay,
+            )
+        delay *= 1 + random.uniform(-self.jitter, self.jitter)
+
+        entry = RetryEntry(
+            not_before=self._clock() + max(delay, 0.0),
+            symbol=symbol,
+            attempt=attempt,
+            last_error=error or "",
+        )
+        with self._lock:
+            heapq.heappush(self._heap, entry)
+            self._scheduled_total += 1
+
+        self.logger.info(
+            f"リトライ予約: {symbol} (試行{attempt}回目, {delay:.1f}秒後)"
+        )
+        return entry
+
+    def pop_ready(self, limit: Optional[int] = None) -> List[RetryEntry]:
+        """実行可能時刻に達したエントリを取り出す.
+
+        Args:
+            limit: 取り出す最大件数（Noneの場合は全件）
+
+        Returns:
+            実行可能時刻の早い順のエントリのリスト。
+        """
+        now = self._clock()
+        ready: List[RetryEntry] = []
+        with self._lock:
+            while self._heap and self._heap[0].not_before <= now:
+                if limit is not None and len(ready) >= limit:
+                    break
+                ready.append(heapq.heappop(self._heap))
+        return ready
+
+    def ready_count(self) -> int:
+        """実行可能時刻に達したエントリの件数."""
+        now = self._clock()
+        with self._lock:
+            return sum(1 for entry in self._heap if entry.not_before <= now)
+
+    def next_ready_in(self) -> Optional[float]:
+        """次のエントリが実行可能になるまでの秒数.
+
+        Returns:
+            秒数（キューが空の場合はNone、既に実行可能なら0）。
+        """
+        with self._lock:
+            if not self._heap:
+                return None
+            return max(self._heap[0].not_before - self._clock(), 0.0)
+
+    def __len__(self) -> int:
+        """リトライ待ちの件数."""
+        with self._lock:
+            return len(self._heap)
+
+    def get_stats(self) -> Dict[str, Any]:
+        """リトライキューの統計を取得.
+
+        Returns:
+            待機件数・予約総数・次の実行までの秒数の辞書。
+        """
+        next_ready = self.next_ready_in()
+        with self._lock:
+            return {
+                "pending": len(self._heap),
+                "scheduled_total": self._scheduled_total,
+                "next_ready_in_seconds": (
+                    round(next_ready, 2) if next_ready is not None else None
+                ),
+            }
@@ -3,19 +3,39 @@
 このモジュールは複数銘柄の株価データ一括処理機能を提供します。
 """
 
+from datetime import date, datetime
 import logging
 from typing import Any, Dict, List, Optional
 
 import pandas as pd
-import yfinance as yf
 
+from app.services.common.circuit_breaker import (
+    CircuitBreaker,
+    get_circuit_breaker,
+)
+from app.services.common.fetch_gateway import (
+    FetchContext,
+    FetchGateway,
+    get_fetch_gateway,
+)
 from app.services.stock_data.converter import StockDataConverter
 from app.services.stock_data.fetcher import StockDataFetcher
+from app.services.stock_data.provider import (
+    MarketDataProvider,
+    get_provider,
+)
+from app.services.stock_data.response_cache import (
+    ResponseCache,
+    get_response_cache,
+)
 from app.services.stock_data.validator import StockDataValidator
 
 
 logger = logging.getLogger(__name__)
 
+# 一括ダウンロード自体が失敗した場合の銘柄別エラーメッセージの接頭辞
+BATCH_DOWNLOAD_ERROR_PREFIX = "一括ダウンロードエラー"
+
 
 class StockBatchProcessingError(Exception):
     """一括処理エラー."""
@@ -26,11 +46,34 @@ class StockBatchProcessingError(Exception):
 class StockBatchProcessor:
     """株価データ一括処理クラス."""
 
-    def __init__(self):
-        """初期化."""
+    def __init__(
+        self,
+        provider: Optional[MarketDataProvider] = None,
+        circuit_breaker: Optional[CircuitBreaker] = None,
+        gateway: Optional[FetchGateway] = None,
+        fetch_context: Optional[FetchContext] = None,
+        response_cache: Optional[ResponseCache] = None,
+    ):
+        """初期化.
+
+        Args:
+            provider: 市場データプロバイダー（Noneの場合は環境変数の設定に従う）
+            circuit_breaker: 上流APIのサーキットブレーカー
+                （Noneの場合はプロセス共有のブレーカー）
+            gateway: 上流リクエストの窓口（Noneの場合はプロセス共有）
+            fetch_context: リクエスト元の優先度・ジョブ
+                （Noneの場合は interactive）
+            response_cache: プロバイダー応答のキャッシュ
+                （Noneの場合はプロセス共有のキャッシュ）
+        """
         self.logger = logger
         self.validator = StockDataValidator()
         self.converter = StockDataConverter()
+        self.provider = provider or get_provider()
+        self.circuit_breaker = circuit_breaker or get_circuit_breaker()
+        self.gateway = gateway or get_fetch_gateway()
+        self.fetch_context = fetch_context or FetchContext()
+        self.response_cache = response_cache or get_response_cache()
 
     def fetch_multiple_timeframes(
         self,
@@ -67,13 +110,19 @@ class StockBatchProcessor:
         for interval in intervals:
             try:
                 # 個別の時間軸でデータ取得（外部のfetch_stock_dataを使用）
-                fetcher = StockDataFetcher()
+                fetcher = StockDataFetcher(
+                    provider=self.provider,
+                    circuit_breaker=self.circuit_breaker,
+                    gateway=self.gateway,
+                    fetch_context=self.fetch_context,
+                    response_cache=self.response_cache,
+                )
                 df = fetcher.fetch_stock_data(
                     symbol=formatted_symbol, interval=interval, period=period
                 )
 
                 # データ変換
-                data_list = self.converter.convert_to_dict(df, interval)
+                data_list = self.converter.convert_to_batch(df, interval)
                 price_data = self.converter.extract_price_data(df)
 
                 results[interval] = {
@@ -117,6 +166,7 @@ class StockBatchProcessor:
         symbols: List[str],
         interval: str = "1d",
         period: Optional[str] = None,
+        start: Optional[datetime | date] = None,
     ) -> Dict[str, Dict[str, Any]]:
         """複数銘柄の株価データを一括取得.
 
@@ -124,6 +174,7 @@ class StockBatchProcessor:
             symbols: 銘柄コードのリスト
             interval: 時間軸
             period: 取得期間
+            start: 取得開始日時（指定時はperiodより優先、差分取得用）
 
         Returns:
             {銘柄コード: 結果} の辞書
@@ -140,7 +191,9 @@ class StockBatchProcessor:
         self.logger.info(f"一括データ取得開始: {len(valid_symbols)}銘柄 ({interval})")
 
         # 有効な銘柄のデータを処理
-        self._process_valid_symbols(valid_symbols, interval, period, results)
+        self._process_valid_symbols(
+            valid_symbols, interval, period, results, start
+        )
 
         # 結果をログ出力
         self._log_batch_results(results, len(symbols))
@@ -183,27 +236,74 @@ class StockBatchProcessor:
         interval: str,
         period: Optional[str],
         results: Dict[str, Dict[str, Any]],
+        start: Optional[datetime | date] = None,
     ) -> None:
         """有効な銘柄のデータを処理."""
-        try:
-            # 一括ダウンロード
-            batch_df = self._download_batch_from_yahoo(
-                valid_symbols, interval, period
-            )
+        # キャッシュ済みの銘柄はダウンロードしない
+        symbol_dataframes = self._load_cached_frames(
+            valid_symbols, interval, period, start
+        )
+        missing_symbols = [
+            symbol
+            for symbol in valid_symbols
+            if symbol not in symbol_dataframes
+        ]
 
-            # 銘柄ごとに分割
-            symbol_dataframes = self.converter.split_multi_symbol_result(
-                batch_df, valid_symbols
-            )
+        if missing_symbols:
+            try:
+                # 一括ダウンロード
+                batch_df = self._download_batch_from_provider(
+                    missing_symbols, interval, period, start
+                )
+
+                # 銘柄ごとに分割
+                fetched = self.converter.split_multi_symbol_result(
+                    batch_df, missing_symbols
+                )
+                self._store_cached_frames(fetched, interval, period, start)
+                symbol_dataframes.update(fetched)
 
-            # 各銘柄のデータを処理
-            self._process_individual_symbols(
-                symbol_dataframes, valid_symbols, interval, results
+            except Exception as e:
+                # 一括ダウンロード失敗時はダウンロード対象の全銘柄をエラーとする
+                self._handle_batch_download_error(missing_symbols, e, results)
+
+        # 各銘柄のデータを処理
+        self._process_individual_symbols(
+            symbol_dataframes,
+            [s for s in valid_symbols if s in symbol_dataframes],
+            interval,
+            results,
+        )
+
+    def _load_cached_frames(
+        self,
+        symbols: List[str],
+        interval: str,
+        period: Optional[str],
+        start: Optional[datetime | date],
+    ) -> Dict[str, pd.DataFrame]:
+        """応答キャッシュから銘柄ごとのデータを取得."""
+        frames = {}
+        for symbol in symbols:
+            df = self.response_cache.get(symbol, interval, period, start)
+            if df is not None:
+                frames[symbol] = df
+        if frames:
+            self.logger.info(
+                f"応答キャッシュ使用: {len(frames)}/{len(symbols)}銘柄 ({interval})"
             )
+        return frames
 
-        except Exception as e:
-            # 一括ダウンロード失敗時は全銘柄をエラーとする
-            self._handle_batch_download_error(valid_symbols, e, results)
+    def _store_cached_frames(
+        self,
+        frames: Dict[str, pd.DataFrame],
+        interval: str,
+        period: Optional[str],
+        start: Optional[datetime | date],
+    ) -> None:
+        """銘柄ごとのデータを応答キャッシュに保存."""
+        for symbol, df in frames.items():
+            self.response_cache.put(symbol, interval, df, period, start)
 
     def _process_individual_symbols(
         self,
@@ -247,8 +347,8 @@ class StockBatchProcessor:
         # データ検証
         self.validator.validate_dataframe_structure(df, symbol)
 
-        # データ変換
-        data_list = self.converter.convert_to_dict(df, interval)
+        # データ変換（列指向のまま保存まで受け渡す）
+        data_list = self.converter.convert_to_batch(df, interval)
         price_data = self.converter.extract_price_data(df)
 
         results[symbol] = {
@@ -267,7 +367,7 @@ class StockBatchProcessor:
         results: Dict[str, Dict[str, Any]],
     ) -> None:
         """一括ダウンロードエラーを処理."""
-        error_msg = f"一括ダウンロードエラー: {str(error)}"
+        error_msg = f"{BATCH_DOWNLOAD_ERROR_PREFIX}: {str(error)}"
         for symbol in valid_symbols:
             results[symbol] = {
                 "success": False,
@@ -283,54 +383,37 @@ class StockBatchProcessor:
         success_count = sum(1 for r in results.values() if r.get("success"))
         self.logger.info(f"一括データ取得完了: 成功: {success_count}/{total_symbols}")
 
-    def _download_batch_from_yahoo(
+    def _download_batch_from_provider(
         self,
         symbols: List[str],
         interval: str,
         period: Optional[str] = None,
+        start: Optional[datetime | date] = None,
     ) -> pd.DataFrame:
-        """Yahoo Financeから一括ダウンロード.
+        """市場データプロバイダーから一括ダウンロード.
 
         Args:
             symbols: 銘柄コードのリスト
             interval: 時間軸
             period: 取得期間
+            start: 取得開始日時（指定時はperiodより優先）
 
         Returns:
             ダウンロードしたDataFrame
 
         Raises:
-            StockBatchProcessingError: ダウンロードエラーの場合
+            StockBatchProcessingError: ダウンロードエラー、またはサーキット
+                ブレーカー作動中の場合
         """
         try:
-            # 複数銘柄を一括ダウンロード
-            tickers = yf.Tickers(" ".join(symbols))
-
-            # 期間の設定
-            if period:
-                df = tickers.history(period=period, interval=interval)
-            else:
-                # デフォルト期間の設定
-                default_periods = {
-                    "1m": "7d",
-                    "2m": "60d",
-                    "5m": "60d",
-                    "15m": "60d",
-                    "30m": "60d",
-                    "60m": "730d",
-                    "90m": "60d",
-                    "1h": "730d",
-                    "1d": "max",
-                    "5d": "max",
-                    "1wk": "max",
-                    "1mo": "max",
-                    "3mo": "max",
-                }
-                period = default_periods.get(interval, "1y")
-                df = tickers.history(period=period, interval=interval)
-
-            return df
-
+            with self.circuit_breaker.call():
+                # 一括取得は銘柄数分の枠を消費したものとして公平性を計算する
+                with self.gateway.request(
+                    self.fetch_context, cost=len(symbols)
+                ):
+                    return self.provider.fetch_batch_history(
+                        symbols, interval, period, start
+                    )
         except Exception as e:
             raise StockBatchProcessingError(
                 f"Yahoo Financeからのデータダウンロードに失敗しました: {e}"
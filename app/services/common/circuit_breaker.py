@@ -0,0 +1,327 @@
+"""上流APIのサーキットブレーカー.
+
+上流API（Yahoo Finance）が劣化している間、全ジョブのリクエストを即座に
+拒否して無駄な試行を抑えます。状態は closed（通常）・open（遮断）・
+half-open（試験中）の3つで、open の一定時間経過後は1件だけ試験
+リクエストを通し、成功すれば closed に戻り、失敗すれば遮断時間を
+延ばして再び open になります。
+"""
+
+from contextlib import contextmanager
+from dataclasses import dataclass
+from datetime import datetime
+from enum import Enum
+import logging
+import os
+import threading
+import time
+from typing import Any, Callable, Dict, Iterator, Optional, Tuple
+
+from app.exceptions import CircuitOpenError
+from app.services.common.error_handler import ErrorHandler, ErrorType
+
+
+logger = logging.getLogger(__name__)
+
+# 拒否時のエラーメッセージ（ラップ後のメッセージからの判定に使用）
+CIRCUIT_OPEN_MESSAGE = "上流APIのサーキットブレーカー作動中"
+
+# 試験リクエストの実行中に拒否した呼び出しへ示す再試行までの秒数
+_PROBE_WAIT_SECONDS = 1.0
+
+
+def is_circuit_open_message(message: Optional[str]) -> bool:
+    """エラーメッセージがサーキットブレーカーによる拒否を示すか判定.
+
+    Args:
+        message: エラーメッセージ
+
+    Returns:
+        拒否を示す場合True。
+    """
+    return bool(message) and CIRCUIT_OPEN_MESSAGE in message
+
+
+class CircuitState(Enum):
+    """サーキットブレーカーの状態."""
+
+    CLOSED = "closed"
+    OPEN = "open"
+    HALF_OPEN = "half_open"
+
+
+@dataclass
+class CircuitBreakerConfig:
+    """サーキットブレーカーの設定.
+
+    Attributes:
+        failure_threshold: 遮断に至る連続失敗回数
+        reset_timeout: 遮断から試験リクエストまでの秒数（初期値）
+        max_reset_timeout: 試験失敗が続いた場合の遮断秒数の上限
+    """
+
+    failure_threshold: int = 5
+    reset_timeout: float = 30.0
+    max_reset_timeout: float = 300.0
+
+    @classmethod
+    def from_env(cls) -> "CircuitBreakerConfig":
+        """環境変数から設定を作成.
+
+        Returns:
+            CIRCUIT_BREAKER_* 環境変数を反映した設定。
+        """
+        return cls(
+            failure_threshold=int(
+                os.getenv("CIRCUIT_BREAKER_FAILURE_THRESHOLD", "5")
+            ),
+            reset_timeout=float(
+                os.getenv("CIRCUIT_BREAKER_RESET_TIMEOUT", "30.0")
+            ),
+            max_reset_timeout=float(
+                os.getenv("CIRCUIT_BREAKER_MAX_RESET_TIMEOUT", "300.0")
+            ),
+        )
+
+
+class CircuitBreaker:
+    """closed / open / half-open の3状態を持つサーキットブレーカー.
+
+    call() コンテキストで上流リクエストを囲むと、遮断中は CircuitOpenError
+    を送出し、終了時に結果を記録する。失敗として数えるのは ErrorHandler
+    が一時的エラー（接続・タイムアウト・429等）と分類した例外のみで、
+    銘柄不正等の永続的エラーは上流が応答している証拠として成功扱いする。
+    """
+
+    def __init__(
+        self,
+        config: Optional[CircuitBreakerConfig] = None,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        """初期化.
+
+        Args:
+            config: ブレーカー設定（Noneの場合は環境変数の設定に従う）
+            clock: 現在時刻の取得関数
+        """
+        self.logger = logger
+        self.config = config or CircuitBreakerConfig.from_env()
+        self.error_handler = ErrorHandler()
+        self._clock = clock
+        self._lock = threading.Lock()
+        self._state = CircuitState.CLOSED
+        self._consecutive_failures = 0
+        self._reset_timeout = self.config.reset_timeout
+        self._opened_until = 0.0
+        self._probe_in_flight = False
+        self._last_trip_at: Optional[str] = None
+        self._stats: Dict[str, int] = {
+            "trips": 0,
+            "rejected": 0,
+            "probes": 0,
+            "successes": 0,
+            "failures": 0,
+        }
+
+    @property
+    def state(self) -> CircuitState:
+        """現在の状態（遮断時間経過後は half-open）."""
+        with self._lock:
+            return self._current_state()
+
+    @contextmanager
+    def call(self) -> Iterator[None]:
+        """上流リクエストをブレーカー経由で実行するコンテキスト.
+
+        Raises:
+            CircuitOpenError: 遮断中、または試験リクエストの実行中の場合
+        """
+        allowed, probe = self._admit()
+        if not allowed:
+            retry_after = self.retry_after()
+            raise CircuitOpenError(
+                f"{CIRCUIT_OPEN_MESSAGE}（{retry_after:.1f}秒後に再試行可能）",
+                details={"retry_after_seconds": round(retry_after, 2)},
+            )
+        try:
+            yield
+        except Exception as e:
+            if self.is_failure(e):
+                self.record_failure(e)
+            else:
+                self.record_success()
+            raise
+        else:
+            self.record_success()
+        finally:
+            if probe:
+                # 中断（KeyboardInterrupt 等）で結果を記録できなかった場合も
+                # 試験枠を解放し、次の呼び出しで試験できるようにする
+                self._release_probe()
+
+    def allow_request(self) -> bool:
+        """リクエストを通すか判定（half-open では1件のみ通す）.
+
+        Returns:
+            通す場合True。
+        """
+        return self._admit()[0]
+
+    def _admit(self) -> Tuple[bool, bool]:
+        """リクエストを通すかと、試験リクエストかを判定.
+
+        Returns:
+            (通す場合True, 試験枠を確保した場合True) のタプル。
+        """
+        with self._lock:
+            state = self._current_state()
+            if state == CircuitState.CLOSED:
+                return True, False
+            if state == CircuitState.HALF_OPEN and not self._probe_in_flight:
+                self._probe_in_flight = True
+                self._stats["probes"] += 1
+                self.logger.info("サーキットブレーカー: 試験リクエストを実行")
+                return True, True
+            self._stats["rejected"] += 1
+            return False, False
+
+    def _release_probe(self) -> None:
+        """結果を記録せずに終わった試験リクエストの枠を解放."""
+        with self._lock:
+            if self._current_state() == CircuitState.HALF_OPEN:
+                self._probe_in_flight = False
+
+    def is_open(self) -> bool:
+        """現在リクエストが拒否される状態か（試験枠は消費しない）."""
+        with self._lock:
+            state = self._current_state()
+            return state == CircuitState.OPEN or (
+                state == CircuitState.HALF_OPEN and self._probe_in_flight
+            )
+
+    def retry_after(self) -> float:
+        """次にリクエストが通る見込みまでの秒数.
+
+        Returns:
+            秒数（closed、または試験リクエストを受け付けられる場合は0）。
+        """
+        with self._lock:
+            state = self._current_state()
+            if state == CircuitState.OPEN:
+                return max(self._opened_until - self._clock(), 0.0)
+            if state == CircuitState.HALF_OPEN and self._probe_in_flight:
+                return _PROBE_WAIT_SECONDS
+            return 0.0
+
+    def is_failure(self, error: Exception) -> bool:
+        """例外を上流の劣化として数えるか判定.
+
+        Args:
+            error: 発生した例外
+
+        Returns:
+            一時的エラーの場合True。
+        """
+        if isinstance(error, CircuitOpenError):
+            return False
+        return self.error_handler.classify_error(error) == ErrorType.TEMPORARY
+
+    def record_success(self) -> None:
+        """成功を記録（half-open の場合は closed に戻す）."""
+        with self._lock:
+            self._stats["successes"] += 1
+            self._consecutive_failures = 0
+            if self._current_state() == CircuitState.HALF_OPEN:
+                self._state = CircuitState.CLOSED
+                self._probe_in_flight = False
+                self._reset_timeout = self.config.reset_timeout
+                self.logger.info("サーキットブレーカー: 上流の復旧を確認")
+
+    def record_failure(self, error: Optional[BaseException] = None) -> None:
+        """失敗を記録（閾値到達、または試験失敗で open にする）.
+
+        Args:
+            error: 発生した例外
+        """
+        with self._lock:
+            self._stats["failures"] += 1
+            self._consecutive_failures += 1
+            state = self._current_state()
+            if state == CircuitState.HALF_OPEN:
+                # 試験失敗のたびに遮断時間を延ばす
+                self._reset_timeout = min(
+                    self._reset_timeout * 2, self.config.max_reset_timeout
+                )
+                self._trip(error)
+            elif (
+                state == CircuitState.CLOSED
+                and self._consecutive_failures >= self.config.failure_threshold
+            ):
+                self._trip(error)
+
+    def _trip(self, error: Optional[BaseException]) -> None:
+        """Open 状態へ遷移（ロック取得済みで呼び出す）."""
+        self._state = CircuitState.OPEN
+        self._opened_until = self._clock() + self._reset_timeout
+        self._probe_in_flight = False
+        self._last_trip_at = datetime.utcnow().isoformat() + "Z"
+        self._stats["trips"] += 1
+        self.logger.warning(
+            f"サーキットブレーカー作動: 連続失敗{self._consecutive_failures}回, "
+            f"{self._reset_timeout:.0f}秒間遮断 ({error})"
+        )
+
+    def _current_state(self) -> CircuitState:
+        """遮断時間の経過を反映した状態（ロック取得済みで呼び出す）."""
+        if (
+            self._state == CircuitState.OPEN
+            and self._clock() >= self._opened_until
+        ):
+            self._state = CircuitState.HALF_OPEN
+            self._probe_in_flight = False
+        return self._state
+
+    def get_state(self) -> Dict[str, Any]:
+        """現在の状態と統計を取得.
+
+        Returns:
+            状態・連続失敗回数・作動回数等の辞書。
+        """
+        retry_after = self.retry_after()
+        with self._lock:
+            return {
+                "state": self._current_state().value,
+                "consecutive_failures": self._consecutive_failures,
+                "failure_threshold": self.config.failure_threshold,
+                "reset_timeout_seconds": self._reset_timeout,
+                "retry_after_seconds": round(retry_after, 2),
+                "last_trip_at": self._last_trip_at,
+                **self._stats,
+            }
+
+
+# グローバルブレーカー（同一上流を使う全ジョブで共有）
+_circuit_breaker: Optional[CircuitBreaker] = None
+_circuit_breaker_lock = threading.Lock()
+
+
+def get_circuit_breaker() -> CircuitBreaker:
+    """プロセス全体で共有するサーキットブレーカーを取得.
+
+    Returns:
+        CircuitBreaker インスタンス。
+    """
+    global _circuit_breaker
+
+    with _circuit_breaker_lock:
+        if _circuit_breaker is None:
+            _circuit_breaker = CircuitBreaker()
+        return _circuit_breaker
+
+
+def reset_circuit_breaker() -> None:
+    """共有ブレーカーを破棄（設定変更時・テスト用）."""
+    global _circuit_breaker
+
+    with _circuit_breaker_lock:
+        _circuit_breaker = None
@@ -0,0 +1,426 @@
+"""上流APIへのフェッチゲートウェイ.
+
+一括取得ジョブ・JPX順次取得・画面からの単一銘柄取得・スケジューラーの
+定期更新など、プロセス内の全ての上流リクエストを1つの窓口で受け付け、
+上流の処理枠（AdaptiveRateController の同時実行数）を優先度と
+ジョブ間の重み付き公平性に従って割り当てます。
+
+- 優先度は interactive > scheduled > backfill の順で、上位のリクエスト
+  が待っている間は下位に枠を渡さない
+- 同じ優先度の中ではジョブごとの仮想時間（消費量 / 重み）が最も小さい
+  ジョブから順に枠を渡す（重み付き公平キューイング）
+- 同時実行数に余裕がある場合、interactive 用に一定数の枠を予約し、
+  大規模なバックフィル中でも単一銘柄の取得を待たせない
+"""
+
+from collections import deque
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from enum import IntEnum
+import itertools
+import logging
+import os
+import threading
+import time
+from typing import Any, Callable, Deque, Dict, Iterator, List, Optional
+
+from app.services.common.rate_controller import (
+    AdaptiveRateController,
+    RequestHandle,
+    get_rate_controller,
+)
+
+
+logger = logging.getLogger(__name__)
+
+# 待機中のワーカーが枠の状態を再確認する間隔（秒）
+_WAIT_POLL_SECONDS = 1.0
+
+
+class FetchPriority(IntEnum):
+    """リクエストの優先度（値が小さいほど優先）."""
+
+    INTERACTIVE = 0
+    SCHEDULED = 1
+    BACKFILL = 2
+
+
+@dataclass(frozen=True)
+class FetchContext:
+    """リクエスト元の情報.
+
+    Attributes:
+        priority: 優先度
+        job_id: ジョブID（同一ジョブのリクエストで公平性を計算する）
+        weight: ジョブの重み（大きいほど多くの枠を受け取る）
+    """
+
+    priority: FetchPriority = FetchPriority.INTERACTIVE
+    job_id: Optional[str] = None
+    weight: float = 1.0
+
+    @property
+    def job_key(self) -> str:
+        """優先度内でジョブを識別するキー."""
+        return self.job_id or "default"
+
+
+@dataclass
+class FetchGatewayConfig:
+    """ゲートウェイの設定.
+
+    Attributes:
+        reserved_interactive_slots: interactive 用に予約する枠数
+            （同時実行数がこれ以下の場合は予約しない）
+        stats_window: 統計に使う直近のリクエスト数
+    """
+
+    reserved_interactive_slots: int = 1
+    stats_window: int = 500
+
+    @classmethod
+    def from_env(cls) -> "FetchGatewayConfig":
+        """環境変数から設定を作成.
+
+        Returns:
+            FETCH_GATEWAY_* 環境変数を反映した設定。
+        """
+        return cls(
+            reserved_interactive_slots=int(
+                os.getenv("FETCH_GATEWAY_RESERVED_INTERACTIVE_SLOTS", "1")
+            ),
+        )
+
+
+@dataclass
+class _Waiter:
+    """枠を待っているリクエスト."""
+
+    context: FetchContext
+    cost: float
+    seq: int
+    enqueued_at: float
+    granted: bool = False
+
+
+@dataclass
+class _ClassStats:
+    """優先度ごとの統計."""
+
+    window: int
+    requests: int = 0
+    errors: int = 0
+    in_flight: int = 0
+    queue_times: Deque[float] = field(init=False)
+    latencies: Deque[float] = field(init=False)
+
+    def __post_init__(self) -> None:
+        """直近の計測値を保持するバッファを作成."""
+        self.queue_times = deque(maxlen=self.window)
+        self.latencies = deque(maxlen=self.window)
+
+
+def _percentile(values: List[float], ratio: float) -> float:
+    """パーセンタイル値（最近傍法）."""
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    index = min(int(len(ordered) * ratio), len(ordered) - 1)
+    return ordered[index]
+
+
+class FetchGateway:
+    """優先度と重み付き公平キューイングで上流の処理枠を割り当てる窓口.
+
+    request() コンテキストで上流リクエストを囲むと、枠が割り当てられる
+    まで待機し、その後 AdaptiveRateController のリクエスト間隔・
+    クールダウンに従って実行する。枠数は controller の現在の同時実行数に
+    追従するため、429 を検知して同時実行数が減れば全ジョブの枠が減る。
+    """
+
+    def __init__(
+        self,
+        rate_controller: Optional[AdaptiveRateController] = None,
+        config: Optional[FetchGatewayConfig] = None,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        """初期化.
+
+        Args:
+            rate_controller: 上流の流量制御
+                （Noneの場合はプロセス共有のコントローラー）
+            config: ゲートウェイ設定（Noneの場合は環境変数の設定に従う）
+            clock: 現在時刻の取得関数
+        """
+        self.logger = logger
+        self.rate_controller = rate_controller or get_rate_controller()
+        self.config = config or FetchGatewayConfig.from_env()
+        self._clock = clock
+        self._condition = threading.Condition()
+        self._seq = itertools.count()
+        self._in_flight = 0
+        # {優先度: {ジョブキー: 待機中リクエスト}}
+        self._queues: Dict[FetchPriority, Dict[str, Deque[_Waiter]]] = {
+            priority: {} for priority in FetchPriority
+        }
+        # ジョブごとの仮想時間（消費量 / 重み）と優先度ごとの基準時刻
+        self._virtual: Dict[FetchPriority, Dict[str, float]] = {
+            priority: {} for priority in FetchPriority
+        }
+        self._class_virtual: Dict[FetchPriority, float] = {
+            priority: 0.0 for priority in FetchPriority
+        }
+        # ジョブごとの実行中件数（仮想時間の保持期間の判定に使用）
+        self._job_in_flight: Dict[FetchPriority, Dict[str, int]] = {
+            priority: {} for priority in FetchPriority
+        }
+        self._stats: Dict[FetchPriority, _ClassStats] = {
+            priority: _ClassStats(self.config.stats_window)
+            for priority in FetchPriority
+        }
+
+    @property
+    def capacity(self) -> int:
+        """現在の枠数（controller の同時実行数に追従）."""
+        return max(int(self.rate_controller.concurrency), 1)
+
+    @contextmanager
+    def request(
+        self, context: Optional[FetchContext] = None, cost: float = 1.0
+    ) -> Iterator[RequestHandle]:
+        """枠の割り当てを待って上流リクエストを実行するコンテキスト.
+
+        Args:
+            context: リクエスト元の情報（Noneの場合は interactive）
+            cost: リクエストの消費量（一括取得では銘柄数）
+
+        Yields:
+            結果を controller に補足するためのハンドル。
+        """
+        context = context or FetchContext()
+        waiter = self._enqueue(context, cost)
+        self._wait_for_grant(waiter)
+        queue_time = self._clock() - waiter.enqueued_at
+
+        started = self._clock()
+        failed = False
+        try:
+            with self.rate_controller.request() as handle:
+                yield handle
+        except BaseException:
+            failed = True
+            raise
+        finally:
+            self._release(waiter, queue_time, self._clock() - started, failed)
+
+    def _enqueue(self, context: FetchContext, cost: float) -> _Waiter:
+        """待機列に追加し、枠が空いていれば割り当てる."""
+        priority = context.priority
+        job_key = context.job_key
+        with self._condition:
+            waiter = _Waiter(
+                context=context,
+                cost=max(cost, 0.0),
+                seq=next(self._seq),
+                enqueued_at=self._clock(),
+            )
+            jobs = self._queues[priority]
+            if job_key not in jobs:
+                # 新たに待ち始めたジョブは現在の基準時刻から参加させ、
+                # 過去の空き時間の分だけ割り込むことがないようにする
+                virtual = self._virtual[priority]
+                virtual[job_key] = max(
+                    virtual.get(job_key, 0.0), self._class_virtual[priority]
+                )
+                jobs[job_key] = deque()
+            jobs[job_key].append(waiter)
+            self._dispatch()
+            return waiter
+
+    def _wait_for_grant(self, waiter: _Waiter) -> None:
+        """枠が割り当てられるまで待機."""
+        with self._condition:
+            try:
+                while not waiter.granted:
+                    self._condition.wait(timeout=_WAIT_POLL_SECONDS)
+                    # controller の同時実行数の増加を反映
+                    self._dispatch()
+            except BaseException:
+                self._abandon(waiter)
+                raise
+
+    def _abandon(self, waiter: _Waiter) -> None:
+        """待機を中断したリクエストを取り除く（ロック取得済みで呼び出す）."""
+        if waiter.granted:
+            self._finish(waiter)
+            self._dispatch()
+            return
+        priority = waiter.context.priority
+        job_key = waiter.context.job_key
+        queue = self._queues[priority].get(job_key)
+        if queue and waiter in queue:
+            queue.remove(waiter)
+            if not queue:
+                del self._queues[priority][job_key]
+                self._forget_idle_job(priority, job_key)
+
+    def _release(
+        self,
+        waiter: _Waiter,
+        queue_time: float,
+        latency: float,
+        failed: bool,
+    ) -> None:
+        """枠を返却して統計を更新し、次の待機リクエストに割り当てる."""
+        with self._condition:
+            self._finish(waiter)
+            stats = self._stats[waiter.context.priority]
+            stats.requests += 1
+            if failed:
+                stats.errors += 1
+            stats.queue_times.append(queue_time)
+            stats.latencies.append(latency)
+            self._dispatch()
+
+    def _finish(self, waiter: _Waiter) -> None:
+        """実行中件数を減らす（ロック取得済みで呼び出す）."""
+        priority = waiter.context.priority
+        job_key = waiter.context.job_key
+        self._in_flight -= 1
+        self._stats[priority].in_flight -= 1
+
+        job_in_flight = self._job_in_flight[priority]
+        job_in_flight[job_key] -= 1
+        if job_in_flight[job_key] == 0:
+            del job_in_flight[job_key]
+            self._forget_idle_job(priority, job_key)
+
+    def _forget_idle_job(self, priority: FetchPriority, job_key: str) -> None:
+        """待機も実行中もなくなったジョブの仮想時間を破棄（ロック取得済み）."""
+        if (
+            job_key not in self._queues[priority]
+            and job_key not in self._job_in_flight[priority]
+        ):
+            self._virtual[priority].pop(job_key, None)
+
+    def _dispatch(self) -> None:
+        """空いている枠を待機リクエストに割り当てる（ロック取得済み）."""
+        granted = False
+        while True:
+            waiter = self._select_next()
+            if waiter is None:
+                break
+            priority = waiter.context.priority
+            job_key = waiter.context.job_key
+            job_in_flight = self._job_in_flight[priority]
+            waiter.granted = True
+            self._in_flight += 1
+            self._stats[priority].in_flight += 1
+            job_in_flight[job_key] = job_in_flight.get(job_key, 0) + 1
+            granted = True
+        if granted:
+            self._condition.notify_all()
+
+    def _select_next(self) -> Optional[_Waiter]:
+        """次に枠を渡すリクエストを選んで待機列から取り出す."""
+        capacity = self.capacity
+        if self._in_flight >= capacity:
+            return None
+
+        # 予約枠に達している場合は interactive のみに割り当てる
+        reserved = self.config.reserved_interactive_slots
+        interactive_only = (
+            capacity > reserved and self._in_flight >= capacity - reserved
+        )
+
+        for priority in FetchPriority:
+            if interactive_only and priority != FetchPriority.INTERACTIVE:
+                break
+            jobs = self._queues[priority]
+            if not jobs:
+                continue
+
+            virtual = self._virtual[priority]
+            job_key = min(
+                jobs, key=lambda key: (virtual[key], jobs[key][0].seq)
+            )
+            waiter = jobs[job_key].popleft()
+            self._class_virtual[priority] = virtual[job_key]
+            virtual[job_key] += waiter.cost / max(waiter.context.weight, 1e-6)
+            if not jobs[job_key]:
+                del jobs[job_key]
+            return waiter
+        return None
+
+    def get_stats(self) -> Dict[str, Any]:
+        """優先度ごとの待ち時間・レイテンシ等の統計を取得.
+
+        Returns:
+            枠数・実行中件数と優先度ごとの統計の辞書。
+        """
+        with self._condition:
+            classes: Dict[str, Any] = {}
+            for priority, stats in self._stats.items():
+                queue_times = list(stats.queue_times)
+                latencies = list(stats.latencies)
+                jobs = self._queues[priority]
+                classes[priority.name.lower()] = {
+                    "requests": stats.requests,
+                    "errors": stats.errors,
+                    "in_flight": stats.in_flight,
+                    "waiting": sum(len(queue) for queue in jobs.values()),
+                    "waiting_jobs": len(jobs),
+                    "avg_queue_ms": _average_ms(queue_times),
+                    "p95_queue_ms": round(
+                        _percentile(queue_times, 0.95) * 1000, 1
+                    ),
+                    "max_queue_ms": round(
+                        max(queue_times, default=0) * 1000, 1
+                    ),
+                    "avg_latency_ms": _average_ms(latencies),
+                    "p95_latency_ms": round(
+                        _percentile(latencies, 0.95) * 1000, 1
+                    ),
+                }
+            return {
+                "capacity": self.capacity,
+                "in_flight": self._in_flight,
+                "reserved_interactive_slots": (
+                    self.config.reserved_interactive_slots
+                ),
+                "classes": classes,
+            }
+
+
+def _average_ms(values: List[float]) -> float:
+    """平均値（ミリ秒）."""
+    if not values:
+        return 0.0
+    return round(sum(values) / len(values) * 1000, 1)
+
+
+# グローバルゲートウェイ（プロセス内の全上流リクエストで共有）
+_fetch_gateway: Optional[FetchGateway] = None
+_fetch_gateway_lock = threading.Lock()
+
+
+def get_fetch_gateway() -> FetchGateway:
+    """プロセス全体で共有するゲートウェイを取得.
+
+    Returns:
+        FetchGateway インスタンス。
+    """
+    global _fetch_gateway
+
+    with _fetch_gateway_lock:
+        if _fetch_gateway is None:
+            _fetch_gateway = FetchGateway()
+        return _fetch_gateway
+
+
+def reset_fetch_gateway() -> None:
+    """共有ゲートウェイを破棄（設定変更時・テスト用）."""
+    global _fetch_gateway
+
+    with _fetch_gateway_lock:
+        _fetch_gateway = None
@@ -0,0 +1,387 @@
+"""適応型の同時実行数・リクエスト間隔制御.
+
+上流API（Yahoo Finance）へのリクエストを AIMD（加算増加・乗算減少）方式で
+制御します。レイテンシとエラー率が健全な間は同時実行数とリクエストレートを
+少しずつ引き上げ、429（レート制限）やタイムアウトを検知した場合は大きく
+引き下げたうえでクールダウン期間を設けます。
+"""
+
+from collections import deque
+from contextlib import contextmanager
+from dataclasses import dataclass
+import logging
+import os
+import random
+import threading
+import time
+from typing import Any, Deque, Dict, Iterator, Optional
+
+from app.exceptions import APIException, ErrorCode
+
+
+logger = logging.getLogger(__name__)
+
+# 429・タイムアウトと判定するエラーメッセージのキーワード
+_THROTTLE_KEYWORDS = (
+    "429",
+    "too many requests",
+    "rate limit",
+    "timeout",
+    "timed out",
+)
+
+
+def is_throttle_error(error: Optional[BaseException]) -> bool:
+    """429（レート制限）またはタイムアウトのエラーか判定.
+
+    Args:
+        error: 判定対象の例外
+
+    Returns:
+        上流の過負荷を示すエラーの場合True。
+    """
+    if error is None:
+        return False
+    if isinstance(error, TimeoutError):
+        return True
+    if isinstance(error, APIException) and error.error_code in (
+        ErrorCode.API_RATE_LIMIT,
+        ErrorCode.API_TIMEOUT,
+    ):
+        return True
+    return is_throttle_message(str(error))
+
+
+def is_throttle_message(message: Optional[str]) -> bool:
+    """エラーメッセージが429・タイムアウトを示すか判定.
+
+    Args:
+        message: エラーメッセージ
+
+    Returns:
+        429・タイムアウトを示す場合True。
+    """
+    if not message:
+        return False
+    lowered = message.lower()
+    return any(keyword in lowered for keyword in _THROTTLE_KEYWORDS)
+
+
+@dataclass
+class RateControlConfig:
+    """適応制御の設定.
+
+    Attributes:
+        initial_concurrency: 同時実行数の初期値
+        min_concurrency: 同時実行数の下限
+        max_concurrency: 同時実行数の上限
+        initial_rate: リクエストレートの初期値（リクエスト/秒）
+        min_rate: リクエストレートの下限
+        max_rate: リクエストレートの上限
+        rate_increase: 成功1件あたりのレート加算量
+        decrease_factor: 429・タイムアウト時の乗算係数
+        latency_target_ms: これを超えるレイテンシでは増加を止める
+        cooldown_seconds: 429・タイムアウト時のクールダウン初期値
+        max_cooldown_seconds: 連続検知時のクールダウン上限
+        window_size: 直近の比率算出に使うリクエスト数
+    """
+
+    initial_concurrency: int = 3
+    min_concurrency: int = 1
+    max_concurrency: int = 8
+    initial_rate: float = 1.0
+    min_rate: float = 0.1
+    max_rate: float = 10.0
+    rate_increase: float = 0.05
+    decrease_factor: float = 0.5
+    latency_target_ms: float = 5000.0
+    cooldown_seconds: float = 5.0
+    max_cooldown_seconds: float = 120.0
+    window_size: int = 100
+
+    @classmethod
+    def from_env(cls, **overrides: Any) -> "RateControlConfig":
+        """環境変数から設定を作成.
+
+        Args:
+            **overrides: 環境変数より優先する設定値
+
+        Returns:
+            FETCH_RATE_* 環境変数を反映した設定。
+        """
+        defaults = cls(**overrides)
+        return cls(
+            initial_concurrency=defaults.initial_concurrency,
+            min_concurrency=defaults.min_concurrency,
+            max_concurrency=int(
+                os.getenv(
+                    "FETCH_RATE_MAX_CONCURRENCY", defaults.max_concurrency
+                )
+            ),
+            initial_rate=float(
+                os.getenv("FETCH_RATE_INITIAL", defaults.initial_rate)
+            ),
+            min_rate=float(os.getenv("FETCH_RATE_MIN", defaults.min_rate)),
+            max_rate=float(os.getenv("FETCH_RATE_MAX", defaults.max_rate)),
+            rate_increase=defaults.rate_increase,
+            decrease_factor=defaults.decrease_factor,
+            latency_target_ms=float(
+                os.getenv(
+                    "FETCH_RATE_LATENCY_TARGET_MS", defaults.latency_target_ms
+                )
+            ),
+            cooldown_seconds=float(
+                os.getenv(
+                    "FETCH_RATE_COOLDOWN_SECONDS", defaults.cooldown_seconds
+                )
+            ),
+            max_cooldown_seconds=defaults.max_cooldown_seconds,
+            window_size=defaults.window_size,
+        )
+
+
+class RequestHandle:
+    """1リクエストの結果を controller に伝えるハンドル."""
+
+    def __init__(self) -> None:
+        """初期化."""
+        self.throttled = False
+        self.failed = False
+
+    def mark_throttled(self) -> None:
+        """例外を伴わない429・タイムアウト（一括取得の部分失敗等）を記録."""
+        self.throttled = True
+
+    def mark_failed(self) -> None:
+        """例外を伴わない失敗を記録."""
+        self.failed = True
+
+
+class AdaptiveRateController:
+    """AIMD方式の同時実行数・リクエストレート制御.
+
+    request() コンテキストで上流リクエストを囲むと、開始前に同時実行枠と
+    リクエスト間隔（1/レート）およびクールダウンを待ち、終了時に
+    レイテンシと結果をもとに制御値を更新する。
+    """
+
+    def __init__(self, config: Optional[RateControlConfig] = None):
+        """初期化.
+
+        Args:
+            config: 制御設定（Noneの場合は環境変数の設定に従う）
+        """
+        self.logger = logger
+        self.config = config or RateControlConfig.from_env()
+        self.concurrency = float(
+            min(
+                max(
+                    self.config.initial_concurrency,
+                    self.config.min_concurrency,
+                ),
+                self.config.max_concurrency,
+            )
+        )
+        self.rate = min(
+            max(self.config.initial_rate, self.config.min_rate),
+            self.config.max_rate,
+        )
+        self._condition = threading.Condition()
+        self._in_flight = 0
+        self._next_request_at = 0.0
+        self._cooldown_until = 0.0
+        self._last_decrease_at = 0.0
+        self._consecutive_throttles = 0
+        # 直近の結果（"ok" / "error" / "throttled"）とレイテンシ
+        self._outcomes: Deque[str] = deque(maxlen=self.config.window_size)
+        self._latencies: Deque[float] = deque(maxlen=self.config.window_size)
+        self._stats: Dict[str, int] = {
+            "requests": 0,
+            "throttled": 0,
+            "errors": 0,
+            "increases": 0,
+            "decreases": 0,
+        }
+
+    @property
+    def max_concurrency(self) -> int:
+        """同時実行数の上限（ワーカースレッド数の決定に使用）."""
+        return self.config.max_concurrency
+
+    @contextmanager
+    def request(self) -> Iterator[RequestHandle]:
+        """上流リクエストを制御下で実行するコンテキスト.
+
+        Yields:
+            結果を補足するためのハンドル。
+        """
+        self.acquire()
+        handle = RequestHandle()
+        started = time.monotonic()
+        error: Optional[BaseException] = None
+        try:
+            yield handle
+        except BaseException as e:
+            error = e
+            raise
+        finally:
+            latency = time.monotonic() - started
+            if error is not None and is_throttle_error(error):
+                handle.mark_throttled()
+            elif error is not None:
+                handle.mark_failed()
+            self.release(latency, handle.throttled, handle.failed)
+
+    def acquire(self) -> None:
+        """同時実行枠・リクエスト間隔・クールダウンを待って枠を確保."""
+        with self._condition:
+            while True:
+                now = time.monotonic()
+                wait = max(
+                    self._next_request_at - now, self._cooldown_until - now
+                )
+                if self._in_flight < int(self.concurrency) and wait <= 0:
+                    break
+                # 枠待ちの場合は release() の通知、間隔待ちの場合は時間で起床
+                self._condition.wait(timeout=wait if wait > 0 else None)
+
+            self._in_flight += 1
+            self._stats["requests"] += 1
+            self._next_request_at = now + 1.0 / self.rate
+
+    def release(
+        self, latency: float, throttled: bool = False, failed: bool = False
+    ) -> None:
+        """リクエスト完了を記録し制御値を更新.
+
+        Args:
+            latency: リクエストのレイテンシ（秒）
+            throttled: 429・タイムアウトだったか
+            failed: その他の失敗だったか
+        """
+        with self._condition:
+            self._in_flight = max(self._in_flight - 1, 0)
+            self._latencies.append(latency)
+
+            if throttled:
+                self._outcomes.append("throttled")
+                self._stats["throttled"] += 1
+                self._decrease()
+            elif failed:
+                self._outcomes.append("error")
+                self._stats["errors"] += 1
+            else:
+                self._outcomes.append("ok")
+                self._consecutive_throttles = 0
+                if latency * 1000 <= self.config.latency_target_ms:
+                    self._increase()
+
+            self._condition.notify_all()
+
+    def _increase(self) -> None:
+        """加算増加（成功1件ごと、同時実行数は枠1周で+1）."""
+        config = self.config
+        if (
+            self.rate < config.max_rate
+            or self.concurrency < config.max_concurrency
+        ):
+            self._stats["increases"] += 1
+        self.rate = min(self.rate + config.rate_increase, config.max_rate)
+        self.concurrency = min(
+            self.concurrency + 1.0 / max(self.concurrency, 1.0),
+            float(config.max_concurrency),
+        )
+
+    def _decrease(self) -> None:
+        """乗算減少とクールダウン設定.
+
+        同時に失敗した複数のリクエストで過剰に減少しないよう、
+        減少は平均レイテンシ1回分（最短1秒）に1度までとする。
+        """
+        config = self.config
+        now = time.monotonic()
+        self._consecutive_throttles += 1
+
+        # 連続検知ほど長いクールダウン（ジッター付き）
+        cooldown = min(
+            config.cooldown_seconds * (2 ** (self._consecutive_throttles - 1)),
+            config.max_cooldown_seconds,
+        ) * random.uniform(0.8, 1.2)
+        self._cooldown_until = max(self._cooldown_until, now + cooldown)
+
+        window = max(self._average_latency(), 1.0)
+        if now - self._last_decrease_at < window:
+            return
+
+        self._last_decrease_at = now
+        self._stats["decreases"] += 1
+        self.rate = max(self.rate * config.decrease_factor, config.min_rate)
+        self.concurrency = max(
+            self.concurrency * config.decrease_factor,
+            float(config.min_concurrency),
+        )
+        self.logger.warning(
+            f"上流の過負荷を検知: レート {self.rate:.2f}req/s, "
+            f"同時実行数 {int(self.concurrency)}, "
+            f"クールダウン {cooldown:.1f}秒"
+        )
+
+    def _average_latency(self) -> float:
+        """直近の平均レイテンシ（秒）."""
+        if not self._latencies:
+            return 0.0
+        return sum(self._latencies) / len(self._latencies)
+
+    def get_state(self) -> Dict[str, Any]:
+        """現在の制御状態を取得.
+
+        Returns:
+            レート・同時実行数・直近の429比率等の辞書。
+        """
+        with self._condition:
+            window = len(self._outcomes)
+            throttled = sum(1 for o in self._outcomes if o == "throttled")
+            errors = sum(1 for o in self._outcomes if o == "error")
+            cooldown = max(self._cooldown_until - time.monotonic(), 0.0)
+            return {
+                "rate_per_second": round(self.rate, 3),
+                "concurrency": int(self.concurrency),
+                "max_concurrency": self.config.max_concurrency,
+                "in_flight": self._in_flight,
+                "recent_throttle_ratio": (
+                    round(throttled / window, 3) if window else 0.0
+                ),
+                "recent_error_ratio": (
+                    round(errors / window, 3) if window else 0.0
+                ),
+                "avg_latency_ms": round(self._average_latency() * 1000, 1),
+                "cooldown_remaining_seconds": round(cooldown, 2),
+                **self._stats,
+            }
+
+
+# グローバルコントローラー（同一上流を使う全ジョブで共有）
+_rate_controller: Optional[AdaptiveRateController] = None
+_rate_controller_lock = threading.Lock()
+
+
+def get_rate_controller() -> AdaptiveRateController:
+    """プロセス全体で共有するコントローラーを取得.
+
+    Returns:
+        AdaptiveRateController インスタンス。
+    """
+    global _rate_controller
+
+    with _rate_controller_lock:
+        if _rate_controller is None:
+            _rate_controller = AdaptiveRateController()
+        return _rate_controller
+
+
+def reset_rate_controller() -> None:
+    """共有コントローラーを破棄（設定変更時・テスト用）."""
+    global _rate_controller
+
+    with _rate_controller_lock:
+        _rate_controller = None
@@ -0,0 +1,135 @@
+"""同一リクエストの同時実行をまとめる single-flight.
+
+同じキーの処理が実行中の間に届いた呼び出しは、新たに実行せず先行する
+呼び出しの完了を待って同じ結果（または同じ例外）を受け取ります。
+画面操作とスケジューラが同じ銘柄・時間軸・期間を同時に要求した場合に、
+上流への取得と保存を1回に抑えるために使用します。
+"""
+
+import logging
+import threading
+from typing import (
+    Any,
+    Callable,
+    Dict,
+    Hashable,
+    Optional,
+    Tuple,
+    TypeVar,
+)
+
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+
+class _Call:
+    """実行中の呼び出し."""
+
+    def __init__(self):
+        """初期化."""
+        self.done = threading.Event()
+        self.result: Any = None
+        self.error: Optional[BaseException] = None
+        self.waiters = 0
+
+
+class SingleFlight:
+    """キーごとに実行中の呼び出しを1つにまとめる（スレッドセーフ）."""
+
+    def __init__(self):
+        """初期化."""
+        self.logger = logger
+        self._lock = threading.Lock()
+        self._calls: Dict[Hashable, _Call] = {}
+        self._stats: Dict[str, int] = {
+            "calls": 0,
+            "executions": 0,
+            "coalesced": 0,
+        }
+
+    def do(self, key: Hashable, fn: Callable[[], T]) -> Tuple[T, bool]:
+        """キーに対応する処理を実行、または実行中の処理の結果を待つ.
+
+        Args:
+            key: リクエストを識別するキー
+            fn: 実行する処理
+
+        Returns:
+            (処理結果, 他の呼び出しの結果を共有したか) のタプル。
+
+        Raises:
+            Exception: 処理が送出した例外（待機中の呼び出しにも同じ例外を
+                送出する）
+        """
+        with self._lock:
+            self._stats["calls"] += 1
+            call = self._calls.get(key)
+            if call is not None:
+                call.waiters += 1
+                self._stats["coalesced"] += 1
+                leader = False
+            else:
+                call = _Call()
+                self._calls[key] = call
+                self._stats["executions"] += 1
+                leader = True
+
+        if not leader:
+            self.logger.debug(f"実行中のリクエストに合流: {key}")
+            call.done.wait()
+            if call.error is not None:
+                raise call.error
+            return call.result, True
+
+        try:
+            call.result = fn()
+        except BaseException as e:
+            call.error = e
+            raise
+        finally:
+            with self._lock:
+                del self._calls[key]
+            call.done.set()
+            if call.waiters:
+                self.logger.info(
+                    f"同一リクエストを集約: {key} ({call.waiters}件が合流)"
+                )
+        return call.result, False
+
+    def get_stats(self) -> Dict[str, int]:
+        """集約の統計を取得.
+
+        Returns:
+            呼び出し数・実行数・集約数・実行中のキー数の辞書。
+        """
+        with self._lock:
+            return {**self._stats, "in_flight": len(self._calls)}
+
+
+# グローバルインスタンス（プロセス内の全リクエストで共有）
+_single_flight: Optional[SingleFlight] = None
+_single_flight_lock = threading.Lock()
+
+
+def get_single_flight() -> SingleFlight:
+    """プロセス全体で共有する SingleFlight を取得.
+
+    Returns:
+        SingleFlight インスタンス。
+    """
+    global _single_flight
+
+    with _single_flight_lock:
+        if _single_flight is None:
+            _single_flight = SingleFlight()
+        return _single_flight
+
+
+def reset_single_flight() -> None:
+    """共有インスタンスを破棄（テスト用）."""
+    global _single_flight
+
+    with _single_flight_lock:
+        _single_flight = None
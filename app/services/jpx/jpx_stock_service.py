@@ -4,6 +4,7 @@ JPX公式サイトからExcel形式の銘柄一覧をダウンロードし、
 データベースの銘柄マスタを更新する機能を提供します。
 """
 
+from dataclasses import dataclass, field
 from datetime import datetime
 from io import BytesIO
 import logging
@@ -11,13 +12,45 @@ from typing import Any, Dict, List, Optional, Set
 
 import pandas as pd
 import requests
+from sqlalchemy import insert, select, update
 from sqlalchemy.orm import Session
 
 from app.models import StockMaster, StockMasterUpdate, get_db_session
+from app.services.jpx.master_cache import (
+    JPXMasterCache,
+    MasterSnapshot,
+    content_hash,
+    get_jpx_master_cache,
+)
 
 
 logger = logging.getLogger(__name__)
 
+# JPXのExcelの列名と銘柄マスタの項目の対応
+JPX_COLUMNS = {
+    "コード": "stock_code",
+    "銘柄名": "stock_name",
+    "市場・商品区分": "market_category",
+    "33業種コード": "sector_code_33",
+    "33業種区分": "sector_name_33",
+    "17業種コード": "sector_code_17",
+    "17業種区分": "sector_name_17",
+    "規模コード": "scale_code",
+    "規模区分": "scale_category",
+}
+
+# 差分の判定に使う銘柄マスタの項目（data_date は取得日のため含めない）
+MASTER_FIELDS = (
+    "stock_name",
+    "market_category",
+    "sector_code_33",
+    "sector_name_33",
+    "sector_code_17",
+    "sector_name_17",
+    "scale_code",
+    "scale_category",
+)
+
 
 class JPXStockServiceError(Exception):
     """JPX銘柄サービス関連エラーの基底クラス."""
@@ -37,6 +70,61 @@ class JPXParseError(JPXStockServiceError):
     pass
 
 
+def _text_values(values: pd.Series) -> pd.Series:
+    """列を前後の空白を除いた文字列に変換（空文字列は欠損値）.
+
+    欠損値を含むためfloatになった整数のコード列は、"50.0" ではなく
+    "50" になるよう整数に戻してから変換する。
+    """
+    if pd.api.types.is_float_dtype(values):
+        finite = values.dropna()
+        if (finite == finite.round()).all():
+            values = values.astype("Int64")
+    values = values.astype("string").str.strip()
+    return values.replace("", pd.NA)
+
+
+def _clean_text_columns(df: pd.DataFrame, columns: List[str]) -> pd.DataFrame:
+    """指定した列を文字列に揃えたDataFrameを作成.
+
+    各列は _text_values() で変換し、欠損値はNoneにする。存在しない列は
+    すべてNoneになる。
+
+    Args:
+        df: 元のDataFrame
+        columns: 作成する列名
+
+    Returns:
+        pd.DataFrame: 値がPythonの文字列またはNoneの object 列だけを持つ
+        DataFrame
+    """
+    frame = pd.DataFrame(index=df.index)
+    for column in columns:
+        if column in df.columns:
+            values = _text_values(df[column])
+        else:
+            values = pd.Series(pd.NA, index=df.index, dtype="string")
+        frame[column] = values.astype(object).where(values.notna(), None)
+    return frame
+
+
+@dataclass
+class MasterDiff:
+    """銘柄マスタの差分.
+
+    Attributes:
+        added: 新規銘柄の挿入用レコード
+        changed: 変更があった銘柄の更新用レコード（id を含む）
+        removed_codes: 無効化する銘柄コード
+        field_changes: 項目別の変更銘柄数（再有効化は is_active）
+    """
+
+    added: List[Dict[str, Any]] = field(default_factory=list)
+    changed: List[Dict[str, Any]] = field(default_factory=list)
+    removed_codes: Set[str] = field(default_factory=set)
+    field_changes: Dict[str, int] = field(default_factory=dict)
+
+
 class JPXStockService:
     """JPX銘柄一覧取得・更新サービス."""
 
@@ -46,11 +134,16 @@ class JPXStockService:
     # リクエストタイムアウト（秒）
     REQUEST_TIMEOUT = 30
 
-    def __init__(self):
+    def __init__(self, master_cache: Optional[JPXMasterCache] = None):
         """Initialize JPXStockService with configured HTTP session.
 
         Sets up a requests session with appropriate headers.
+
+        Args:
+            master_cache: Cache of the last applied JPX file (defaults to
+                the process-wide cache).
         """
+        self.master_cache = master_cache or get_jpx_master_cache()
         self.session = requests.Session()
         # User-Agentを設定してブロックを回避
         self.session.headers.update(
@@ -62,6 +155,9 @@ class JPXStockService:
     def fetch_jpx_stock_list(self) -> pd.DataFrame:
         """JPXから銘柄一覧を取得してDataFrameとして返す.
 
+        前回反映したファイルと同じ内容の場合は、Excelを解析せずに
+        キャッシュした正規化結果を返します。
+
         Returns:
             pd.DataFrame: 正規化された銘柄一覧データ
 
@@ -69,31 +165,65 @@ class JPXStockService:
             JPXDownloadError: ダウンロードに失敗した場合
             JPXParseError: データのパースに失敗した場合。
         """
-        try:
-            logger.info(f"JPX銘柄一覧をダウンロード中: {self.JPX_STOCK_LIST_URL}")
+        return self._fetch_snapshot().frame
+
+    def _fetch_snapshot(self) -> MasterSnapshot:
+        """JPXから銘柄一覧を取得し、前回から変更があるか判定.
 
-            # Excelファイルをダウンロード
-            response = self.session.get(
-                self.JPX_STOCK_LIST_URL, timeout=self.REQUEST_TIMEOUT
+        前回のレスポンスの ETag/Last-Modified で条件付きリクエストを送り、
+        304 の場合はダウンロードを省略します。ダウンロードした内容の
+        ハッシュが前回と一致する場合はExcelの解析を省略します。
+
+        Returns:
+            MasterSnapshot: 正規化された銘柄一覧と変更の有無
+
+        Raises:
+            JPXDownloadError: ダウンロードに失敗した場合
+            JPXParseError: データのパースに失敗した場合。
+        """
+        try:
+            logger.info(
+                f"JPX銘柄一覧をダウンロード中: {self.JPX_STOCK_LIST_URL}"
             )
+
+            response = self._download(self.master_cache.conditional_headers())
+            if response.status_code == 304:
+                snapshot = self._cached_snapshot(not_modified=True)
+                if snapshot is not None:
+                    logger.info(
+                        "JPX銘柄一覧は前回から更新されていません (304)"
+                    )
+                    return snapshot
+                response = self._download({})
             response.raise_for_status()
 
             logger.info(f"ダウンロード完了: {len(response.content)} bytes")
 
+            digest = content_hash(response.content)
+            if self.master_cache.matches(digest):
+                snapshot = self._cached_snapshot(not_modified=False)
+                if snapshot is not None:
+                    logger.info(
+                        "JPX銘柄一覧の内容が前回と同じため解析を省略しました"
+                    )
+                    return snapshot
+
             # Excelデータを読み込み
             df = pd.read_excel(BytesIO(response.content))
 
             logger.info(f"Excel読み込み完了: {len(df)} 行")
 
             # データを正規化
-            normalized_data = self._normalize_jpx_data(df)
-
-            # 正規化されたデータをDataFrameに変換（後方互換性のため）
-            normalized_df = pd.DataFrame(normalized_data)
+            normalized_df = self._normalize_jpx_frame(df)
 
             logger.info(f"データ正規化完了: {len(normalized_df)} 銘柄")
 
-            return normalized_df
+            return MasterSnapshot(
+                content_hash=digest,
+                frame=normalized_df,
+                etag=response.headers.get("ETag"),
+                last_modified=response.headers.get("Last-Modified"),
+            )
 
         except requests.exceptions.RequestException as e:
             error_msg = f"JPXからのダウンロードに失敗しました: {str(e)}"
@@ -105,55 +235,68 @@ class JPXStockService:
             logger.error(error_msg)
             raise JPXParseError(error_msg) from e
 
-    def _get_safe_value(self, row, key: str) -> Optional[str]:
-        """行から安全に値を取得（空文字列やNaNの場合はNoneを返す）.
+    def _download(self, headers: Dict[str, str]) -> requests.Response:
+        """JPX銘柄一覧のExcelファイルをダウンロード."""
+        return self.session.get(
+            self.JPX_STOCK_LIST_URL,
+            timeout=self.REQUEST_TIMEOUT,
+            headers=headers,
+        )
+
+    def _cached_snapshot(self, not_modified: bool) -> Optional[MasterSnapshot]:
+        """前回反映した銘柄一覧のスナップショットをキャッシュから作成."""
+        state = self.master_cache.state()
+        frame = self.master_cache.load_frame()
+        if state is None or frame is None:
+            return None
+        self.master_cache.record_hit(not_modified)
+        return MasterSnapshot(
+            content_hash=state["content_hash"],
+            frame=frame,
+            etag=state.get("etag"),
+            last_modified=state.get("last_modified"),
+            unchanged=True,
+        )
+
+    def _normalize_jpx_data(self, df: pd.DataFrame) -> List[Dict[str, Any]]:
+        """JPXのExcelデータを正規化する.
 
         Args:
-            row: データ行
-            key: キー
+            df: 生のJPXデータ
 
         Returns:
-            値またはNone
+            List[Dict[str, Any]]: 正規化されたデータ（辞書のリスト）
+
+        Raises:
+            JPXParseError: データの正規化に失敗した場合。
         """
-        value = row[key]
-        if pd.notna(value) and value != "":
-            return value
-        return None
+        return self._normalize_jpx_frame(df).to_dict("records")
 
-    def _normalize_jpx_data(self, df: pd.DataFrame) -> List[Dict[str, Any]]:
-        """JPXのExcelデータを正規化する.
+    def _normalize_jpx_frame(self, df: pd.DataFrame) -> pd.DataFrame:
+        """JPXのExcelデータを銘柄マスタの列名のDataFrameに正規化する.
+
+        列単位の文字列操作でクリーニング（前後の空白除去、空文字列と
+        NaNはNone）し、銘柄コードまたは銘柄名が空の行を除外します。
 
         Args:
             df: 生のJPXデータ
 
         Returns:
-            List[Dict[str, Any]]: 正規化されたデータ（辞書のリスト）
+            pd.DataFrame: stock_code、MASTER_FIELDS、data_date の列を持つ
+            DataFrame（値はPythonの文字列またはNone）
 
         Raises:
             JPXParseError: データの正規化に失敗した場合。
         """
         try:
-            # JPXのExcelフォーマットに応じて列名をマッピング
-            expected_columns = [
-                "コード",
-                "銘柄名",
-                "市場・商品区分",
-                "33業種コード",
-                "33業種区分",
-                "17業種コード",
-                "17業種区分",
-                "規模コード",
-                "規模区分",
-            ]
-
             # 利用可能な列を確認
             available_columns = df.columns.tolist()
             logger.debug(f"利用可能な列: {available_columns}")
 
             # 必要な列を抽出（存在する列のみ）
             column_mapping = {
-                col: col
-                for col in expected_columns
+                col: JPX_COLUMNS[col]
+                for col in JPX_COLUMNS
                 if col in available_columns
             }
 
@@ -163,84 +306,36 @@ class JPXStockService:
                 and "stock_code" not in available_columns
             ):
                 if len(available_columns) >= 1:
-                    column_mapping[available_columns[0]] = "コード"
+                    column_mapping[available_columns[0]] = "stock_code"
 
             if (
                 "銘柄名" not in column_mapping
                 and "stock_name" not in available_columns
             ):
                 if len(available_columns) >= 2:
-                    column_mapping[available_columns[1]] = "銘柄名"
+                    column_mapping[available_columns[1]] = "stock_name"
 
             if not column_mapping:
                 raise JPXParseError("必要な列が見つかりません")
 
-            # データを抽出
-            selected_df = df[list(column_mapping.keys())].copy()
-            selected_df.columns = [
-                column_mapping[col] for col in selected_df.columns
-            ]
-
-            # 標準的な列名にマッピング
-            normalized_df = pd.DataFrame()
-            normalized_df["stock_code"] = selected_df.get("コード", "")
-            normalized_df["stock_name"] = selected_df.get("銘柄名", "")
-            normalized_df["market_category"] = selected_df.get("市場・商品区分", "")
-            normalized_df["sector_code_33"] = selected_df.get("33業種コード", "")
-            normalized_df["sector_name_33"] = selected_df.get("33業種区分", "")
-            normalized_df["sector_code_17"] = selected_df.get("17業種コード", "")
-            normalized_df["sector_name_17"] = selected_df.get("17業種区分", "")
-            normalized_df["scale_code"] = selected_df.get("規模コード", "")
-            normalized_df["scale_category"] = selected_df.get("規模区分", "")
-
-            # データクリーニング
-            normalized_df = normalized_df.dropna(
-                subset=["stock_code", "stock_name"]
+            # 標準的な列名にマッピングしてクリーニング
+            selected_df = df[list(column_mapping)].rename(
+                columns=column_mapping
             )
-            normalized_df["stock_code"] = (
-                normalized_df["stock_code"].astype(str).str.strip()
-            )
-            normalized_df["stock_name"] = (
-                normalized_df["stock_name"].astype(str).str.strip()
+            normalized_df = _clean_text_columns(
+                selected_df, ["stock_code", *MASTER_FIELDS]
             )
 
-            # 空の銘柄コードを除外
-            normalized_df = normalized_df[normalized_df["stock_code"] != ""]
+            # 銘柄コード・銘柄名が空の行を除外
+            normalized_df = normalized_df[
+                normalized_df["stock_code"].notna()
+                & normalized_df["stock_name"].notna()
+            ].reset_index(drop=True)
 
             # データ取得日を追加
             normalized_df["data_date"] = datetime.now().strftime("%Y%m%d")
 
-            # 辞書のリストに変換
-            result = []
-            for _, row in normalized_df.iterrows():
-                result.append(
-                    {
-                        "stock_code": row["stock_code"],
-                        "stock_name": row["stock_name"],
-                        "market_category": self._get_safe_value(
-                            row, "market_category"
-                        ),
-                        "sector_code_33": self._get_safe_value(
-                            row, "sector_code_33"
-                        ),
-                        "sector_name_33": self._get_safe_value(
-                            row, "sector_name_33"
-                        ),
-                        "sector_code_17": self._get_safe_value(
-                            row, "sector_code_17"
-                        ),
-                        "sector_name_17": self._get_safe_value(
-                            row, "sector_name_17"
-                        ),
-                        "scale_code": self._get_safe_value(row, "scale_code"),
-                        "scale_category": self._get_safe_value(
-                            row, "scale_category"
-                        ),
-                        "data_date": row["data_date"],
-                    }
-                )
-
-            return result
+            return normalized_df
 
         except Exception as e:
             error_msg = f"データの正規化に失敗しました: {str(e)}"
@@ -248,15 +343,25 @@ class JPXStockService:
             raise JPXParseError(error_msg) from e
 
     def update_stock_master(
-        self, update_type: str = "manual"
+        self, update_type: str = "manual", force: bool = False
     ) -> Dict[str, Any]:
         """銘柄マスタを更新する.
 
+        現在の銘柄マスタを1回のクエリで読み込み、取得した銘柄一覧との
+        差分（新規・変更・削除）をまとめて算出してから、新規銘柄の一括
+        挿入、変更があった銘柄だけの一括更新、削除銘柄の一括無効化の
+        順に反映します。
+
+        JPXのファイルが前回反映したものと同じ場合は差分の算出を省略し、
+        status="unchanged" の更新履歴だけを記録します。
+
         Args:
             update_type: 更新タイプ ('manual' または 'scheduled')
+            force: ファイルが前回と同じでも差分を算出して反映するか
 
         Returns:
-            Dict[str, Any]: 更新結果のサマリー
+            Dict[str, Any]: 更新結果のサマリー（field_changes に項目別の
+            変更銘柄数を含む）
 
         Raises:
             JPXStockServiceError: 更新処理に失敗した場合。
@@ -267,6 +372,7 @@ class JPXStockService:
             "added_stocks": 0,
             "updated_stocks": 0,
             "removed_stocks": 0,
+            "field_changes": {},
             "status": "success",
             "error_message": None,
         }
@@ -275,44 +381,41 @@ class JPXStockService:
 
         try:
             # JPXから最新データを取得
-            df = self.fetch_jpx_stock_list()
-            update_record["total_stocks"] = len(df)
+            snapshot = self._fetch_snapshot()
+            update_record["total_stocks"] = len(snapshot.frame)
+
+            if snapshot.unchanged and not force:
+                update_record["status"] = "unchanged"
+                self._record_update(update_record)
+                logger.info(f"銘柄マスタ更新省略（変更なし）: {update_record}")
+                return update_record
+
+            incoming = self._prepare_master_frame(snapshot.frame)
 
             with get_db_session() as session:
                 # 更新履歴レコードを作成
                 update_id = self._create_update_record(session, update_record)
 
-                # 既存の銘柄コード一覧を取得
-                existing_codes = self._get_existing_stock_codes(session)
-
-                # 新規銘柄と更新銘柄を処理
-                new_codes = set(df["stock_code"].tolist())
-
-                for _, row in df.iterrows():
-                    code = str(row["stock_code"]).strip()
-                    if not code:
-                        continue
+                # 現在の銘柄マスタとの差分を算出
+                current = self._load_current_master(session)
+                diff = self._diff_stock_master(incoming, current)
 
-                    if code not in existing_codes:
-                        # 新規銘柄を追加
-                        self._insert_stock(session, row)
-                        update_record["added_stocks"] += 1
-                    else:
-                        # 既存銘柄を更新
-                        self._update_stock(session, row)
-                        update_record["updated_stocks"] += 1
+                update_record["added_stocks"] = len(diff.added)
+                update_record["updated_stocks"] = len(diff.changed)
+                update_record["removed_stocks"] = len(diff.removed_codes)
+                update_record["field_changes"] = diff.field_changes
 
-                # 削除された銘柄を無効化
-                removed_codes = existing_codes - new_codes
-                update_record["removed_stocks"] = len(removed_codes)
-                if removed_codes:
-                    self._deactivate_stocks(session, removed_codes)
+                # 差分を一括で反映
+                self._apply_master_diff(session, diff)
 
                 # 更新履歴を完了
                 self._complete_update_record(session, update_id, update_record)
 
                 session.commit()
 
+            # 反映が完了したファイルを次回の比較用に保存
+            self.master_cache.store(snapshot)
+
             logger.info(f"銘柄マスタ更新完了: {update_record}")
             return update_record
 
@@ -349,64 +452,102 @@ class JPXStockService:
         session.flush()
         return update.id
 
-    def _get_existing_stock_codes(self, session: Session) -> Set[str]:
-        """既存の有効な銘柄コード一覧を取得."""
-        result = (
-            session.query(StockMaster.stock_code)
-            .filter(StockMaster.is_active == 1)
-            .all()
+    def _record_update(self, update_record: Dict[str, Any]) -> None:
+        """差分を反映しなかった更新の履歴を記録."""
+        with get_db_session() as session:
+            update_id = self._create_update_record(session, update_record)
+            self._complete_update_record(session, update_id, update_record)
+            session.commit()
+
+    def _prepare_master_frame(self, df: pd.DataFrame) -> pd.DataFrame:
+        """取得した銘柄一覧を銘柄マスタの列に揃える.
+
+        各列を文字列にして前後の空白を除き、空文字列とNaNはNoneにする。
+        銘柄コードが空の行は除外し、重複するコードは後の行を残す。
+
+        Args:
+            df: fetch_jpx_stock_list() の結果
+
+        Returns:
+            pd.DataFrame: stock_code、MASTER_FIELDS、data_date の列を持つ
+            DataFrame（値はPythonの文字列またはNone）
+        """
+        frame = _clean_text_columns(
+            df, ["stock_code", *MASTER_FIELDS, "data_date"]
         )
-        return {code[0] for code in result}
-
-    def _insert_stock(self, session: Session, row: pd.Series) -> None:
-        """新規銘柄を挿入."""
-        stock = StockMaster(
-            stock_code=str(row["stock_code"]).strip(),
-            stock_name=str(row["stock_name"]).strip(),
-            market_category=str(row.get("market_category", "")).strip()
-            or None,
-            sector_code_33=str(row.get("sector_code_33", "")).strip() or None,
-            sector_name_33=str(row.get("sector_name_33", "")).strip() or None,
-            sector_code_17=str(row.get("sector_code_17", "")).strip() or None,
-            sector_name_17=str(row.get("sector_name_17", "")).strip() or None,
-            scale_code=str(row.get("scale_code", "")).strip() or None,
-            scale_category=str(row.get("scale_category", "")).strip() or None,
-            data_date=str(row.get("data_date", "")).strip() or None,
-            is_active=1,
+        frame = frame[frame["stock_code"].notna()]
+        frame = frame.drop_duplicates(subset="stock_code", keep="last")
+        return frame.reset_index(drop=True)
+
+    def _load_current_master(self, session: Session) -> pd.DataFrame:
+        """現在の銘柄マスタを無効な銘柄も含めて1回のクエリで取得."""
+        columns = ["id", "stock_code", *MASTER_FIELDS, "is_active"]
+        rows = session.execute(
+            select(*(getattr(StockMaster, column) for column in columns))
+        ).all()
+        return pd.DataFrame(rows, columns=columns)
+
+    def _diff_stock_master(
+        self, incoming: pd.DataFrame, current: pd.DataFrame
+    ) -> MasterDiff:
+        """取得した銘柄一覧と現在の銘柄マスタの差分を算出.
+
+        銘柄コードで突き合わせ、MASTER_FIELDS のいずれかが異なる銘柄と
+        無効化されていた銘柄を変更ありとする。data_date は取得日のため
+        比較せず、変更ありの銘柄にだけ反映する。
+
+        Args:
+            incoming: _prepare_master_frame() の結果
+            current: _load_current_master() の結果
+
+        Returns:
+            MasterDiff: 新規・変更・削除の差分
+        """
+        merged = incoming.merge(
+            current,
+            on="stock_code",
+            how="left",
+            suffixes=("", "_current"),
+            indicator=True,
+        )
+        is_new = (merged["_merge"] == "left_only").to_numpy()
+        existing = merged[~is_new]
+
+        masks = {}
+        for column in MASTER_FIELDS:
+            new, old = existing[column], existing[f"{column}_current"]
+            masks[column] = ~((new == old) | (new.isna() & old.isna()))
+        masks["is_active"] = existing["is_active"] != 1
+        changed_mask = pd.concat(masks, axis=1).any(axis=1)
+
+        columns = ["stock_code", *MASTER_FIELDS, "data_date"]
+        added = merged.loc[is_new, columns].assign(is_active=1)
+        changed = existing.loc[changed_mask, columns].assign(
+            id=existing.loc[changed_mask, "id"].astype("int64"), is_active=1
         )
-        session.add(stock)
 
-    def _update_stock(self, session: Session, row: pd.Series) -> None:
-        """既存銘柄を更新."""
-        stock = (
-            session.query(StockMaster)
-            .filter(StockMaster.stock_code == str(row["stock_code"]).strip())
-            .first()
+        active_codes = current.loc[current["is_active"] == 1, "stock_code"]
+        removed = set(active_codes) - set(incoming["stock_code"])
+
+        return MasterDiff(
+            added=added.to_dict("records"),
+            changed=changed.to_dict("records"),
+            removed_codes=removed,
+            field_changes={
+                column: int(mask.sum())
+                for column, mask in masks.items()
+                if mask.any()
+            },
         )
 
-        if stock:
-            stock.stock_name = str(row["stock_name"]).strip()
-            stock.market_category = (
-                str(row.get("market_category", "")).strip() or None
-            )
-            stock.sector_code_33 = (
-                str(row.get("sector_code_33", "")).strip() or None
-            )
-            stock.sector_name_33 = (
-                str(row.get("sector_name_33", "")).strip() or None
-            )
-            stock.sector_code_17 = (
-                str(row.get("sector_code_17", "")).strip() or None
-            )
-            stock.sector_name_17 = (
-                str(row.get("sector_name_17", "")).strip() or None
-            )
-            stock.scale_code = str(row.get("scale_code", "")).strip() or None
-            stock.scale_category = (
-                str(row.get("scale_category", "")).strip() or None
-            )
-            stock.data_date = str(row.get("data_date", "")).strip() or None
-            stock.is_active = 1
+    def _apply_master_diff(self, session: Session, diff: MasterDiff) -> None:
+        """差分を一括挿入・一括更新・一括無効化で反映."""
+        if diff.added:
+            session.execute(insert(StockMaster), diff.added)
+        if diff.changed:
+            session.execute(update(StockMaster), diff.changed)
+        if diff.removed_codes:
+            self._deactivate_stocks(session, diff.removed_codes)
 
     def _deactivate_stocks(
         self, session: Session, stock_codes: Set[str]
@@ -430,6 +571,7 @@ class JPXStockService:
             update.added_stocks = update_record["added_stocks"]
             update.updated_stocks = update_record["updated_stocks"]
             update.removed_stocks = update_record["removed_stocks"]
+            update.field_changes = update_record.get("field_changes")
             update.status = update_record["status"]
             update.error_message = update_record.get("error_message")
             update.completed_at = datetime.now()
@@ -0,0 +1,305 @@
+"""JPX銘柄一覧の処理済みファイルキャッシュ.
+
+最後に銘柄マスタへ反映したJPXのExcelファイルについて、内容のハッシュ・
+ETag・Last-Modified と正規化済みの銘柄一覧を保存します。JPXの銘柄一覧は
+月に1回程度しか更新されないため、次回の更新時は以下の順で処理を省略
+します。
+
+- ETag/Last-Modified による条件付きリクエストで 304 が返った場合:
+  ダウンロード・Excel解析・DB差分のすべてを省略
+- ダウンロードした内容のハッシュが一致した場合:
+  Excel解析・DB差分を省略
+
+正規化済みの銘柄一覧は列ごとの文字列配列（npz）で保存し、Excelを解析
+し直さずに読み込めるようにします。保存はDBへの反映が完了した後にだけ
+行うため、反映に失敗したファイルが処理済みとして扱われることはありません。
+"""
+
+from dataclasses import dataclass
+import hashlib
+import json
+import logging
+import os
+from pathlib import Path
+import threading
+from typing import Any, Dict, Optional
+
+import numpy as np
+import pandas as pd
+
+
+logger = logging.getLogger(__name__)
+
+# キャッシュファイルの形式バージョン（形式変更時に旧ファイルを無効化）
+_FORMAT_VERSION = 1
+
+_STATE_FILE = "state.json"
+_FRAME_FILE = "master.npz"
+
+
+@dataclass
+class JPXMasterCacheConfig:
+    """JPX銘柄一覧キャッシュの設定.
+
+    Attributes:
+        enabled: キャッシュを使用するか
+        directory: キャッシュファイルの保存先
+    """
+
+    enabled: bool = False
+    directory: str = "data/jpx_master_cache"
+
+    @classmethod
+    def from_env(cls) -> "JPXMasterCacheConfig":
+        """環境変数から設定を作成.
+
+        Returns:
+            JPX_MASTER_CACHE_* 環境変数を反映した設定。
+        """
+        return cls(
+            enabled=os.getenv("JPX_MASTER_CACHE_ENABLED", "false").lower()
+            == "true",
+            directory=os.getenv(
+                "JPX_MASTER_CACHE_DIR", "data/jpx_master_cache"
+            ),
+        )
+
+
+@dataclass
+class MasterSnapshot:
+    """取得したJPX銘柄一覧ファイルと正規化結果.
+
+    Attributes:
+        content_hash: ファイル内容のSHA-256
+        frame: 正規化済みの銘柄一覧
+        etag: レスポンスの ETag
+        last_modified: レスポンスの Last-Modified
+        unchanged: 前回反映したファイルと同じ内容か
+    """
+
+    content_hash: str
+    frame: pd.DataFrame
+    etag: Optional[str] = None
+    last_modified: Optional[str] = None
+    unchanged: bool = False
+
+
+def content_hash(content: bytes) -> str:
+    """ファイル内容のハッシュを算出.
+
+    Args:
+        content: ファイルの内容
+
+    Returns:
+        SHA-256 の16進文字列。
+    """
+    return hashlib.sha256(content).hexdigest()
+
+
+class JPXMasterCache:
+    """最後に反映したJPX銘柄一覧を保存するディスクキャッシュ.
+
+    スレッドセーフ。無効化されている場合、state() と load_frame() は
+    常にNoneを返し、store() は何もしない。
+    """
+
+    def __init__(self, config: Optional[JPXMasterCacheConfig] = None):
+        """初期化.
+
+        Args:
+            config: キャッシュ設定（Noneの場合は環境変数の設定に従う）
+        """
+        self.config = config or JPXMasterCacheConfig.from_env()
+        self.directory = Path(self.config.directory)
+        self._lock = threading.Lock()
+        self._stats = {"not_modified": 0, "hash_matches": 0, "stores": 0}
+        self.logger = logger
+
+    @property
+    def enabled(self) -> bool:
+        """キャッシュが有効か."""
+        return self.config.enabled
+
+    def state(self) -> Optional[Dict[str, Any]]:
+        """前回反映したファイルの情報を取得.
+
+        Returns:
+            content_hash、etag、last_modified、rows を持つ辞書
+            （未保存・無効・読み込み失敗の場合はNone）。
+        """
+        if not self.enabled:
+            return None
+        try:
+            state = json.loads(
+                (self.directory / _STATE_FILE).read_text(encoding="utf-8")
+            )
+        except FileNotFoundError:
+            return None
+        except Exception as e:
+            self.logger.warning(f"JPX銘柄一覧キャッシュの読み込みに失敗: {e}")
+            return None
+        if state.get("version") != _FORMAT_VERSION:
+            return None
+        return state
+
+    def conditional_headers(self) -> Dict[str, str]:
+        """前回のレスポンスに基づく条件付きリクエストのヘッダーを作成.
+
+        Returns:
+            If-None-Match / If-Modified-Since ヘッダーの辞書（正規化結果を
+            読み込めない場合は空の辞書）。
+        """
+        state = self.state()
+        if state is None or not (self.directory / _FRAME_FILE).exists():
+            return {}
+        headers = {}
+        if state.get("etag"):
+            headers["If-None-Match"] = state["etag"]
+        if state.get("last_modified"):
+            headers["If-Modified-Since"] = state["last_modified"]
+        return headers
+
+    def matches(self, digest: str) -> bool:
+        """前回反映したファイルと同じ内容か判定.
+
+        Args:
+            digest: content_hash() の結果
+
+        Returns:
+            ハッシュが一致する場合True。
+        """
+        state = self.state()
+        return state is not None and state.get("content_hash") == digest
+
+    def load_frame(self) -> Optional[pd.DataFrame]:
+        """前回反映した正規化済みの銘柄一覧を読み込み.
+
+        Returns:
+            銘柄一覧（未保存・無効・読み込み失敗の場合はNone）。
+        """
+        if not self.enabled:
+            return None
+        try:
+            with np.load(
+                self.directory / _FRAME_FILE, allow_pickle=False
+            ) as npz:
+                columns = json.loads(str(npz["__columns__"]))
+                frame = pd.DataFrame(
+                    {
+                        column: _decode_column(npz[f"c{i}"])
+                        for i, column in enumerate(columns)
+                    }
+                )
+        except FileNotFoundError:
+            return None
+        except Exception as e:
+            self.logger.warning(f"JPX銘柄一覧キャッシュの読み込みに失敗: {e}")
+            return None
+        return frame
+
+    def record_hit(self, not_modified: bool) -> None:
+        """処理を省略した回数を記録.
+
+        Args:
+            not_modified: 条件付きリクエストで 304 が返った場合True
+                （Falseの場合はハッシュの一致）
+        """
+        with self._lock:
+            key = "not_modified" if not_modified else "hash_matches"
+            self._stats[key] += 1
+
+    def store(self, snapshot: MasterSnapshot) -> None:
+        """反映が完了したファイルの情報と正規化結果を保存.
+
+        正規化結果を書き込んでから情報ファイルを置き換えるため、途中で
+        中断しても古い情報と新しい正規化結果が組み合わさることはない。
+
+        Args:
+            snapshot: 反映したファイルのスナップショット
+        """
+        if not self.enabled:
+            return
+        frame = snapshot.frame
+        state = {
+            "version": _FORMAT_VERSION,
+            "content_hash": snapshot.content_hash,
+            "etag": snapshot.etag,
+            "last_modified": snapshot.last_modified,
+            "rows": len(frame),
+        }
+        with self._lock:
+            self.directory.mkdir(parents=True, exist_ok=True)
+            (self.directory / _STATE_FILE).unlink(missing_ok=True)
+
+            # 列名は __columns__、各列は c<番号> として保存する
+            arrays: Dict[str, Any] = {
+                f"c{i}": _encode_column(frame[column])
+                for i, column in enumerate(frame.columns)
+            }
+            arrays["__columns__"] = np.array(json.dumps(list(frame.columns)))
+            tmp_path = self.directory / f"master.{os.getpid()}.tmp.npz"
+            np.savez_compressed(tmp_path, **arrays)
+            os.replace(tmp_path, self.directory / _FRAME_FILE)
+
+            tmp_state = self.directory / f"state.{os.getpid()}.tmp"
+            tmp_state.write_text(json.dumps(state), encoding="utf-8")
+            os.replace(tmp_state, self.directory / _STATE_FILE)
+            self._stats["stores"] += 1
+
+    def clear(self) -> None:
+        """保存した情報と正規化結果を削除."""
+        with self._lock:
+            (self.directory / _STATE_FILE).unlink(missing_ok=True)
+            (self.directory / _FRAME_FILE).unlink(missing_ok=True)
+
+    def get_stats(self) -> Dict[str, Any]:
+        """キャッシュの統計情報を取得.
+
+        Returns:
+            処理を省略した回数と保存回数。
+        """
+        with self._lock:
+            return {"enabled": self.enabled, **self._stats}
+
+
+def _encode_column(values: pd.Series) -> np.ndarray:
+    """列をUnicode文字列の配列に変換（欠損値は空文字列）.
+
+    正規化済みの銘柄一覧では空文字列は欠損値として扱われるため、
+    空文字列で欠損値を表しても区別できなくなることはない。
+    """
+    return values.astype("string").fillna("").to_numpy(dtype=str)
+
+
+def _decode_column(values: np.ndarray) -> pd.Series:
+    """_encode_column() の逆変換（空文字列はNone）."""
+    decoded = values.astype(object)
+    decoded[values == ""] = None
+    return pd.Series(decoded, dtype=object)
+
+
+# グローバルキャッシュ（プロセス内の全更新処理で共有）
+_jpx_master_cache: Optional[JPXMasterCache] = None
+_jpx_master_cache_lock = threading.Lock()
+
+
+def get_jpx_master_cache() -> JPXMasterCache:
+    """プロセス全体で共有するJPX銘柄一覧キャッシュを取得.
+
+    Returns:
+        JPXMasterCache インスタンス。
+    """
+    global _jpx_master_cache
+
+    with _jpx_master_cache_lock:
+        if _jpx_master_cache is None:
+            _jpx_master_cache = JPXMasterCache()
+        return _jpx_master_cache
+
+
+def reset_jpx_master_cache() -> None:
+    """共有キャッシュを破棄（設定変更時・テスト用）."""
+    global _jpx_master_cache
+
+    with _jpx_master_cache_lock:
+        _jpx_master_cache = None
@@ -0,0 +1,1042 @@
+"""古い株価データの圧縮保存（bar_chunks）と参照.
+
+参照の少ない過去データ（既定では1年より前）を、時間軸テーブル
+（stocks_<interval>）から銘柄・時間軸・月ごとの1行（bar_chunks）に
+移します。1銘柄の全期間の参照は、数千〜数万行のヒープタプルではなく
+数十行の圧縮データの読み込みで済みます。
+
+圧縮データの形式（encode_chunk / decode_chunk）:
+
+- ヘッダー: マジック ``BCH1`` と行数（リトルエンディアンの uint32）
+- 本体: 日時・始値・高値・安値・終値・出来高の6列を、それぞれ int64
+  の差分（先頭は値そのもの）にしてバイト単位で転置し、連結して zlib
+  で圧縮したもの
+- 日時は比較用の整数キー（マイクロ秒。分足・時間足はUTC基準、日足・
+  週足・月足は日付の0時）、価格は Numeric(10,2) に合わせて100倍した
+  整数で格納します（時間軸テーブルと同じ値に復元できます）
+
+圧縮（ArchiveCompactor）:
+
+- ARCHIVE_AFTER_DAYS 日より前の月を、古い月から順に
+  ARCHIVE_SYMBOL_BATCH 銘柄ずつ1トランザクションで移します
+  （時間軸テーブルからの DELETE ... RETURNING と bar_chunks への保存）。
+- 圧縮済みの月に後から保存された足は次回の圧縮で既存の圧縮データと
+  統合します（時間軸テーブルの値を優先）。
+- 分足・時間足は空になった月のパーティションを削除します。
+- 件数・期間は変わらないため bar_coverage は更新しません（統合で
+  重複した足の分だけ減算します）。
+- データ保持ジョブ（RETENTION_RULES）は時間軸テーブルだけを対象と
+  するため、保持日数が ARCHIVE_AFTER_DAYS より短い時間軸は圧縮の前に
+  集約・削除されます。
+
+参照（read_archived / merge_page）は時間軸テーブルの行と統合して返し、
+同じ足が両方にある場合は時間軸テーブルの値を優先します。日時の降順の
+ページ（read_archived_page）は新しい月から必要な分だけ復元し、件数は
+row_count の合計から求めます。
+"""
+
+from dataclasses import dataclass, field
+from datetime import date, datetime, timedelta
+import logging
+import os
+import struct
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+import zlib
+
+import numpy as np
+import pandas as pd
+from sqlalchemy import text
+
+from app.services.batch.batch_service import BatchService
+from app.services.stock_data import coverage
+from app.services.stock_data.bar_batch import (
+    DATE_INTERVALS,
+    BarBatch,
+    time_column_for,
+    time_keys,
+)
+from app.services.stock_data.partitions import (
+    PARTITION_TZ,
+    PartitionManager,
+    TimeValue,
+    _is_postgresql,
+    add_months,
+    get_partition_manager,
+    month_of,
+    partition_bounds,
+    partition_name,
+)
+from app.utils.timeframe_utils import (
+    get_all_intervals,
+    get_table_name,
+    validate_interval,
+)
+
+
+logger = logging.getLogger(__name__)
+
+# 圧縮データのヘッダー（マジック, 行数）
+CHUNK_MAGIC = b"BCH1"
+CHUNK_HEADER = struct.Struct("<4sI")
+
+# 列の数（日時, 始値, 高値, 安値, 終値, 出来高）
+CHUNK_COLUMNS = 6
+
+# 価格の倍率（Numeric(10,2)）
+PRICE_SCALE = 100
+
+DEFAULT_AFTER_DAYS = 365
+
+BATCH_TYPE = "archive"
+
+
+class ArchiveError(Exception):
+    """圧縮保存のエラー."""
+
+    pass
+
+
+def _shuffle(values: np.ndarray) -> bytes:
+    """int64 配列をバイト単位で転置（差分の上位バイトの0が連続する）."""
+    return values.astype("<i8").view(np.uint8).reshape(-1, 8).T.tobytes()
+
+
+def _unshuffle(data: bytes, rows: int) -> np.ndarray:
+    """_shuffle で転置したバイト列を int64 配列に戻す."""
+    return (
+        np.frombuffer(data, dtype=np.uint8)
+        .reshape(8, rows)
+        .T.copy()
+        .view("<i8")
+        .ravel()
+    )
+
+
+def sort_bars(bars: BarBatch) -> BarBatch:
+    """日時の昇順に並べたバッチを作成."""
+    order = np.argsort(bars.time_keys(), kind="stable")
+    return BarBatch(
+        interval=bars.interval,
+        index=bars.index[order],
+        open=bars.open[order],
+        high=bars.high[order],
+        low=bars.low[order],
+        close=bars.close[order],
+        volume=bars.volume[order],
+    )
+
+
+def encode_chunk(bars: BarBatch) -> bytes:
+    """バッチを差分符号化・圧縮した列データに変換.
+
+    Args:
+        bars: 1銘柄・1か月分のバッチ
+
+    Returns:
+        bar_chunks.data に格納するバイト列。
+    """
+    bars = sort_bars(bars)
+    columns = [
+        bars.time_keys(),
+        *(
+            np.rint(prices * PRICE_SCALE).astype(np.int64)
+            for prices in (bars.open, bars.high, bars.low, bars.close)
+        ),
+        bars.volume.astype(np.int64),
+    ]
+    payload = b"".join(
+        _shuffle(np.diff(column, prepend=0)) for column in columns
+    )
+    return CHUNK_HEADER.pack(CHUNK_MAGIC, len(bars)) + zlib.compress(payload)
+
+
+def decode_chunk(data: bytes, interval: str) -> BarBatch:
+    """encode_chunk で作成した列データをバッチに戻す.
+
+    Args:
+        data: bar_chunks.data の値
+        interval: 時間軸
+
+    Returns:
+        日時の昇順のバッチ（分足・時間足の日時は Asia/Tokyo）。
+
+    Raises:
+        ArchiveError: 形式が不正な場合。
+    """
+    data = bytes(data)
+    magic, rows = CHUNK_HEADER.unpack_from(data)
+    if magic != CHUNK_MAGIC:
+        raise ArchiveError(f"圧縮データの形式が不正です: {magic!r}")
+    payload = zlib.decompress(data[CHUNK_HEADER.size :])
+    size = rows * 8
+    if len(payload) != size * CHUNK_COLUMNS:
+        raise ArchiveError("圧縮データの長さが行数と一致しません")
+    keys, opens, highs, lows, closes, volumes = (
+        np.cumsum(_unshuffle(payload[i * size : (i + 1) * size], rows))
+        for i in range(CHUNK_COLUMNS)
+    )
+
+    index = pd.DatetimeIndex(pd.to_datetime(keys, unit="us"))
+    if interval not in DATE_INTERVALS:
+        index = index.tz_localize("UTC").tz_convert(PARTITION_TZ)
+    return BarBatch(
+        interval=interval,
+        index=index,
+        open=opens / PRICE_SCALE,
+        high=highs / PRICE_SCALE,
+        low=lows / PRICE_SCALE,
+        close=closes / PRICE_SCALE,
+        volume=volumes,
+    )
+
+
+def merge_bars(archived: Optional[BarBatch], live: BarBatch) -> BarBatch:
+    """圧縮済みの足と時間軸テーブルの足を統合（同じ日時は後者を優先）."""
+    bars = BarBatch.concat(
+        [archived, live] if archived is not None else [live], live.interval
+    )
+    return sort_bars(bars.drop_duplicate_times())
+
+
+def rows_to_batches(
+    rows: Sequence[Tuple[Any, ...]], interval: str
+) -> Dict[str, BarBatch]:
+    """(symbol, 日時, open, high, low, close, volume) の行を銘柄別のバッチに変換."""
+    if not rows:
+        return {}
+    frame = pd.DataFrame(
+        rows,
+        columns=["symbol", "time", "open", "high", "low", "close", "volume"],
+    )
+    batches = {}
+    for symbol, group in frame.groupby("symbol", sort=True):
+        if interval in DATE_INTERVALS:
+            index = pd.DatetimeIndex(group["time"])
+        else:
+            index = pd.DatetimeIndex(
+                pd.to_datetime(group["time"], utc=True)
+            ).tz_convert(PARTITION_TZ)
+        batches[symbol] = BarBatch(
+            interval=interval,
+            index=index,
+            open=group["open"].to_numpy(dtype=np.float64),
+            high=group["high"].to_numpy(dtype=np.float64),
+            low=group["low"].to_numpy(dtype=np.float64),
+            close=group["close"].to_numpy(dtype=np.float64),
+            volume=group["volume"].to_numpy(dtype=np.int64),
+        )
+    return batches
+
+
+def month_range(interval: str, month: date) -> Tuple[TimeValue, TimeValue]:
+    """月の範囲 [開始, 終了) を時間軸テーブルの時間カラムの型で取得."""
+    if interval in DATE_INTERVALS:
+        return month, add_months(month, 1)
+    return partition_bounds(month)
+
+
+def read_archived(
+    bind: Any,
+    interval: str,
+    symbol: Optional[str] = None,
+    start: Optional[TimeValue] = None,
+    end_before: Optional[TimeValue] = None,
+) -> Dict[str, BarBatch]:
+    """期間 [start, end_before) の圧縮済みの足を取得.
+
+    時間軸テーブルにも同じ足がある場合（圧縮後に保存され、まだ統合
+    されていない足）は、時間軸テーブルの値を優先して結果から除く。
+
+    Args:
+        bind: セッションまたは接続
+        interval: 時間軸
+        symbol: 銘柄コード（Noneの場合は全銘柄）
+        start: 開始（Noneの場合は制限なし）
+        end_before: 終了（この日時を含まない。Noneの場合は制限なし）
+
+    Returns:
+        {銘柄コード: 日時の昇順のバッチ} の辞書（該当がない銘柄は含まない）。
+    """
+    if not _is_postgresql(bind):
+        return {}
+
+    where, params = _chunk_filter(interval, symbol, start, end_before)
+    rows = bind.execute(
+        text(
+            "SELECT symbol, data FROM bar_chunks "
+            f"WHERE {where} ORDER BY symbol, month"
+        ),
+        params,
+    ).all()
+    if not rows:
+        return {}
+
+    start_key, end_key = _range_keys(start, end_before)
+    chunks: Dict[str, List[BarBatch]] = {}
+    for row_symbol, data in rows:
+        bars = _select_range(decode_chunk(data, interval), start_key, end_key)
+        if len(bars):
+            chunks.setdefault(row_symbol, []).append(bars)
+
+    archived = {
+        row_symbol: BarBatch.concat(batches, interval)
+        for row_symbol, batches in chunks.items()
+    }
+    return _exclude_live(bind, interval, archived)
+
+
+@dataclass
+class ChunkInfo:
+    """ページの作成に使う圧縮データ1件（銘柄・月）の情報.
+
+    Attributes:
+        symbol: 銘柄コード
+        month: 対象月（月初日）
+        row_count: 格納している足の数
+        last_key: 最後の足の比較用キー
+        data: 指定期間の境界にかかる場合の圧縮データ（期間内の件数を
+            数えるために取得。期間に含まれる場合はNone）
+    """
+
+    symbol: str
+    month: date
+    row_count: int
+    last_key: int
+    data: Optional[bytes] = None
+
+
+def list_chunks(
+    bind: Any,
+    interval: str,
+    symbol: Optional[str] = None,
+    start: Optional[TimeValue] = None,
+    end_before: Optional[TimeValue] = None,
+) -> List[ChunkInfo]:
+    """期間 [start, end_before) にかかる圧縮データを新しい月から順に取得.
+
+    圧縮データ本体は期間の境界にかかるものだけを取得する。
+
+    Args:
+        bind: セッションまたは接続
+        interval: 時間軸
+        symbol: 銘柄コード（Noneの場合は全銘柄）
+        start: 開始（Noneの場合は制限なし）
+        end_before: 終了（この日時を含まない。Noneの場合は制限なし）
+
+    Returns:
+        月の降順（同じ月は銘柄コード順）の ChunkInfo の一覧。
+    """
+    if not _is_postgresql(bind):
+        return []
+
+    where, params = _chunk_filter(interval, symbol, start, end_before)
+    partial = []
+    if start is not None:
+        where += " AND last_at >= :start_at"
+        params["start_at"] = coverage.to_coverage_time(start)
+        partial.append("first_at < :start_at")
+    if end_before is not None:
+        where += " AND first_at < :end_at"
+        params["end_at"] = coverage.to_coverage_time(end_before)
+        partial.append("last_at >= :end_at")
+    data = (
+        f"CASE WHEN {' OR '.join(partial)} THEN data END"
+        if partial
+        else "NULL"
+    )
+    rows = bind.execute(
+        text(
+            f"SELECT symbol, month, row_count, last_at, {data} "
+            f"FROM bar_chunks WHERE {where} ORDER BY month DESC, symbol"
+        ),
+        params,
+    ).all()
+    if not rows:
+        return []
+    last_keys = time_keys(
+        [coverage.from_coverage_time(row[3], interval) for row in rows]
+    )
+    return [
+        ChunkInfo(
+            symbol=row_symbol,
+            month=month,
+            row_count=row_count,
+            last_key=int(last_key),
+            data=chunk_data,
+        )
+        for (row_symbol, month, row_count, _, chunk_data), last_key in zip(
+            rows, last_keys
+        )
+    ]
+
+
+def read_archived_page(
+    bind: Any,
+    interval: str,
+    chunks: Sequence[ChunkInfo],
+    live: Sequence[Tuple[int, Dict[str, Any]]],
+    count: int,
+    start: Optional[TimeValue] = None,
+    end_before: Optional[TimeValue] = None,
+) -> Tuple[Dict[str, BarBatch], int]:
+    """日時の降順のページの作成に必要な分だけ圧縮済みの足を取得.
+
+    新しい月から順に復元し、時間軸テーブルの先頭の行と復元済みの足の
+    うち次の月の最後の足より新しいものが count 件に達した時点で打ち
+    切る（以降の月の足はページに含まれない）。件数は row_count の合計
+    から求め、期間の境界にかかる圧縮データだけを復元して数える。
+
+    Args:
+        bind: セッションまたは接続
+        interval: 時間軸
+        chunks: list_chunks の結果
+        live: 時間軸テーブルの日時の降順の先頭 count 件の
+            (比較用キー, 辞書) の一覧
+        count: ページの末尾までの件数（offset + limit）
+        start: 開始（list_chunks と同じ値）
+        end_before: 終了（list_chunks と同じ値）
+
+    Returns:
+        (merge_page に渡す {銘柄コード: 日時の昇順のバッチ},
+        期間内の圧縮済みの足の件数) のタプル。
+    """
+    start_key, end_key = _range_keys(start, end_before)
+    decoded: Dict[Tuple[str, date], BarBatch] = {}
+    total = 0
+    for chunk in chunks:
+        if chunk.data is None:
+            total += chunk.row_count
+            continue
+        bars = _select_range(
+            decode_chunk(chunk.data, interval), start_key, end_key
+        )
+        decoded[(chunk.symbol, chunk.month)] = bars
+        total += len(bars)
+
+    months: Dict[date, List[ChunkInfo]] = {}
+    for chunk in chunks:
+        months.setdefault(chunk.month, []).append(chunk)
+    groups = list(months.items())
+
+    live_keys = np.array([key for key, _ in live], dtype=np.int64)
+    parts: Dict[str, List[BarBatch]] = {}
+    for i, (month, group) in enumerate(groups):
+        missing = [
+            chunk.symbol
+            for chunk in group
+            if (chunk.symbol, month) not in decoded
+        ]
+        if missing:
+            for row_symbol, data in bind.execute(
+                text(
+                    "SELECT symbol, data FROM bar_chunks "
+                    "WHERE interval = :interval AND month = :month "
+                    "AND symbol = ANY(:symbols)"
+                ),
+                {"interval": interval, "month": month, "symbols": missing},
+            ):
+                decoded[(row_symbol, month)] = _select_range(
+                    decode_chunk(data, interval), start_key, end_key
+                )
+        batches = {
+            chunk.symbol: decoded[(chunk.symbol, month)]
+            for chunk in group
+            if len(decoded.get((chunk.symbol, month), ()))
+        }
+        for row_symbol, bars in _exclude_live(bind, interval, batches).items():
+            parts.setdefault(row_symbol, []).append(bars)
+
+        if i + 1 < len(groups):
+            threshold = max(chunk.last_key for chunk in groups[i + 1][1])
+            known = int((live_keys > threshold).sum()) + sum(
+                int((bars.time_keys() > threshold).sum())
+                for batches_of_symbol in parts.values()
+                for bars in batches_of_symbol
+            )
+            if known >= count:
+                break
+
+    archived = {
+        row_symbol: sort_bars(BarBatch.concat(batches_of_symbol, interval))
+        for row_symbol, batches_of_symbol in parts.items()
+    }
+    return archived, total
+
+
+def _chunk_filter(
+    interval: str,
+    symbol: Optional[str],
+    start: Optional[TimeValue],
+    end_before: Optional[TimeValue],
+) -> Tuple[str, Dict[str, Any]]:
+    """期間・銘柄で bar_chunks を絞り込む条件（月単位）とパラメータ."""
+    conditions = ["interval = :interval"]
+    params: Dict[str, Any] = {"interval": interval}
+    if symbol:
+        conditions.append("symbol = :symbol")
+        params["symbol"] = symbol
+    if start is not None:
+        conditions.append("month >= :first_month")
+        params["first_month"] = month_of(start)
+    if end_before is not None:
+        conditions.append("month <= :last_month")
+        params["last_month"] = month_of(end_before)
+    return " AND ".join(conditions), params
+
+
+def _range_keys(
+    start: Optional[TimeValue], end_before: Optional[TimeValue]
+) -> Tuple[Optional[int], Optional[int]]:
+    """期間 [start, end_before) の両端の比較用キー."""
+    start_key = time_keys([start])[0] if start is not None else None
+    end_key = time_keys([end_before])[0] if end_before is not None else None
+    return start_key, end_key
+
+
+def _select_range(
+    bars: BarBatch, start_key: Optional[int], end_key: Optional[int]
+) -> BarBatch:
+    """期間 [start_key, end_key) の足だけを残したバッチ."""
+    if start_key is None and end_key is None:
+        return bars
+    keys = bars.time_keys()
+    mask = np.ones(len(bars), dtype=bool)
+    if start_key is not None:
+        mask &= keys >= start_key
+    if end_key is not None:
+        mask &= keys < end_key
+    return bars.select(mask)
+
+
+def _exclude_live(
+    bind: Any, interval: str, archived: Dict[str, BarBatch]
+) -> Dict[str, BarBatch]:
+    """時間軸テーブルにも存在する足を圧縮済みの足から除く."""
+    if not archived:
+        return archived
+    column = time_column_for(interval)
+    time_type = "date" if interval in DATE_INTERVALS else "timestamptz"
+    symbols = sorted(archived)
+    ranges = [archived[symbol].time_range() for symbol in symbols]
+    live = bind.execute(
+        text(
+            f"SELECT t.symbol, t.{column} FROM {get_table_name(interval)} AS t "
+            "JOIN unnest(CAST(:symbols AS text[]), "
+            f"CAST(:starts AS {time_type}[]), CAST(:ends AS {time_type}[])) "
+            "AS w(symbol, start_at, end_at) "
+            f"ON t.symbol = w.symbol AND t.{column} BETWEEN w.start_at AND w.end_at"
+        ),
+        {
+            "symbols": symbols,
+            "starts": [first for first, _ in ranges],
+            "ends": [last for _, last in ranges],
+        },
+    ).all()
+    existing: Dict[str, List[Any]] = {}
+    for symbol, value in live:
+        existing.setdefault(symbol, []).append(value)
+    for symbol, values in existing.items():
+        bars = archived[symbol]
+        keep = ~np.isin(bars.time_keys(), time_keys(values))
+        archived[symbol] = bars.select(keep)
+    return {symbol: bars for symbol, bars in archived.items() if len(bars)}
+
+
+def archived_row(symbol: str, bars: BarBatch, position: int) -> Dict[str, Any]:
+    """圧縮済みの足を StockDataBase.to_dict() と同じ形式の辞書に変換."""
+    value = bars.times(position, position + 1)[0]
+    return {
+        "id": None,
+        "symbol": symbol,
+        "open": float(bars.open[position]),
+        "high": float(bars.high[position]),
+        "low": float(bars.low[position]),
+        "close": float(bars.close[position]),
+        "volume": int(bars.volume[position]),
+        "created_at": None,
+        "updated_at": None,
+        bars.time_column: value.isoformat(),
+    }
+
+
+def merge_page(
+    live: Sequence[Tuple[int, Dict[str, Any]]],
+    archived: Dict[str, BarBatch],
+    limit: int,
+    offset: int,
+) -> List[Dict[str, Any]]:
+    """時間軸テーブルの行と圧縮済みの足を日時の降順で統合し、1ページ分を取得.
+
+    Args:
+        live: 日時の降順の先頭 offset + limit 件の (比較用キー, 辞書) の一覧
+        archived: read_archived / read_archived_page の結果
+        limit: 取得件数
+        offset: 取得開始位置
+
+    Returns:
+        StockDataBase.to_dict() と同じ形式の辞書の一覧。
+    """
+    symbols = list(archived)
+    archived_keys = [archived[symbol].time_keys() for symbol in symbols]
+    keys = np.concatenate(
+        [np.array([key for key, _ in live], dtype=np.int64), *archived_keys]
+    )
+    sources = np.concatenate(
+        [
+            np.full(len(live), -1),
+            *(np.full(len(k), i) for i, k in enumerate(archived_keys)),
+        ]
+    )
+    positions = np.concatenate(
+        [np.arange(len(live)), *(np.arange(len(k)) for k in archived_keys)]
+    )
+    rows = []
+    for i in np.argsort(-keys, kind="stable")[offset : offset + limit]:
+        if sources[i] < 0:
+            rows.append(live[positions[i]][1])
+        else:
+            symbol = symbols[sources[i]]
+            rows.append(archived_row(symbol, archived[symbol], positions[i]))
+    return rows
+
+
+def archived_ranges(
+    bind: Any, symbols: List[str], interval: str
+) -> Dict[str, Dict[str, Any]]:
+    """複数銘柄の圧縮済みの足の最新日時と件数を一括取得.
+
+    Returns:
+        {銘柄コード: {"latest_date", "record_count"}} の辞書
+        （get_data_ranges と同じ形式。該当がない銘柄は含まない）。
+    """
+    if not symbols or not _is_postgresql(bind):
+        return {}
+    rows = bind.execute(
+        text(
+            "SELECT symbol, max(last_at), sum(row_count) FROM bar_chunks "
+            "WHERE interval = :interval AND symbol = ANY(:symbols) "
+            "GROUP BY symbol"
+        ),
+        {"interval": interval, "symbols": symbols},
+    ).all()
+    return {
+        symbol: {
+            "latest_date": coverage.from_coverage_time(latest, interval),
+            "record_count": int(count),
+        }
+        for symbol, latest, count in rows
+    }
+
+
+def archived_keys(
+    bind: Any,
+    interval: str,
+    time_ranges: Dict[str, Tuple[Optional[TimeValue], Optional[TimeValue]]],
+) -> Dict[str, np.ndarray]:
+    """複数銘柄の期間を含む月の圧縮済みの足の比較用キーを1回のクエリで取得.
+
+    Args:
+        bind: セッションまたは接続
+        interval: 時間軸
+        time_ranges: {銘柄コード: (最小, 最大)} の辞書
+
+    Returns:
+        {銘柄コード: 比較用キーの配列} の辞書（該当がない銘柄は含まない）。
+    """
+    windows = [
+        (symbol, month_of(first), month_of(last))
+        for symbol, (first, last) in time_ranges.items()
+        if first is not None and last is not None
+    ]
+    if not windows or not _is_postgresql(bind):
+        return {}
+    symbols, first_months, last_months = (
+        list(values) for values in zip(*windows)
+    )
+    rows = bind.execute(
+        text(
+            "SELECT c.symbol, c.data FROM bar_chunks AS c "
+            "JOIN unnest(CAST(:symbols AS text[]), "
+            "CAST(:first_months AS date[]), CAST(:last_months AS date[])) "
+            "AS w(symbol, first_month, last_month) "
+            "ON c.symbol = w.symbol "
+            "AND c.month BETWEEN w.first_month AND w.last_month "
+            "WHERE c.interval = :interval"
+        ),
+        {
+            "interval": interval,
+            "symbols": symbols,
+            "first_months": first_months,
+            "last_months": last_months,
+        },
+    ).all()
+    keys: Dict[str, List[np.ndarray]] = {}
+    for symbol, data in rows:
+        keys.setdefault(symbol, []).append(
+            decode_chunk(data, interval).time_keys()
+        )
+    return {symbol: np.concatenate(parts) for symbol, parts in keys.items()}
+
+
+def exclude_archived(
+    bind: Any, interval: str, bars_by_symbol: Dict[str, BarBatch]
+) -> Dict[str, BarBatch]:
+    """圧縮済みの足と日時が重複する足を保存対象から除く.
+
+    ON CONFLICT は時間軸テーブルの行しか参照しないため、圧縮済みの
+    期間を再取得した場合に同じ足を時間軸テーブルへ保存し直さないよう、
+    保存前に除く（圧縮済みの値を優先する）。
+
+    Args:
+        bind: セッションまたは接続
+        interval: 時間軸
+        bars_by_symbol: {銘柄コード: BarBatch} の辞書
+
+    Returns:
+        {銘柄コード: 重複を除いたバッチ} の辞書（全銘柄を含む）。
+    """
+    archived = archived_keys(
+        bind,
+        interval,
+        {symbol: bars.time_range() for symbol, bars in bars_by_symbol.items()},
+    )
+    return {
+        symbol: (
+            bars.select(~np.isin(bars.time_keys(), archived[symbol]))
+            if symbol in archived
+            else bars
+        )
+        for symbol, bars in bars_by_symbol.items()
+    }
+
+
+def _parse_intervals(spec: str) -> List[str]:
+    """ARCHIVE_INTERVALS 形式（カンマ区切り）を時間軸の一覧に変換."""
+    intervals = [item.strip() for item in spec.split(",") if item.strip()]
+    for interval in intervals:
+        if not validate_interval(interval):
+            raise ArchiveError(f"サポートされていない時間軸: {interval}")
+    return intervals
+
+
+@dataclass
+class ArchiveConfig:
+    """圧縮保存ジョブの設定.
+
+    Attributes:
+        after_days: 圧縮する日数（この日数より前の月を圧縮する）
+        intervals: 対象の時間軸
+        symbol_batch: 1トランザクションで移す銘柄数
+        hour: スケジュール実行の時刻（時、Asia/Tokyo）
+        minute: スケジュール実行の時刻（分）
+    """
+
+    after_days: int = DEFAULT_AFTER_DAYS
+    intervals: List[str] = field(default_factory=get_all_intervals)
+    symbol_batch: int = 200
+    hour: int = 4
+    minute: int = 0
+
+    @classmethod
+    def from_env(cls) -> "ArchiveConfig":
+        """環境変数から設定を作成.
+
+        Returns:
+            ARCHIVE_* 環境変数を反映した設定。
+        """
+        intervals = os.getenv("ARCHIVE_INTERVALS")
+        return cls(
+            after_days=max(
+                1,
+                int(os.getenv("ARCHIVE_AFTER_DAYS", str(DEFAULT_AFTER_DAYS))),
+            ),
+            intervals=(
+                _parse_intervals(intervals)
+                if intervals
+                else get_all_intervals()
+            ),
+            symbol_batch=max(1, int(os.getenv("ARCHIVE_SYMBOL_BATCH", "200"))),
+            hour=int(os.getenv("ARCHIVE_HOUR", "4")),
+            minute=int(os.getenv("ARCHIVE_MINUTE", "0")),
+        )
+
+    def boundary(self, now: datetime) -> date:
+        """圧縮対象の境界の月（この月より前の月を圧縮する）."""
+        today = now.astimezone(PARTITION_TZ).date()
+        return month_of(today - timedelta(days=self.after_days))
+
+
+def upsert_chunks_sql() -> str:
+    """圧縮データを保存する SQL（既存の月は置き換える）."""
+    return (
+        "INSERT INTO bar_chunks (symbol, interval, month, row_count, "
+        "first_at, last_at, data, updated_at) "
+        "VALUES (:symbol, :interval, :month, :row_count, :first_at, "
+        ":last_at, :data, now()) "
+        "ON CONFLICT (symbol, interval, month) DO UPDATE SET "
+        "row_count = EXCLUDED.row_count, first_at = EXCLUDED.first_at, "
+        "last_at = EXCLUDED.last_at, data = EXCLUDED.data, "
+        "updated_at = EXCLUDED.updated_at"
+    )
+
+
+class ArchiveCompactor:
+    """古い月の足を時間軸テーブルから bar_chunks に移すジョブ."""
+
+    def __init__(
+        self,
+        config: Optional[ArchiveConfig] = None,
+        engine: Any = None,
+        partition_manager: Optional[PartitionManager] = None,
+    ):
+        """初期化.
+
+        Args:
+            config: ジョブ設定（Noneの場合は環境変数の設定に従う）
+            engine: 接続先のエンジン（Noneの場合はアプリのエンジン）
+            partition_manager: パーティション管理（Noneの場合は共有の
+                マネージャー）
+        """
+        if engine is None:
+            from app.models import engine
+        self.config = config or ArchiveConfig.from_env()
+        self.engine = engine
+        self.partitions = partition_manager or get_partition_manager()
+        self.logger = logger
+
+    def run(self, now: Optional[datetime] = None) -> Dict[str, Any]:
+        """全時間軸を圧縮し、結果を BatchExecution に記録.
+
+        時間軸の圧縮に失敗しても残りの時間軸は圧縮する。
+
+        Args:
+            now: 基準日時（Noneの場合は現在日時）
+
+        Returns:
+            batch_id、時間軸ごとの結果（intervals）と合計件数。
+        """
+        now = now or datetime.now(PARTITION_TZ)
+        intervals = self.config.intervals
+        batch = BatchService.create_batch(
+            BATCH_TYPE, total_stocks=len(intervals)
+        )
+        self.logger.info(
+            f"圧縮保存ジョブ開始: batch_id={batch['id']}, "
+            f"時間軸 {len(intervals)}件"
+        )
+
+        results = []
+        errors = []
+        for index, interval in enumerate(intervals, start=1):
+            detail = BatchService.create_batch_detail(
+                batch["id"], interval, status="processing"
+            )
+            try:
+                result = self.compact_interval(interval, now)
+                BatchService.update_batch_detail(
+                    detail["id"],
+                    "completed",
+                    records_inserted=result["archived_rows"],
+                )
+            except Exception as e:
+                self.logger.error(f"圧縮保存に失敗: {interval}: {e}")
+                errors.append(f"{interval}: {e}")
+                result = {"interval": interval, "error": str(e)}
+                BatchService.update_batch_detail(
+                    detail["id"], "failed", error_message=str(e)
+                )
+            results.append(result)
+            BatchService.update_batch_progress(
+                batch["id"], index, index - len(errors), len(errors)
+            )
+
+        summary = {
+            "intervals": results,
+            "archived_rows": sum(r.get("archived_rows", 0) for r in results),
+            "chunks": sum(r.get("chunks", 0) for r in results),
+            "dropped_partitions": sum(
+                len(r.get("dropped_partitions", [])) for r in results
+            ),
+        }
+        BatchService.complete_batch(
+            batch["id"],
+            status="failed" if errors else "completed",
+            error_message="; ".join(errors) or None,
+            summary=summary,
+        )
+        self.logger.info(
+            f"圧縮保存ジョブ完了: batch_id={batch['id']}, "
+            f"圧縮 {summary['archived_rows']}件 "
+            f"({summary['chunks']}チャンク), "
+            f"パーティション削除 {summary['dropped_partitions']}件"
+        )
+        return {"batch_id": batch["id"], **summary}
+
+    def compact_interval(self, interval: str, now: datetime) -> Dict[str, Any]:
+        """1つの時間軸の境界より前の月を古い順に圧縮.
+
+        Args:
+            interval: 時間軸
+            now: 基準日時
+
+        Returns:
+            interval、boundary、months（圧縮した月）、archived_rows、
+            chunks（保存した圧縮データの数）、dropped_partitions を持つ辞書。
+        """
+        table = get_table_name(interval)
+        column = time_column_for(interval)
+        boundary = self.config.boundary(now)
+        result: Dict[str, Any] = {
+            "interval": interval,
+            "boundary": boundary.isoformat(),
+            "months": [],
+            "archived_rows": 0,
+            "chunks": 0,
+            "dropped_partitions": [],
+        }
+
+        while True:
+            with self.engine.connect() as conn:
+                first = conn.execute(
+                    text(
+                        f"SELECT min({column}) FROM {table} "
+                        f"WHERE {column} < :boundary"
+                    ),
+                    {"boundary": month_range(interval, boundary)[0]},
+                ).scalar()
+            if first is None:
+                break
+            month = month_of(first)
+            archived_rows, chunks = self.compact_month(interval, month)
+            result["months"].append(month.isoformat())
+            result["archived_rows"] += archived_rows
+            result["chunks"] += chunks
+            result["dropped_partitions"] += self._drop_empty_partition(
+                interval, month
+            )
+
+        self.logger.info(
+            f"圧縮保存: {interval} ({boundary:%Y-%m} より前) - "
+            f"{len(result['months'])}か月, {result['archived_rows']}件, "
+            f"{result['chunks']}チャンク"
+        )
+        return result
+
+    def compact_month(self, interval: str, month: date) -> Tuple[int, int]:
+        """1か月分の足を銘柄ごとに圧縮して移す.
+
+        Args:
+            interval: 時間軸
+            month: 対象月（月初日）
+
+        Returns:
+            (移した足の数, 保存した圧縮データの数) のタプル。
+        """
+        table = get_table_name(interval)
+        column = time_column_for(interval)
+        start, end = month_range(interval, month)
+        window = {"start": start, "end": end}
+        with self.engine.connect() as conn:
+            symbols = list(
+                conn.execute(
+                    text(
+                        f"SELECT DISTINCT symbol FROM {table} "
+                        f"WHERE {column} >= :start AND {column} < :end "
+                        "ORDER BY symbol"
+                    ),
+                    window,
+                ).scalars()
+            )
+
+        archived_rows = 0
+        chunks = 0
+        batch_size = self.config.symbol_batch
+        for offset in range(0, len(symbols), batch_size):
+            batch = symbols[offset : offset + batch_size]
+            with self.engine.begin() as conn:
+                rows = conn.execute(
+                    text(
+                        f"DELETE FROM {table} WHERE symbol = ANY(:symbols) "
+                        f"AND {column} >= :start AND {column} < :end "
+                        f"RETURNING symbol, {column}, open, high, low, "
+                        "close, volume"
+                    ),
+                    {"symbols": batch, **window},
+                ).all()
+                saved = self._save_chunks(
+                    conn, interval, month, rows_to_batches(rows, interval)
+                )
+            archived_rows += len(rows)
+            chunks += saved
+        return archived_rows, chunks
+
+    def _save_chunks(
+        self,
+        conn: Any,
+        interval: str,
+        month: date,
+        live: Dict[str, BarBatch],
+    ) -> int:
+        """銘柄ごとに既存の圧縮データと統合して保存し、保存数を返す."""
+        if not live:
+            return 0
+        existing = {
+            symbol: decode_chunk(data, interval)
+            for symbol, data in conn.execute(
+                text(
+                    "SELECT symbol, data FROM bar_chunks "
+                    "WHERE interval = :interval AND month = :month "
+                    "AND symbol = ANY(:symbols) ORDER BY symbol FOR UPDATE"
+                ),
+                {"interval": interval, "month": month, "symbols": list(live)},
+            )
+        }
+
+        chunks = []
+        duplicates = {}
+        for symbol, bars in live.items():
+            archived = existing.get(symbol)
+            merged = merge_bars(archived, bars)
+            duplicated = (
+                len(bars) + (len(archived) if archived is not None else 0)
+            ) - len(merged)
+            if duplicated:
+                duplicates[symbol] = duplicated
+            first, last = merged.time_range()
+            chunks.append(
+                {
+                    "symbol": symbol,
+                    "interval": interval,
+                    "month": month,
+                    "row_count": len(merged),
+                    "first_at": coverage.to_coverage_time(first),
+                    "last_at": coverage.to_coverage_time(last),
+                    "data": encode_chunk(merged),
+                }
+            )
+        conn.execute(text(upsert_chunks_sql()), chunks)
+        coverage.record_removed(conn, interval, duplicates)
+        return len(chunks)
+
+    def _drop_empty_partition(self, interval: str, month: date) -> List[str]:
+        """圧縮して空になった月のパーティションを削除（分足・時間足のみ）."""
+        table = get_table_name(interval)
+        with self.engine.begin() as conn:
+            names = [
+                partition["name"]
+                for partition in self.partitions.list_partitions(conn, table)
+                if partition["month"] == month
+            ]
+            if not names:
+                return []
+            # 確認から削除までの間に足が保存されないようロックする
+            conn.execute(text(f"LOCK TABLE {table} IN ACCESS EXCLUSIVE MODE"))
+            name = partition_name(table, month)
+            if conn.execute(
+                text(f"SELECT EXISTS (SELECT 1 FROM {name})")
+            ).scalar():
+                return []
+            conn.execute(text(f"DROP TABLE {name}"))
+        self.partitions.invalidate(table)
+        self.logger.info(f"パーティションを削除: {name}")
+        return [name]
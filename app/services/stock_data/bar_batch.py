@@ -0,0 +1,350 @@
+"""列指向の株価バッチ.
+
+1銘柄・1時間軸のOHLCVを、行ごとの辞書ではなく列ごとのNumPy配列と
+日時インデックスで保持します。変換・重複除外・DB保存の間で行単位の
+辞書を作らずに受け渡すことで、大量データ取り込み時のメモリ使用量と
+オブジェクト生成コストを抑えます。
+
+従来の辞書リスト形式が必要な場合は to_records() で変換できます。
+"""
+
+from dataclasses import dataclass
+from datetime import date, datetime
+import itertools
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+
+# 日付（date）で保存する時間軸（それ以外は日時で保存）
+DATE_INTERVALS = ("1d", "1wk", "1mo")
+
+
+def time_column_for(interval: str) -> str:
+    """時間軸に対応する日付/日時のカラム名を取得.
+
+    Args:
+        interval: 時間軸
+
+    Returns:
+        "date" または "datetime"。
+    """
+    return "date" if interval in DATE_INTERVALS else "datetime"
+
+
+def time_keys(values: Iterable[date | datetime]) -> np.ndarray:
+    """日付/日時を比較用の整数キー（マイクロ秒）に変換.
+
+    タイムゾーン付きの日時はUTC基準の値に揃えるため、異なるタイム
+    ゾーンで表現された同一時刻は同じキーになる。
+
+    Args:
+        values: 日付/日時のシーケンス
+
+    Returns:
+        int64 の配列。
+    """
+    index = pd.DatetimeIndex(list(values))
+    return _index_keys(index)
+
+
+def _index_keys(index: pd.DatetimeIndex) -> np.ndarray:
+    """日時インデックスを比較用の整数キーに変換."""
+    if index.tz is not None:
+        index = index.tz_convert("UTC").tz_localize(None)
+    return index.as_unit("us").asi8
+
+
+@dataclass
+class BarBatch:
+    """1銘柄・1時間軸のOHLCVを列ごとに保持するバッチ.
+
+    Attributes:
+        interval: 時間軸
+        index: 各行の日時
+        open: 始値
+        high: 高値
+        low: 安値
+        close: 終値
+        volume: 出来高
+    """
+
+    interval: str
+    index: pd.DatetimeIndex
+    open: np.ndarray
+    high: np.ndarray
+    low: np.ndarray
+    close: np.ndarray
+    volume: np.ndarray
+
+    @classmethod
+    def empty(cls, interval: str) -> "BarBatch":
+        """空のバッチを作成.
+
+        Args:
+            interval: 時間軸
+
+        Returns:
+            0行のバッチ。
+        """
+        prices = np.empty(0, dtype=np.float64)
+        return cls(
+            interval=interval,
+            index=pd.DatetimeIndex([]),
+            open=prices,
+            high=prices,
+            low=prices,
+            close=prices,
+            volume=np.empty(0, dtype=np.int64),
+        )
+
+    @classmethod
+    def from_records(
+        cls, records: List[Dict[str, Any]], interval: str
+    ) -> "BarBatch":
+        """辞書リスト形式のレコードからバッチを作成.
+
+        Args:
+            records: convert_to_dict() 形式のレコード
+            interval: 時間軸
+
+        Returns:
+            レコードと同じ内容のバッチ。
+        """
+        if not records:
+            return cls.empty(interval)
+
+        time_column = time_column_for(interval)
+        return cls(
+            interval=interval,
+            index=pd.DatetimeIndex([r[time_column] for r in records]),
+            open=np.array([r["open"] for r in records], dtype=np.float64),
+            high=np.array([r["high"] for r in records], dtype=np.float64),
+            low=np.array([r["low"] for r in records], dtype=np.float64),
+            close=np.array([r["close"] for r in records], dtype=np.float64),
+            volume=np.array([r["volume"] for r in records], dtype=np.int64),
+        )
+
+    @classmethod
+    def concat(cls, batches: List["BarBatch"], interval: str) -> "BarBatch":
+        """複数のバッチを順に連結.
+
+        Args:
+            batches: 同一時間軸のバッチのリスト
+            interval: 時間軸
+
+        Returns:
+            全行を含むバッチ（1件の場合はそのバッチ自身）。
+        """
+        batches = [bars for bars in batches if len(bars)]
+        if not batches:
+            return cls.empty(interval)
+        if len(batches) == 1:
+            return batches[0]
+        return cls(
+            interval=interval,
+            index=batches[0].index.append([b.index for b in batches[1:]]),
+            open=np.concatenate([b.open for b in batches]),
+            high=np.concatenate([b.high for b in batches]),
+            low=np.concatenate([b.low for b in batches]),
+            close=np.concatenate([b.close for b in batches]),
+            volume=np.concatenate([b.volume for b in batches]),
+        )
+
+    def __len__(self) -> int:
+        """行数."""
+        return len(self.index)
+
+    @property
+    def time_column(self) -> str:
+        """日付/日時のカラム名."""
+        return time_column_for(self.interval)
+
+    def times(
+        self, start: int = 0, stop: Optional[int] = None
+    ) -> List[date | datetime]:
+        """指定範囲の行の日付/日時をPythonオブジェクトで取得.
+
+        Args:
+            start: 開始位置
+            stop: 終了位置（Noneの場合は末尾まで）
+
+        Returns:
+            日付（date）または日時（datetime）のリスト。
+        """
+        index = self.index[start:stop]
+        if self.interval in DATE_INTERVALS:
+            return list(index.date)
+        return list(index.to_pydatetime())
+
+    def time_keys(self) -> np.ndarray:
+        """各行の日時の比較用整数キー（モジュール関数と同じ基準）.
+
+        日付で保存する時間軸では、DBの date 値と一致するよう現地の
+        日付（0時）をキーにする。
+        """
+        index = self.index
+        if self.interval in DATE_INTERVALS:
+            if index.tz is not None:
+                index = index.tz_localize(None)
+            index = index.normalize()
+        return _index_keys(index)
+
+    def select(self, mask: np.ndarray) -> "BarBatch":
+        """マスクがTrueの行だけを含むバッチを作成.
+
+        Args:
+            mask: 行ごとの真偽値配列
+
+        Returns:
+            抽出したバッチ。
+        """
+        return BarBatch(
+            interval=self.interval,
+            index=self.index[mask],
+            open=self.open[mask],
+            high=self.high[mask],
+            low=self.low[mask],
+            close=self.close[mask],
+            volume=self.volume[mask],
+        )
+
+    def drop_duplicate_times(self) -> "BarBatch":
+        """日付/日時が重複する行を除いたバッチを作成（後の行を残す）.
+
+        Returns:
+            重複がない場合は自身、ある場合は抽出したバッチ。
+        """
+        duplicated = pd.Index(self.time_keys()).duplicated(keep="last")
+        if not duplicated.any():
+            return self
+        return self.select(~duplicated)
+
+    def date_range(self) -> Tuple[Optional[Any], Optional[Any]]:
+        """最初と最後の日付/日時を取得.
+
+        Returns:
+            (最小, 最大) のタプル（空の場合は (None, None)）。
+        """
+        if not len(self):
+            return None, None
+        return self.index.min(), self.index.max()
+
+    def time_range(self) -> Tuple[Optional[Any], Optional[Any]]:
+        """最初と最後の日付/日時をPythonオブジェクトで取得.
+
+        Returns:
+            (最小, 最大) の日付（date）または日時（datetime）のタプル
+            （空の場合は (None, None)）。
+        """
+        first, last = self.date_range()
+        if first is None:
+            return None, None
+        if self.interval in DATE_INTERVALS:
+            return first.date(), last.date()
+        return first.to_pydatetime(), last.to_pydatetime()
+
+    def iter_rows(
+        self, symbol: str, chunk_size: int = 10_000
+    ) -> Iterator[List[Tuple[Any, ...]]]:
+        """DB挿入用の行タプルをチャンク単位で生成.
+
+        全行分のオブジェクトを一度に作らないよう、chunk_size 行ずつ
+        (symbol, 日付/日時, open, high, low, close, volume) のタプルを作る。
+
+        Args:
+            symbol: 銘柄コード
+            chunk_size: 1チャンクの行数
+
+        Yields:
+            行タプルのリスト。
+        """
+        for start in range(0, len(self), chunk_size):
+            stop = start + chunk_size
+            yield list(
+                zip(
+                    itertools.repeat(symbol),
+                    self.times(start, stop),
+                    self.open[start:stop].tolist(),
+                    self.high[start:stop].tolist(),
+                    self.low[start:stop].tolist(),
+                    self.close[start:stop].tolist(),
+                    self.volume[start:stop].tolist(),
+                )
+            )
+
+    def csv_chunks(
+        self, symbol: str, chunk_size: int = 10_000
+    ) -> Iterator[str]:
+        """COPY 用のCSV文字列をチャンク単位で生成.
+
+        各行は symbol, 日付/日時, open, high, low, close, volume の順。
+        タイムゾーン付きの日時はUTCのオフセット付き文字列で出力する。
+
+        Args:
+            symbol: 銘柄コード
+            chunk_size: 1チャンクの行数
+
+        Yields:
+            改行で終わるCSV文字列。
+        """
+        for start in range(0, len(self), chunk_size):
+            stop = start + chunk_size
+            columns = [
+                self._time_strings(start, stop),
+                *(
+                    map(str, values[start:stop].tolist())
+                    for values in (
+                        self.open,
+                        self.high,
+                        self.low,
+                        self.close,
+                        self.volume,
+                    )
+                ),
+            ]
+            yield "".join(
+                f"{symbol},{','.join(row)}\n" for row in zip(*columns)
+            )
+
+    def _time_strings(self, start: int, stop: int) -> List[str]:
+        """指定範囲の行の日付/日時をISO形式の文字列で取得."""
+        index = self.index[start:stop]
+        if self.interval in DATE_INTERVALS:
+            if index.tz is not None:
+                index = index.tz_localize(None)
+            return np.datetime_as_string(index.values, unit="D").tolist()
+        if index.tz is None:
+            return np.datetime_as_string(index.values, unit="us").tolist()
+        utc = index.tz_convert("UTC").tz_localize(None)
+        return [
+            f"{value}+00"
+            for value in np.datetime_as_string(utc.values, unit="us")
+        ]
+
+    def to_records(self) -> List[Dict[str, Any]]:
+        """convert_to_dict() 形式の辞書リストに変換.
+
+        Returns:
+            open/high/low/close/volume と日付/日時を持つ辞書のリスト。
+        """
+        time_column = self.time_column
+        return [
+            {
+                "open": o,
+                "high": h,
+                "low": lo,
+                "close": c,
+                "volume": v,
+                time_column: t,
+            }
+            for o, h, lo, c, v, t in zip(
+                self.open.tolist(),
+                self.high.tolist(),
+                self.low.tolist(),
+                self.close.tolist(),
+                self.volume.tolist(),
+                self.times(),
+            )
+        ]
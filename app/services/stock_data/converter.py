@@ -5,13 +5,19 @@
 
 from datetime import datetime
 import logging
-from typing import Any, Dict, List, cast
+from typing import Any, Dict, List, Tuple, cast
 
+import numpy as np
 import pandas as pd
 
+from app.services.stock_data.bar_batch import DATE_INTERVALS, BarBatch
+
 
 logger = logging.getLogger(__name__)
 
+# 変換に必要な列
+PRICE_VOLUME_COLUMNS = ("Open", "High", "Low", "Close", "Volume")
+
 
 class StockDataConversionError(Exception):
     """データ変換エラー."""
@@ -31,6 +37,9 @@ class StockDataConverter:
     ) -> List[Dict[str, Any]]:
         """DataFrameを辞書リストに変換（データベース保存用）.
 
+        日時インデックスと数値列のみのDataFrameは列単位の一括処理で変換し、
+        それ以外は行単位で変換する。どちらの方法でも結果は同一となる。
+
         Args:
             df: yfinanceから取得したDataFrame
             interval: 時間軸
@@ -45,33 +54,168 @@ class StockDataConverter:
             if df.empty:
                 return []
 
-            records = []
-            skipped_count = 0
+            if self._can_vectorize(df):
+                batch, skipped_count = self._convert_columns(df, interval)
+                records = batch.to_records()
+            else:
+                records, skipped_count = self._convert_rows(df, interval)
 
-            for index, row in df.iterrows():
-                # 価格データの妥当性をチェック
-                if not self._is_valid_price_data(row):
-                    skipped_count += 1
-                    self.logger.debug(
-                        f"データスキップ: 無効な価格データ "
-                        f"(Open:{row['Open']}, High:{row['High']}, "
-                        f"Low:{row['Low']}, Close:{row['Close']})"
-                    )
-                    continue
+            self._log_conversion(len(records), skipped_count, interval)
+            return records
 
-                index_ts = cast(pd.Timestamp, index)
-                record = self._create_record_from_row(index_ts, row, interval)
-                records.append(record)
+        except Exception as e:
+            raise StockDataConversionError(f"データ変換エラー: {e}") from e
 
-            if skipped_count > 0:
-                self.logger.info(f"無効なデータをスキップ: {skipped_count}件")
+    def convert_to_batch(self, df: pd.DataFrame, interval: str) -> BarBatch:
+        """DataFrameを列指向のバッチに変換（データベース保存用）.
 
-            self.logger.debug(f"データ変換完了: {len(records)}件 ({interval})")
-            return records
+        convert_to_dict() と同じ行を、行ごとの辞書を作らずに列ごとの
+        配列として返す。
+
+        Args:
+            df: yfinanceから取得したDataFrame
+            interval: 時間軸
+
+        Returns:
+            有効な行のみを含むバッチ。
+
+        Raises:
+            StockDataConversionError: 変換エラーの場合
+        """
+        try:
+            if df.empty:
+                return BarBatch.empty(interval)
+
+            if self._can_vectorize(df):
+                batch, skipped_count = self._convert_columns(df, interval)
+            else:
+                records, skipped_count = self._convert_rows(df, interval)
+                batch = BarBatch.from_records(records, interval)
+
+            self._log_conversion(len(batch), skipped_count, interval)
+            return batch
 
         except Exception as e:
             raise StockDataConversionError(f"データ変換エラー: {e}") from e
 
+    def _log_conversion(
+        self, converted_count: int, skipped_count: int, interval: str
+    ) -> None:
+        """変換結果をログ出力."""
+        if skipped_count > 0:
+            self.logger.info(f"無効なデータをスキップ: {skipped_count}件")
+
+        self.logger.debug(f"データ変換完了: {converted_count}件 ({interval})")
+
+    def _can_vectorize(self, df: pd.DataFrame) -> bool:
+        """一括変換できるDataFrameか判定.
+
+        日時インデックスを持ち、価格・出来高列が揃っていて、全列が
+        NumPyの数値型（整数・浮動小数点）の場合に一括変換する。
+        """
+        return (
+            isinstance(df.index, pd.DatetimeIndex)
+            and all(column in df.columns for column in PRICE_VOLUME_COLUMNS)
+            and all(
+                isinstance(dtype, np.dtype) and dtype.kind in "iuf"
+                for dtype in df.dtypes
+            )
+        )
+
+    def _convert_columns(
+        self, df: pd.DataFrame, interval: str
+    ) -> Tuple[BarBatch, int]:
+        """列単位の一括処理でバッチに変換.
+
+        行単位の変換（iterrows）と同じ結果になるよう、出来高は行の共通型
+        （浮動小数点列があれば float64）を経由して整数に変換する。
+
+        Returns:
+            (有効な行のバッチ, スキップした件数) のタプル。
+        """
+        open_, high, low, close = (
+            df[column].to_numpy(dtype=np.float64)
+            for column in ("Open", "High", "Low", "Close")
+        )
+
+        # データベース制約に準拠した行のマスク（NaNを含む行は無効）
+        valid = (
+            (open_ > 0)
+            & (high > 0)
+            & (low > 0)
+            & (close > 0)
+            & (high >= low)
+            & (high >= open_)
+            & (high >= close)
+            & (low <= open_)
+            & (low <= close)
+        )
+        skipped_count = int(len(valid) - np.count_nonzero(valid))
+        if skipped_count and self.logger.isEnabledFor(logging.DEBUG):
+            self._log_skipped_rows(df[~valid])
+
+        batch = BarBatch(
+            interval=interval,
+            index=df.index[valid],
+            open=open_[valid],
+            high=high[valid],
+            low=low[valid],
+            close=close[valid],
+            volume=self._to_volume(df, valid),
+        )
+        return batch, skipped_count
+
+    def _to_volume(self, df: pd.DataFrame, valid: np.ndarray) -> np.ndarray:
+        """有効な行の出来高を int64 の配列に変換（欠損は0）."""
+        row_dtype = np.result_type(*df.dtypes)
+        volume = df["Volume"].to_numpy()[valid]
+        if row_dtype.kind != "f":
+            return volume.astype(np.int64)
+
+        volume = volume.astype(row_dtype).astype(np.float64)
+        if np.isinf(volume).any():
+            raise OverflowError("cannot convert float infinity to integer")
+        return np.nan_to_num(volume, nan=0.0).astype(np.int64)
+
+    def _log_skipped_rows(self, invalid: pd.DataFrame) -> None:
+        """スキップした行の価格をデバッグログに出力."""
+        for row in invalid[["Open", "High", "Low", "Close"]].itertuples(
+            index=False
+        ):
+            self.logger.debug(
+                f"データスキップ: 無効な価格データ "
+                f"(Open:{row[0]}, High:{row[1]}, "
+                f"Low:{row[2]}, Close:{row[3]})"
+            )
+
+    def _convert_rows(
+        self, df: pd.DataFrame, interval: str
+    ) -> Tuple[List[Dict[str, Any]], int]:
+        """行単位で辞書リストに変換.
+
+        Returns:
+            (辞書リスト, スキップした件数) のタプル。
+        """
+        records = []
+        skipped_count = 0
+
+        for index, row in df.iterrows():
+            # 価格データの妥当性をチェック
+            if not self._is_valid_price_data(row):
+                skipped_count += 1
+                self.logger.debug(
+                    f"データスキップ: 無効な価格データ "
+                    f"(Open:{row['Open']}, High:{row['High']}, "
+                    f"Low:{row['Low']}, Close:{row['Close']})"
+                )
+                continue
+
+            index_ts = cast(pd.Timestamp, index)
+            record = self._create_record_from_row(index_ts, row, interval)
+            records.append(record)
+
+        return records, skipped_count
+
     def _is_valid_price_data(self, row: pd.Series) -> bool:
         """価格データの妥当性をチェック.
 
@@ -135,7 +279,7 @@ class StockDataConverter:
             }
 
             # 時系列インターバルに応じて日付/日時を設定
-            if interval in ["1d", "1wk", "1mo"]:
+            if interval in DATE_INTERVALS:
                 record["date"] = index.date()
             else:
                 record["datetime"] = index.to_pydatetime()
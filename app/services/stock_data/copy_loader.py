@@ -0,0 +1,133 @@
+"""COPY によるステージング経由の株価データ一括ロード.
+
+行ごとのパラメータバインドを伴う INSERT の代わりに、CSV を
+``COPY ... FROM STDIN`` で一時ステージングテーブルへ流し込み、
+1回の ``INSERT ... SELECT ... ON CONFLICT`` で本テーブルへ
+マージします。既存データとの重複はDB側で除外されるため、事前の
+既存日付の取得も不要です。
+"""
+
+import io
+from typing import Any, Dict, Iterator, Optional
+
+from app.services.stock_data.bar_batch import BarBatch
+from app.services.stock_data.upsert import (
+    ON_CONFLICT_NOTHING,
+    UpsertCounts,
+    add_counts,
+    counting_insert,
+    empty_counts,
+    insert_columns,
+    updates_existing,
+)
+
+
+# 一時ステージングテーブル名（トランザクション終了時に削除）。
+# 検索パス上の同名の通常テーブルを削除しないよう一時スキーマで修飾する
+STAGING_TABLE = "pg_temp.stocks_staging"
+
+# COPY へ渡すCSVの1チャンクの行数
+COPY_CHUNK_ROWS = 10_000
+
+
+class CsvStream(io.TextIOBase):
+    """CSVチャンクのイテレータを COPY 用のファイルとして読み出す.
+
+    psycopg2 の copy_expert は read(size) を繰り返し呼び出すため、
+    全行分の文字列を一度に作らずにストリーミングできる。
+    """
+
+    def __init__(self, chunks: Iterator[str]):
+        """初期化.
+
+        Args:
+            chunks: CSV文字列のイテレータ
+        """
+        self._chunks = chunks
+        self._chunk = ""
+        self._position = 0
+
+    def readable(self) -> bool:
+        """読み出し可能."""
+        return True
+
+    def read(self, size: Optional[int] = -1) -> str:
+        """最大 size 文字を読み出す（負数/Noneの場合は残り全て）."""
+        remaining = -1 if size is None or size < 0 else size
+        parts = []
+        while remaining:
+            if self._position >= len(self._chunk):
+                chunk = next(self._chunks, None)
+                if chunk is None:
+                    break
+                self._chunk, self._position = chunk, 0
+            end = (
+                len(self._chunk)
+                if remaining < 0
+                else self._position + remaining
+            )
+            part = self._chunk[self._position : end]
+            self._position += len(part)
+            if remaining > 0:
+                remaining -= len(part)
+            parts.append(part)
+        return "".join(parts)
+
+
+def _csv_chunks(
+    bars_by_symbol: Dict[str, BarBatch], on_conflict: str
+) -> Iterator[str]:
+    """全銘柄のCSVチャンクを順に生成."""
+    for symbol, bars in bars_by_symbol.items():
+        if updates_existing(on_conflict):
+            bars = bars.drop_duplicate_times()
+        yield from bars.csv_chunks(symbol, COPY_CHUNK_ROWS)
+
+
+def copy_merge(
+    cursor: Any,
+    table_name: str,
+    bars_by_symbol: Dict[str, BarBatch],
+    on_conflict: str = ON_CONFLICT_NOTHING,
+) -> UpsertCounts:
+    """ステージングテーブル経由で株価データをマージ.
+
+    Args:
+        cursor: psycopg2 のカーソル
+        table_name: マージ先のテーブル名（stocks_<interval>）
+        bars_by_symbol: {銘柄コード: BarBatch} の辞書（同一時間軸）
+        on_conflict: 重複時の動作（"nothing"、"update" または "reconcile"）
+
+    Returns:
+        銘柄別の挿入・更新件数（0件の銘柄も含む）。
+
+    Raises:
+        psycopg2.Error: COPY またはマージに失敗した場合。
+    """
+    counts = empty_counts(bars_by_symbol)
+    if not any(len(bars) for bars in bars_by_symbol.values()):
+        return counts
+
+    time_column = next(iter(bars_by_symbol.values())).time_column
+    columns = insert_columns(time_column)
+
+    cursor.execute(f"DROP TABLE IF EXISTS {STAGING_TABLE}")
+    cursor.execute(
+        f"CREATE TEMP TABLE {STAGING_TABLE} ON COMMIT DROP AS "
+        f"SELECT {columns} FROM {table_name} WITH NO DATA"
+    )
+    cursor.copy_expert(
+        f"COPY {STAGING_TABLE} ({columns}) FROM STDIN WITH (FORMAT csv)",
+        CsvStream(_csv_chunks(bars_by_symbol, on_conflict)),
+    )
+    cursor.execute(
+        counting_insert(
+            table_name,
+            time_column,
+            f"SELECT {columns} FROM {STAGING_TABLE}",
+            on_conflict,
+        )
+    )
+    add_counts(counts, cursor.fetchall())
+    cursor.execute(f"DROP TABLE {STAGING_TABLE}")
+    return counts
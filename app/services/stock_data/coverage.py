@@ -0,0 +1,247 @@
+"""銘柄・時間軸ごとのデータ範囲（bar_coverage）の更新と参照.
+
+bar_coverage は銘柄・時間軸ごとの保存件数、最初・最後の足の日時、
+最後に取得データを保存した日時を保持します。株価データの保存・削除と
+同じトランザクションで更新するため、データ状態の確認は時間軸テーブル
+を集計せず主キーの1回の参照で済みます。
+
+- 保存: 新規挿入件数を加算し、期間を保存した足の範囲まで広げる
+- 削除（データ保持ジョブ）: 削除件数を減算し、期間を再計算する
+- 再構築: 時間軸テーブルを集計して作り直す（導入時・不整合の修復用）
+
+件数・期間には圧縮保存した足（bar_chunks）も含みます。
+
+更新は PostgreSQL のみ対象とし、その他の接続先では何もしません。
+日足・週足・月足の日付は Asia/Tokyo の日付の0時として格納します。
+"""
+
+from datetime import date, datetime, time
+import logging
+from typing import Any, Dict, List, Optional, Tuple, Union
+
+from sqlalchemy import func, select, text
+
+from app.models import BarCoverage
+from app.services.stock_data.partitions import PARTITION_TZ, _is_postgresql
+from app.utils.timeframe_utils import get_table_name, is_intraday_interval
+
+
+logger = logging.getLogger(__name__)
+
+# 銘柄別の保存結果（{銘柄コード: (新規挿入件数, (最初, 最後))}）
+SavedRanges = Dict[str, Tuple[int, Tuple[Optional[Any], Optional[Any]]]]
+
+
+def to_coverage_time(value: Any) -> Optional[datetime]:
+    """日付/日時を bar_coverage に格納する日時に変換.
+
+    日付は Asia/Tokyo の0時とし、日時はそのまま返す。
+    """
+    if value is None or isinstance(value, datetime):
+        return value
+    if isinstance(value, date):
+        return datetime.combine(value, time.min, tzinfo=PARTITION_TZ)
+    return value
+
+
+def from_coverage_time(
+    value: Optional[datetime], interval: str
+) -> Optional[Union[datetime, date]]:
+    """bar_coverage の日時を時間軸テーブルと同じ型（日時/日付）に戻す."""
+    if value is None or is_intraday_interval(interval):
+        return value
+    if value.tzinfo is not None:
+        value = value.astimezone(PARTITION_TZ)
+    return value.date()
+
+
+def _time_column(interval: str) -> str:
+    """時間軸テーブルの時間カラムを bar_coverage と同じ型で参照する式."""
+    if is_intraday_interval(interval):
+        return "datetime"
+    return "(date::timestamp AT TIME ZONE 'Asia/Tokyo')"
+
+
+def record_saved(
+    bind: Any, interval: str, saved: SavedRanges, fetched: bool = True
+) -> None:
+    """保存した足の件数と期間を反映.
+
+    保存と同じトランザクションで呼び出す。複数の保存が同じ銘柄の行を
+    更新してもデッドロックしないよう、銘柄コード順に更新する。
+
+    Args:
+        bind: セッションまたは接続
+        interval: 時間軸
+        saved: {銘柄コード: (新規挿入件数, (最初, 最後))} の辞書
+        fetched: 取得データの保存か（False の場合は last_fetched_at を
+            更新しない。集約で追加した足など）
+    """
+    if not saved or not _is_postgresql(bind):
+        return
+    symbols = sorted(saved)
+    bind.execute(
+        text(
+            "INSERT INTO bar_coverage (symbol, interval, row_count, "
+            "first_at, last_at, last_fetched_at, updated_at) "
+            "SELECT s.symbol, :interval, s.inserted, s.first_at, s.last_at, "
+            "CASE WHEN :fetched THEN now() END, now() "
+            "FROM unnest(CAST(:symbols AS text[]), "
+            "CAST(:inserted AS bigint[]), CAST(:firsts AS timestamptz[]), "
+            "CAST(:lasts AS timestamptz[])) "
+            "AS s(symbol, inserted, first_at, last_at) "
+            "ORDER BY s.symbol "
+            "ON CONFLICT (symbol, interval) DO UPDATE SET "
+            "row_count = bar_coverage.row_count + EXCLUDED.row_count, "
+            "first_at = LEAST(bar_coverage.first_at, EXCLUDED.first_at), "
+            "last_at = GREATEST(bar_coverage.last_at, EXCLUDED.last_at), "
+            "last_fetched_at = COALESCE(EXCLUDED.last_fetched_at, "
+            "bar_coverage.last_fetched_at), "
+            "updated_at = EXCLUDED.updated_at"
+        ),
+        {
+            "interval": interval,
+            "fetched": fetched,
+            "symbols": symbols,
+            "inserted": [int(saved[symbol][0]) for symbol in symbols],
+            "firsts": [
+                to_coverage_time(saved[symbol][1][0]) for symbol in symbols
+            ],
+            "lasts": [
+                to_coverage_time(saved[symbol][1][1]) for symbol in symbols
+            ],
+        },
+    )
+
+
+def record_removed(bind: Any, interval: str, removed: Dict[str, int]) -> None:
+    """削除した足の件数を減算し、期間を時間軸テーブルと bar_chunks から再計算.
+
+    削除と同じトランザクションで呼び出す。
+
+    Args:
+        bind: セッションまたは接続
+        interval: 時間軸
+        removed: {銘柄コード: 削除件数} の辞書
+    """
+    if not removed or not _is_postgresql(bind):
+        return
+    table = get_table_name(interval)
+    column = _time_column(interval)
+    symbols = sorted(removed)
+    bind.execute(
+        text(
+            "UPDATE bar_coverage AS c SET "
+            "row_count = GREATEST(c.row_count - r.removed, 0), "
+            f"first_at = LEAST((SELECT min({column}) FROM {table} "
+            "WHERE symbol = c.symbol), (SELECT min(first_at) "
+            "FROM bar_chunks WHERE symbol = c.symbol "
+            "AND interval = c.interval)), "
+            f"last_at = GREATEST((SELECT max({column}) FROM {table} "
+            "WHERE symbol = c.symbol), (SELECT max(last_at) "
+            "FROM bar_chunks WHERE symbol = c.symbol "
+            "AND interval = c.interval)), "
+            "updated_at = now() "
+            "FROM unnest(CAST(:symbols AS text[]), "
+            "CAST(:removed AS bigint[])) AS r(symbol, removed) "
+            "WHERE c.symbol = r.symbol AND c.interval = :interval"
+        ),
+        {
+            "interval": interval,
+            "symbols": symbols,
+            "removed": [int(removed[symbol]) for symbol in symbols],
+        },
+    )
+
+
+def rebuild(bind: Any, interval: str) -> int:
+    """時間軸テーブルと bar_chunks を集計して bar_coverage を作り直す.
+
+    集計中の保存で件数がずれないよう、時間軸テーブルを SHARE モードで
+    ロックする（参照は可能、保存はトランザクション終了まで待機）。
+    last_fetched_at は保持する。
+
+    Args:
+        bind: 接続（呼び出し元のトランザクション内で実行）
+        interval: 時間軸
+
+    Returns:
+        データがある銘柄数。
+    """
+    table = get_table_name(interval)
+    column = _time_column(interval)
+    bind.execute(text(f"LOCK TABLE {table} IN SHARE MODE"))
+    bind.execute(
+        text(
+            "UPDATE bar_coverage SET row_count = 0, first_at = NULL, "
+            "last_at = NULL, updated_at = now() WHERE interval = :interval"
+        ),
+        {"interval": interval},
+    )
+    result = bind.execute(
+        text(
+            "INSERT INTO bar_coverage "
+            "(symbol, interval, row_count, first_at, last_at, updated_at) "
+            "SELECT symbol, :interval, sum(row_count), min(first_at), "
+            "max(last_at), now() FROM ("
+            f"SELECT symbol, count(*) AS row_count, min({column}) AS first_at, "
+            f"max({column}) AS last_at FROM {table} GROUP BY symbol "
+            "UNION ALL SELECT symbol, row_count, first_at, last_at "
+            "FROM bar_chunks WHERE interval = :interval) AS ranges "
+            "GROUP BY symbol "
+            "ON CONFLICT (symbol, interval) DO UPDATE SET "
+            "row_count = EXCLUDED.row_count, "
+            "first_at = EXCLUDED.first_at, last_at = EXCLUDED.last_at, "
+            "updated_at = EXCLUDED.updated_at"
+        ),
+        {"interval": interval},
+    )
+    logger.info(f"データ範囲を再構築: {interval} - {result.rowcount}銘柄")
+    return result.rowcount
+
+
+def get_coverage(
+    bind: Any,
+    symbols: Optional[List[str]] = None,
+    intervals: Optional[List[str]] = None,
+    limit: Optional[int] = None,
+    offset: int = 0,
+) -> Tuple[List[Dict[str, Any]], int]:
+    """銘柄・時間軸ごとのデータ範囲を1回のクエリで取得.
+
+    Args:
+        bind: セッションまたは接続
+        symbols: 対象の銘柄コード（Noneの場合は全銘柄）
+        intervals: 対象の時間軸（Noneの場合は全時間軸）
+        limit: 取得件数の上限（Noneの場合は全件）
+        offset: 取得開始位置
+
+    Returns:
+        (銘柄コード・時間軸順の行の一覧, 条件に一致する全件数) のタプル。
+        各行の first / latest は時間軸テーブルと同じ型（日時/日付）。
+    """
+    table = BarCoverage.__table__
+    query = select(table, func.count().over().label("total"))
+    if symbols is not None:
+        query = query.where(table.c.symbol.in_(symbols))
+    if intervals is not None:
+        query = query.where(table.c.interval.in_(intervals))
+    query = query.order_by(table.c.symbol, table.c.interval)
+    if limit is not None:
+        query = query.limit(limit)
+    if offset:
+        query = query.offset(offset)
+
+    rows = bind.execute(query).all()
+    coverage = [
+        {
+            "symbol": row.symbol,
+            "interval": row.interval,
+            "record_count": row.row_count,
+            "first": from_coverage_time(row.first_at, row.interval),
+            "latest": from_coverage_time(row.last_at, row.interval),
+            "last_fetched_at": row.last_fetched_at,
+        }
+        for row in rows
+    ]
+    return coverage, rows[0].total if rows else 0
@@ -0,0 +1,253 @@
+"""プロセス分離型の株価データ取得ワーカープール.
+
+yfinanceは内部でグローバル辞書を使用しており、同一プロセス内での並行アクセスは
+スレッドセーフではない。本モジュールは市場データプロバイダーの呼び出しを
+独立したワーカープロセス（それぞれ独自のインタプリタ状態を持つ）で実行する
+ことで、グローバルロックによる直列化なしに並行ダウンロードを可能にする。
+
+ワーカーからの戻り値はDataFrameをそのままpickleせず、列ごとのnumpy配列に
+分解したコンパクトなペイロードとして受け渡す。
+"""
+
+from concurrent.futures import ProcessPoolExecutor
+from datetime import date, datetime
+import logging
+import multiprocessing
+import os
+import threading
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+from app.services.stock_data.provider import (
+    MarketDataProvider,
+    create_provider,
+)
+
+
+logger = logging.getLogger(__name__)
+
+# ワーカープロセス数の環境変数（0または未設定の場合はプールを使用しない）
+FETCH_POOL_WORKERS_ENV = "FETCH_POOL_WORKERS"
+
+FramePayload = Dict[str, Any]
+
+
+def encode_frame(df: pd.DataFrame) -> FramePayload:
+    """DataFrameをnumpy配列ベースのペイロードに変換.
+
+    Args:
+        df: 変換対象のDataFrame（DatetimeIndexを想定）
+
+    Returns:
+        列ごとのnumpy配列とインデックス情報を持つ辞書。
+    """
+    index = df.index
+    tz = None
+    unit = None
+    if isinstance(index, pd.DatetimeIndex):
+        tz = str(index.tz) if index.tz is not None else None
+        unit = index.unit
+        index_values = index.asi8.copy()
+    else:
+        index_values = np.asarray(index)
+
+    return {
+        "index": index_values,
+        "index_name": index.name,
+        "index_is_datetime": isinstance(index, pd.DatetimeIndex),
+        "unit": unit,
+        "tz": tz,
+        "columns": list(df.columns),
+        "column_names": list(df.columns.names),
+        "data": [df.iloc[:, i].to_numpy() for i in range(df.shape[1])],
+    }
+
+
+def decode_frame(payload: FramePayload) -> pd.DataFrame:
+    """ペイロードからDataFrameを復元.
+
+    Args:
+        payload: encode_frame で作成したペイロード
+
+    Returns:
+        復元したDataFrame。
+    """
+    if payload["index_is_datetime"]:
+        index = pd.DatetimeIndex(
+            payload["index"].view(f"datetime64[{payload['unit']}]"),
+            name=payload["index_name"],
+        )
+        if payload["tz"]:
+            index = index.tz_localize("UTC").tz_convert(payload["tz"])
+    else:
+        index = pd.Index(payload["index"], name=payload["index_name"])
+
+    columns = payload["columns"]
+    if columns and all(isinstance(c, tuple) for c in columns):
+        column_index = pd.MultiIndex.from_tuples(
+            columns, names=payload["column_names"]
+        )
+    else:
+        column_index = pd.Index(columns, name=payload["column_names"][0])
+
+    df = pd.DataFrame(
+        {i: values for i, values in enumerate(payload["data"])}, index=index
+    )
+    df.columns = column_index
+    return df
+
+
+# ワーカープロセス内で生成したプロバイダー（プロセスごとに1つ）
+_worker_provider: Optional[MarketDataProvider] = None
+
+
+def _run_provider_call(
+    provider_factory: Callable[[], MarketDataProvider],
+    method: str,
+    args: Tuple[Any, ...],
+) -> FramePayload:
+    """ワーカープロセスで実行されるエントリポイント."""
+    global _worker_provider
+
+    if _worker_provider is None:
+        _worker_provider = provider_factory()
+    return encode_frame(getattr(_worker_provider, method)(*args))
+
+
+class FetchWorkerPool:
+    """プロバイダー呼び出しをワーカープロセスで実行するプール."""
+
+    def __init__(
+        self,
+        max_workers: int,
+        provider_factory: Callable[[], MarketDataProvider] = create_provider,
+    ):
+        """初期化.
+
+        Args:
+            max_workers: ワーカープロセス数
+            provider_factory: ワーカー内でプロバイダーを生成する関数
+                （pickle可能なトップレベル関数またはfunctools.partial）
+        """
+        if max_workers < 1:
+            raise ValueError(
+                f"ワーカー数は1以上を指定してください: {max_workers}"
+            )
+
+        self.logger = logger
+        self.max_workers = max_workers
+        self.provider_factory = provider_factory
+        # 親プロセスのスレッド・ロック状態を引き継がないようspawnで起動
+        # （app パッケージは app.app を遅延インポートするため、ワーカーは
+        # テーブル作成・パーティション作成・書き込みスプールを実行しない）
+        self._executor = ProcessPoolExecutor(
+            max_workers=max_workers,
+            mp_context=multiprocessing.get_context("spawn"),
+        )
+
+    def call(self, method: str, *args: Any) -> pd.DataFrame:
+        """ワーカープロセスでプロバイダーのメソッドを実行.
+
+        呼び出し元スレッドは結果が返るまでブロックする。複数スレッドから
+        同時に呼び出すと、最大 max_workers 件のダウンロードが並行に実行される。
+
+        Args:
+            method: プロバイダーのメソッド名
+            *args: メソッドの引数
+
+        Returns:
+            取得したDataFrame。
+        """
+        future = self._executor.submit(
+            _run_provider_call, self.provider_factory, method, args
+        )
+        return decode_frame(future.result())
+
+    def shutdown(self, wait: bool = True) -> None:
+        """ワーカープロセスを停止.
+
+        Args:
+            wait: 実行中のタスクの完了を待つか
+        """
+        self._executor.shutdown(wait=wait)
+
+
+class WorkerPoolProvider(MarketDataProvider):
+    """ワーカープールへ取得を委譲するプロバイダー."""
+
+    name = "worker_pool"
+
+    def __init__(self, pool: FetchWorkerPool):
+        """初期化.
+
+        Args:
+            pool: 取得を実行するワーカープール
+        """
+        self.pool = pool
+
+    def fetch_history(
+        self,
+        symbol: str,
+        interval: str,
+        period: Optional[str] = None,
+        start: Optional[datetime | date] = None,
+    ) -> pd.DataFrame:
+        """単一銘柄の株価履歴をワーカープロセスで取得."""
+        return self.pool.call("fetch_history", symbol, interval, period, start)
+
+    def fetch_batch_history(
+        self,
+        symbols: List[str],
+        interval: str,
+        period: Optional[str] = None,
+        start: Optional[datetime | date] = None,
+    ) -> pd.DataFrame:
+        """複数銘柄の株価履歴をワーカープロセスで一括取得."""
+        return self.pool.call(
+            "fetch_batch_history", symbols, interval, period, start
+        )
+
+
+# グローバルワーカープール
+_fetch_pool: Optional[FetchWorkerPool] = None
+_fetch_pool_lock = threading.Lock()
+
+
+def get_fetch_pool() -> Optional[FetchWorkerPool]:
+    """環境変数の設定に従ってグローバルワーカープールを取得.
+
+    FETCH_POOL_WORKERS が1以上の場合にプールを生成する。
+
+    Returns:
+        ワーカープール（無効な場合はNone）。
+    """
+    global _fetch_pool
+
+    try:
+        workers = int(os.getenv(FETCH_POOL_WORKERS_ENV, "0"))
+    except ValueError:
+        logger.warning(
+            f"{FETCH_POOL_WORKERS_ENV} が不正な値です。ワーカープールを無効化します"
+        )
+        workers = 0
+
+    if workers <= 0:
+        return None
+
+    with _fetch_pool_lock:
+        if _fetch_pool is None:
+            _fetch_pool = FetchWorkerPool(max_workers=workers)
+            logger.info(f"取得ワーカープールを起動しました: {workers}プロセス")
+        return _fetch_pool
+
+
+def shutdown_fetch_pool() -> None:
+    """グローバルワーカープールを停止."""
+    global _fetch_pool
+
+    with _fetch_pool_lock:
+        if _fetch_pool is not None:
+            _fetch_pool.shutdown()
+            _fetch_pool = None
@@ -3,24 +3,35 @@
 このモジュールは株価データのAPI通信機能を提供します。
 """
 
+from datetime import date, datetime
 import logging
-import threading
 from typing import Optional
 
 import pandas as pd
-import yfinance as yf
 
 from app.exceptions import StockDataFetchError as _StockDataFetchError
+from app.services.common.circuit_breaker import (
+    CircuitBreaker,
+    get_circuit_breaker,
+)
+from app.services.common.fetch_gateway import (
+    FetchContext,
+    FetchGateway,
+    get_fetch_gateway,
+)
+from app.services.stock_data.provider import (
+    MarketDataProvider,
+    get_provider,
+)
+from app.services.stock_data.response_cache import (
+    ResponseCache,
+    get_response_cache,
+)
 from app.services.stock_data.validator import StockDataValidator
 
 
 logger = logging.getLogger(__name__)
 
-# yfinanceのスレッドセーフティ問題を回避するためのグローバルロック
-# yfinanceは内部でグローバル辞書を使用しており、並行アクセス時に競合状態が発生する
-# 参考: https://github.com/ranaroussi/yfinance/issues/2557
-_yfinance_lock = threading.Lock()
-
 # テスト互換性のため、fetcherモジュールからも同名を公開
 StockDataFetchError = _StockDataFetchError
 
@@ -28,16 +39,40 @@ StockDataFetchError = _StockDataFetchError
 class StockDataFetcher:
     """株価データ取得クラス（API通信専用）."""
 
-    def __init__(self):
-        """初期化."""
+    def __init__(
+        self,
+        provider: Optional[MarketDataProvider] = None,
+        circuit_breaker: Optional[CircuitBreaker] = None,
+        gateway: Optional[FetchGateway] = None,
+        fetch_context: Optional[FetchContext] = None,
+        response_cache: Optional[ResponseCache] = None,
+    ):
+        """初期化.
+
+        Args:
+            provider: 市場データプロバイダー（Noneの場合は環境変数の設定に従う）
+            circuit_breaker: 上流APIのサーキットブレーカー
+                （Noneの場合はプロセス共有のブレーカー）
+            gateway: 上流リクエストの窓口（Noneの場合はプロセス共有）
+            fetch_context: リクエスト元の優先度・ジョブ
+                （Noneの場合は interactive）
+            response_cache: プロバイダー応答のキャッシュ
+                （Noneの場合はプロセス共有のキャッシュ）
+        """
         self.logger = logger
         self.validator = StockDataValidator()
+        self.provider = provider or get_provider()
+        self.circuit_breaker = circuit_breaker or get_circuit_breaker()
+        self.gateway = gateway or get_fetch_gateway()
+        self.fetch_context = fetch_context or FetchContext()
+        self.response_cache = response_cache or get_response_cache()
 
     def fetch_stock_data(
         self,
         symbol: str,
         interval: str = "1d",
         period: Optional[str] = None,
+        start: Optional[datetime | date] = None,
     ) -> pd.DataFrame:
         """株価データを取得.
 
@@ -45,6 +80,7 @@ class StockDataFetcher:
             symbol: 銘柄コード
             interval: 時間軸（1d, 1h, 5m等）
             period: 取得期間（1y, 6mo等）
+            start: 取得開始日時（指定時はperiodより優先、差分取得用）
 
         Returns:
             株価データのDataFrame
@@ -70,7 +106,9 @@ class StockDataFetcher:
 
         try:
             # データ取得
-            df = self._download_from_yahoo(formatted_symbol, interval, period)
+            df = self._download_from_provider(
+                formatted_symbol, interval, period, start
+            )
 
             # データの検証（バリデーターを使用）
             self.validator.validate_dataframe_structure(df, formatted_symbol)
@@ -88,58 +126,42 @@ class StockDataFetcher:
             self.logger.error(error_msg)
             raise StockDataFetchError(error_msg) from e
 
-    def _download_from_yahoo(
+    def _download_from_provider(
         self,
         symbol: str,
         interval: str,
         period: Optional[str] = None,
+        start: Optional[datetime | date] = None,
     ) -> pd.DataFrame:
-        """Yahoo Financeからデータをダウンロード.
+        """市場データプロバイダーからデータをダウンロード.
 
         Args:
             symbol: 銘柄コード
             interval: 時間軸
             period: 取得期間
+            start: 取得開始日時（指定時はperiodより優先）
 
         Returns:
             ダウンロードしたDataFrame
 
         Raises:
-            StockDataFetchError: ダウンロードエラーの場合
+            StockDataFetchError: ダウンロードエラー、またはサーキット
+                ブレーカー作動中の場合
         """
-        try:
-            # yfinanceのスレッドセーフティ問題を回避するためのロック
-            # 複数スレッドが同時にyfinanceにアクセスすると、内部のグローバル辞書で
-            # 競合状態が発生し、データが正しく取得できない場合がある
-            with _yfinance_lock:
-                ticker = yf.Ticker(symbol)
-
-                # 期間の設定
-                if period:
-                    df = ticker.history(period=period, interval=interval)
-                else:
-                    # デフォルト期間の設定
-                    default_periods = {
-                        "1m": "7d",
-                        "2m": "60d",
-                        "5m": "60d",
-                        "15m": "60d",
-                        "30m": "60d",
-                        "60m": "730d",
-                        "90m": "60d",
-                        "1h": "730d",
-                        "1d": "max",
-                        "5d": "max",
-                        "1wk": "max",
-                        "1mo": "max",
-                        "3mo": "max",
-                    }
-                    period = default_periods.get(interval, "1y")
-                    df = ticker.history(period=period, interval=interval)
-
-            return df
+        cached = self.response_cache.get(symbol, interval, period, start)
+        if cached is not None:
+            return cached
 
+        try:
+            with self.circuit_breaker.call():
+                with self.gateway.request(self.fetch_context):
+                    df = self.provider.fetch_history(
+                        symbol, interval, period, start
+                    )
         except Exception as e:
             raise StockDataFetchError(
                 f"Yahoo Financeからのデータダウンロードに失敗しました: {e}"
             ) from e
+
+        self.response_cache.put(symbol, interval, df, period, start)
+        return df
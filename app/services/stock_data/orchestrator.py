@@ -2,15 +2,24 @@
 
 from datetime import datetime
 import logging
-from typing import Any, Dict, List, Optional
+from typing import Any, Dict, List, Optional, Tuple
 
-from app.services.bulk.stock_batch_processor import StockBatchProcessor
+from app.services.common.fetch_gateway import FetchContext
+from app.services.common.single_flight import (
+    SingleFlight,
+    get_single_flight,
+)
 from app.services.stock_data.converter import StockDataConverter
 from app.services.stock_data.fetcher import (
     StockDataFetcher,
     StockDataFetchError,
 )
-from app.services.stock_data.saver import StockDataSaveError, StockDataSaver
+from app.services.stock_data.provider import get_default_period
+from app.services.stock_data.saver import (
+    StockData,
+    StockDataSaveError,
+    StockDataSaver,
+)
 from app.utils.timeframe_utils import get_all_intervals, get_display_name
 
 
@@ -26,19 +35,30 @@ class StockDataOrchestrationError(Exception):
 class StockDataOrchestrator:
     """株価データ取得・保存オーケストレータークラス."""
 
-    def __init__(self):
-        """初期化."""
-        self.fetcher = StockDataFetcher()
+    def __init__(
+        self,
+        fetch_context: Optional[FetchContext] = None,
+        single_flight: Optional[SingleFlight] = None,
+    ):
+        """初期化.
+
+        Args:
+            fetch_context: 上流リクエストの優先度・ジョブ
+                （Noneの場合は interactive）
+            single_flight: 同一リクエストの集約
+                （Noneの場合はプロセス共有のインスタンス）
+        """
+        self.fetcher = StockDataFetcher(fetch_context=fetch_context)
         self.saver = StockDataSaver()
         self.converter = StockDataConverter()
-        self.batch_processor = StockBatchProcessor()
+        self.single_flight = single_flight or get_single_flight()
         self.logger = logger
 
     def _build_success_result(
         self,
         symbol: str,
         interval: str,
-        data_list: List[Dict],
+        data_list: StockData,
         save_result: Dict[str, Any],
         integrity_check: Dict[str, Any],
     ) -> Dict[str, Any]:
@@ -101,8 +121,8 @@ class StockDataOrchestrator:
         Raises:
             StockDataSaveError: 保存時のエラー
         """
-        # データ変換
-        data_list = self.converter.convert_to_dict(df, interval)
+        # データ変換（列指向のまま保存まで受け渡す）
+        data_list = self.converter.convert_to_batch(df, interval)
 
         # データ保存
         save_result = self.saver.save_stock_data(
@@ -131,6 +151,69 @@ class StockDataOrchestrator:
     ) -> Dict[str, Any]:
         """株価データの取得と保存を実行.
 
+        同じ銘柄・時間軸・期間の処理が実行中の場合は、上流への取得と保存を
+        重ねて行わず、実行中の処理の結果を共有する。共有した結果には
+        "coalesced": True が付与される。
+
+        Args:
+            symbol: 銘柄コード
+            interval: 時間軸
+            period: 取得期間
+            force_update: True の場合、既存データを無視して全て取得
+
+        Returns:
+            実行結果の詳細情報。
+        """
+        key = self._request_key(symbol, interval, period, force_update)
+        result, shared = self.single_flight.do(
+            key,
+            lambda: self._fetch_and_save_once(
+                symbol, interval, period, force_update
+            ),
+        )
+        return {**result, "coalesced": shared}
+
+    def _request_key(
+        self,
+        symbol: str,
+        interval: str,
+        period: Optional[str],
+        force_update: bool,
+    ) -> Tuple[str, ...]:
+        """同一リクエストを判定するための正規化したキーを作成.
+
+        Args:
+            symbol: 銘柄コード
+            interval: 時間軸
+            period: 取得期間（Noneの場合は時間軸のデフォルト期間）
+            force_update: 既存データを無視するか
+
+        Returns:
+            (銘柄コード, 時間軸, 取得期間, 更新方法) のタプル。
+        """
+        try:
+            formatted_symbol = self.fetcher.validator.validate_symbol_input(
+                symbol
+            )
+        except Exception:
+            # 不正な銘柄コードは取得処理側でエラー結果を返す
+            formatted_symbol = str(symbol)
+        return (
+            formatted_symbol,
+            interval,
+            period or get_default_period(interval),
+            "force" if force_update else "default",
+        )
+
+    def _fetch_and_save_once(
+        self,
+        symbol: str,
+        interval: str,
+        period: Optional[str],
+        force_update: bool,
+    ) -> Dict[str, Any]:
+        """株価データの取得と保存を1回実行.
+
         Args:
             symbol: 銘柄コード
             interval: 時間軸
@@ -211,51 +294,26 @@ class StockDataOrchestrator:
     def _fetch_and_process_batch(
         self, symbol: str, intervals: List[str], period: Optional[str]
     ) -> Dict[str, Dict[str, Any]]:
-        """バッチ取得と各時間軸の処理を実行.
+        """各時間軸の取得と処理を実行.
+
+        時間軸ごとに fetch_and_save を経由するため、画面操作等から同じ
+        リクエストが同時に届いた場合は取得と保存が1回に集約される。
 
         Args:
             symbol: 銘柄コード
             intervals: 時間軸のリスト
             period: 取得期間
 
-        Returns:
-            {interval: 実行結果} の辞書。
-        """
-        try:
-            # BatchProcessorを使用して複数時間軸のデータを取得
-            batch_results = self.batch_processor.fetch_multiple_timeframes(
-                symbol=symbol, intervals=intervals, period=period
-            )
-            # 各時間軸のデータを処理
-            return self._process_batch_results(symbol, batch_results)
-
-        except Exception as e:
-            # バッチ取得全体でエラーが発生した場合
-            self.logger.error("複数時間軸データ取得エラー: %s: %s", symbol, e)
-            return {
-                interval: self._build_error_result(symbol, interval, e)
-                for interval in intervals
-            }
-
-    def _process_batch_results(
-        self, symbol: str, batch_results: Dict[str, Any]
-    ) -> Dict[str, Dict[str, Any]]:
-        """バッチ取得結果の各時間軸データを処理.
-
-        Args:
-            symbol: 銘柄コード
-            batch_results: {interval: DataFrame} の辞書
-
         Returns:
             {interval: 実行結果} の辞書。
         """
         results = {}
-        for interval, df in batch_results.items():
+        for interval in intervals:
             try:
-                results[interval] = self._process_single_timeframe(
-                    symbol, interval, df
+                results[interval] = self.fetch_and_save(
+                    symbol, interval, period=period
                 )
-            except (StockDataSaveError, Exception) as e:
+            except Exception as e:
                 self.logger.error("データ保存エラー: %s (%s): %s", symbol, interval, e)
                 results[interval] = self._build_error_result(
                     symbol, interval, e
@@ -275,11 +333,12 @@ class StockDataOrchestrator:
             整合性チェック結果。
         """
         try:
-            # データベース内のレコード数
-            record_count = self.saver.count_records(symbol, interval)
-
-            # 最新データ日時
-            latest_date = self.saver.get_latest_date(symbol, interval)
+            # データベース内のレコード数・最新データ日時（bar_coverage）
+            coverage = self.saver.get_coverage(symbol, [interval]).get(
+                interval, {}
+            )
+            record_count = coverage.get("record_count", 0)
+            latest_date = coverage.get("latest")
 
             # 基本的な整合性チェック
             is_valid = record_count > 0
@@ -330,29 +389,34 @@ class StockDataOrchestrator:
         if intervals is None:
             intervals = get_all_intervals()
 
-        status = {}
-
-        for interval in intervals:
-            try:
-                record_count = self.saver.count_records(symbol, interval)
-                latest_date = self.saver.get_latest_date(symbol, interval)
-
-                status[interval] = {
-                    "interval": interval,
-                    "display_name": get_display_name(interval),
-                    "record_count": record_count,
-                    "latest_date": (
-                        latest_date.isoformat() if latest_date else None
-                    ),
-                    "has_data": record_count > 0,
-                }
-
-            except Exception as e:
-                status[interval] = {
+        try:
+            # 全時間軸のデータ範囲を bar_coverage から1回で取得
+            coverage = self.saver.get_coverage(symbol, intervals)
+        except Exception as e:
+            return {
+                interval: {
                     "interval": interval,
                     "display_name": get_display_name(interval),
                     "error": str(e),
                 }
+                for interval in intervals
+            }
+
+        status = {}
+
+        for interval in intervals:
+            record_count = coverage.get(interval, {}).get("record_count", 0)
+            latest_date = coverage.get(interval, {}).get("latest")
+
+            status[interval] = {
+                "interval": interval,
+                "display_name": get_display_name(interval),
+                "record_count": record_count,
+                "latest_date": (
+                    latest_date.isoformat() if latest_date else None
+                ),
+                "has_data": record_count > 0,
+            }
 
         return status
 
@@ -0,0 +1,463 @@
+"""分足・時間足テーブルの月単位パーティション管理.
+
+stocks_1m / 5m / 15m / 30m / 1h は datetime 列で月ごとにレンジ
+パーティション化しています（親テーブルの定義は app.models を参照）。
+パーティションの境界は取引所のタイムゾーン（Asia/Tokyo）の月初で、
+名前は ``{テーブル名}_pYYYYMM`` です。
+
+- 保存処理は書き込む期間のパーティションを同じトランザクション内で作成
+  するため、過去データの取り込みでも DEFAULT パーティションは不要です。
+- アプリ起動時は当月から PARTITION_MONTHS_AHEAD か月先までを事前に作成
+  し、通常の保存でパーティション作成（親テーブルの排他ロック）が発生
+  しないようにします。
+- 保持期間を過ぎたデータはパーティション単位で削除し、DELETE による
+  行単位の削除と VACUUM を不要にします。
+
+作成済みの月はプロセス内にキャッシュし、保存のたびにカタログを参照
+しません。キャッシュはカタログで確認した月だけを保持し、保存に失敗
+した場合は invalidate() で破棄します。
+"""
+
+from dataclasses import dataclass
+from datetime import date, datetime, time, timedelta
+import logging
+import os
+import re
+import threading
+from typing import Any, Dict, Iterable, List, Optional, Set, Tuple, Union
+from zoneinfo import ZoneInfo
+
+from sqlalchemy import text
+from sqlalchemy.exc import SQLAlchemyError
+
+
+logger = logging.getLogger(__name__)
+
+# パーティション化している時間軸のテーブル
+PARTITIONED_TABLES: Tuple[str, ...] = (
+    "stocks_1m",
+    "stocks_5m",
+    "stocks_15m",
+    "stocks_30m",
+    "stocks_1h",
+)
+
+# パーティション境界のタイムゾーン（東証）
+PARTITION_TZ = ZoneInfo("Asia/Tokyo")
+
+_PARTITION_NAME = re.compile(r"_p(\d{4})(\d{2})$")
+
+TimeValue = Union[date, datetime]
+
+
+@dataclass
+class PartitionConfig:
+    """パーティション管理の設定.
+
+    Attributes:
+        months_ahead: 事前に作成する当月より先の月数
+    """
+
+    months_ahead: int = 3
+
+    @classmethod
+    def from_env(cls) -> "PartitionConfig":
+        """環境変数から設定を作成.
+
+        Returns:
+            PARTITION_MONTHS_AHEAD 環境変数を反映した設定。
+        """
+        return cls(months_ahead=int(os.getenv("PARTITION_MONTHS_AHEAD", "3")))
+
+
+def month_of(value: TimeValue) -> date:
+    """日付/日時が属するパーティションの月（月初日）を取得.
+
+    タイムゾーン付きの日時は Asia/Tokyo に変換し、タイムゾーンなしの
+    日時と日付は Asia/Tokyo の値とみなす。
+    """
+    if isinstance(value, datetime):
+        if value.tzinfo is not None:
+            value = value.astimezone(PARTITION_TZ)
+        value = value.date()
+    return value.replace(day=1)
+
+
+def add_months(month: date, months: int) -> date:
+    """月初日に月数を加算."""
+    index = month.year * 12 + month.month - 1 + months
+    return date(index // 12, index % 12 + 1, 1)
+
+
+def months_between(start: TimeValue, end: TimeValue) -> List[date]:
+    """開始・終了（両端を含む）にかかる月の一覧を取得."""
+    month, last = month_of(start), month_of(end)
+    months = []
+    while month <= last:
+        months.append(month)
+        month = add_months(month, 1)
+    return months
+
+
+def partition_name(table: str, month: date) -> str:
+    """パーティションのテーブル名を取得."""
+    return f"{table}_p{month:%Y%m}"
+
+
+def partition_bounds(month: date) -> Tuple[datetime, datetime]:
+    """パーティションの範囲 [開始, 終了) をタイムゾーン付きで取得."""
+    start = datetime.combine(month, time.min, tzinfo=PARTITION_TZ)
+    end = datetime.combine(add_months(month, 1), time.min, tzinfo=PARTITION_TZ)
+    return start, end
+
+
+def create_partition_sql(table: str, month: date) -> str:
+    """パーティションを作成する CREATE TABLE 文を生成."""
+    start, end = partition_bounds(month)
+    return (
+        f"CREATE TABLE IF NOT EXISTS {partition_name(table, month)} "
+        f"PARTITION OF {table} "
+        f"FOR VALUES FROM ('{start.isoformat(sep=' ')}') "
+        f"TO ('{end.isoformat(sep=' ')}')"
+    )
+
+
+def day_range(
+    start: Optional[date], end: Optional[date]
+) -> Tuple[Optional[datetime], Optional[datetime]]:
+    """日付の範囲（両端を含む）を日時の範囲 [開始, 終了) に変換.
+
+    日付のまま timestamptz 列と比較すると、実行時のタイムゾーンに依存
+    するためプラン作成時にパーティションを絞り込めない。Asia/Tokyo の
+    日時に揃えることで、対象の月のパーティションだけを参照させる。
+    """
+    return (
+        (
+            datetime.combine(start, time.min, tzinfo=PARTITION_TZ)
+            if start
+            else None
+        ),
+        (
+            datetime.combine(
+                end + timedelta(days=1), time.min, tzinfo=PARTITION_TZ
+            )
+            if end
+            else None
+        ),
+    )
+
+
+def _is_postgresql(bind: Any) -> bool:
+    """セッション/接続の接続先が PostgreSQL か判定."""
+    get_bind = getattr(bind, "get_bind", None)
+    target = get_bind() if callable(get_bind) else bind
+    return getattr(getattr(target, "dialect", None), "name", None) == (
+        "postgresql"
+    )
+
+
+class PartitionManager:
+    """月単位パーティションの作成・一覧・削除.
+
+    スレッドセーフ。PostgreSQL 以外の接続先と、パーティション化されて
+    いないテーブル（移行前の既存テーブルなど）に対しては何もしない。
+    """
+
+    def __init__(self, config: Optional[PartitionConfig] = None):
+        """初期化.
+
+        Args:
+            config: パーティション設定（Noneの場合は環境変数の設定に従う）
+        """
+        self.config = config or PartitionConfig.from_env()
+        self._lock = threading.Lock()
+        self._partitioned: Dict[str, bool] = {}
+        self._months: Dict[str, Set[date]] = {}
+        self._stats = {"created": 0, "dropped": 0, "catalog_lookups": 0}
+        self.logger = logger
+
+    def ensure_range(
+        self,
+        bind: Any,
+        table: str,
+        start: Optional[TimeValue],
+        end: Optional[TimeValue],
+    ) -> List[str]:
+        """期間（両端を含む）を格納するパーティションを作成.
+
+        呼び出し元のトランザクション内で作成するため、保存に失敗して
+        ロールバックされた場合は作成したパーティションも残らない。
+        同じパーティションを同時に作成しないよう、作成時はテーブル単位の
+        アドバイザリロックを取得する。
+
+        Args:
+            bind: SQLAlchemy のセッションまたは接続
+            table: テーブル名
+            start: 期間の開始
+            end: 期間の終了
+
+        Returns:
+            作成したパーティション名の一覧。
+        """
+        if table not in PARTITIONED_TABLES or start is None or end is None:
+            return []
+        months = months_between(start, end)
+        with self._lock:
+            if self._partitioned.get(table) is False:
+                return []
+            if self._months.get(table, set()).issuperset(months):
+                return []
+        if not _is_postgresql(bind) or not self._is_partitioned(bind, table):
+            return []
+
+        existing = self._load_months(bind, table)
+        missing = [month for month in months if month not in existing]
+        if not missing:
+            return []
+
+        bind.execute(
+            text("SELECT pg_advisory_xact_lock(hashtext(:table))"),
+            {"table": table},
+        )
+        created = []
+        for month in missing:
+            bind.execute(text(create_partition_sql(table, month)))
+            created.append(partition_name(table, month))
+        with self._lock:
+            self._stats["created"] += len(created)
+        self.logger.info(f"パーティションを作成: {', '.join(created)}")
+        return created
+
+    def ensure_upcoming(self, engine: Any = None) -> Dict[str, List[str]]:
+        """当月から設定された月数先までのパーティションを作成.
+
+        テーブルごとに別のトランザクションで作成し、失敗しても他の
+        テーブルの作成と呼び出し元の処理は継続する。
+
+        Args:
+            engine: 接続先のエンジン（Noneの場合はアプリのエンジン）
+
+        Returns:
+            {テーブル名: 作成したパーティション名の一覧} の辞書。
+        """
+        if engine is None:
+            from app.models import engine
+
+        current = month_of(datetime.now(PARTITION_TZ))
+        last = add_months(current, self.config.months_ahead)
+        created: Dict[str, List[str]] = {}
+        for table in PARTITIONED_TABLES:
+            try:
+                with engine.begin() as conn:
+                    created[table] = self.ensure_range(
+                        conn, table, current, last
+                    )
+            except SQLAlchemyError as e:
+                self.logger.warning(
+                    f"パーティションの事前作成に失敗: {table}: {e}"
+                )
+                self.invalidate(table)
+                created[table] = []
+        return created
+
+    def list_partitions(self, bind: Any, table: str) -> List[Dict[str, Any]]:
+        """テーブルの月単位パーティションを古い順に取得.
+
+        Args:
+            bind: SQLAlchemy のセッションまたは接続
+            table: テーブル名
+
+        Returns:
+            name、month、start、end（[start, end) の範囲）を持つ辞書の一覧。
+        """
+        partitions = []
+        for name in self._partition_names(bind, table):
+            match = _PARTITION_NAME.search(name)
+            if not match:
+                continue
+            month = date(int(match.group(1)), int(match.group(2)), 1)
+            start, end = partition_bounds(month)
+            partitions.append(
+                {"name": name, "month": month, "start": start, "end": end}
+            )
+        return sorted(partitions, key=lambda partition: partition["month"])
+
+    def drop_before(
+        self, bind: Any, table: str, cutoff: TimeValue
+    ) -> List[str]:
+        """範囲全体が基準日時より前のパーティションを削除.
+
+        基準日時を含む月のパーティションは削除しない（行単位の削除は
+        呼び出し元で行う）。
+
+        Args:
+            bind: SQLAlchemy のセッションまたは接続
+            table: テーブル名
+            cutoff: 基準日時（これより前のデータが削除対象）
+
+        Returns:
+            削除したパーティション名の一覧。
+        """
+        if (
+            table not in PARTITIONED_TABLES
+            or not _is_postgresql(bind)
+            or not self._is_partitioned(bind, table)
+        ):
+            return []
+        if not isinstance(cutoff, datetime):
+            cutoff = datetime.combine(cutoff, time.min, tzinfo=PARTITION_TZ)
+        elif cutoff.tzinfo is None:
+            cutoff = cutoff.replace(tzinfo=PARTITION_TZ)
+
+        expired = [
+            partition["name"]
+            for partition in self.list_partitions(bind, table)
+            if partition["end"] <= cutoff
+        ]
+        if not expired:
+            return []
+
+        bind.execute(
+            text("SELECT pg_advisory_xact_lock(hashtext(:table))"),
+            {"table": table},
+        )
+        for name in expired:
+            bind.execute(text(f"DROP TABLE IF EXISTS {name}"))
+        self.invalidate(table)
+        with self._lock:
+            self._stats["dropped"] += len(expired)
+        self.logger.info(f"パーティションを削除: {', '.join(expired)}")
+        return expired
+
+    def invalidate(self, table: Optional[str] = None) -> None:
+        """作成済みの月のキャッシュを破棄.
+
+        Args:
+            table: 対象のテーブル名（Noneの場合は全テーブル）
+        """
+        with self._lock:
+            if table is None:
+                self._partitioned.clear()
+                self._months.clear()
+            else:
+                self._partitioned.pop(table, None)
+                self._months.pop(table, None)
+
+    def get_stats(self) -> Dict[str, Any]:
+        """パーティション管理の統計情報を取得.
+
+        Returns:
+            設定、パーティション化されたテーブル、作成・削除件数。
+        """
+        with self._lock:
+            return {
+                "months_ahead": self.config.months_ahead,
+                "partitioned_tables": sorted(
+                    table
+                    for table, partitioned in self._partitioned.items()
+                    if partitioned
+                ),
+                **self._stats,
+            }
+
+    def _is_partitioned(self, bind: Any, table: str) -> bool:
+        """テーブルがパーティション化されているか判定（結果をキャッシュ）."""
+        with self._lock:
+            cached = self._partitioned.get(table)
+        if cached is not None:
+            return cached
+        partitioned = (
+            bind.execute(
+                text(
+                    "SELECT 1 FROM pg_partitioned_table p "
+                    "JOIN pg_class c ON c.oid = p.partrelid "
+                    "WHERE c.oid = to_regclass(:table)"
+                ),
+                {"table": table},
+            ).first()
+            is not None
+        )
+        with self._lock:
+            self._partitioned[table] = partitioned
+        return partitioned
+
+    def _partition_names(self, bind: Any, table: str) -> List[str]:
+        """テーブルのパーティション名をカタログから取得."""
+        with self._lock:
+            self._stats["catalog_lookups"] += 1
+        rows = bind.execute(
+            text(
+                "SELECT c.relname FROM pg_inherits i "
+                "JOIN pg_class c ON c.oid = i.inhrelid "
+                "WHERE i.inhparent = to_regclass(:table)"
+            ),
+            {"table": table},
+        )
+        return [row[0] for row in rows]
+
+    def _load_months(self, bind: Any, table: str) -> Set[date]:
+        """作成済みの月をカタログから取得してキャッシュを更新."""
+        months = {
+            partition["month"]
+            for partition in self.list_partitions(bind, table)
+        }
+        with self._lock:
+            self._months[table] = set(months)
+        return months
+
+
+def ensure_partitions(
+    bind: Any,
+    table: str,
+    time_ranges: Iterable[Tuple[Optional[TimeValue], Optional[TimeValue]]],
+) -> List[str]:
+    """複数の期間をまとめて格納するパーティションを作成.
+
+    Args:
+        bind: SQLAlchemy のセッションまたは接続
+        table: テーブル名
+        time_ranges: (開始, 終了) の一覧（Noneを含む期間は無視）
+
+    Returns:
+        作成したパーティション名の一覧。
+    """
+    ranges = [
+        (start, end)
+        for start, end in time_ranges
+        if start is not None and end is not None
+    ]
+    if not ranges:
+        return []
+    return get_partition_manager().ensure_range(
+        bind,
+        table,
+        min(start for start, _ in ranges),
+        max(end for _, end in ranges),
+    )
+
+
+# グローバルマネージャー（プロセス内の全保存処理で共有）
+_partition_manager: Optional[PartitionManager] = None
+_partition_manager_lock = threading.Lock()
+
+
+def get_partition_manager() -> PartitionManager:
+    """プロセス全体で共有するパーティションマネージャーを取得.
+
+    Returns:
+        PartitionManager インスタンス。
+    """
+    global _partition_manager
+
+    with _partition_manager_lock:
+        if _partition_manager is None:
+            _partition_manager = PartitionManager()
+        return _partition_manager
+
+
+def reset_partition_manager() -> None:
+    """共有マネージャーを破棄（設定変更時・テスト用）."""
+    global _partition_manager
+
+    with _partition_manager_lock:
+        _partition_manager = None
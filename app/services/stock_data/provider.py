@@ -0,0 +1,585 @@
+"""市場データプロバイダー.
+
+株価データの取得元を抽象化し、以下のプロバイダーを提供します。
+
+- YahooFinanceProvider: yfinance経由でYahoo Financeから取得（本番用）
+- ReplayProvider: 記録済みファイルまたは合成データを返す（負荷試験・ベンチマーク用）
+
+StockDataFetcher と StockBatchProcessor はこのインターフェース経由でデータを取得するため、
+ネットワークに接続できない環境でも取り込み処理全体を再現性のある条件で計測できます。
+"""
+
+from abc import ABC, abstractmethod
+from collections import deque
+from datetime import date, datetime, timedelta, timezone
+import logging
+import os
+from pathlib import Path
+import random
+import re
+import threading
+import time
+from typing import Any, Deque, Dict, List, Optional
+import zlib
+
+import numpy as np
+import pandas as pd
+import yfinance as yf
+
+from app.exceptions import MarketDataProviderError, MarketDataRateLimitError
+
+
+logger = logging.getLogger(__name__)
+
+# プロバイダー選択の環境変数（yahoo / replay）
+MARKET_DATA_PROVIDER_ENV = "MARKET_DATA_PROVIDER"
+
+# 期間未指定時のデフォルト取得期間（yfinance period）
+DEFAULT_PERIODS: Dict[str, str] = {
+    "1m": "7d",
+    "2m": "60d",
+    "5m": "60d",
+    "15m": "60d",
+    "30m": "60d",
+    "60m": "730d",
+    "90m": "60d",
+    "1h": "730d",
+    "1d": "max",
+    "5d": "max",
+    "1wk": "max",
+    "1mo": "max",
+    "3mo": "max",
+}
+
+# yfinanceのスレッドセーフティ問題を回避するためのグローバルロック
+# yfinanceは内部でグローバル辞書を使用しており、並行アクセス時に競合状態が発生する
+# 参考: https://github.com/ranaroussi/yfinance/issues/2557
+# ワーカープール（FETCH_POOL_WORKERS）使用時は各プロセスが独立した状態を持つため
+# ロックによる直列化はプロセス内に閉じる
+_yfinance_lock = threading.Lock()
+
+
+def get_default_period(interval: str) -> str:
+    """時間軸のデフォルト取得期間を取得.
+
+    Args:
+        interval: 時間軸
+
+    Returns:
+        yfinanceの取得期間。
+    """
+    return DEFAULT_PERIODS.get(interval, "1y")
+
+
+class MarketDataProvider(ABC):
+    """市場データプロバイダーの基底クラス.
+
+    返却するDataFrameはyfinanceのhistory()と同じ形式とする。
+    単一銘柄は Open/High/Low/Close/Volume 列、複数銘柄は
+    (価格項目, 銘柄コード) のMultiIndex列を持つ。
+    """
+
+    name = "base"
+
+    @abstractmethod
+    def fetch_history(
+        self,
+        symbol: str,
+        interval: str,
+        period: Optional[str] = None,
+        start: Optional[datetime | date] = None,
+    ) -> pd.DataFrame:
+        """単一銘柄の株価履歴を取得.
+
+        Args:
+            symbol: 銘柄コード
+            interval: 時間軸
+            period: 取得期間（Noneの場合はデフォルト期間）
+            start: 取得開始日時（指定時はperiodより優先）
+
+        Returns:
+            株価データのDataFrame。
+        """
+
+    @abstractmethod
+    def fetch_batch_history(
+        self,
+        symbols: List[str],
+        interval: str,
+        period: Optional[str] = None,
+        start: Optional[datetime | date] = None,
+    ) -> pd.DataFrame:
+        """複数銘柄の株価履歴を一括取得.
+
+        Args:
+            symbols: 銘柄コードのリスト
+            interval: 時間軸
+            period: 取得期間（Noneの場合はデフォルト期間）
+            start: 取得開始日時（指定時はperiodより優先）
+
+        Returns:
+            (価格項目, 銘柄コード) のMultiIndex列を持つDataFrame。
+        """
+
+
+class YahooFinanceProvider(MarketDataProvider):
+    """Yahoo Finance（yfinance）プロバイダー."""
+
+    name = "yahoo"
+
+    def fetch_history(
+        self,
+        symbol: str,
+        interval: str,
+        period: Optional[str] = None,
+        start: Optional[datetime | date] = None,
+    ) -> pd.DataFrame:
+        """単一銘柄の株価履歴をYahoo Financeから取得."""
+        with _yfinance_lock:
+            ticker = yf.Ticker(symbol)
+            return self._history(ticker, interval, period, start)
+
+    def fetch_batch_history(
+        self,
+        symbols: List[str],
+        interval: str,
+        period: Optional[str] = None,
+        start: Optional[datetime | date] = None,
+    ) -> pd.DataFrame:
+        """複数銘柄の株価履歴をYahoo Financeから一括取得."""
+        with _yfinance_lock:
+            tickers = yf.Tickers(" ".join(symbols))
+            return self._history(tickers, interval, period, start)
+
+    def _history(
+        self,
+        source: Any,
+        interval: str,
+        period: Optional[str],
+        start: Optional[datetime | date],
+    ) -> pd.DataFrame:
+        """Ticker/Tickersのhistory()を期間指定に応じて呼び出す."""
+        if start is not None:
+            # 差分取得: 開始日時から現在まで
+            return source.history(start=start, interval=interval)
+        return source.history(
+            period=period or get_default_period(interval), interval=interval
+        )
+
+
+class ReplayProvider(MarketDataProvider):
+    """記録済み・合成OHLCVデータを返すリプレイプロバイダー.
+
+    data_dir/<interval>/<symbol>.csv(.gz) が存在すればその内容を返し、
+    存在しない場合は synthetic=True であれば銘柄と日時から決定的に
+    生成した合成データを返す。遅延・エラー率・429（レート制限）を
+    設定でき、外部APIの振る舞いを再現した負荷試験に使用する。
+    """
+
+    name = "replay"
+
+    # 分足・時間足の生成頻度
+    INTRADAY_FREQ: Dict[str, str] = {
+        "1m": "1min",
+        "2m": "2min",
+        "5m": "5min",
+        "15m": "15min",
+        "30m": "30min",
+        "60m": "60min",
+        "90m": "90min",
+        "1h": "60min",
+    }
+
+    # 日足以上の生成頻度
+    DAILY_FREQ: Dict[str, str] = {
+        "1d": "B",
+        "5d": "B",
+        "1wk": "W-MON",
+        "1mo": "MS",
+        "3mo": "QS",
+    }
+
+    # 合成データの市場タイムゾーンと取引時間（時）
+    MARKET_TZ = "Asia/Tokyo"
+    MARKET_OPEN_HOUR = 9
+    MARKET_CLOSE_HOUR = 15
+
+    # period="max" の場合に合成する期間
+    MAX_SYNTHETIC_PERIOD = timedelta(days=365 * 20)
+
+    def __init__(
+        self,
+        data_dir: Optional[str] = None,
+        synthetic: bool = True,
+        latency_ms: float = 0.0,
+        latency_jitter_ms: float = 0.0,
+        error_rate: float = 0.0,
+        rate_limit_rate: float = 0.0,
+        max_requests_per_minute: Optional[int] = None,
+        seed: Optional[int] = None,
+        now: Optional[datetime] = None,
+    ):
+        """初期化.
+
+        Args:
+            data_dir: 記録済みデータのディレクトリ
+            synthetic: ファイルがない場合に合成データを返すか
+            latency_ms: 1リクエストあたりの疑似遅延（ミリ秒）
+            latency_jitter_ms: 遅延の揺らぎ幅（ミリ秒、一様分布）
+            error_rate: 一時的エラーを返す確率（0.0〜1.0）
+            rate_limit_rate: 429を返す確率（0.0〜1.0）
+            max_requests_per_minute: 直近60秒のリクエスト上限
+                （超過時は429を返す、Noneの場合は無制限）
+            seed: 遅延・エラー発生の乱数シード
+            now: 合成データの基準日時（Noneの場合は現在時刻）
+        """
+        self.logger = logger
+        self.data_dir = Path(data_dir) if data_dir else None
+        self.synthetic = synthetic
+        self.latency_ms = latency_ms
+        self.latency_jitter_ms = latency_jitter_ms
+        self.error_rate = error_rate
+        self.rate_limit_rate = rate_limit_rate
+        self.max_requests_per_minute = max_requests_per_minute
+        self.now = now
+        self._random = random.Random(seed)
+        self._lock = threading.Lock()
+        self._request_times: Deque[float] = deque()
+        self._stats: Dict[str, int] = {
+            "requests": 0,
+            "errors": 0,
+            "rate_limited": 0,
+        }
+
+    def fetch_history(
+        self,
+        symbol: str,
+        interval: str,
+        period: Optional[str] = None,
+        start: Optional[datetime | date] = None,
+    ) -> pd.DataFrame:
+        """単一銘柄のリプレイデータを取得."""
+        self._simulate_request(symbol)
+        return self._load_frame(symbol, interval, period, start)
+
+    def fetch_batch_history(
+        self,
+        symbols: List[str],
+        interval: str,
+        period: Optional[str] = None,
+        start: Optional[datetime | date] = None,
+    ) -> pd.DataFrame:
+        """複数銘柄のリプレイデータを一括取得（1リクエストとして扱う）."""
+        self._simulate_request(" ".join(symbols))
+
+        frames = {}
+        for symbol in symbols:
+            df = self._load_frame(symbol, interval, period, start)
+            if not df.empty:
+                frames[symbol] = df
+
+        if not frames:
+            return pd.DataFrame()
+
+        combined = pd.concat(frames, axis=1).swaplevel(axis=1)
+        combined.columns.names = ["Price", "Ticker"]
+        return combined
+
+    def record(self, symbol: str, interval: str, df: pd.DataFrame) -> Path:
+        """取得済みデータをリプレイ用ファイルとして保存.
+
+        Args:
+            symbol: 銘柄コード
+            interval: 時間軸
+            df: 保存するDataFrame
+
+        Returns:
+            保存したファイルのパス。
+
+        Raises:
+            MarketDataProviderError: data_dirが未設定の場合
+        """
+        if self.data_dir is None:
+            raise MarketDataProviderError("リプレイデータの保存先が未設定です")
+
+        path = self.data_dir / interval / f"{symbol}.csv.gz"
+        path.parent.mkdir(parents=True, exist_ok=True)
+        df.to_csv(path, compression="gzip")
+        return path
+
+    def get_stats(self) -> Dict[str, int]:
+        """リクエスト統計を取得.
+
+        Returns:
+            リクエスト数・エラー数・429発生数の辞書。
+        """
+        with self._lock:
+            return dict(self._stats)
+
+    def _simulate_request(self, target: str) -> None:
+        """遅延・エラー・レート制限を模擬."""
+        with self._lock:
+            self._stats["requests"] += 1
+
+            if self.max_requests_per_minute:
+                current = time.monotonic()
+                while (
+                    self._request_times
+                    and current - self._request_times[0] >= 60
+                ):
+                    self._request_times.popleft()
+                if len(self._request_times) >= self.max_requests_per_minute:
+                    self._stats["rate_limited"] += 1
+                    retry_after = 60 - (current - self._request_times[0])
+                    raise MarketDataRateLimitError(
+                        f"429 Too Many Requests (replay): {target}",
+                        details={"retry_after": round(retry_after, 3)},
+                    )
+                self._request_times.append(current)
+
+            roll = self._random.random()
+            latency = self.latency_ms + self._random.uniform(
+                0, self.latency_jitter_ms
+            )
+
+        if roll < self.rate_limit_rate:
+            with self._lock:
+                self._stats["rate_limited"] += 1
+            raise MarketDataRateLimitError(
+                f"429 Too Many Requests (replay): {target}"
+            )
+
+        if latency > 0:
+            time.sleep(latency / 1000)
+
+        if roll < self.rate_limit_rate + self.error_rate:
+            with self._lock:
+                self._stats["errors"] += 1
+            raise MarketDataProviderError(f"一時的なエラー (replay): {target}")
+
+    def _load_frame(
+        self,
+        symbol: str,
+        interval: str,
+        period: Optional[str],
+        start: Optional[datetime | date],
+    ) -> pd.DataFrame:
+        """ファイルまたは合成データから期間内のDataFrameを作成."""
+        end = pd.Timestamp(self.now or datetime.now(timezone.utc))
+        if end.tzinfo is None:
+            end = end.tz_localize(self.MARKET_TZ)
+        end = end.tz_convert(self.MARKET_TZ)
+
+        range_start = self._resolve_range_start(interval, period, start, end)
+
+        path = self._find_file(symbol, interval)
+        if path is not None:
+            df = pd.read_csv(path, index_col=0, parse_dates=True)
+            if not isinstance(df.index, pd.DatetimeIndex):
+                df.index = pd.to_datetime(df.index, utc=True)
+            if df.index.tz is None:
+                df.index = df.index.tz_localize(self.MARKET_TZ)
+        elif self.synthetic:
+            df = self._generate(
+                symbol,
+                interval,
+                range_start or end - self.MAX_SYNTHETIC_PERIOD,
+                end,
+            )
+        else:
+            return pd.DataFrame()
+
+        if range_start is not None:
+            df = df[df.index >= range_start]
+        return df
+
+    def _resolve_range_start(
+        self,
+        interval: str,
+        period: Optional[str],
+        start: Optional[datetime | date],
+        end: pd.Timestamp,
+    ) -> Optional[pd.Timestamp]:
+        """取得開始日時を決定（Noneは全期間）."""
+        if start is not None:
+            ts = pd.Timestamp(start)
+            if ts.tzinfo is None:
+                ts = ts.tz_localize(self.MARKET_TZ)
+            return ts.tz_convert(self.MARKET_TZ)
+
+        delta = self._period_to_timedelta(
+            period or get_default_period(interval), end
+        )
+        return end - delta if delta is not None else None
+
+    def _period_to_timedelta(
+        self, period: str, end: pd.Timestamp
+    ) -> Optional[timedelta]:
+        """yfinanceのperiod文字列を期間に変換（maxはNone）."""
+        if period == "max":
+            return None
+        if period == "ytd":
+            return end - end.replace(month=1, day=1, hour=0, minute=0)
+
+        match = re.fullmatch(r"(\d+)(d|wk|mo|y)", period)
+        if not match:
+            raise MarketDataProviderError(f"不正な取得期間: {period}")
+
+        value, unit = int(match.group(1)), match.group(2)
+        days_per_unit = {"d": 1, "wk": 7, "mo": 30, "y": 365}
+        return timedelta(days=value * days_per_unit[unit])
+
+    def _find_file(self, symbol: str, interval: str) -> Optional[Path]:
+        """記録済みデータファイルを検索."""
+        if self.data_dir is None:
+            return None
+        for suffix in (".csv.gz", ".csv"):
+            path = self.data_dir / interval / f"{symbol}{suffix}"
+            if path.exists():
+                return path
+        return None
+
+    def _generate(
+        self,
+        symbol: str,
+        interval: str,
+        range_start: pd.Timestamp,
+        end: pd.Timestamp,
+    ) -> pd.DataFrame:
+        """銘柄と日時から決定的に合成OHLCVデータを生成.
+
+        値は (銘柄, 日時) のみから決まるため、取得範囲が異なる
+        リクエスト間でも重複区間の値は一致する。
+        """
+        if interval in self.INTRADAY_FREQ:
+            index = pd.date_range(
+                range_start.floor("min"),
+                end,
+                freq=self.INTRADAY_FREQ[interval],
+                name="Datetime",
+            )
+            index = index[
+                (index.dayofweek < 5)
+                & (index.hour >= self.MARKET_OPEN_HOUR)
+                & (index.hour < self.MARKET_CLOSE_HOUR)
+            ]
+        else:
+            index = pd.date_range(
+                range_start.normalize(),
+                end.normalize(),
+                freq=self.DAILY_FREQ.get(interval, "B"),
+                name="Date",
+            )
+
+        seconds = index.as_unit("s").asi8.astype(np.uint64)
+        seed = np.uint64(zlib.crc32(symbol.encode("utf-8")))
+        u1 = self._uniform(seconds, seed, np.uint64(2654435761))
+        u2 = self._uniform(seconds, seed, np.uint64(2246822519))
+
+        base = 500.0 + float(seed % np.uint64(5000))
+        t = seconds.astype(np.float64)
+        trend = base * (
+            1.0
+            + 0.3 * np.sin(2 * np.pi * t / (365 * 86400))
+            + 0.1 * np.sin(2 * np.pi * t / (30 * 86400) + float(seed % 7))
+        )
+        close = np.round(trend * (1 + (u1 - 0.5) * 0.02), 1)
+        open_ = np.round(trend * (1 + (u2 - 0.5) * 0.02), 1)
+        high = np.round(np.maximum(open_, close) * (1 + u1 * 0.01), 1)
+        low = np.round(np.minimum(open_, close) * (1 - u2 * 0.01), 1)
+        volume = (1_000 + u1 * 1_000_000).astype(np.int64)
+
+        return pd.DataFrame(
+            {
+                "Open": open_,
+                "High": high,
+                "Low": low,
+                "Close": close,
+                "Volume": volume,
+                "Dividends": 0.0,
+                "Stock Splits": 0.0,
+            },
+            index=index,
+        )
+
+    @staticmethod
+    def _uniform(
+        seconds: np.ndarray, seed: np.uint64, multiplier: np.uint64
+    ) -> np.ndarray:
+        """日時と銘柄シードから [0, 1) の決定的な擬似乱数を生成."""
+        mixed = (seconds * multiplier + seed) % np.uint64(2**32)
+        return mixed.astype(np.float64) / float(2**32)
+
+
+def create_provider(name: Optional[str] = None) -> MarketDataProvider:
+    """環境変数の設定に従ってプロバイダーを生成.
+
+    Args:
+        name: プロバイダー名（Noneの場合は MARKET_DATA_PROVIDER 環境変数）
+
+    Returns:
+        プロバイダーインスタンス。
+
+    Raises:
+        MarketDataProviderError: 不明なプロバイダー名の場合
+    """
+    name = (name or os.getenv(MARKET_DATA_PROVIDER_ENV, "yahoo")).lower()
+
+    if name == "yahoo":
+        return YahooFinanceProvider()
+
+    if name == "replay":
+        max_rpm = os.getenv("REPLAY_MAX_REQUESTS_PER_MINUTE")
+        seed = os.getenv("REPLAY_SEED")
+        return ReplayProvider(
+            data_dir=os.getenv("REPLAY_DATA_DIR"),
+            synthetic=os.getenv("REPLAY_SYNTHETIC", "true").lower() == "true",
+            latency_ms=float(os.getenv("REPLAY_LATENCY_MS", "0")),
+            latency_jitter_ms=float(
+                os.getenv("REPLAY_LATENCY_JITTER_MS", "0")
+            ),
+            error_rate=float(os.getenv("REPLAY_ERROR_RATE", "0")),
+            rate_limit_rate=float(os.getenv("REPLAY_RATE_LIMIT_RATE", "0")),
+            max_requests_per_minute=int(max_rpm) if max_rpm else None,
+            seed=int(seed) if seed else None,
+        )
+
+    raise MarketDataProviderError(f"不明な市場データプロバイダー: {name}")
+
+
+# グローバルプロバイダー
+_provider: Optional[MarketDataProvider] = None
+_provider_lock = threading.Lock()
+
+
+def get_provider() -> MarketDataProvider:
+    """グローバルプロバイダーを取得.
+
+    FETCH_POOL_WORKERS が1以上の場合は、ワーカープロセス内で
+    create_provider() のプロバイダーを実行するプールプロバイダーを返す。
+
+    Returns:
+        プロバイダーインスタンス。
+    """
+    global _provider
+
+    with _provider_lock:
+        if _provider is None:
+            # fetch_poolはプロバイダー定義に依存するため遅延インポート
+            from app.services.stock_data.fetch_pool import (
+                WorkerPoolProvider,
+                get_fetch_pool,
+            )
+
+            pool = get_fetch_pool()
+            _provider = WorkerPoolProvider(pool) if pool else create_provider()
+            logger.info(f"市場データプロバイダー: {_provider.name}")
+        return _provider
+
+
+def reset_provider() -> None:
+    """グローバルプロバイダーを破棄（設定変更時・テスト用）."""
+    global _provider
+
+    with _provider_lock:
+        _provider = None
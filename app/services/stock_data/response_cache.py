@@ -0,0 +1,422 @@
+"""市場データプロバイダー応答のディスクキャッシュ.
+
+プロバイダーから取得した銘柄ごとのDataFrameを、リクエスト内容
+（銘柄・時間軸・期間・開始日時）のハッシュをファイル名として列単位の圧縮
+ファイル（npz）に保存します。失敗した一括取得の再実行や、同じ元データ
+を使う複数時間軸の取得で同じ区間を再ダウンロードせずに済み、変換処理の
+不具合調査でも同じ応答を何度でも再現できます。
+
+有効期限は時間軸に応じて決まります。
+
+- 分足・時間足: 足の長さ（1分足なら60秒）
+- 日足以上: 次の取引終了時刻まで
+
+合計サイズが上限を超えた場合は、最も長く参照されていないファイルから
+削除します。
+"""
+
+from collections import OrderedDict
+from dataclasses import dataclass
+from datetime import date, datetime, timedelta
+import hashlib
+import json
+import logging
+import os
+from pathlib import Path
+import threading
+import time
+from typing import Any, Callable, Dict, Optional
+from zoneinfo import ZoneInfo
+
+import numpy as np
+import pandas as pd
+
+
+logger = logging.getLogger(__name__)
+
+# 取引所のタイムゾーンと取引終了時刻（東証: 15:30）
+MARKET_TZ = ZoneInfo("Asia/Tokyo")
+MARKET_CLOSE_TIME = (15, 30)
+
+# 分足・時間足の有効期限（秒、足が確定するまで）
+INTRADAY_TTL_SECONDS: Dict[str, float] = {
+    "1m": 60,
+    "2m": 120,
+    "5m": 300,
+    "15m": 900,
+    "30m": 1800,
+    "60m": 3600,
+    "90m": 5400,
+    "1h": 3600,
+}
+
+# キャッシュファイルの形式バージョン（形式変更時に旧ファイルを無効化）
+_FORMAT_VERSION = 1
+
+
+@dataclass
+class ResponseCacheConfig:
+    """応答キャッシュの設定.
+
+    Attributes:
+        enabled: キャッシュを使用するか
+        directory: キャッシュファイルの保存先
+        max_bytes: キャッシュの合計サイズの上限（バイト）
+    """
+
+    enabled: bool = False
+    directory: str = "data/response_cache"
+    max_bytes: int = 512 * 1024 * 1024
+
+    @classmethod
+    def from_env(cls) -> "ResponseCacheConfig":
+        """環境変数から設定を作成.
+
+        Returns:
+            RESPONSE_CACHE_* 環境変数を反映した設定。
+        """
+        return cls(
+            enabled=os.getenv("RESPONSE_CACHE_ENABLED", "false").lower()
+            == "true",
+            directory=os.getenv("RESPONSE_CACHE_DIR", "data/response_cache"),
+            max_bytes=int(
+                float(os.getenv("RESPONSE_CACHE_MAX_MB", "512")) * 1024 * 1024
+            ),
+        )
+
+
+def next_market_close(now: datetime) -> datetime:
+    """指定日時より後の直近の取引終了時刻を取得（祝日は考慮しない）.
+
+    Args:
+        now: 基準日時（タイムゾーン付き）
+
+    Returns:
+        取引終了時刻（取引所のタイムゾーン）。
+    """
+    local = now.astimezone(MARKET_TZ)
+    hour, minute = MARKET_CLOSE_TIME
+    close = local.replace(hour=hour, minute=minute, second=0, microsecond=0)
+    if close <= local:
+        close += timedelta(days=1)
+    while close.weekday() >= 5:
+        close += timedelta(days=1)
+    return close
+
+
+class ResponseCache:
+    """銘柄ごとのプロバイダー応答を保存するLRUディスクキャッシュ.
+
+    スレッドセーフ。無効化されている場合、get() は常にNoneを返し、
+    put() は何もしない。
+    """
+
+    def __init__(
+        self,
+        config: Optional[ResponseCacheConfig] = None,
+        clock: Callable[[], float] = time.time,
+    ):
+        """初期化.
+
+        Args:
+            config: キャッシュ設定（Noneの場合は環境変数の設定に従う）
+            clock: 現在時刻（UNIX時刻）の取得関数
+        """
+        self.logger = logger
+        self.config = config or ResponseCacheConfig.from_env()
+        self.directory = Path(self.config.directory)
+        self._clock = clock
+        self._lock = threading.Lock()
+        # パス -> ファイルサイズ（参照の古い順）
+        self._entries: "OrderedDict[Path, int]" = OrderedDict()
+        self._total_bytes = 0
+        self._stats: Dict[str, int] = {
+            "hits": 0,
+            "misses": 0,
+            "expired": 0,
+            "stores": 0,
+            "evictions": 0,
+        }
+        if self.config.enabled:
+            self._load_index()
+
+    @property
+    def enabled(self) -> bool:
+        """キャッシュが有効か."""
+        return self.config.enabled
+
+    def get(
+        self,
+        symbol: str,
+        interval: str,
+        period: Optional[str] = None,
+        start: Optional[datetime | date] = None,
+    ) -> Optional[pd.DataFrame]:
+        """キャッシュ済みの応答を取得.
+
+        Args:
+            symbol: 銘柄コード
+            interval: 時間軸
+            period: 取得期間
+            start: 取得開始日時
+
+        Returns:
+            有効期限内の応答のDataFrame（ない場合はNone）。
+        """
+        if not self.enabled:
+            return None
+
+        path = self._path_for(symbol, interval, period, start)
+        df = self._read(path)
+
+        with self._lock:
+            if df is None:
+                self._stats["misses"] += 1
+                return None
+            self._stats["hits"] += 1
+            if path in self._entries:
+                self._entries.move_to_end(path)
+        try:
+            # 再起動後もLRU順を引き継げるよう最終更新日時を参照日時にする
+            os.utime(path)
+        except OSError:
+            pass
+
+        self.logger.debug(f"応答キャッシュヒット: {symbol} ({interval})")
+        return df
+
+    def put(
+        self,
+        symbol: str,
+        interval: str,
+        df: pd.DataFrame,
+        period: Optional[str] = None,
+        start: Optional[datetime | date] = None,
+    ) -> bool:
+        """応答をキャッシュに保存.
+
+        空のDataFrame、日時インデックスでないDataFrame、数値以外の列を
+        含むDataFrameは保存しない。
+
+        Args:
+            symbol: 銘柄コード
+            interval: 時間軸
+            df: プロバイダーの応答
+            period: 取得期間
+            start: 取得開始日時
+
+        Returns:
+            保存した場合True。
+        """
+        if not self.enabled or not self._is_cacheable(df):
+            return False
+
+        expires_at = self._clock() + self.ttl_for(interval)
+        path = self._path_for(symbol, interval, period, start)
+
+        try:
+            self._write(path, df, expires_at)
+        except OSError as e:
+            self.logger.warning(f"応答キャッシュの保存に失敗: {symbol}: {e}")
+            return False
+
+        size = path.stat().st_size
+        with self._lock:
+            self._total_bytes -= self._entries.pop(path, 0)
+            self._entries[path] = size
+            self._total_bytes += size
+            self._stats["stores"] += 1
+            self._evict_over_limit()
+        return True
+
+    def ttl_for(self, interval: str) -> float:
+        """時間軸から有効期限（秒）を決定.
+
+        Args:
+            interval: 時間軸
+
+        Returns:
+            有効期限の秒数。
+        """
+        if interval in INTRADAY_TTL_SECONDS:
+            return INTRADAY_TTL_SECONDS[interval]
+
+        now = datetime.fromtimestamp(self._clock(), tz=MARKET_TZ)
+        return (next_market_close(now) - now).total_seconds()
+
+    def clear(self) -> None:
+        """キャッシュファイルをすべて削除."""
+        with self._lock:
+            for path in self._entries:
+                path.unlink(missing_ok=True)
+            self._entries.clear()
+            self._total_bytes = 0
+
+    def get_stats(self) -> Dict[str, Any]:
+        """キャッシュの統計を取得.
+
+        Returns:
+            ヒット数・ミス数・期限切れ数・保存数・削除数・件数・
+            合計サイズの辞書。
+        """
+        with self._lock:
+            lookups = self._stats["hits"] + self._stats["misses"]
+            return {
+                "enabled": self.enabled,
+                **self._stats,
+                "hit_rate": (
+                    round(self._stats["hits"] / lookups, 4) if lookups else 0.0
+                ),
+                "entries": len(self._entries),
+                "bytes": self._total_bytes,
+                "max_bytes": self.config.max_bytes,
+            }
+
+    def _path_for(
+        self,
+        symbol: str,
+        interval: str,
+        period: Optional[str],
+        start: Optional[datetime | date],
+    ) -> Path:
+        """リクエスト内容のハッシュからキャッシュファイルのパスを作成."""
+        key = json.dumps(
+            [
+                _FORMAT_VERSION,
+                symbol,
+                interval,
+                start.isoformat() if start is not None else None,
+                # 開始日時の指定がある場合、取得期間は使われない
+                period if start is None else None,
+            ]
+        )
+        digest = hashlib.sha256(key.encode("utf-8")).hexdigest()
+        return self.directory / f"{digest}.npz"
+
+    def _read(self, path: Path) -> Optional[pd.DataFrame]:
+        """キャッシュファイルを読み込み（期限切れ・破損時は削除してNone）."""
+        try:
+            with np.load(path, allow_pickle=False) as npz:
+                meta = json.loads(str(npz["__meta__"]))
+                if meta["expires_at"] <= self._clock():
+                    with self._lock:
+                        self._stats["expired"] += 1
+                    self._remove(path)
+                    return None
+                return self._decode(npz, meta)
+        except FileNotFoundError:
+            return None
+        except Exception as e:
+            self.logger.warning(f"応答キャッシュの読み込みに失敗: {path}: {e}")
+            self._remove(path)
+            return None
+
+    def _write(self, path: Path, df: pd.DataFrame, expires_at: float) -> None:
+        """DataFrameを列単位の圧縮ファイルとして保存."""
+        index = df.index
+        meta = {
+            "expires_at": expires_at,
+            "columns": [str(column) for column in df.columns],
+            "columns_name": df.columns.name,
+            "index_name": index.name,
+            "index_unit": index.unit,
+            "index_tz": str(index.tz) if index.tz is not None else None,
+        }
+        arrays = {
+            f"c{i}": df.iloc[:, i].to_numpy() for i in range(len(df.columns))
+        }
+
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = path.with_name(
+            f"{path.stem}.{os.getpid()}.{threading.get_ident()}.tmp.npz"
+        )
+        np.savez_compressed(
+            tmp_path,
+            __meta__=np.array(json.dumps(meta)),
+            __index__=index.asi8,
+            **arrays,
+        )
+        os.replace(tmp_path, path)
+
+    @staticmethod
+    def _decode(npz: Any, meta: Dict[str, Any]) -> pd.DataFrame:
+        """圧縮ファイルの内容からDataFrameを復元."""
+        unit = meta["index_unit"]
+        index = pd.DatetimeIndex(
+            npz["__index__"].astype(f"datetime64[{unit}]"),
+            name=meta["index_name"],
+        )
+        if meta["index_tz"] is not None:
+            index = index.tz_localize("UTC").tz_convert(meta["index_tz"])
+        df = pd.DataFrame(
+            {column: npz[f"c{i}"] for i, column in enumerate(meta["columns"])},
+            index=index,
+        )
+        df.columns.name = meta["columns_name"]
+        return df
+
+    @staticmethod
+    def _is_cacheable(df: pd.DataFrame) -> bool:
+        """キャッシュ可能な形式のDataFrameか判定."""
+        return (
+            not df.empty
+            and isinstance(df.index, pd.DatetimeIndex)
+            and not isinstance(df.columns, pd.MultiIndex)
+            and all(dtype.kind in "biuf" for dtype in df.dtypes)
+        )
+
+    def _remove(self, path: Path) -> None:
+        """キャッシュファイルを削除."""
+        path.unlink(missing_ok=True)
+        with self._lock:
+            self._total_bytes -= self._entries.pop(path, 0)
+
+    def _evict_over_limit(self) -> None:
+        """合計サイズが上限以下になるまで古いファイルを削除（ロック取得済み）."""
+        while self._total_bytes > self.config.max_bytes and self._entries:
+            path, size = self._entries.popitem(last=False)
+            path.unlink(missing_ok=True)
+            self._total_bytes -= size
+            self._stats["evictions"] += 1
+
+    def _load_index(self) -> None:
+        """既存のキャッシュファイルを最終更新日時の古い順に登録."""
+        if not self.directory.exists():
+            return
+        files = []
+        for path in self.directory.glob("*.npz"):
+            if ".tmp" in path.suffixes:
+                path.unlink(missing_ok=True)
+                continue
+            stat = path.stat()
+            files.append((stat.st_mtime, path, stat.st_size))
+        for _, path, size in sorted(files):
+            self._entries[path] = size
+            self._total_bytes += size
+
+
+# グローバルキャッシュ（プロセス内の全取得処理で共有）
+_response_cache: Optional[ResponseCache] = None
+_response_cache_lock = threading.Lock()
+
+
+def get_response_cache() -> ResponseCache:
+    """プロセス全体で共有する応答キャッシュを取得.
+
+    Returns:
+        ResponseCache インスタンス。
+    """
+    global _response_cache
+
+    with _response_cache_lock:
+        if _response_cache is None:
+            _response_cache = ResponseCache()
+        return _response_cache
+
+
+def reset_response_cache() -> None:
+    """共有キャッシュを破棄（設定変更時・テスト用）."""
+    global _response_cache
+
+    with _response_cache_lock:
+        _response_cache = None
@@ -0,0 +1,418 @@
+"""分足・時間足データの保持期間とロールアップの管理.
+
+時間軸ごとのルール（例: 「1分足は30日保持し、5分足に集約してから
+削除」）に従って古いデータを整理し、頻繁に書き込む分足テーブルと
+そのインデックスをメモリに収まる大きさに保ちます。
+
+ルールは ``時間軸:保持日数[:集約先の時間軸]`` をカンマ区切りで
+RETENTION_RULES に指定します（既定: ``1m:30:5m``）。記載順に適用する
+ため、``1m:30:5m,5m:180:1h`` のように細かい時間軸から並べます。
+
+- 保持期間の境界は Asia/Tokyo の日付境界です。
+- 期間全体が境界より前の月のパーティションは、集約した後に
+  パーティションごと削除します（DELETE・VACUUM 不要）。
+- 境界を含む月のパーティションと、パーティション化されていない
+  テーブルは RETENTION_CHUNK_DAYS 日ずつ集約・削除します。
+- 集約と削除は区間ごとに同じトランザクションで行うため、集約前の
+  データだけが削除されることはありません。集約先に既にある足
+  （プロバイダーから取得した足）は上書きしません。
+- 集約・削除した足の件数と期間は同じトランザクションで bar_coverage
+  に反映します。
+
+実行結果は BatchExecution（batch_type="retention"）に記録します。
+total_stocks 等の件数はルール数、BatchExecutionDetail の stock_code は
+時間軸、records_inserted は集約で追加した足の数です。
+"""
+
+from dataclasses import dataclass, field
+from datetime import datetime, time, timedelta
+import logging
+import os
+from typing import Any, Dict, List, Optional
+
+from sqlalchemy import text
+
+from app.services.batch.batch_service import BatchService
+from app.services.stock_data import coverage
+from app.services.stock_data.partitions import (
+    PARTITION_TZ,
+    PartitionManager,
+    get_partition_manager,
+)
+from app.utils.timeframe_utils import get_table_name
+
+
+logger = logging.getLogger(__name__)
+
+# ルールを指定できる時間軸と足の長さ
+INTERVAL_STEPS: Dict[str, timedelta] = {
+    "1m": timedelta(minutes=1),
+    "5m": timedelta(minutes=5),
+    "15m": timedelta(minutes=15),
+    "30m": timedelta(minutes=30),
+    "1h": timedelta(hours=1),
+}
+
+# 集約する足の区切りの起点（Asia/Tokyo の0時）
+ROLLUP_ORIGIN = datetime(2000, 1, 3, tzinfo=PARTITION_TZ)
+
+DEFAULT_RULES = "1m:30:5m"
+
+BATCH_TYPE = "retention"
+
+
+class RetentionError(Exception):
+    """データ保持ルールのエラー."""
+
+    pass
+
+
+@dataclass(frozen=True)
+class RetentionRule:
+    """時間軸ごとの保持ルール.
+
+    Attributes:
+        interval: 対象の時間軸
+        keep_days: 保持日数
+        rollup_to: 削除前に集約する時間軸（Noneの場合は集約しない）
+    """
+
+    interval: str
+    keep_days: int
+    rollup_to: Optional[str] = None
+
+    def __post_init__(self):
+        """ルールの妥当性を検証."""
+        if self.interval not in INTERVAL_STEPS:
+            raise RetentionError(
+                f"保持ルールは分足・時間足のみ指定できます: {self.interval}"
+            )
+        if self.keep_days < 1:
+            raise RetentionError(
+                f"保持日数は1以上を指定してください: {self.interval}"
+            )
+        if self.rollup_to is None:
+            return
+        source = INTERVAL_STEPS[self.interval]
+        target = INTERVAL_STEPS.get(self.rollup_to)
+        if target is None or target <= source or target % source:
+            raise RetentionError(
+                f"集約先は {self.interval} の整数倍の時間軸を指定してください: "
+                f"{self.rollup_to}"
+            )
+
+    def cutoff(self, now: datetime) -> datetime:
+        """保持期間の境界（これより前のデータが整理対象）を取得."""
+        today = now.astimezone(PARTITION_TZ).date()
+        return datetime.combine(
+            today - timedelta(days=self.keep_days),
+            time.min,
+            tzinfo=PARTITION_TZ,
+        )
+
+
+def parse_rules(spec: str) -> List[RetentionRule]:
+    """RETENTION_RULES 形式の文字列を保持ルールの一覧に変換.
+
+    Args:
+        spec: ``時間軸:保持日数[:集約先]`` のカンマ区切り
+
+    Returns:
+        記載順の保持ルール。
+
+    Raises:
+        RetentionError: 形式またはルールが不正な場合。
+    """
+    rules = []
+    for item in spec.split(","):
+        item = item.strip()
+        if not item:
+            continue
+        parts = item.split(":")
+        if len(parts) not in (2, 3) or not parts[1].strip().isdigit():
+            raise RetentionError(f"保持ルールの形式が不正です: {item}")
+        rules.append(
+            RetentionRule(
+                interval=parts[0].strip(),
+                keep_days=int(parts[1]),
+                rollup_to=(
+                    (parts[2].strip() or None) if len(parts) == 3 else None
+                ),
+            )
+        )
+    return rules
+
+
+@dataclass
+class RetentionConfig:
+    """データ保持ジョブの設定.
+
+    Attributes:
+        rules: 記載順に適用する保持ルール
+        chunk_days: 境界を含む月などを1回で集約・削除する日数
+        hour: スケジュール実行の時刻（時、Asia/Tokyo）
+        minute: スケジュール実行の時刻（分）
+    """
+
+    rules: List[RetentionRule] = field(
+        default_factory=lambda: parse_rules(DEFAULT_RULES)
+    )
+    chunk_days: int = 1
+    hour: int = 3
+    minute: int = 0
+
+    @classmethod
+    def from_env(cls) -> "RetentionConfig":
+        """環境変数から設定を作成.
+
+        Returns:
+            RETENTION_* 環境変数を反映した設定。
+        """
+        return cls(
+            rules=parse_rules(os.getenv("RETENTION_RULES", DEFAULT_RULES)),
+            chunk_days=max(1, int(os.getenv("RETENTION_CHUNK_DAYS", "1"))),
+            hour=int(os.getenv("RETENTION_HOUR", "3")),
+            minute=int(os.getenv("RETENTION_MINUTE", "0")),
+        )
+
+
+def rollup_sql(source_table: str, target_table: str) -> str:
+    """区間内の足を集約先の時間軸に集約して挿入する SQL を作成.
+
+    始値は区間の最初、終値は最後の足の値、高値・安値は最大・最小、
+    出来高は合計とする。集約先に既にある足はそのまま残す。
+    結果は bar_coverage の更新用に、追加した足の銘柄ごとの件数と
+    最初・最後の日時を返す。
+    """
+    return (
+        f"WITH inserted AS (INSERT INTO {target_table} "
+        "(symbol, datetime, open, high, low, close, volume) "
+        "SELECT symbol, bucket, "
+        "(array_agg(open ORDER BY datetime))[1], max(high), min(low), "
+        "(array_agg(close ORDER BY datetime DESC))[1], sum(volume) "
+        "FROM (SELECT *, date_bin(:step, datetime, :origin) AS bucket "
+        f"FROM {source_table} "
+        "WHERE datetime >= :start AND datetime < :end) AS source "
+        "GROUP BY symbol, bucket "
+        "ON CONFLICT (symbol, datetime) DO NOTHING "
+        "RETURNING symbol, datetime) "
+        "SELECT symbol, count(*), min(datetime), max(datetime) "
+        "FROM inserted GROUP BY symbol"
+    )
+
+
+class RetentionJob:
+    """保持ルールに従って分足・時間足データを集約・削除するジョブ."""
+
+    def __init__(
+        self,
+        config: Optional[RetentionConfig] = None,
+        engine: Any = None,
+        partition_manager: Optional[PartitionManager] = None,
+    ):
+        """初期化.
+
+        Args:
+            config: ジョブ設定（Noneの場合は環境変数の設定に従う）
+            engine: 接続先のエンジン（Noneの場合はアプリのエンジン）
+            partition_manager: パーティション管理（Noneの場合は共有の
+                マネージャー）
+        """
+        if engine is None:
+            from app.models import engine
+        self.config = config or RetentionConfig.from_env()
+        self.engine = engine
+        self.partitions = partition_manager or get_partition_manager()
+        self.logger = logger
+
+    def run(self, now: Optional[datetime] = None) -> Dict[str, Any]:
+        """全ルールを適用し、結果を BatchExecution に記録.
+
+        ルールの適用に失敗しても残りのルールは適用する。
+
+        Args:
+            now: 基準日時（Noneの場合は現在日時）
+
+        Returns:
+            batch_id、ルールごとの結果（rules）と合計件数。
+        """
+        now = now or datetime.now(PARTITION_TZ)
+        rules = self.config.rules
+        batch = BatchService.create_batch(BATCH_TYPE, total_stocks=len(rules))
+        self.logger.info(
+            f"データ保持ジョブ開始: batch_id={batch['id']}, "
+            f"ルール {len(rules)}件"
+        )
+
+        results = []
+        errors = []
+        for index, rule in enumerate(rules, start=1):
+            detail = BatchService.create_batch_detail(
+                batch["id"], rule.interval, status="processing"
+            )
+            try:
+                result = self.apply_rule(rule, now)
+                BatchService.update_batch_detail(
+                    detail["id"],
+                    "completed",
+                    records_inserted=result["rolled_up"],
+                )
+            except Exception as e:
+                self.logger.error(
+                    f"データ保持ルールの適用に失敗: {rule.interval}: {e}"
+                )
+                errors.append(f"{rule.interval}: {e}")
+                result = {"interval": rule.interval, "error": str(e)}
+                BatchService.update_batch_detail(
+                    detail["id"], "failed", error_message=str(e)
+                )
+            results.append(result)
+            BatchService.update_batch_progress(
+                batch["id"], index, index - len(errors), len(errors)
+            )
+
+        summary = {
+            "rules": results,
+            "rolled_up": sum(r.get("rolled_up", 0) for r in results),
+            "deleted_rows": sum(r.get("deleted_rows", 0) for r in results),
+            "dropped_partitions": sum(
+                len(r.get("dropped_partitions", [])) for r in results
+            ),
+        }
+        BatchService.complete_batch(
+            batch["id"],
+            status="failed" if errors else "completed",
+            error_message="; ".join(errors) or None,
+            summary=summary,
+        )
+        self.logger.info(
+            f"データ保持ジョブ完了: batch_id={batch['id']}, "
+            f"集約 {summary['rolled_up']}件, "
+            f"削除 {summary['deleted_rows']}件, "
+            f"パーティション削除 {summary['dropped_partitions']}件"
+        )
+        return {"batch_id": batch["id"], **summary}
+
+    def apply_rule(self, rule: RetentionRule, now: datetime) -> Dict[str, Any]:
+        """1つのルールを適用.
+
+        Args:
+            rule: 保持ルール
+            now: 基準日時
+
+        Returns:
+            interval、rollup_to、cutoff、rolled_up（集約で追加した足の数）、
+            deleted_rows（行単位で削除した件数）、dropped_partitions
+            （削除したパーティション名）を持つ辞書。
+        """
+        source = get_table_name(rule.interval)
+        cutoff = rule.cutoff(now)
+        result: Dict[str, Any] = {
+            "interval": rule.interval,
+            "rollup_to": rule.rollup_to,
+            "cutoff": cutoff.isoformat(),
+            "rolled_up": 0,
+            "deleted_rows": 0,
+            "dropped_partitions": [],
+        }
+
+        # 期間全体が境界より前の月はパーティションごと削除
+        with self.engine.connect() as conn:
+            expired = [
+                partition
+                for partition in self.partitions.list_partitions(conn, source)
+                if partition["end"] <= cutoff
+            ]
+        for partition in expired:
+            with self.engine.begin() as conn:
+                result["rolled_up"] += self._rollup(
+                    conn, rule, partition["start"], partition["end"]
+                )
+                removed = dict(
+                    conn.execute(
+                        text(
+                            f"SELECT symbol, count(*) FROM {source} "
+                            "WHERE datetime >= :start AND datetime < :end "
+                            "GROUP BY symbol"
+                        ),
+                        {"start": partition["start"], "end": partition["end"]},
+                    ).all()
+                )
+                result["dropped_partitions"] += self.partitions.drop_before(
+                    conn, source, partition["end"]
+                )
+                coverage.record_removed(conn, rule.interval, removed)
+
+        # 残りは chunk_days 日ずつ集約・削除
+        while True:
+            with self.engine.begin() as conn:
+                first = conn.execute(
+                    text(
+                        f"SELECT min(datetime) FROM {source} "
+                        "WHERE datetime < :cutoff"
+                    ),
+                    {"cutoff": cutoff},
+                ).scalar()
+                if first is None:
+                    break
+                start = datetime.combine(
+                    first.astimezone(PARTITION_TZ).date(),
+                    time.min,
+                    tzinfo=PARTITION_TZ,
+                )
+                end = min(
+                    start + timedelta(days=self.config.chunk_days), cutoff
+                )
+                result["rolled_up"] += self._rollup(conn, rule, start, end)
+                removed = dict(
+                    conn.execute(
+                        text(
+                            f"WITH deleted AS (DELETE FROM {source} "
+                            "WHERE datetime >= :start AND datetime < :end "
+                            "RETURNING symbol) "
+                            "SELECT symbol, count(*) FROM deleted "
+                            "GROUP BY symbol"
+                        ),
+                        {"start": start, "end": end},
+                    ).all()
+                )
+                coverage.record_removed(conn, rule.interval, removed)
+                result["deleted_rows"] += sum(removed.values())
+
+        self.logger.info(
+            f"データ保持ルール適用: {rule.interval} "
+            f"({cutoff:%Y-%m-%d} より前) - 集約 {result['rolled_up']}件, "
+            f"削除 {result['deleted_rows']}件, "
+            f"パーティション削除 {len(result['dropped_partitions'])}件"
+        )
+        return result
+
+    def _rollup(
+        self, conn: Any, rule: RetentionRule, start: datetime, end: datetime
+    ) -> int:
+        """区間 [start, end) の足を集約先に挿入し、追加した足の数を返す."""
+        if rule.rollup_to is None:
+            return 0
+        target = get_table_name(rule.rollup_to)
+        self.partitions.ensure_range(
+            conn, target, start, end - timedelta(microseconds=1)
+        )
+        rows = conn.execute(
+            text(rollup_sql(get_table_name(rule.interval), target)),
+            {
+                "step": INTERVAL_STEPS[rule.rollup_to],
+                "origin": ROLLUP_ORIGIN,
+                "start": start,
+                "end": end,
+            },
+        ).all()
+        coverage.record_saved(
+            conn,
+            rule.rollup_to,
+            {
+                symbol: (count, (first, last))
+                for symbol, count, first, last in rows
+            },
+            fetched=False,
+        )
+        return sum(count for _, count, _, _ in rows)
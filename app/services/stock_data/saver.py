@@ -2,12 +2,32 @@
 
 from datetime import date, datetime
 import logging
-from typing import Any, Dict, List, Optional, Tuple, Type
+from typing import Any, Dict, List, Mapping, Optional, Tuple, Type, Union
 
+import numpy as np
+import psycopg2
+from psycopg2.extras import execute_values
+from sqlalchemy import func, text
 from sqlalchemy.exc import SQLAlchemyError
 from sqlalchemy.orm import Session
 
 from app.models import get_db_session
+from app.services.stock_data import archive, coverage
+from app.services.stock_data.bar_batch import BarBatch, time_keys
+from app.services.stock_data.copy_loader import copy_merge
+from app.services.stock_data.partitions import (
+    ensure_partitions,
+    get_partition_manager,
+)
+from app.services.stock_data.upsert import (
+    ON_CONFLICT_ACTIONS,
+    ON_CONFLICT_NOTHING,
+    ON_CONFLICT_RECONCILE,
+    UpsertCounts,
+    empty_counts,
+    updates_existing,
+    upsert_bars,
+)
 from app.utils.timeframe_utils import (
     get_display_name,
     get_model_for_interval,
@@ -18,6 +38,21 @@ from app.utils.timeframe_utils import (
 
 logger = logging.getLogger(__name__)
 
+# 保存対象データ（辞書リスト、または列指向のバッチ）
+StockData = Union[List[Dict[str, Any]], BarBatch]
+
+# 列指向バッチの挿入で1回に送る行数
+INSERT_PAGE_SIZE = 1000
+
+# 保存方式
+# - upsert: ON CONFLICT 付きの複数行 INSERT（重複はDB側で処理）
+# - copy: COPY + ステージングテーブル経由の ON CONFLICT マージ
+# - insert: 既存日付を事前に取得して除外してから INSERT
+SAVE_METHOD_UPSERT = "upsert"
+SAVE_METHOD_COPY = "copy"
+SAVE_METHOD_INSERT = "insert"
+SAVE_METHODS = (SAVE_METHOD_UPSERT, SAVE_METHOD_COPY, SAVE_METHOD_INSERT)
+
 
 class StockDataSaveError(Exception):
     """データ保存エラー."""
@@ -36,39 +71,65 @@ class StockDataSaver:
         self,
         symbol: str,
         interval: str,
-        data_list: List[Dict[str, Any]],
+        data_list: StockData,
         session: Optional[Session] = None,
+        method: str = SAVE_METHOD_UPSERT,
+        on_conflict: str = ON_CONFLICT_NOTHING,
     ) -> Dict[str, Any]:
         """株価データを保存.
 
+        既定の "upsert" 方式では、既存データを事前に取得せず
+        (symbol, 日付/日時) の一意制約に対する ON CONFLICT で重複を
+        DB側で処理し、RETURNING の結果から保存件数を集計する。
+
         Args:
             symbol: 銘柄コード
             interval: 時間軸
-            data_list: 保存するデータのリスト
+            data_list: 保存するデータ（辞書リスト、または BarBatch）
             session: SQLAlchemyセッション（Noneの場合は新規作成）
+            method: 保存方式（"upsert"、"copy" または "insert"）
+            on_conflict: 重複時の動作（"nothing"、"update" または
+                "reconcile"、"insert" 方式は "nothing" のみ）
 
         Returns:
-            保存結果の統計情報
+            保存結果の統計情報（"reconcile" の場合は値が同じで更新
+            しなかった件数 unchanged を含む）
 
         Raises:
             StockDataSaveError: データ保存失敗時。
         """
-        # 時間軸の検証
+        # 時間軸・保存方式の検証
         if not validate_interval(interval):
             raise ValueError(f"サポートされていない時間軸: {interval}")
+        self._validate_method(method, on_conflict)
 
         # モデルクラスの取得
         model_class = get_model_for_interval(interval)
 
+        if method != SAVE_METHOD_INSERT:
+            data_list = self._to_bar_batch(data_list, interval)
+
         # セッション管理
         if session:
             return self._save_with_session(
-                session, symbol, interval, model_class, data_list
+                session,
+                symbol,
+                interval,
+                model_class,
+                data_list,
+                method,
+                on_conflict,
             )
         else:
             with get_db_session() as session:
                 return self._save_with_session(
-                    session, symbol, interval, model_class, data_list
+                    session,
+                    symbol,
+                    interval,
+                    model_class,
+                    data_list,
+                    method,
+                    on_conflict,
                 )
 
     def _save_with_session(
@@ -77,7 +138,9 @@ class StockDataSaver:
         symbol: str,
         interval: str,
         model_class: Type[Any],
-        data_list: List[Dict[str, Any]],
+        data_list: StockData,
+        method: str = SAVE_METHOD_INSERT,
+        on_conflict: str = ON_CONFLICT_NOTHING,
     ) -> Dict[str, Any]:
         """セッションを使用してデータを保存(内部メソッド).
 
@@ -86,7 +149,9 @@ class StockDataSaver:
             symbol: 銘柄コード
             interval: 時間軸
             model_class: データベースモデルクラス
-            data_list: 保存するデータのリスト
+            data_list: 保存するデータ（辞書リスト、または BarBatch）
+            method: 保存方式
+            on_conflict: 重複時の動作
 
         Returns:
             保存結果の統計情報。
@@ -94,14 +159,32 @@ class StockDataSaver:
         Raises:
             StockDataSaveError: データ保存失敗時。
         """
+        if isinstance(data_list, BarBatch):
+            return self._save_bars_with_session(
+                session,
+                symbol,
+                interval,
+                model_class,
+                data_list,
+                method,
+                on_conflict,
+            )
+
         self.logger.info(
             f"データ保存開始: {symbol} (時間軸: {get_display_name(interval)}, "
             f"件数: {len(data_list)})"
         )
 
         existing_dates = self._get_existing_dates(
-            session, model_class, symbol, interval
+            session,
+            model_class,
+            symbol,
+            interval,
+            self._record_time_range(data_list),
         )
+        existing_dates |= self._get_archived_dates(
+            session, {symbol: data_list}, interval
+        )[symbol]
         records_to_insert, stats = self._prepare_records(
             data_list, symbol, interval, existing_dates
         )
@@ -111,13 +194,79 @@ class StockDataSaver:
         )
 
         # コミットは呼び出し側で行う(トランザクション管理を分離)
+        return self._build_save_result(symbol, interval, stats)
+
+    def _save_bars_with_session(
+        self,
+        session: Session,
+        symbol: str,
+        interval: str,
+        model_class: Type[Any],
+        bars: BarBatch,
+        method: str = SAVE_METHOD_INSERT,
+        on_conflict: str = ON_CONFLICT_NOTHING,
+    ) -> Dict[str, Any]:
+        """列指向のバッチをセッションを使用して保存(内部メソッド).
+
+        Args:
+            session: SQLAlchemyセッション
+            symbol: 銘柄コード
+            interval: 時間軸
+            model_class: データベースモデルクラス
+            bars: 保存するバッチ
+            method: 保存方式
+            on_conflict: 重複時の動作
+
+        Returns:
+            保存結果の統計情報。
+
+        Raises:
+            StockDataSaveError: データ保存失敗時。
+        """
+        self.logger.info(
+            f"データ保存開始: {symbol} (時間軸: {get_display_name(interval)}, "
+            f"件数: {len(bars)})"
+        )
+
+        counts = self._write_bars(
+            session,
+            model_class,
+            {symbol: bars},
+            symbol,
+            interval,
+            method,
+            on_conflict,
+        )[symbol]
+
+        date_start, date_end = bars.date_range()
+        stats = {
+            "total": len(bars),
+            **self._conflict_stats(len(bars), counts, on_conflict),
+            "errors": 0,
+            "date_start": date_start,
+            "date_end": date_end,
+        }
+
+        # コミットは呼び出し側で行う(トランザクション管理を分離)
+        return self._build_save_result(symbol, interval, stats)
+
+    def _build_save_result(
+        self, symbol: str, interval: str, stats: Dict[str, Any]
+    ) -> Dict[str, Any]:
+        """保存統計から保存結果を作成し、完了ログを出力する."""
         result = {
             "symbol": symbol,
             "interval": interval,
             "total": stats["total"],
             "saved": stats["saved"],
+            "updated": stats.get("updated", 0),
             "skipped": stats["skipped"],
             "errors": stats["errors"],
+            **(
+                {"unchanged": stats["unchanged"]}
+                if "unchanged" in stats
+                else {}
+            ),
             "date_range": {
                 "start": (
                     stats["date_start"].strftime("%Y-%m-%d")
@@ -178,27 +327,83 @@ class StockDataSaver:
         return results
 
     def save_batch_stock_data(
-        self, symbols_data: Dict[str, List[Dict[str, Any]]], interval: str
+        self,
+        symbols_data: Dict[str, StockData],
+        interval: str,
+        method: str = SAVE_METHOD_COPY,
+        on_conflict: str = ON_CONFLICT_NOTHING,
     ) -> Dict[str, Any]:
-        """複数銘柄のデータをバッチ保存(重複データ事前除外方式).
+        """複数銘柄のデータをバッチ保存.
+
+        既定の "copy" 方式では、全銘柄のデータを COPY で一時ステージング
+        テーブルへ流し込み、1回の INSERT ... ON CONFLICT で マージする。
+        "upsert" 方式は ON CONFLICT 付きの複数行 INSERT で保存する。
+        どちらも重複はDB側で処理する。"insert" 方式では既存データを
+        事前に取得して除外してから挿入する。全銘柄のデータが BarBatch の
+        場合は、いずれの方式も行ごとの辞書を作らずに列指向のまま扱う。
+
+        "reconcile" を指定すると、保存済みの行のうち価格・出来高が変わった
+        行だけを更新する。上流で後から修正される直近の足（当日の日足や
+        分足の出来高）を、重複期間の再取得で反映するために使用する。
 
         Args:
-            symbols_data: {銘柄コード: データリスト} の辞書
+            symbols_data: {銘柄コード: データリスト または BarBatch} の辞書
             interval: 時間軸
+            method: 保存方式（"copy"、"upsert" または "insert"）
+            on_conflict: 重複時の動作（"nothing"、"update" または
+                "reconcile"、"insert" 方式は "nothing" のみ）
 
         Returns:
-            バッチ保存結果の統計情報
+            バッチ保存結果の統計情報（"reconcile" の場合は total_unchanged
+            と銘柄ごとの unchanged を含む）
 
         Raises:
             StockDataSaveError: データ保存失敗時。
         """
-        # 時間軸の検証
+        # 時間軸・保存方式の検証
         if not validate_interval(interval):
             raise ValueError(f"サポートされていない時間軸: {interval}")
+        self._validate_method(method, on_conflict)
 
         # モデルクラスの取得
         model_class = get_model_for_interval(interval)
 
+        if method != SAVE_METHOD_INSERT or self._is_bar_batches(symbols_data):
+            return self._save_bar_batches(
+                {
+                    symbol: self._to_bar_batch(data, interval)
+                    for symbol, data in symbols_data.items()
+                },
+                interval,
+                model_class,
+                method,
+                on_conflict,
+            )
+
+        # 辞書リストとバッチが混在する場合は辞書リストに揃える
+        return self._save_record_lists(
+            self._to_record_lists(symbols_data), interval, model_class
+        )
+
+    def _save_record_lists(
+        self,
+        symbols_data: Dict[str, List[Dict[str, Any]]],
+        interval: str,
+        model_class: Type[Any],
+    ) -> Dict[str, Any]:
+        """複数銘柄の辞書リスト形式のデータを保存.
+
+        Args:
+            symbols_data: {銘柄コード: データリスト} の辞書
+            interval: 時間軸
+            model_class: データベースモデルクラス
+
+        Returns:
+            バッチ保存結果の統計情報。
+
+        Raises:
+            StockDataSaveError: データ保存失敗時。
+        """
         total_saved = 0
         total_skipped = 0
         total_errors = 0
@@ -310,6 +515,415 @@ class StockDataSaver:
             "results_by_symbol": results_by_symbol,
         }
 
+    def _save_bar_batches(
+        self,
+        symbols_data: Dict[str, BarBatch],
+        interval: str,
+        model_class: Type[Any],
+        method: str,
+        on_conflict: str,
+    ) -> Dict[str, Any]:
+        """複数銘柄の列指向バッチを保存.
+
+        Args:
+            symbols_data: {銘柄コード: BarBatch} の辞書
+            interval: 時間軸
+            model_class: データベースモデルクラス
+            method: 保存方式
+            on_conflict: 重複時の動作
+
+        Returns:
+            バッチ保存結果の統計情報（save_batch_stock_data と同じ形式）。
+
+        Raises:
+            StockDataSaveError: データ保存失敗時。
+        """
+        self.logger.info(
+            f"バッチデータ保存開始: {len(symbols_data)}銘柄 "
+            f"(時間軸: {get_display_name(interval)})"
+        )
+
+        try:
+            with get_db_session() as session:
+                counts = self._write_bars(
+                    session,
+                    model_class,
+                    symbols_data,
+                    "batch",
+                    interval,
+                    method,
+                    on_conflict,
+                )
+        except StockDataSaveError:
+            raise
+        except Exception as e:
+            raise StockDataSaveError(
+                f"バッチデータ保存中に予期しないエラー: "
+                f"(時間軸: {get_display_name(interval)}): {e}"
+            )
+
+        results_by_symbol = {
+            symbol: {
+                **self._conflict_stats(len(bars), counts[symbol], on_conflict),
+                "errors": 0,
+                "total": len(bars),
+            }
+            for symbol, bars in symbols_data.items()
+        }
+        total_records = sum(len(bars) for bars in symbols_data.values())
+        total_saved = sum(c["inserted"] for c in counts.values())
+        total_updated = sum(c["updated"] for c in counts.values())
+        total_skipped = total_records - total_saved - total_updated
+
+        self.logger.info(
+            f"バッチデータ保存完了: {len(symbols_data)}銘柄 "
+            f"(時間軸: {get_display_name(interval)}) - "
+            f"対象データ数: {total_records}, 保存: {total_saved}, "
+            f"更新: {total_updated}, 重複スキップ: {total_skipped}, エラー: 0"
+        )
+
+        result = {
+            "interval": interval,
+            "total_symbols": len(symbols_data),
+            "total_saved": total_saved,
+            "total_updated": total_updated,
+            "total_skipped": total_skipped,
+            "total_errors": 0,
+            "results_by_symbol": results_by_symbol,
+        }
+        if on_conflict == ON_CONFLICT_RECONCILE:
+            result["total_unchanged"] = total_skipped
+        return result
+
+    def _conflict_stats(
+        self, total: int, counts: Dict[str, int], on_conflict: str
+    ) -> Dict[str, int]:
+        """挿入・更新件数から銘柄ごとの保存件数を作成.
+
+        "reconcile" の場合、挿入も更新もされなかった行は保存済みの値と
+        同じ行なので unchanged としても返す。
+        """
+        skipped = total - counts["inserted"] - counts["updated"]
+        stats = {
+            "saved": counts["inserted"],
+            "updated": counts["updated"],
+            "skipped": skipped,
+        }
+        if on_conflict == ON_CONFLICT_RECONCILE:
+            stats["unchanged"] = skipped
+        return stats
+
+    def _validate_method(self, method: str, on_conflict: str) -> None:
+        """保存方式と重複時の動作を検証."""
+        if method not in SAVE_METHODS:
+            raise ValueError(f"サポートされていない保存方式: {method}")
+        if on_conflict not in ON_CONFLICT_ACTIONS:
+            raise ValueError(
+                f"サポートされていない重複時の動作: {on_conflict}"
+            )
+        if method == SAVE_METHOD_INSERT and updates_existing(on_conflict):
+            raise ValueError(
+                f"insert 方式では重複時の更新（{on_conflict}）を使用できません"
+            )
+
+    def _to_bar_batch(self, data: StockData, interval: str) -> BarBatch:
+        """辞書リスト形式のデータを BarBatch に揃える."""
+        if isinstance(data, BarBatch):
+            return data
+        return BarBatch.from_records(data, interval)
+
+    def _write_bars(
+        self,
+        session: Session,
+        model_class: Type[Any],
+        bars_by_symbol: Dict[str, BarBatch],
+        symbol: str,
+        interval: str,
+        method: str,
+        on_conflict: str = ON_CONFLICT_NOTHING,
+    ) -> UpsertCounts:
+        """保存方式に応じて列指向のバッチを書き込む.
+
+        Args:
+            session: SQLAlchemyセッション
+            model_class: データベースモデルクラス
+            bars_by_symbol: {銘柄コード: BarBatch} の辞書
+            symbol: ログ・エラーメッセージ用の銘柄コード
+            interval: 時間軸
+            method: 保存方式
+            on_conflict: 重複時の動作
+
+        Returns:
+            銘柄別の挿入・更新件数（圧縮済みの足と重複した足は含まない）。
+
+        Raises:
+            StockDataSaveError: データ保存失敗時。
+        """
+        # 圧縮済みの月の足は書き込まない（パーティションを作り直さない）
+        unarchived = self._exclude_archived_bars(
+            session, model_class, bars_by_symbol, symbol, interval
+        )
+        self._ensure_partitions(
+            session,
+            model_class,
+            [bars.time_range() for bars in unarchived.values()],
+            symbol,
+            interval,
+        )
+        if method != SAVE_METHOD_INSERT:
+            counts = self._merge_bars(
+                session,
+                model_class,
+                unarchived,
+                symbol,
+                interval,
+                method,
+                on_conflict,
+            )
+            self._record_coverage(
+                session, model_class, bars_by_symbol, counts, symbol, interval
+            )
+            return counts
+
+        existing = self._get_existing_keys(
+            session,
+            model_class,
+            {
+                bar_symbol: bars.time_range()
+                for bar_symbol, bars in unarchived.items()
+            },
+            interval,
+        )
+        new_bars = {
+            bar_symbol: self._exclude_existing_bars(bars, existing[bar_symbol])
+            for bar_symbol, bars in unarchived.items()
+        }
+        self._insert_bars(session, model_class, new_bars, symbol, interval)
+        counts = empty_counts(new_bars)
+        for bar_symbol, bars in new_bars.items():
+            counts[bar_symbol]["inserted"] = len(bars)
+        self._record_coverage(
+            session, model_class, bars_by_symbol, counts, symbol, interval
+        )
+        return counts
+
+    def _exclude_archived_bars(
+        self,
+        session: Session,
+        model_class: Type[Any],
+        bars_by_symbol: Dict[str, BarBatch],
+        symbol: str,
+        interval: str,
+    ) -> Dict[str, BarBatch]:
+        """圧縮保存済み（bar_chunks）の足と日時が重複する足を除く.
+
+        Raises:
+            StockDataSaveError: 圧縮済みの足の取得失敗時。
+        """
+        try:
+            return archive.exclude_archived(session, interval, bars_by_symbol)
+        except SQLAlchemyError as e:
+            self._forget_partitions(model_class)
+            self.logger.error(
+                f"圧縮済みデータ取得エラー: {symbol} "
+                f"(時間軸: {get_display_name(interval)}): {e}"
+            )
+            raise StockDataSaveError(
+                f"データ保存に失敗: {symbol} "
+                f"(時間軸: {get_display_name(interval)}): {e}"
+            )
+
+    def _merge_bars(
+        self,
+        session: Session,
+        model_class: Type[Any],
+        bars_by_symbol: Dict[str, BarBatch],
+        symbol: str,
+        interval: str,
+        method: str,
+        on_conflict: str,
+    ) -> UpsertCounts:
+        """ON CONFLICT により重複をDB側で処理して列指向のバッチを保存する.
+
+        method が "copy" の場合はステージングテーブル経由、"upsert" の
+        場合は複数行 INSERT で保存する。
+        """
+        merge = copy_merge if method == SAVE_METHOD_COPY else upsert_bars
+        # psycopg2 の接続（カーソルをコンテキストマネージャとして使う）
+        raw_connection: Any = session.connection().connection
+        try:
+            with raw_connection.cursor() as cursor:
+                counts = merge(
+                    cursor,
+                    model_class.__tablename__,
+                    bars_by_symbol,
+                    on_conflict,
+                )
+            self.logger.debug(
+                f"マージ実行({method}): "
+                f"挿入 {sum(c['inserted'] for c in counts.values())}件, "
+                f"更新 {sum(c['updated'] for c in counts.values())}件"
+            )
+            return counts
+        except (SQLAlchemyError, psycopg2.Error) as e:
+            self._forget_partitions(model_class)
+            self.logger.error(
+                f"マージエラー({method}): {symbol} "
+                f"(時間軸: {get_display_name(interval)}): {e}"
+            )
+            raise StockDataSaveError(
+                f"データ保存に失敗: {symbol} "
+                f"(時間軸: {get_display_name(interval)}): {e}"
+            )
+
+    def _record_coverage(
+        self,
+        session: Session,
+        model_class: Type[Any],
+        bars_by_symbol: Mapping[str, StockData],
+        counts: UpsertCounts,
+        symbol: str,
+        interval: str,
+    ) -> None:
+        """保存と同じトランザクションで bar_coverage を更新する.
+
+        保存対象の全銘柄について、新規挿入件数と保存した足の期間を
+        反映し、取得日時を更新する。
+
+        Raises:
+            StockDataSaveError: 更新失敗時。
+        """
+        saved = {
+            bar_symbol: (
+                counts.get(bar_symbol, {}).get("inserted", 0),
+                (
+                    data.time_range()
+                    if isinstance(data, BarBatch)
+                    else self._record_time_range(data)
+                ),
+            )
+            for bar_symbol, data in bars_by_symbol.items()
+        }
+        try:
+            coverage.record_saved(session, interval, saved)
+        except SQLAlchemyError as e:
+            self._forget_partitions(model_class)
+            self.logger.error(
+                f"データ範囲更新エラー: {symbol} "
+                f"(時間軸: {get_display_name(interval)}): {e}"
+            )
+            raise StockDataSaveError(
+                f"データ保存に失敗: {symbol} "
+                f"(時間軸: {get_display_name(interval)}): {e}"
+            )
+
+    def _ensure_partitions(
+        self,
+        session: Session,
+        model_class: Type[Any],
+        time_ranges: List[Tuple[Optional[Any], Optional[Any]]],
+        symbol: str,
+        interval: str,
+    ) -> None:
+        """書き込む期間の月単位パーティションを作成する（分足・時間足のみ）.
+
+        Raises:
+            StockDataSaveError: パーティション作成失敗時。
+        """
+        table = getattr(model_class, "__tablename__", None)
+        if table is None:
+            return
+        try:
+            ensure_partitions(session, table, time_ranges)
+        except SQLAlchemyError as e:
+            self._forget_partitions(model_class)
+            self.logger.error(
+                f"パーティション作成エラー: {symbol} "
+                f"(時間軸: {get_display_name(interval)}): {e}"
+            )
+            raise StockDataSaveError(
+                f"データ保存に失敗: {symbol} "
+                f"(時間軸: {get_display_name(interval)}): {e}"
+            )
+
+    def _forget_partitions(self, model_class: Type[Any]) -> None:
+        """保存失敗時に作成済みパーティションのキャッシュを破棄する.
+
+        ロールバックで取り消されたパーティションを作成済みとみなさない
+        よう、次回の保存でカタログを参照し直させる。
+        """
+        table = getattr(model_class, "__tablename__", None)
+        if table is not None:
+            get_partition_manager().invalidate(table)
+
+    def _is_bar_batches(self, symbols_data: Dict[str, StockData]) -> bool:
+        """全銘柄のデータが BarBatch かどうかを判定."""
+        return bool(symbols_data) and all(
+            isinstance(data, BarBatch) for data in symbols_data.values()
+        )
+
+    def _to_record_lists(
+        self, symbols_data: Dict[str, StockData]
+    ) -> Dict[str, List[Dict[str, Any]]]:
+        """銘柄別データ（BarBatch を含む）を辞書リスト形式に揃える."""
+        return {
+            symbol: (data.to_records() if isinstance(data, BarBatch) else data)
+            for symbol, data in symbols_data.items()
+        }
+
+    def _exclude_existing_bars(
+        self, bars: BarBatch, existing_dates: set
+    ) -> BarBatch:
+        """既存データと日付/日時が重複する行を除いたバッチを作成."""
+        if not existing_dates or not len(bars):
+            return bars
+        duplicated = np.isin(bars.time_keys(), time_keys(existing_dates))
+        return bars.select(~duplicated)
+
+    def _insert_bars(
+        self,
+        session: Session,
+        model_class: Type[Any],
+        bars_by_symbol: Dict[str, BarBatch],
+        symbol: str,
+        interval: str,
+    ) -> None:
+        """列指向のバッチを行ごとの辞書を作らずに挿入する.
+
+        行タプルは INSERT_PAGE_SIZE 行ずつ作成して送信するため、
+        全行分のオブジェクトを同時に保持しない。
+        """
+        if not any(len(bars) for bars in bars_by_symbol.values()):
+            return
+
+        time_column = next(iter(bars_by_symbol.values())).time_column
+        sql = (
+            f"INSERT INTO {model_class.__tablename__} "
+            f"(symbol, {time_column}, open, high, low, close, volume) "
+            "VALUES %s"
+        )
+        inserted = 0
+        raw_connection: Any = session.connection().connection
+        try:
+            with raw_connection.cursor() as cursor:
+                for bar_symbol, bars in bars_by_symbol.items():
+                    for rows in bars.iter_rows(bar_symbol, INSERT_PAGE_SIZE):
+                        execute_values(
+                            cursor, sql, rows, page_size=INSERT_PAGE_SIZE
+                        )
+                        inserted += len(rows)
+            self.logger.debug(f"バルクインサート実行: {inserted}件")
+        except (SQLAlchemyError, psycopg2.Error) as e:
+            self._forget_partitions(model_class)
+            self.logger.error(
+                f"バルクインサートエラー: {symbol} "
+                f"(時間軸: {get_display_name(interval)}): {e}"
+            )
+            raise StockDataSaveError(
+                f"データ保存に失敗: {symbol} "
+                f"(時間軸: {get_display_name(interval)}): {e}"
+            )
+
     def _filter_duplicate_data(
         self,
         session: Session,
@@ -319,6 +933,10 @@ class StockDataSaver:
     ) -> Dict[str, List[Dict[str, Any]]]:
         """重複データを事前に除外.
 
+        既存データは全銘柄分を1回のクエリで、各銘柄の保存対象期間内に
+        限定して取得する。圧縮保存済み（bar_chunks）の足と重複する
+        データも除外する。
+
         Args:
             session: SQLAlchemyセッション
             model_class: データベースモデルクラス
@@ -330,31 +948,24 @@ class StockDataSaver:
         """
         filtered_data: Dict[str, List[Dict[str, Any]]] = {}
 
-        # 時間軸に応じて適切なカラム名を決定
-        date_column_name = (
-            "date" if not is_intraday_interval(interval) else "datetime"
+        # 全銘柄の保存対象期間内の既存データを1回のクエリで取得
+        existing = self._get_existing_keys(
+            session,
+            model_class,
+            {
+                symbol: self._record_time_range(data_list)
+                for symbol, data_list in symbols_data.items()
+            },
+            interval,
         )
-        date_column = getattr(model_class, date_column_name)
+        archived = self._get_archived_dates(session, symbols_data, interval)
 
         for symbol, data_list in symbols_data.items():
             if not data_list:
                 filtered_data[symbol] = []
                 continue
 
-            # 該当銘柄の既存データの日付/日時を取得
-            existing_dates = set()
-            try:
-                existing_records = (
-                    session.query(date_column)
-                    .filter(model_class.symbol == symbol)  # type: ignore[attr-defined]
-                    .all()
-                )
-                existing_dates = {record[0] for record in existing_records}
-            except Exception as e:
-                self.logger.warning(f"既存データ取得エラー: {symbol}: {e}")
-                # エラーの場合は安全のため全データを保存対象とする
-                filtered_data[symbol] = data_list
-                continue
+            existing_dates = existing[symbol] | archived[symbol]
 
             # 重複していないデータのみを抽出
             non_duplicate_data = []
@@ -428,6 +1039,77 @@ class StockDataSaver:
             with get_db_session() as session:
                 return _get_latest(session)
 
+    def get_data_ranges(
+        self,
+        symbols: List[str],
+        interval: str,
+        session: Optional[Session] = None,
+    ) -> Dict[str, Dict[str, Any]]:
+        """複数銘柄の最新データ日時とレコード数を一括取得.
+
+        銘柄ごとに get_latest_date / count_records を呼ぶ代わりに、
+        1回のGROUP BYクエリでまとめて取得する。圧縮保存した足
+        （bar_chunks）も含む。
+
+        Args:
+            symbols: 銘柄コードのリスト
+            interval: 時間軸
+            session: SQLAlchemyセッション（Noneの場合は新規作成）
+
+        Returns:
+            {銘柄コード: {"latest_date": 最新日時, "record_count": 件数}} の辞書
+            （データがない銘柄は含まれない）。
+        """
+        # 時間軸の検証
+        if not validate_interval(interval):
+            raise ValueError(f"サポートされていない時間軸: {interval}")
+
+        if not symbols:
+            return {}
+
+        # モデルクラスの取得
+        model_class = get_model_for_interval(interval)
+        date_column_name = (
+            "datetime" if is_intraday_interval(interval) else "date"
+        )
+        date_column = getattr(model_class, date_column_name)
+
+        def _get_ranges(sess: Session) -> Dict[str, Dict[str, Any]]:
+            rows = (
+                sess.query(
+                    model_class.symbol,
+                    func.max(date_column),
+                    func.count(),
+                )
+                .filter(model_class.symbol.in_(symbols))
+                .group_by(model_class.symbol)
+                .all()
+            )
+            ranges = {
+                symbol: {"latest_date": latest, "record_count": count}
+                for symbol, latest, count in rows
+            }
+            # 圧縮保存済みの足を合算
+            for symbol, chunk in archive.archived_ranges(
+                sess, symbols, interval
+            ).items():
+                live = ranges.setdefault(
+                    symbol, {"latest_date": None, "record_count": 0}
+                )
+                if (
+                    live["latest_date"] is None
+                    or chunk["latest_date"] > live["latest_date"]
+                ):
+                    live["latest_date"] = chunk["latest_date"]
+                live["record_count"] += chunk["record_count"]
+            return ranges
+
+        if session:
+            return _get_ranges(session)
+        else:
+            with get_db_session() as session:
+                return _get_ranges(session)
+
     def count_records(
         self, symbol: str, interval: str, session: Optional[Session] = None
     ) -> int:
@@ -461,29 +1143,199 @@ class StockDataSaver:
             with get_db_session() as session:
                 return _count(session)
 
+    def get_coverage(
+        self,
+        symbol: str,
+        intervals: Optional[List[str]] = None,
+        session: Optional[Session] = None,
+    ) -> Dict[str, Dict[str, Any]]:
+        """銘柄の時間軸ごとのデータ範囲を bar_coverage から1回で取得.
+
+        count_records / get_latest_date を時間軸ごとに呼ぶ代わりに、
+        保存時に更新しているデータ範囲を主キーで参照する。
+
+        Args:
+            symbol: 銘柄コード
+            intervals: 時間軸のリスト（Noneの場合は全時間軸）
+            session: SQLAlchemyセッション（Noneの場合は新規作成）
+
+        Returns:
+            {時間軸: {"record_count", "first", "latest", "last_fetched_at"}}
+            の辞書（データ範囲がない時間軸は含まれない）。
+        """
+        for interval in intervals or []:
+            if not validate_interval(interval):
+                raise ValueError(f"サポートされていない時間軸: {interval}")
+
+        def _get_coverage(sess: Session) -> Dict[str, Dict[str, Any]]:
+            rows, _ = coverage.get_coverage(sess, [symbol], intervals)
+            return {row.pop("interval"): row for row in rows}
+
+        if session:
+            return _get_coverage(session)
+        else:
+            with get_db_session() as session:
+                return _get_coverage(session)
+
     def _get_existing_dates(
         self,
         session: Session,
         model_class: type,
         symbol: str,
         interval: str,
+        time_range: Tuple[Optional[Any], Optional[Any]] = (None, None),
     ) -> set:
-        """既存データの日付/日時を安全に取得する."""
+        """既存データの日付/日時を安全に取得する.
+
+        time_range を指定した場合は、その期間（両端を含む）の既存データ
+        のみを取得する。
+        """
         try:
             date_column_name = (
                 "date" if not is_intraday_interval(interval) else "datetime"
             )
             date_column = getattr(model_class, date_column_name)
+            conditions = [model_class.symbol == symbol]  # type: ignore[attr-defined]
+            start, end = time_range
+            if start is not None and end is not None:
+                conditions.append(date_column.between(start, end))
             existing_records = (
-                session.query(date_column)
-                .filter(model_class.symbol == symbol)  # type: ignore[attr-defined]
-                .all()
+                session.query(date_column).filter(*conditions).all()
             )
             return {record[0] for record in existing_records}
         except Exception as e:
             self.logger.warning(f"既存データ取得エラー: {symbol}: {e}")
             return set()
 
+    def _get_archived_dates(
+        self,
+        session: Session,
+        symbols_data: Dict[str, List[Dict[str, Any]]],
+        interval: str,
+    ) -> Dict[str, set]:
+        """圧縮保存済みの足と重複する日付/日時を複数銘柄分まとめて取得する.
+
+        Args:
+            session: SQLAlchemyセッション
+            symbols_data: {銘柄コード: データリスト} の辞書
+            interval: 時間軸
+
+        Returns:
+            {銘柄コード: 重複する日付/日時の集合} の辞書（取得失敗時は空集合）。
+        """
+        values_by_symbol = {
+            symbol: [
+                value
+                for value in (
+                    data.get("date") or data.get("datetime")
+                    for data in data_list
+                )
+                if value is not None
+            ]
+            for symbol, data_list in symbols_data.items()
+        }
+        archived_dates: Dict[str, set] = {
+            symbol: set() for symbol in symbols_data
+        }
+        try:
+            archived = archive.archived_keys(
+                session,
+                interval,
+                {
+                    symbol: (min(values), max(values))
+                    for symbol, values in values_by_symbol.items()
+                    if values
+                },
+            )
+        except Exception as e:
+            self.logger.warning(
+                f"圧縮済みデータ取得エラー: {len(symbols_data)}銘柄 "
+                f"(時間軸: {get_display_name(interval)}): {e}"
+            )
+            return archived_dates
+
+        for symbol, keys in archived.items():
+            values = values_by_symbol[symbol]
+            duplicated = np.isin(time_keys(values), keys)
+            archived_dates[symbol] = {
+                value for value, dup in zip(values, duplicated) if dup
+            }
+        return archived_dates
+
+    def _get_existing_keys(
+        self,
+        session: Session,
+        model_class: Type[Any],
+        time_ranges: Dict[str, Tuple[Optional[Any], Optional[Any]]],
+        interval: str,
+    ) -> Dict[str, set]:
+        """複数銘柄の既存データの日付/日時を1回のクエリで取得する.
+
+        銘柄・開始・終了の配列を unnest した期間と結合し、各銘柄の
+        保存対象期間（両端を含む）に含まれる既存データのみを取得する。
+
+        Args:
+            session: SQLAlchemyセッション
+            model_class: データベースモデルクラス
+            time_ranges: {銘柄コード: (最小, 最大)} の辞書
+            interval: 時間軸
+
+        Returns:
+            {銘柄コード: 既存の日付/日時の集合} の辞書（取得失敗時は空集合）。
+        """
+        existing: Dict[str, set] = {symbol: set() for symbol in time_ranges}
+        windows = [
+            (symbol, start, end)
+            for symbol, (start, end) in time_ranges.items()
+            if start is not None and end is not None
+        ]
+        if not windows:
+            return existing
+
+        if is_intraday_interval(interval):
+            time_column, time_type = "datetime", "timestamptz"
+        else:
+            time_column, time_type = "date", "date"
+        query = text(
+            f"SELECT t.symbol, t.{time_column} "
+            f"FROM {model_class.__tablename__} AS t "
+            f"JOIN unnest(CAST(:symbols AS text[]), "
+            f"CAST(:starts AS {time_type}[]), "
+            f"CAST(:ends AS {time_type}[])) AS w(symbol, start_at, end_at) "
+            f"ON t.symbol = w.symbol "
+            f"AND t.{time_column} BETWEEN w.start_at AND w.end_at"
+        )
+        symbols, starts, ends = (list(values) for values in zip(*windows))
+        try:
+            rows = session.execute(
+                query, {"symbols": symbols, "starts": starts, "ends": ends}
+            ).all()
+        except Exception as e:
+            self.logger.warning(
+                f"既存データ取得エラー: {len(windows)}銘柄 "
+                f"(時間軸: {get_display_name(interval)}): {e}"
+            )
+            return existing
+
+        for symbol, value in rows:
+            existing[symbol].add(value)
+        return existing
+
+    def _record_time_range(
+        self, data_list: List[Dict[str, Any]]
+    ) -> Tuple[Optional[Any], Optional[Any]]:
+        """辞書リストの最初と最後の日付/日時を取得（空の場合は None）."""
+        values = [
+            value
+            for value in (
+                data.get("date") or data.get("datetime") for data in data_list
+            )
+            if value is not None
+        ]
+        if not values:
+            return None, None
+        return min(values), max(values)
+
     def _prepare_records(
         self,
         data_list: List[Dict[str, Any]],
@@ -543,11 +1395,19 @@ class StockDataSaver:
         """レコードをバルクインサートする."""
         if not records:
             return
+        self._ensure_partitions(
+            session,
+            model_class,
+            [self._record_time_range(records)],
+            symbol,
+            interval,
+        )
         mapper_or_class: Any = getattr(model_class, "__mapper__", model_class)
         try:
             session.bulk_insert_mappings(mapper_or_class, records)
             self.logger.debug(f"バルクインサート実行: {len(records)}件")
         except SQLAlchemyError as e:
+            self._forget_partitions(model_class)
             self.logger.error(
                 f"バルクインサートエラー: {symbol} "
                 f"(時間軸: {get_display_name(interval)}): {e}"
@@ -556,3 +1416,20 @@ class StockDataSaver:
                 f"データ保存に失敗: {symbol} "
                 f"(時間軸: {get_display_name(interval)}): {e}"
             )
+
+        records_by_symbol: Dict[str, List[Dict[str, Any]]] = {}
+        for record in records:
+            records_by_symbol.setdefault(
+                record.get("symbol", symbol), []
+            ).append(record)
+        self._record_coverage(
+            session,
+            model_class,
+            records_by_symbol,
+            {
+                record_symbol: {"inserted": len(symbol_records), "updated": 0}
+                for record_symbol, symbol_records in records_by_symbol.items()
+            },
+            symbol,
+            interval,
+        )
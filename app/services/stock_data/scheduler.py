@@ -8,7 +8,12 @@ from apscheduler.events import EVENT_JOB_ERROR, EVENT_JOB_EXECUTED
 from apscheduler.schedulers.background import BackgroundScheduler
 from apscheduler.triggers.cron import CronTrigger
 
+from app.services.common.circuit_breaker import get_circuit_breaker
+from app.services.common.fetch_gateway import FetchContext, FetchPriority
+from app.services.stock_data.archive import ArchiveCompactor, ArchiveConfig
 from app.services.stock_data.orchestrator import StockDataOrchestrator
+from app.services.stock_data.partitions import get_partition_manager
+from app.services.stock_data.retention import RetentionConfig, RetentionJob
 
 
 logger = logging.getLogger(__name__)
@@ -20,7 +25,12 @@ class StockDataScheduler:
     def __init__(self):
         """初期化."""
         self.scheduler = BackgroundScheduler()
-        self.orchestrator = StockDataOrchestrator()
+        self.orchestrator = StockDataOrchestrator(
+            fetch_context=FetchContext(
+                FetchPriority.SCHEDULED, job_id="scheduler"
+            )
+        )
+        self.circuit_breaker = get_circuit_breaker()
         self.logger = logger
         self._setup_event_listeners()
 
@@ -141,6 +151,92 @@ class StockDataScheduler:
 
         self.logger.info(f"カスタムジョブ追加: {name} (ID: {job_id})")
 
+    def add_retention_job(
+        self,
+        config: Optional[RetentionConfig] = None,
+        job_id: str = "retention",
+    ):
+        """データ保持ジョブ（古い分足・時間足の集約・削除）を追加.
+
+        Args:
+            config: データ保持の設定（Noneの場合は環境変数の設定に従う）
+            job_id: ジョブID。
+        """
+        config = config or RetentionConfig.from_env()
+        trigger = CronTrigger(
+            hour=config.hour, minute=config.minute, timezone="Asia/Tokyo"
+        )
+
+        self.scheduler.add_job(
+            func=self._retention_job,
+            trigger=trigger,
+            args=[config],
+            id=job_id,
+            name="データ保持",
+            replace_existing=True,
+        )
+
+        self.logger.info(
+            f"データ保持ジョブ追加: ルール {len(config.rules)}件 "
+            f"(実行時刻: {config.hour:02d}:{config.minute:02d})"
+        )
+
+    def _retention_job(self, config: RetentionConfig):
+        """データ保持ジョブの実行（内部メソッド）.
+
+        保持ルールの適用後、翌月以降のパーティションも作成しておく。
+
+        Args:
+            config: データ保持の設定。
+        """
+        try:
+            RetentionJob(config).run()
+        except Exception as e:
+            self.logger.error(f"データ保持ジョブエラー: {e}")
+
+        get_partition_manager().ensure_upcoming()
+
+    def add_archive_job(
+        self,
+        config: Optional[ArchiveConfig] = None,
+        job_id: str = "archive",
+    ):
+        """圧縮保存ジョブ（古い足の bar_chunks への移動）を追加.
+
+        Args:
+            config: 圧縮保存の設定（Noneの場合は環境変数の設定に従う）
+            job_id: ジョブID。
+        """
+        config = config or ArchiveConfig.from_env()
+        trigger = CronTrigger(
+            hour=config.hour, minute=config.minute, timezone="Asia/Tokyo"
+        )
+
+        self.scheduler.add_job(
+            func=self._archive_job,
+            trigger=trigger,
+            args=[config],
+            id=job_id,
+            name="データ圧縮保存",
+            replace_existing=True,
+        )
+
+        self.logger.info(
+            f"圧縮保存ジョブ追加: {config.after_days}日より前の月 "
+            f"(実行時刻: {config.hour:02d}:{config.minute:02d})"
+        )
+
+    def _archive_job(self, config: ArchiveConfig):
+        """圧縮保存ジョブの実行（内部メソッド）.
+
+        Args:
+            config: 圧縮保存の設定。
+        """
+        try:
+            ArchiveCompactor(config).run()
+        except Exception as e:
+            self.logger.error(f"圧縮保存ジョブエラー: {e}")
+
     def _update_job(self, symbol: str, intervals: Optional[List[str]] = None):
         """更新ジョブの実行（内部メソッド）.
 
@@ -148,6 +244,14 @@ class StockDataScheduler:
             symbol: 銘柄コード
             intervals: 時間軸のリスト。
         """
+        # 上流APIが遮断中の場合は次回の実行まで見送る
+        if self.circuit_breaker.is_open():
+            self.logger.warning(
+                f"更新ジョブ見送り（サーキットブレーカー作動中）: {symbol} - "
+                f"{self.circuit_breaker.retry_after():.0f}秒後に再開見込み"
+            )
+            return
+
         try:
             self.logger.info(f"更新ジョブ開始: {symbol}")
 
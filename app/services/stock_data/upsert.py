@@ -0,0 +1,184 @@
+"""一意制約を利用した株価データの集合指向アップサート.
+
+既存データの日付/日時を事前に取得して Python 側で重複を除く代わりに、
+(symbol, date|datetime) の一意制約に対する ``ON CONFLICT`` で重複を
+DB側で処理します。``RETURNING`` の結果を銘柄ごとに集計するため、
+新規挿入・更新の件数を正確に返せます。
+"""
+
+from typing import Any, Dict, Iterable, Optional, Tuple
+
+from psycopg2.extras import execute_values
+
+from app.services.stock_data.bar_batch import BarBatch
+from app.services.stock_data.partitions import PARTITIONED_TABLES
+
+
+# 重複時の動作（nothing: スキップ, update: 価格・出来高を上書き,
+# reconcile: 価格・出来高が保存済みの値と異なる行だけを上書き）
+ON_CONFLICT_NOTHING = "nothing"
+ON_CONFLICT_UPDATE = "update"
+ON_CONFLICT_RECONCILE = "reconcile"
+ON_CONFLICT_ACTIONS = (
+    ON_CONFLICT_NOTHING,
+    ON_CONFLICT_UPDATE,
+    ON_CONFLICT_RECONCILE,
+)
+
+# 価格・出来高のカラム
+VALUE_COLUMNS = ("open", "high", "low", "close", "volume")
+
+# 1回の INSERT で送る行数
+UPSERT_PAGE_SIZE = 1000
+
+# 銘柄別の件数（{銘柄コード: {"inserted": 件数, "updated": 件数}}）
+UpsertCounts = Dict[str, Dict[str, int]]
+
+
+def insert_columns(time_column: str) -> str:
+    """INSERT 対象のカラムリストを取得."""
+    return ", ".join(("symbol", time_column, *VALUE_COLUMNS))
+
+
+def updates_existing(on_conflict: str) -> bool:
+    """重複時に保存済みの行を更新する動作か判定.
+
+    更新する動作では、同一の INSERT に同じキーの行が複数含まれると
+    エラーになるため、送信前に重複を除く必要がある。
+    """
+    return on_conflict in (ON_CONFLICT_UPDATE, ON_CONFLICT_RECONCILE)
+
+
+def on_conflict_clause(
+    time_column: str, on_conflict: str, table_name: Optional[str] = None
+) -> str:
+    """一意制約違反時の ON CONFLICT 句を作成.
+
+    "reconcile" では保存済みの価格・出来高と比較する WHERE 句を付ける。
+    比較対象の EXCLUDED はカラムの型（Numeric(10,2) 等）に変換済みの
+    ため、丸め誤差だけの差は変更とみなされない。
+
+    Args:
+        time_column: 日付/日時のカラム名
+        on_conflict: 重複時の動作（"nothing"、"update" または "reconcile"）
+        table_name: 挿入先のテーブル名（"reconcile" の場合は必須）
+
+    Returns:
+        ON CONFLICT 句。
+
+    Raises:
+        ValueError: サポートされていない動作、またはテーブル名が
+            指定されていない場合。
+    """
+    if on_conflict not in ON_CONFLICT_ACTIONS:
+        raise ValueError(f"サポートされていない重複時の動作: {on_conflict}")
+
+    target = f"ON CONFLICT (symbol, {time_column})"
+    if on_conflict == ON_CONFLICT_NOTHING:
+        return f"{target} DO NOTHING"
+    assignments = ", ".join(
+        f"{column} = EXCLUDED.{column}" for column in VALUE_COLUMNS
+    )
+    clause = f"{target} DO UPDATE SET {assignments}, updated_at = now()"
+    if on_conflict == ON_CONFLICT_UPDATE:
+        return clause
+
+    if table_name is None:
+        raise ValueError("reconcile にはテーブル名の指定が必要です")
+    stored = ", ".join(f"{table_name}.{column}" for column in VALUE_COLUMNS)
+    incoming = ", ".join(f"EXCLUDED.{column}" for column in VALUE_COLUMNS)
+    return f"{clause} WHERE ({stored}) IS DISTINCT FROM ({incoming})"
+
+
+def counting_insert(
+    table_name: str, time_column: str, source: str, on_conflict: str
+) -> str:
+    """挿入・更新件数を銘柄別に集計して返す INSERT 文を作成.
+
+    新規挿入された行は xmax が 0 になることを利用して、挿入と更新を
+    区別する。"nothing" でスキップした行や "reconcile" で値が同じだった
+    行は RETURNING に含まれないため、どちらの件数にも数えられない。
+
+    パーティション化テーブルでは RETURNING でシステム列（xmax）を参照
+    できないため、created_at が現在のトランザクションの開始時刻である
+    行を新規挿入とみなす（同じトランザクション内で先に挿入した行を
+    更新した場合も挿入として数えられる）。
+
+    Args:
+        table_name: 挿入先のテーブル名
+        time_column: 日付/日時のカラム名
+        source: 挿入する行（"VALUES %s" または "SELECT ..."）
+        on_conflict: 重複時の動作
+
+    Returns:
+        (銘柄コード, 挿入件数, 更新件数) の行を返すSQL。
+    """
+    inserted = (
+        "created_at IS NOT DISTINCT FROM now()"
+        if table_name in PARTITIONED_TABLES
+        else "xmax = 0"
+    )
+    return (
+        f"WITH merged AS ("
+        f"INSERT INTO {table_name} ({insert_columns(time_column)}) "
+        f"{source} "
+        f"{on_conflict_clause(time_column, on_conflict, table_name)} "
+        f"RETURNING symbol, ({inserted}) AS inserted) "
+        f"SELECT symbol, count(*) FILTER (WHERE inserted), "
+        f"count(*) FILTER (WHERE NOT inserted) "
+        f"FROM merged GROUP BY symbol"
+    )
+
+
+def empty_counts(symbols: Iterable[str]) -> UpsertCounts:
+    """全銘柄0件の集計結果を作成."""
+    return {symbol: {"inserted": 0, "updated": 0} for symbol in symbols}
+
+
+def add_counts(
+    counts: UpsertCounts, rows: Iterable[Tuple[str, int, int]]
+) -> UpsertCounts:
+    """counting_insert() の結果行を集計結果に加算."""
+    for symbol, inserted, updated in rows:
+        counts[symbol]["inserted"] += inserted
+        counts[symbol]["updated"] += updated
+    return counts
+
+
+def upsert_bars(
+    cursor: Any,
+    table_name: str,
+    bars_by_symbol: Dict[str, BarBatch],
+    on_conflict: str = ON_CONFLICT_NOTHING,
+) -> UpsertCounts:
+    """列指向のバッチを ON CONFLICT 付きの複数行 INSERT で保存.
+
+    Args:
+        cursor: psycopg2 のカーソル
+        table_name: 挿入先のテーブル名（stocks_<interval>）
+        bars_by_symbol: {銘柄コード: BarBatch} の辞書（同一時間軸）
+        on_conflict: 重複時の動作
+
+    Returns:
+        銘柄別の挿入・更新件数（0件の銘柄も含む）。
+
+    Raises:
+        psycopg2.Error: 保存に失敗した場合。
+    """
+    counts = empty_counts(bars_by_symbol)
+    if not any(len(bars) for bars in bars_by_symbol.values()):
+        return counts
+
+    time_column = next(iter(bars_by_symbol.values())).time_column
+    sql = counting_insert(table_name, time_column, "VALUES %s", on_conflict)
+    for symbol, bars in bars_by_symbol.items():
+        if updates_existing(on_conflict):
+            bars = bars.drop_duplicate_times()
+        for rows in bars.iter_rows(symbol, UPSERT_PAGE_SIZE):
+            add_counts(
+                counts,
+                execute_values(
+                    cursor, sql, rows, page_size=UPSERT_PAGE_SIZE, fetch=True
+                ),
+            )
+    return counts
@@ -0,0 +1,800 @@
+"""取り込み済み株価データのライトビハインド・スプール.
+
+変換済みのバッチをDBへ同期的に保存する代わりに、ローカルディスクの
+追記専用スプールへ列単位のセグメントファイル（npz）として書き出し、
+専用のライタースレッドがまとめてDBへ保存（グループコミット）します。
+DBが遅い・一時的に停止している間も取得処理は止まらず、取得済みの
+データは破棄されません。
+
+- セグメントは一時ファイルに書き出して fsync した後にリネームするため、
+  途中まで書かれたセグメントが残ることはない
+- ライターは未保存の行数が上限に達するか、最も古いセグメントの待ち時間
+  が上限に達した時点で、時間軸ごとに1トランザクションで保存する
+- 保存に成功したセグメントだけを削除（確認応答）し、失敗時は間隔を
+  空けて再試行する
+- DBの停止・接続断などの一時的なエラーは保存できるまで再試行する。
+  データ起因のエラー（数値の桁あふれ・制約違反など）の場合はセグメント
+  ごとに保存し直して他のセグメントを保存し、原因のセグメントは規定回数
+  失敗した時点で .failed に改名して再試行対象から外す
+- 起動時に残っているセグメントは未確認として再生する
+- 再生とライターは同じディレクトリにつき1プロセスだけが行う（ディレクトリ
+  内のロックファイルを排他ロック）。ロックを取得できなかったプロセスは
+  スプールを使わず同期保存する
+"""
+
+from collections import deque
+from dataclasses import dataclass
+import json
+import logging
+import os
+from pathlib import Path
+import threading
+import time
+from typing import Any, Callable, Deque, Dict, List, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+import psycopg2
+from sqlalchemy import exc as sa_exc
+
+from app.services.stock_data.bar_batch import BarBatch
+from app.services.stock_data.saver import StockData, StockDataSaver
+from app.services.stock_data.upsert import ON_CONFLICT_NOTHING
+from app.utils.timeframe_utils import validate_interval
+
+
+if os.name == "posix":
+    import fcntl
+
+logger = logging.getLogger(__name__)
+
+# セグメントファイルの形式バージョン
+_FORMAT_VERSION = 1
+
+# 読み込めないセグメントに付ける拡張子（削除せず調査用に残す）
+_CORRUPT_SUFFIX = ".corrupt"
+
+# 規定回数保存に失敗したセグメントに付ける拡張子（調査用に残す）
+_FAILED_SUFFIX = ".failed"
+
+# 再生・ライターを担当するプロセスが排他ロックするファイル
+_LOCK_FILE = "spool.lock"
+
+# 再試行で解消する見込みのあるDBエラー（接続断・タイムアウト・デッドロック）
+_TRANSIENT_ERRORS = (
+    sa_exc.OperationalError,
+    sa_exc.InterfaceError,
+    sa_exc.DisconnectionError,
+    psycopg2.OperationalError,
+    psycopg2.InterfaceError,
+)
+
+
+class WriteSpoolError(Exception):
+    """書き込みスプールエラー."""
+
+    pass
+
+
+@dataclass
+class WriteSpoolConfig:
+    """書き込みスプールの設定.
+
+    Attributes:
+        enabled: スプールを使用するか（無効時は同期保存）
+        directory: セグメントファイルの保存先
+        max_rows: 1回のグループコミットで保存する最大行数
+            （未保存の行数がこれに達したら待ち時間を待たずに保存）
+        max_latency_ms: セグメントを追記してから保存するまでの最大待ち時間
+        retry_seconds: 保存失敗時の再試行間隔（秒）
+        max_attempts: データ起因のエラーで失敗したセグメントを外すまでの
+            試行回数（一時的なエラーは回数に数えない）
+        flush_timeout: 一括取得の終了時に保存完了を待つ最大秒数
+    """
+
+    enabled: bool = False
+    directory: str = "data/write_spool"
+    max_rows: int = 200_000
+    max_latency_ms: int = 1000
+    retry_seconds: float = 5.0
+    max_attempts: int = 3
+    flush_timeout: float = 60.0
+
+    @classmethod
+    def from_env(cls) -> "WriteSpoolConfig":
+        """環境変数から設定を作成.
+
+        Returns:
+            WRITE_SPOOL_* 環境変数を反映した設定。
+        """
+        return cls(
+            enabled=os.getenv("WRITE_SPOOL_ENABLED", "false").lower()
+            == "true",
+            directory=os.getenv("WRITE_SPOOL_DIR", "data/write_spool"),
+            max_rows=int(os.getenv("WRITE_SPOOL_MAX_ROWS", "200000")),
+            max_latency_ms=int(
+                os.getenv("WRITE_SPOOL_MAX_LATENCY_MS", "1000")
+            ),
+            retry_seconds=float(os.getenv("WRITE_SPOOL_RETRY_SECONDS", "5")),
+            max_attempts=int(os.getenv("WRITE_SPOOL_MAX_ATTEMPTS", "3")),
+            flush_timeout=float(os.getenv("WRITE_SPOOL_FLUSH_TIMEOUT", "60")),
+        )
+
+
+@dataclass
+class SpoolSegment:
+    """未確認のセグメント.
+
+    Attributes:
+        path: セグメントファイルのパス
+        interval: 時間軸
+        rows: 行数
+        appended_at: 追記（または再生）した時刻（clock の値）
+        on_conflict: 保存済みの行と重複した場合の動作
+        attempts: データ起因のエラーで保存に失敗した回数
+    """
+
+    path: Path
+    interval: str
+    rows: int
+    appended_at: float
+    on_conflict: str = ON_CONFLICT_NOTHING
+    attempts: int = 0
+
+
+def encode_segment(
+    path: Path,
+    symbols_data: Dict[str, BarBatch],
+    interval: str,
+    on_conflict: str = ON_CONFLICT_NOTHING,
+) -> int:
+    """銘柄ごとのバッチを1つのセグメントファイルに書き出す.
+
+    全銘柄の列を連結し、銘柄ごとの開始位置と併せて保存する。日時は
+    マイクロ秒単位の整数（タイムゾーン付きはUTC基準）で保存する。
+
+    Args:
+        path: 書き出し先のパス（一時ファイル）
+        symbols_data: {銘柄コード: BarBatch} の辞書
+        interval: 時間軸
+        on_conflict: 保存済みの行と重複した場合の動作
+
+    Returns:
+        書き出した行数。
+    """
+    batches = {s: bars for s, bars in symbols_data.items() if len(bars)}
+    meta = {
+        "version": _FORMAT_VERSION,
+        "interval": interval,
+        "on_conflict": on_conflict,
+        "symbols": list(batches),
+        "tz": [
+            str(bars.index.tz) if bars.index.tz is not None else None
+            for bars in batches.values()
+        ],
+    }
+    lengths = [len(bars) for bars in batches.values()]
+    merged = BarBatch.concat(
+        [
+            BarBatch(
+                interval=interval,
+                index=_naive_index(bars.index),
+                open=bars.open,
+                high=bars.high,
+                low=bars.low,
+                close=bars.close,
+                volume=bars.volume,
+            )
+            for bars in batches.values()
+        ],
+        interval,
+    )
+
+    with open(path, "wb") as f:
+        np.savez(
+            f,
+            meta=np.array(json.dumps(meta)),
+            offsets=np.cumsum([0, *lengths], dtype=np.int64),
+            index=merged.index.as_unit("us").asi8,
+            open=merged.open,
+            high=merged.high,
+            low=merged.low,
+            close=merged.close,
+            volume=merged.volume,
+        )
+        f.flush()
+        os.fsync(f.fileno())
+    return sum(lengths)
+
+
+def decode_segment(path: Path) -> Tuple[str, str, Dict[str, BarBatch]]:
+    """セグメントファイルを銘柄ごとのバッチに復元.
+
+    Args:
+        path: セグメントファイルのパス
+
+    Returns:
+        (時間軸, 重複時の動作, {銘柄コード: BarBatch}) のタプル。
+
+    Raises:
+        WriteSpoolError: 形式が不正な場合。
+    """
+    with np.load(path) as npz:
+        meta = json.loads(str(npz["meta"]))
+        if meta.get("version") != _FORMAT_VERSION:
+            raise WriteSpoolError(
+                f"サポートされていないセグメント形式: {meta.get('version')}"
+            )
+        interval = meta["interval"]
+        offsets = npz["offsets"]
+        index = npz["index"].astype("datetime64[us]")
+        columns = {
+            name: npz[name] for name in ("open", "high", "low", "close")
+        }
+        volume = npz["volume"]
+
+    symbols_data = {}
+    for i, (symbol, tz) in enumerate(zip(meta["symbols"], meta["tz"])):
+        start, stop = offsets[i], offsets[i + 1]
+        bars_index = pd.DatetimeIndex(index[start:stop])
+        if tz is not None:
+            bars_index = bars_index.tz_localize("UTC").tz_convert(tz)
+        symbols_data[symbol] = BarBatch(
+            interval=interval,
+            index=bars_index,
+            volume=volume[start:stop],
+            **{name: values[start:stop] for name, values in columns.items()},
+        )
+    return interval, meta["on_conflict"], symbols_data
+
+
+def is_transient_error(error: BaseException) -> bool:
+    """保存エラーが再試行で解消する見込みのある一時的なものか判定.
+
+    StockDataSaveError などに変換された例外は、原因の例外をたどって
+    判定する。
+
+    Args:
+        error: 保存時に発生した例外
+
+    Returns:
+        接続断・タイムアウトなど一時的なエラーの場合True。
+    """
+    seen = set()
+    current: Optional[BaseException] = error
+    while current is not None and id(current) not in seen:
+        if isinstance(current, _TRANSIENT_ERRORS):
+            return True
+        seen.add(id(current))
+        current = current.__cause__ or current.__context__
+    return False
+
+
+def _naive_index(index: pd.DatetimeIndex) -> pd.DatetimeIndex:
+    """タイムゾーン付きの日時インデックスをUTC基準の naive に変換."""
+    if index.tz is None:
+        return index
+    return index.tz_convert("UTC").tz_localize(None)
+
+
+class WriteSpool:
+    """セグメントを追記し、ライタースレッドでDBへグループコミットする.
+
+    スレッドセーフ。append() は呼び出し元のスレッドでセグメントを書き
+    出して即座に戻り、DBへの保存はライタースレッドが行う。
+    """
+
+    def __init__(
+        self,
+        config: Optional[WriteSpoolConfig] = None,
+        saver: Optional[StockDataSaver] = None,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        """初期化.
+
+        Args:
+            config: スプール設定（Noneの場合は環境変数の設定に従う）
+            saver: DB保存に使用するセーバー
+            clock: 経過時間の計測に使用する時刻関数
+        """
+        self.logger = logger
+        self.config = config or WriteSpoolConfig.from_env()
+        self.directory = Path(self.config.directory)
+        self.saver = saver or StockDataSaver()
+        self._clock = clock
+        self._condition = threading.Condition()
+        self._pending: Deque[SpoolSegment] = deque()
+        self._pending_rows = 0
+        # ライターが保存中のセグメント（確認応答前）
+        self._in_flight = 0
+        self._flush_requested = False
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self._sequence = 0
+        # ディレクトリの排他ロック（取得できなかった場合は同期保存）
+        self._lock_fd: Optional[int] = None
+        self._standby = False
+        self._last_error: Optional[str] = None
+        self._stats: Dict[str, int] = {
+            "appended_segments": 0,
+            "appended_rows": 0,
+            "replayed_segments": 0,
+            "commits": 0,
+            "committed_segments": 0,
+            "committed_rows": 0,
+            "inserted": 0,
+            "updated": 0,
+            "failures": 0,
+            "corrupt_segments": 0,
+            "failed_segments": 0,
+        }
+
+    @property
+    def enabled(self) -> bool:
+        """スプールが有効か（他のプロセスがロック中の場合はFalse）."""
+        return self.config.enabled and not self._standby
+
+    def start(self) -> None:
+        """未確認セグメントを登録し、ライタースレッドを起動.
+
+        既に起動済み、または無効化されている場合は何もしない。他の
+        プロセスがディレクトリをロックしている場合は再生もライターの
+        起動も行わず、同期保存させる（enabled が False になる）。
+        """
+        if not self.config.enabled or self._thread is not None:
+            return
+        self.directory.mkdir(parents=True, exist_ok=True)
+        if not self._acquire_lock():
+            self._standby = True
+            self.logger.info(
+                f"書き込みスプールは他のプロセスが使用中のため同期保存します: "
+                f"{self.directory}"
+            )
+            return
+        self._standby = False
+        self._replay()
+        self._stop.clear()
+        self._thread = threading.Thread(
+            target=self._run, name="write-spool-writer", daemon=True
+        )
+        self._thread.start()
+
+    def stop(self, timeout: Optional[float] = None) -> None:
+        """ライタースレッドを停止（未保存のセグメントはディスクに残る）.
+
+        Args:
+            timeout: スレッドの終了を待つ最大秒数
+        """
+        self._stop.set()
+        with self._condition:
+            self._condition.notify_all()
+        if self._thread is not None:
+            self._thread.join(timeout=timeout)
+            self._thread = None
+        self._release_lock()
+
+    def append(
+        self,
+        symbols_data: Dict[str, StockData],
+        interval: str,
+        on_conflict: str = ON_CONFLICT_NOTHING,
+    ) -> Dict[str, int]:
+        """銘柄ごとのバッチをセグメントとして追記.
+
+        ファイルが永続化された時点で戻り、DBへの保存はライタースレッドが
+        行う。
+
+        Args:
+            symbols_data: {銘柄コード: データリスト または BarBatch} の辞書
+            interval: 時間軸
+            on_conflict: 保存済みの行と重複した場合の動作
+
+        Returns:
+            {銘柄コード: 追記した行数} の辞書。
+
+        Raises:
+            ValueError: サポートされていない時間軸の場合。
+            OSError: セグメントの書き出しに失敗した場合。
+        """
+        if not validate_interval(interval):
+            raise ValueError(f"サポートされていない時間軸: {interval}")
+
+        batches = {
+            symbol: (
+                data
+                if isinstance(data, BarBatch)
+                else BarBatch.from_records(data, interval)
+            )
+            for symbol, data in symbols_data.items()
+        }
+        spooled = {symbol: len(bars) for symbol, bars in batches.items()}
+        if not any(spooled.values()):
+            return spooled
+
+        path = self._next_path()
+        tmp_path = path.with_name(f"{path.stem}.tmp")
+        try:
+            rows = encode_segment(tmp_path, batches, interval, on_conflict)
+            os.replace(tmp_path, path)
+        except BaseException:
+            tmp_path.unlink(missing_ok=True)
+            raise
+        self._sync_directory()
+
+        with self._condition:
+            self._pending.append(
+                SpoolSegment(path, interval, rows, self._clock(), on_conflict)
+            )
+            self._pending_rows += rows
+            self._stats["appended_segments"] += 1
+            self._stats["appended_rows"] += rows
+            self._condition.notify_all()
+        return spooled
+
+    def flush(self, timeout: Optional[float] = None) -> bool:
+        """待ち時間を待たずに保存させ、全セグメントの確認応答を待つ.
+
+        Args:
+            timeout: 最大待機秒数（Noneの場合は無制限）
+
+        Returns:
+            未保存のセグメントがなくなった場合True。
+        """
+        deadline = None if timeout is None else self._clock() + timeout
+        with self._condition:
+            self._flush_requested = True
+            self._condition.notify_all()
+            try:
+                while self._pending or self._in_flight:
+                    remaining = (
+                        None if deadline is None else deadline - self._clock()
+                    )
+                    if self._thread is None or (
+                        remaining is not None and remaining <= 0
+                    ):
+                        return False
+                    self._condition.wait(
+                        timeout=(
+                            0.1 if remaining is None else min(remaining, 0.1)
+                        )
+                    )
+                return True
+            finally:
+                self._flush_requested = False
+
+    def get_stats(self) -> Dict[str, Any]:
+        """スプールの統計情報を取得.
+
+        Returns:
+            未保存・保存中のセグメント数、未保存の行数、最も古い
+            セグメントの待ち時間、グループコミットの回数と件数などの辞書。
+        """
+        with self._condition:
+            oldest = self._pending[0].appended_at if self._pending else None
+            return {
+                "enabled": self.enabled,
+                "running": self._thread is not None,
+                "pending_segments": len(self._pending),
+                "in_flight_segments": self._in_flight,
+                "pending_rows": self._pending_rows,
+                "oldest_pending_seconds": (
+                    round(self._clock() - oldest, 3)
+                    if oldest is not None
+                    else None
+                ),
+                "last_error": self._last_error,
+                **self._stats,
+            }
+
+    def _next_path(self) -> Path:
+        """時刻順に並ぶ新しいセグメントのパスを作成."""
+        with self._condition:
+            self._sequence += 1
+            sequence = self._sequence
+        return self.directory / (
+            f"{time.time_ns():020d}-{os.getpid()}-{sequence:06d}.npz"
+        )
+
+    def _sync_directory(self) -> None:
+        """リネームを永続化するためディレクトリを fsync（POSIXのみ）."""
+        if os.name != "posix":
+            return
+        fd = os.open(self.directory, os.O_RDONLY)
+        try:
+            os.fsync(fd)
+        finally:
+            os.close(fd)
+
+    def _acquire_lock(self) -> bool:
+        """ディレクトリのロックファイルを排他ロック（POSIXのみ）.
+
+        Returns:
+            ロックを取得した場合True（他のプロセスが保持中はFalse）。
+        """
+        if os.name != "posix":
+            return True
+        fd = os.open(self.directory / _LOCK_FILE, os.O_RDWR | os.O_CREAT)
+        try:
+            fcntl.flock(fd, fcntl.LOCK_EX | fcntl.LOCK_NB)
+        except BlockingIOError:
+            os.close(fd)
+            return False
+        self._lock_fd = fd
+        return True
+
+    def _release_lock(self) -> None:
+        """ロックファイルのロックを解放."""
+        if self._lock_fd is not None:
+            os.close(self._lock_fd)
+            self._lock_fd = None
+
+    def _replay(self) -> None:
+        """前回の実行で確認応答されなかったセグメントを登録."""
+        for path in self.directory.glob("*.tmp"):
+            path.unlink(missing_ok=True)
+        for path in sorted(self.directory.glob("*.npz")):
+            try:
+                interval, on_conflict, symbols_data = decode_segment(path)
+            except Exception as e:
+                self._quarantine(path, e)
+                continue
+            rows = sum(len(bars) for bars in symbols_data.values())
+            with self._condition:
+                self._pending.append(
+                    SpoolSegment(
+                        path, interval, rows, self._clock(), on_conflict
+                    )
+                )
+                self._pending_rows += rows
+                self._stats["replayed_segments"] += 1
+        if self._stats["replayed_segments"]:
+            self.logger.info(
+                f"書き込みスプールの未確認セグメントを再生: "
+                f"{self._stats['replayed_segments']}件, "
+                f"{self._pending_rows}行"
+            )
+
+    def _quarantine(self, path: Path, error: Exception) -> None:
+        """読み込めないセグメントを再生対象から外す（ファイルは残す）."""
+        self.logger.error(
+            f"書き込みスプールのセグメントを読み込めません: {path}: {error}"
+        )
+        path.rename(path.with_name(path.name + _CORRUPT_SUFFIX))
+        with self._condition:
+            self._stats["corrupt_segments"] += 1
+
+    def _run(self) -> None:
+        """ライタースレッドの処理（停止要求まで保存を繰り返す）."""
+        while not self._stop.is_set():
+            group = self._wait_for_group()
+            if not group:
+                continue
+            if not self._commit(group):
+                # 失敗したセグメントは先頭に戻し、間隔を空けて再試行する
+                with self._condition:
+                    self._pending.extendleft(reversed(group))
+                    self._pending_rows += sum(s.rows for s in group)
+                    self._in_flight -= len(group)
+                    self._condition.notify_all()
+                self._stop.wait(self.config.retry_seconds)
+
+    def _wait_for_group(self) -> List[SpoolSegment]:
+        """保存条件を満たすまで待ち、グループコミットするセグメントを取得."""
+        with self._condition:
+            while not self._stop.is_set():
+                wait_seconds = self._seconds_until_due()
+                if wait_seconds is not None and wait_seconds <= 0:
+                    break
+                self._condition.wait(timeout=wait_seconds)
+            else:
+                return []
+
+            group: List[SpoolSegment] = []
+            rows = 0
+            while self._pending and (
+                not group
+                or rows + self._pending[0].rows <= self.config.max_rows
+            ):
+                segment = self._pending.popleft()
+                group.append(segment)
+                rows += segment.rows
+            self._pending_rows -= rows
+            self._in_flight += len(group)
+            return group
+
+    def _seconds_until_due(self) -> Optional[float]:
+        """次に保存するまでの秒数（ロック取得済み、未保存なしはNone）."""
+        if not self._pending:
+            return None
+        if self._flush_requested or self._pending_rows >= self.config.max_rows:
+            return 0.0
+        age = self._clock() - self._pending[0].appended_at
+        return self.config.max_latency_ms / 1000 - age
+
+    def _commit(self, group: List[SpoolSegment]) -> bool:
+        """セグメントを時間軸（と重複時の動作）ごとに1トランザクションで保存.
+
+        保存に成功したセグメントは削除（確認応答）する。失敗した場合は
+        group を再試行するセグメントだけに更新する。
+
+        Returns:
+            全セグメントを保存（または再試行対象から除外）できた場合True。
+        """
+        batches: Dict[Tuple[str, str], Dict[str, List[BarBatch]]] = {}
+        segments: List[SpoolSegment] = []
+        for segment in group:
+            try:
+                _, _, symbols_data = decode_segment(segment.path)
+            except Exception as e:
+                self._quarantine(segment.path, e)
+                with self._condition:
+                    self._in_flight -= 1
+                continue
+            segments.append(segment)
+            by_symbol = batches.setdefault(
+                (segment.interval, segment.on_conflict), {}
+            )
+            for symbol, bars in symbols_data.items():
+                by_symbol.setdefault(symbol, []).append(bars)
+
+        totals = {"inserted": 0, "updated": 0}
+        committed: List[SpoolSegment] = []
+        try:
+            for (interval, on_conflict), by_symbol in batches.items():
+                self._save(by_symbol, interval, on_conflict, totals)
+                committed.extend(
+                    s
+                    for s in segments
+                    if (s.interval, s.on_conflict) == (interval, on_conflict)
+                )
+        except Exception as e:
+            self._record_failure(e)
+            # 保存済みの時間軸のセグメントは確認応答し、残りを再試行する
+            self._acknowledge(committed, totals)
+            retry = [s for s in segments if s not in committed]
+            if not is_transient_error(e):
+                if len(retry) > 1:
+                    # 原因のセグメントを特定するため1つずつ保存し直す
+                    retry = [s for s in retry if not self._commit_one(s)]
+                else:
+                    retry = [s for s in retry if self._retry_after(s, e)]
+            with self._condition:
+                self._in_flight -= len(segments) - len(retry)
+                self._condition.notify_all()
+            group[:] = retry
+            return not retry
+
+        self._acknowledge(committed, totals)
+        with self._condition:
+            self._in_flight -= len(segments)
+            self._last_error = None
+            self._condition.notify_all()
+        return True
+
+    def _commit_one(self, segment: SpoolSegment) -> bool:
+        """1つのセグメントを保存（データ起因のエラー時の切り分け用）.
+
+        Returns:
+            保存した、または規定回数に達して再試行対象から外した場合True。
+        """
+        totals = {"inserted": 0, "updated": 0}
+        try:
+            _, _, symbols_data = decode_segment(segment.path)
+            self._save(
+                {symbol: [bars] for symbol, bars in symbols_data.items()},
+                segment.interval,
+                segment.on_conflict,
+                totals,
+            )
+        except Exception as e:
+            self._record_failure(e)
+            if is_transient_error(e):
+                return False
+            return not self._retry_after(segment, e)
+        self._acknowledge([segment], totals)
+        return True
+
+    def _save(
+        self,
+        by_symbol: Dict[str, List[BarBatch]],
+        interval: str,
+        on_conflict: str,
+        totals: Dict[str, int],
+    ) -> None:
+        """銘柄ごとのバッチを連結して保存し、件数を totals に加算."""
+        result = self.saver.save_batch_stock_data(
+            {
+                symbol: BarBatch.concat(parts, interval)
+                for symbol, parts in by_symbol.items()
+            },
+            interval,
+            on_conflict=on_conflict,
+        )
+        totals["inserted"] += result.get("total_saved", 0)
+        totals["updated"] += result.get("total_updated", 0)
+
+    def _record_failure(self, error: Exception) -> None:
+        """保存失敗を統計に反映."""
+        self.logger.warning(
+            f"書き込みスプールのグループコミットに失敗（再試行します）: {error}"
+        )
+        with self._condition:
+            self._stats["failures"] += 1
+            self._last_error = str(error)
+
+    def _retry_after(self, segment: SpoolSegment, error: Exception) -> bool:
+        """データ起因のエラーで失敗したセグメントを再試行するか判定.
+
+        規定回数に達したセグメントは .failed に改名して再試行対象から
+        外す（ファイルは調査用に残す）。
+
+        Returns:
+            再試行する場合True。
+        """
+        segment.attempts += 1
+        if segment.attempts < self.config.max_attempts:
+            return True
+        self.logger.error(
+            f"書き込みスプールのセグメントを{segment.attempts}回保存できない"
+            f"ため再試行を中止します: {segment.path}: {error}"
+        )
+        segment.path.rename(
+            segment.path.with_name(segment.path.name + _FAILED_SUFFIX)
+        )
+        with self._condition:
+            self._stats["failed_segments"] += 1
+        return False
+
+    def _acknowledge(
+        self, segments: List[SpoolSegment], totals: Dict[str, int]
+    ) -> None:
+        """保存済みのセグメントを削除し、統計に反映."""
+        if not segments:
+            return
+        for segment in segments:
+            segment.path.unlink(missing_ok=True)
+        rows = sum(segment.rows for segment in segments)
+        with self._condition:
+            self._stats["commits"] += 1
+            self._stats["committed_segments"] += len(segments)
+            self._stats["committed_rows"] += rows
+            self._stats["inserted"] += totals["inserted"]
+            self._stats["updated"] += totals["updated"]
+        self.logger.debug(
+            f"書き込みスプールのグループコミット完了: "
+            f"{len(segments)}セグメント, {rows}行, "
+            f"新規 {totals['inserted']}件"
+        )
+
+
+# グローバルスプール（プロセス内の全取り込み処理で共有）
+_write_spool: Optional[WriteSpool] = None
+_write_spool_lock = threading.Lock()
+
+
+def get_write_spool() -> WriteSpool:
+    """プロセス全体で共有する書き込みスプールを取得.
+
+    初回取得時に、有効であれば前回の未確認セグメントを再生して
+    ライタースレッドを起動する。
+
+    Returns:
+        WriteSpool インスタンス。
+    """
+    global _write_spool
+
+    with _write_spool_lock:
+        if _write_spool is None:
+            _write_spool = WriteSpool()
+            _write_spool.start()
+        return _write_spool
+
+
+def reset_write_spool() -> None:
+    """共有スプールのライターを停止して破棄（設定変更時・テスト用）."""
+    global _write_spool
+
+    with _write_spool_lock:
+        if _write_spool is not None:
+            _write_spool.stop(timeout=1.0)
+        _write_spool = None
@@ -5,10 +5,12 @@
 
 from app.utils.timeframe_utils import (
     TIMEFRAME_DISPLAY_NAME,
+    TIMEFRAME_INCREMENTAL_OVERLAP,
     TIMEFRAME_MODEL_MAP,
     TIMEFRAME_RECOMMENDED_PERIOD,
     get_all_intervals,
     get_display_name,
+    get_incremental_start,
     get_model_for_interval,
     get_recommended_period,
     is_intraday_interval,
@@ -20,10 +22,12 @@ __all__ = [
     "get_model_for_interval",
     "get_display_name",
     "get_recommended_period",
+    "get_incremental_start",
     "is_intraday_interval",
     "get_all_intervals",
     "validate_interval",
     "TIMEFRAME_MODEL_MAP",
     "TIMEFRAME_DISPLAY_NAME",
     "TIMEFRAME_RECOMMENDED_PERIOD",
+    "TIMEFRAME_INCREMENTAL_OVERLAP",
 ]
@@ -1,6 +1,7 @@
 """Provides mapping between yfinance intervals and database models."""
 
-from typing import Dict, Literal, Type
+from datetime import date, datetime, time, timedelta
+from typing import Dict, Literal, Optional, Type
 
 from app.models import (
     StockDataBase,
@@ -66,6 +67,19 @@ TIMEFRAME_RECOMMENDED_PERIOD: Dict[str, str] = {
     "1mo": "max",  # 月足: 全期間
 }
 
+# 差分取得時に最新データから遡って再取得する期間
+# （確定前の足や配当・分割による調整値の修正を取り込むための重複区間）
+TIMEFRAME_INCREMENTAL_OVERLAP: Dict[str, timedelta] = {
+    "1m": timedelta(days=1),
+    "5m": timedelta(days=1),
+    "15m": timedelta(days=1),
+    "30m": timedelta(days=1),
+    "1h": timedelta(days=3),
+    "1d": timedelta(days=7),
+    "1wk": timedelta(weeks=3),
+    "1mo": timedelta(days=62),
+}
+
 
 def get_model_for_interval(interval: str) -> Type[StockDataBase]:
     """Yfinance intervalに対応するデータベースモデルを取得.
@@ -111,6 +125,48 @@ def get_recommended_period(interval: str) -> str:
     return TIMEFRAME_RECOMMENDED_PERIOD.get(interval, "1y")
 
 
+def get_incremental_start(
+    interval: str,
+    latest: Optional[datetime | date],
+    now: Optional[datetime] = None,
+) -> Optional[datetime | date]:
+    """差分取得の開始日時を算出.
+
+    最新データ日時からオーバーラップ期間を差し引いた日時を返す。
+    開始日時が推奨取得期間（yfinanceの取得可能範囲）より古くなる場合は
+    差分取得できないため、全期間取得を示すNoneを返す。
+
+    Args:
+        interval: yfinance interval
+        latest: データベース内の最新データ日時（データなしの場合None）
+        now: 現在日時（テスト用、Noneの場合は現在時刻）
+
+    Returns:
+        差分取得の開始日時（日足以上はdate、分足・時間足はdatetime）、
+        全期間取得が必要な場合はNone。
+    """
+    if latest is None:
+        return None
+
+    if isinstance(latest, datetime):
+        latest_dt = latest
+    else:
+        latest_dt = datetime.combine(latest, time.min)
+
+    overlap = TIMEFRAME_INCREMENTAL_OVERLAP.get(interval, timedelta(days=7))
+    start = latest_dt - overlap
+
+    period = get_recommended_period(interval)
+    if period.endswith("d") and period[:-1].isdigit():
+        current = now or datetime.now(start.tzinfo)
+        if start < current - timedelta(days=int(period[:-1])):
+            return None
+
+    if is_intraday_interval(interval):
+        return start
+    return start.date()
+
+
 def is_intraday_interval(interval: str) -> bool:
     """分足・時間足（日内）の時間軸かどうかを判定.
 
@@ -0,0 +1,248 @@
+"""圧縮保存（bar_chunks）前後の容量と1銘柄の全期間の読み出し時間の計測.
+
+合成した足（ランダムウォーク）を時間軸テーブルに保存し、以下を比較します:
+
+- table: 時間軸テーブル（インデックスを含む）の容量と、1銘柄の全期間を
+  日時順に読み出す時間
+- chunks: 全期間を bar_chunks に移した後の容量と、read_archived で
+  同じ足を読み出す時間（復元を含む）
+
+分足・時間足は取引時間（9:00-11:30, 12:30-15:30）の足を平日分作成します。
+計測は一時スキーマ（bench_archive）に作成したテーブルで行い、
+計測後にスキーマごと削除します。
+
+Usage:
+    python scripts/benchmark/benchmark_archive.py --symbols 50 --months 24 --interval 5m
+
+Note:
+    データベース接続設定（.env）が必要です。
+"""
+
+import argparse
+from datetime import datetime, timedelta
+import os
+import statistics
+import sys
+import time
+from typing import Dict, List
+
+import numpy as np
+import pandas as pd
+from sqlalchemy import create_engine, text
+
+
+# プロジェクトルートをパスに追加
+sys.path.insert(
+    0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..", ".."))
+)
+
+from app.models import DATABASE_URL, BarChunk  # noqa: E402
+from app.services.stock_data import archive  # noqa: E402
+from app.services.stock_data.bar_batch import (  # noqa: E402
+    DATE_INTERVALS,
+    BarBatch,
+)
+from app.services.stock_data.partitions import (  # noqa: E402
+    PARTITION_TZ,
+    PartitionConfig,
+    PartitionManager,
+    add_months,
+)
+from app.services.stock_data.upsert import upsert_bars  # noqa: E402
+from app.utils.timeframe_utils import (  # noqa: E402
+    get_model_for_interval,
+    get_table_name,
+)
+
+
+SCHEMA = "bench_archive"
+FREQUENCIES = {
+    "1m": "1min",
+    "5m": "5min",
+    "15m": "15min",
+    "30m": "30min",
+    "1h": "60min",
+}
+
+
+def trading_index(interval: str, start: datetime, end: datetime):
+    """期間内の平日の取引時間の足の日時を作成."""
+    days = pd.bdate_range(start.date(), end.date())
+    if interval in DATE_INTERVALS:
+        return pd.DatetimeIndex(days)
+    sessions = []
+    for open_at, close_at in (("09:00", "11:30"), ("12:30", "15:30")):
+        # 終了時刻の足は含めない
+        times = pd.timedelta_range(
+            pd.Timedelta(f"{open_at}:00"),
+            pd.Timedelta(f"{close_at}:00"),
+            freq=FREQUENCIES[interval],
+        )[:-1]
+        sessions.append(times)
+    offsets = sessions[0].append(sessions[1])
+    stamps = (days.values[:, None] + offsets.values[None, :]).ravel()
+    return pd.DatetimeIndex(stamps).tz_localize(PARTITION_TZ)
+
+
+def synthetic_bars(index, seed: int, interval: str) -> BarBatch:
+    """ランダムウォークの足を作成."""
+    rng = np.random.default_rng(seed)
+    close = np.round(1000 + np.cumsum(rng.normal(0, 1.5, len(index))), 1)
+    close = np.maximum(close, 1.0)
+    spread = np.round(np.abs(rng.normal(0, 1.0, len(index))), 1)
+    return BarBatch(
+        interval=interval,
+        index=index,
+        open=close,
+        high=close + spread,
+        low=np.maximum(close - spread, 0.1),
+        close=close,
+        volume=rng.integers(100, 50000, len(index)).astype(np.int64) * 100,
+    )
+
+
+def prepare(engine, interval: str, bars_by_symbol: Dict[str, BarBatch]):
+    """一時スキーマにテーブルを作成して足を保存."""
+    model = get_model_for_interval(interval)
+    table = get_table_name(interval)
+    with engine.begin() as conn:
+        conn.execute(text(f"DROP SCHEMA IF EXISTS {SCHEMA} CASCADE"))
+        conn.execute(text(f"CREATE SCHEMA {SCHEMA}"))
+        model.__table__.create(conn)
+        BarChunk.__table__.create(conn)
+        conn.execute(
+            text(
+                "ALTER TABLE bar_chunks ALTER COLUMN data "
+                "SET STORAGE EXTERNAL"
+            )
+        )
+        first, last = next(iter(bars_by_symbol.values())).time_range()
+        PartitionManager(PartitionConfig()).ensure_range(
+            conn, table, first, last
+        )
+    raw = engine.raw_connection()
+    try:
+        upsert_bars(raw.cursor(), table, bars_by_symbol)
+        raw.commit()
+        cursor = raw.cursor()
+        cursor.execute(f"ANALYZE {table}")
+        raw.commit()
+    finally:
+        raw.close()
+
+
+def relation_size(engine, table: str) -> int:
+    """テーブル（パーティション・インデックス・TOASTを含む）の容量."""
+    with engine.connect() as conn:
+        return conn.execute(
+            text(
+                "SELECT COALESCE((SELECT sum(pg_total_relation_size(relid)) "
+                "FROM pg_partition_tree(:table)), "
+                "pg_total_relation_size(:table))"
+            ),
+            {"table": table},
+        ).scalar()
+
+
+def read_table(engine, interval: str, symbol: str, repeat: int) -> float:
+    """時間軸テーブルから1銘柄の全期間を読み出す時間の中央値（ミリ秒）."""
+    table = get_table_name(interval)
+    column = "date" if interval in DATE_INTERVALS else "datetime"
+    query = text(
+        f"SELECT {column}, open, high, low, close, volume FROM {table} "
+        f"WHERE symbol = :symbol ORDER BY {column}"
+    )
+    timings = []
+    with engine.connect() as conn:
+        for _ in range(repeat):
+            start = time.perf_counter()
+            conn.execute(query, {"symbol": symbol}).all()
+            timings.append((time.perf_counter() - start) * 1000)
+    return statistics.median(timings)
+
+
+def read_chunks(engine, interval: str, symbol: str, repeat: int) -> float:
+    """bar_chunks から1銘柄の全期間を読み出す時間の中央値（ミリ秒）."""
+    timings = []
+    with engine.connect() as conn:
+        for _ in range(repeat):
+            start = time.perf_counter()
+            archive.read_archived(conn, interval, symbol)
+            timings.append((time.perf_counter() - start) * 1000)
+    return statistics.median(timings)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--symbols", type=int, default=50)
+    parser.add_argument("--months", type=int, default=24)
+    parser.add_argument("--interval", default="5m")
+    parser.add_argument("--repeat", type=int, default=20)
+    args = parser.parse_args()
+
+    end = datetime(2025, 1, 1, tzinfo=PARTITION_TZ)
+    start = datetime.combine(
+        add_months(end.date(), -args.months), end.time(), tzinfo=PARTITION_TZ
+    )
+    index = trading_index(args.interval, start, end - timedelta(days=1))
+    bars_by_symbol: Dict[str, BarBatch] = {
+        f"BENCH{i:04d}.T": synthetic_bars(index, i, args.interval)
+        for i in range(args.symbols)
+    }
+    rows = len(index) * args.symbols
+    symbol = next(iter(bars_by_symbol))
+    table = get_table_name(args.interval)
+    engine = create_engine(
+        DATABASE_URL, connect_args={"options": f"-csearch_path={SCHEMA}"}
+    )
+
+    print(
+        f"銘柄数: {args.symbols}, 時間軸: {args.interval}, "
+        f"月数: {args.months}, 行数: {rows} (1銘柄 {len(index)}行)"
+    )
+    results: List[tuple] = []
+    try:
+        prepare(engine, args.interval, bars_by_symbol)
+        results.append(
+            (
+                "table",
+                relation_size(engine, table),
+                read_table(engine, args.interval, symbol, args.repeat),
+                0.0,
+            )
+        )
+
+        compactor = archive.ArchiveCompactor(
+            archive.ArchiveConfig(after_days=1, intervals=[args.interval]),
+            engine=engine,
+            partition_manager=PartitionManager(PartitionConfig()),
+        )
+        started = time.perf_counter()
+        compactor.compact_interval(args.interval, datetime.now(PARTITION_TZ))
+        elapsed = time.perf_counter() - started
+        results.append(
+            (
+                "chunks",
+                relation_size(engine, "bar_chunks"),
+                read_chunks(engine, args.interval, symbol, args.repeat),
+                elapsed,
+            )
+        )
+    finally:
+        with engine.begin() as conn:
+            conn.execute(text(f"DROP SCHEMA IF EXISTS {SCHEMA} CASCADE"))
+        engine.dispose()
+
+    print(
+        f"{'storage':>8} {'size MB':>9} {'bytes/row':>10} "
+        f"{'read (ms)':>10} {'compact (s)':>12}"
+    )
+    for name, size, latency, seconds in results:
+        print(
+            f"{name:>8} {size / 1024 / 1024:>9.1f} {size / rows:>10.1f} "
+            f"{latency:>10.2f} {seconds:>12.2f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,112 @@
+"""変換から保存までの受け渡し形式ごとのピークメモリ計測スクリプト.
+
+リプレイプロバイダーの合成データ（period="max"）を複数銘柄分読み込み、
+save_batch_stock_data への受け渡しとバルクインサート用の行作成までを
+以下の2方式で実行して、tracemalloc のピークメモリを比較します。
+DBへの書き込みは行いません。
+
+- dict: convert_to_dict による行ごとの辞書リスト（従来方式）
+- batch: convert_to_batch による列指向の BarBatch
+
+Usage:
+    python scripts/benchmark/benchmark_bar_batch_memory.py --symbols 100
+
+Note:
+    appパッケージの読み込み時にデータベース接続設定（.env）が必要です。
+"""
+
+import argparse
+from datetime import datetime
+import gc
+import os
+import sys
+import time
+import tracemalloc
+from typing import Callable, Dict
+
+import pandas as pd
+
+
+# プロジェクトルートをパスに追加
+sys.path.insert(
+    0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..", ".."))
+)
+
+from app.services.stock_data.converter import (  # noqa: E402
+    StockDataConverter,
+)
+from app.services.stock_data.provider import ReplayProvider  # noqa: E402
+from app.services.stock_data.saver import INSERT_PAGE_SIZE  # noqa: E402
+
+
+def load_frames(symbols: int, interval: str) -> Dict[str, pd.DataFrame]:
+    """合成データを銘柄数分読み込む."""
+    provider = ReplayProvider(now=datetime(2025, 1, 10, 15, 0))
+    return {
+        f"{1000 + i}.T": provider.fetch_history(
+            f"{1000 + i}.T", interval, period="max"
+        )
+        for i in range(symbols)
+    }
+
+
+def run_dict(frames: Dict[str, pd.DataFrame], interval: str) -> int:
+    """従来方式: 辞書リストに変換し、銘柄付きの挿入レコードを作成."""
+    converter = StockDataConverter()
+    symbols_data = {
+        symbol: converter.convert_to_dict(df, interval)
+        for symbol, df in frames.items()
+    }
+    records = [
+        {**data, "symbol": symbol}
+        for symbol, data_list in symbols_data.items()
+        for data in data_list
+    ]
+    return len(records)
+
+
+def run_batch(frames: Dict[str, pd.DataFrame], interval: str) -> int:
+    """列指向方式: BarBatch に変換し、挿入用の行タプルをチャンクで作成."""
+    converter = StockDataConverter()
+    symbols_data = {
+        symbol: converter.convert_to_batch(df, interval)
+        for symbol, df in frames.items()
+    }
+    rows = 0
+    for symbol, bars in symbols_data.items():
+        for chunk in bars.iter_rows(symbol, INSERT_PAGE_SIZE):
+            rows += len(chunk)
+    return rows
+
+
+def _measure(run: Callable, frames: Dict[str, pd.DataFrame], interval: str):
+    """実行し、(行数, ピークメモリ(MB), 経過秒) を返す."""
+    gc.collect()
+    tracemalloc.start()
+    start = time.perf_counter()
+    rows = run(frames, interval)
+    elapsed = time.perf_counter() - start
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return rows, peak / 1024 / 1024, elapsed
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--symbols", type=int, default=100)
+    parser.add_argument("--interval", default="1d")
+    args = parser.parse_args()
+
+    frames = load_frames(args.symbols, args.interval)
+
+    print(f"銘柄数: {args.symbols}, 時間軸: {args.interval}, period: max")
+    print(f"{'mode':>6} {'rows':>10} {'peak (MB)':>10} {'time (s)':>9}")
+    peaks = {}
+    for mode, run in (("dict", run_dict), ("batch", run_batch)):
+        rows, peaks[mode], elapsed = _measure(run, frames, args.interval)
+        print(f"{mode:>6} {rows:>10} {peaks[mode]:>10.1f} {elapsed:>9.2f}")
+    print(f"ピークメモリ削減: {peaks['dict'] / peaks['batch']:.1f}x")
+
+
+if __name__ == "__main__":
+    main()
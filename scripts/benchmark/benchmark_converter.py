@@ -0,0 +1,111 @@
+"""StockDataConverter.convert_to_dict の変換速度計測スクリプト.
+
+合成OHLCVデータ（一部に無効な価格を含む）を使用し、以下の2方式で
+行/秒を計測します。両方式の結果がバイト列として一致することも確認します。
+
+- rows: 従来方式（iterrows による行単位の変換）
+- columns: 列単位の一括変換
+
+Usage:
+    python scripts/benchmark/benchmark_converter.py --rows 10000 100000 1000000
+
+Note:
+    appパッケージの読み込み時にデータベース接続設定（.env）が必要です。
+"""
+
+import argparse
+import os
+import pickle
+import sys
+import time
+from typing import Callable
+
+import numpy as np
+import pandas as pd
+
+
+# プロジェクトルートをパスに追加
+sys.path.insert(
+    0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..", ".."))
+)
+
+from app.services.stock_data.converter import (  # noqa: E402
+    StockDataConverter,
+)
+
+
+def make_frame(rows: int, interval: str, seed: int = 0) -> pd.DataFrame:
+    """yfinance形式の合成OHLCVデータを作成（約1%は無効な価格）."""
+    rng = np.random.default_rng(seed)
+    freq = "1min" if interval != "1d" else "D"
+    index = pd.date_range(
+        "2000-01-03 09:00", periods=rows, freq=freq, tz="Asia/Tokyo"
+    )
+    close = np.round(1000 + rng.normal(0, 50, rows).cumsum() % 500, 1)
+    open_ = np.round(close * (1 + rng.normal(0, 0.01, rows)), 1)
+    high = np.maximum(open_, close) + 1.0
+    low = np.minimum(open_, close) - 1.0
+
+    invalid = rng.random(rows) < 0.01
+    low[invalid] = high[invalid] + 1.0
+
+    return pd.DataFrame(
+        {
+            "Open": open_,
+            "High": high,
+            "Low": low,
+            "Close": close,
+            "Volume": rng.integers(0, 10_000_000, rows),
+            "Dividends": 0.0,
+            "Stock Splits": 0.0,
+        },
+        index=index,
+    )
+
+
+def _measure(convert: Callable, df: pd.DataFrame, interval: str):
+    """変換を実行し、(結果, 行/秒) を返す."""
+    start = time.perf_counter()
+    records = convert(df, interval)
+    elapsed = time.perf_counter() - start
+    return records, len(df) / elapsed
+
+
+def _convert_rows(df: pd.DataFrame, interval: str):
+    """従来方式（行単位）で変換."""
+    records, _ = StockDataConverter()._convert_rows(df, interval)
+    return records
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument(
+        "--rows", type=int, nargs="+", default=[10_000, 100_000, 1_000_000]
+    )
+    parser.add_argument(
+        "--interval", default="1d", help="時間軸（1d: 日付, 1m: 日時）"
+    )
+    args = parser.parse_args()
+
+    converter = StockDataConverter()
+
+    print(f"時間軸: {args.interval}")
+    print(
+        f"{'rows':>10} {'rows (rows/s)':>15} "
+        f"{'columns (rows/s)':>18} {'speedup':>8} {'identical':>10}"
+    )
+    for rows in args.rows:
+        df = make_frame(rows, args.interval)
+        expected, row_rate = _measure(_convert_rows, df, args.interval)
+        actual, column_rate = _measure(
+            converter.convert_to_dict, df, args.interval
+        )
+        identical = pickle.dumps(expected) == pickle.dumps(actual)
+        print(
+            f"{rows:>10} {row_rate:>15,.0f} {column_rate:>18,.0f} "
+            f"{column_rate / row_rate:>7.1f}x {str(identical):>10}"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,108 @@
+"""取得ワーカープールのスループット計測スクリプト.
+
+リプレイプロバイダー（合成データ + 疑似ネットワーク遅延）を使用し、
+以下の2方式で銘柄/秒を計測します。
+
+- lock: 従来方式（スレッド並列 + グローバルロックで直列化）
+- pool: FetchWorkerPool（ワーカープロセスで並行実行）
+
+Usage:
+    python scripts/benchmark/benchmark_fetch_pool.py --symbols 64 --workers 1 2 4 8
+
+Note:
+    appパッケージの読み込み時にデータベース接続設定（.env）が必要です。
+"""
+
+import argparse
+from concurrent.futures import ThreadPoolExecutor
+import functools
+import os
+import sys
+import threading
+import time
+from typing import Callable, List
+
+
+# プロジェクトルートをパスに追加
+sys.path.insert(
+    0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..", ".."))
+)
+
+from app.services.stock_data.fetch_pool import FetchWorkerPool  # noqa: E402
+from app.services.stock_data.provider import ReplayProvider  # noqa: E402
+
+
+def make_provider_factory(latency_ms: float) -> Callable:
+    """ワーカープロセスへ渡すリプレイプロバイダーの生成関数を作成."""
+    return functools.partial(ReplayProvider, latency_ms=latency_ms)
+
+
+def _run(fetch: Callable[[str], object], symbols: List[str], threads: int):
+    """複数スレッドから取得を実行し、銘柄/秒を返す."""
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=threads) as executor:
+        list(executor.map(fetch, symbols))
+    elapsed = time.perf_counter() - start
+    return len(symbols) / elapsed
+
+
+def bench_lock(
+    symbols: List[str], workers: int, factory: Callable, period: str
+) -> float:
+    """従来方式（グローバルロックで直列化）の銘柄/秒を計測."""
+    lock = threading.Lock()
+    provider = factory()
+
+    def fetch(symbol: str):
+        with lock:
+            return provider.fetch_history(symbol, "1d", period)
+
+    return _run(fetch, symbols, workers)
+
+
+def bench_pool(
+    symbols: List[str], workers: int, factory: Callable, period: str
+) -> float:
+    """FetchWorkerPoolの銘柄/秒を計測."""
+    pool = FetchWorkerPool(max_workers=workers, provider_factory=factory)
+
+    def fetch(symbol: str):
+        return pool.call("fetch_history", symbol, "1d", period, None)
+
+    try:
+        # ワーカープロセスの起動コストを計測から除外するためのウォームアップ
+        _run(fetch, [f"WARM{i}" for i in range(workers)], workers)
+        return _run(fetch, symbols, workers)
+    finally:
+        pool.shutdown()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--symbols", type=int, default=64, help="銘柄数")
+    parser.add_argument("--workers", type=int, nargs="+", default=[1, 2, 4, 8])
+    parser.add_argument(
+        "--latency-ms", type=float, default=100, help="疑似ネットワーク遅延"
+    )
+    parser.add_argument(
+        "--years", type=int, default=10, help="1銘柄の取得年数（日足）"
+    )
+    args = parser.parse_args()
+
+    factory = make_provider_factory(args.latency_ms)
+    period = f"{args.years}y"
+    symbols = [f"{1000 + i}.T" for i in range(args.symbols)]
+
+    print(
+        f"銘柄数: {args.symbols}, 遅延: {args.latency_ms}ms, "
+        f"期間: {period}"
+    )
+    print(f"{'workers':>8} {'lock (sym/s)':>14} {'pool (sym/s)':>14}")
+    for workers in args.workers:
+        lock_rate = bench_lock(symbols, workers, factory, period)
+        pool_rate = bench_pool(symbols, workers, factory, period)
+        print(f"{workers:>8} {lock_rate:>14.2f} {pool_rate:>14.2f}")
+
+
+if __name__ == "__main__":
+    main()
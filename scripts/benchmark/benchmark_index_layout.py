@@ -0,0 +1,219 @@
+"""時間軸テーブルのインデックス構成ごとの書き込み速度・検索時間の計測.
+
+インデックス整理（app/migrations/consolidate_stock_indexes.py）の前後の
+構成で、同じ合成データの保存と /api/stocks 相当の検索を比較します。
+
+インデックス構成:
+
+- legacy: 一意制約 + idx_<table>_symbol / _<time> / _symbol_<time>_desc
+- consolidated: 一意制約 + 時間カラムのBRINインデックス
+
+保存はリプレイプロバイダーの合成データを日ごとに全銘柄まとめて
+ON CONFLICT 付き INSERT（保存方式 upsert と同じ処理）で行い、日次の
+差分更新と同じ時間順の書き込みを再現します。
+
+検索（/api/stocks と同じく件数取得 + 日時の降順で100件）:
+
+- symbol_range: 銘柄 + 直近5日
+- symbol_latest: 銘柄のみ
+- all_day: 全銘柄 + 1日（銘柄横断の期間検索）
+- all_latest: 条件なし
+
+計測は一時スキーマ（bench_indexes）に作成したテーブルで行い、
+計測後にスキーマごと削除します。
+
+Usage:
+    python scripts/benchmark/benchmark_index_layout.py --symbols 300 --interval 5m
+
+Note:
+    データベース接続設定（.env）が必要です。
+"""
+
+import argparse
+from datetime import datetime, timedelta
+import os
+import statistics
+import sys
+import time
+from typing import Callable, Dict, List
+
+from sqlalchemy import create_engine, func, select, text
+
+
+# プロジェクトルートをパスに追加
+sys.path.insert(
+    0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..", ".."))
+)
+
+from app.migrations.consolidate_stock_indexes import (  # noqa: E402
+    audit,
+    consolidate_table,
+    restore_table,
+)
+from app.models import DATABASE_URL  # noqa: E402
+from app.services.stock_data.bar_batch import BarBatch  # noqa: E402
+from app.services.stock_data.converter import (  # noqa: E402
+    StockDataConverter,
+)
+from app.services.stock_data.partitions import (  # noqa: E402
+    PARTITION_TZ,
+    PartitionConfig,
+    PartitionManager,
+)
+from app.services.stock_data.provider import (  # noqa: E402
+    ReplayProvider,
+    get_default_period,
+)
+from app.services.stock_data.upsert import upsert_bars  # noqa: E402
+from app.utils.timeframe_utils import get_model_for_interval  # noqa: E402
+
+
+SCHEMA = "bench_indexes"
+LAYOUTS: Dict[str, Callable] = {
+    "legacy": restore_table,
+    "consolidated": consolidate_table,
+}
+PAGE_SIZE = 100
+
+
+def load_days(symbols: int, interval: str) -> List[Dict[str, BarBatch]]:
+    """合成データを読み込み、日ごとの {銘柄コード: BarBatch} に分割."""
+    provider = ReplayProvider(now=datetime(2025, 1, 10, 15, 0))
+    converter = StockDataConverter()
+    days: Dict[object, Dict[str, BarBatch]] = {}
+    for i in range(symbols):
+        symbol = f"BENCH{i:04d}.T"
+        df = provider.fetch_history(
+            symbol, interval, period=get_default_period(interval)
+        )
+        bars = converter.convert_to_batch(df, interval)
+        index = bars.index
+        if index.tz is not None:
+            index = index.tz_convert(PARTITION_TZ)
+        dates = index.normalize()
+        for day in dates.unique():
+            days.setdefault(day, {})[symbol] = bars.select(dates == day)
+    return [days[day] for day in sorted(days)]
+
+
+def prepare_table(engine, model, layout: str, days) -> None:
+    """一時スキーマにテーブルを作成し、指定のインデックス構成にする."""
+    table = model.__tablename__
+    column = "datetime" if hasattr(model, "datetime") else "date"
+    with engine.begin() as conn:
+        conn.execute(text(f"DROP SCHEMA IF EXISTS {SCHEMA} CASCADE"))
+        conn.execute(text(f"CREATE SCHEMA {SCHEMA}"))
+        model.__table__.create(conn)
+        first = next(iter(days[0].values())).time_range()[0]
+        last = next(iter(days[-1].values())).time_range()[1]
+        PartitionManager(PartitionConfig()).ensure_range(
+            conn, table, first, last
+        )
+        LAYOUTS[layout](conn, table, column)
+
+
+def load(engine, table: str, days) -> float:
+    """日ごとに全銘柄の足を保存し、経過秒を返す."""
+    raw = engine.raw_connection()
+    try:
+        start = time.perf_counter()
+        for bars_by_symbol in days:
+            cursor = raw.cursor()
+            upsert_bars(cursor, table, bars_by_symbol)
+            raw.commit()
+        elapsed = time.perf_counter() - start
+        cursor = raw.cursor()
+        cursor.execute(f"ANALYZE {table}")
+        raw.commit()
+        return elapsed
+    finally:
+        raw.close()
+
+
+def query_cases(model, days) -> Dict[str, List]:
+    """/api/stocks 相当の検索条件を作成."""
+    time_column = model.datetime if hasattr(model, "datetime") else model.date
+    symbol = next(iter(days[-1]))
+    last = next(iter(days[-1].values())).time_range()[1]
+    day_start = next(iter(days[len(days) // 2].values())).time_range()[0]
+    return {
+        "symbol_range": [
+            model.symbol == symbol,
+            time_column >= last - timedelta(days=5),
+        ],
+        "symbol_latest": [model.symbol == symbol],
+        "all_day": [
+            time_column >= day_start,
+            time_column < day_start + timedelta(days=1),
+        ],
+        "all_latest": [],
+    }
+
+
+def query_latency(engine, model, conditions, repeat: int) -> float:
+    """件数取得と1ページ分の取得の所要時間の中央値（ミリ秒）."""
+    time_column = model.datetime if hasattr(model, "datetime") else model.date
+    count_query = select(func.count()).select_from(model).where(*conditions)
+    page_query = (
+        select(model)
+        .where(*conditions)
+        .order_by(time_column.desc())
+        .limit(PAGE_SIZE)
+    )
+    timings = []
+    with engine.connect() as conn:
+        for _ in range(repeat):
+            start = time.perf_counter()
+            conn.execute(count_query).scalar()
+            conn.execute(page_query).all()
+            timings.append((time.perf_counter() - start) * 1000)
+    return statistics.median(timings)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--symbols", type=int, default=300)
+    parser.add_argument("--interval", default="5m")
+    parser.add_argument("--repeat", type=int, default=20)
+    args = parser.parse_args()
+
+    model = get_model_for_interval(args.interval)
+    table = model.__tablename__
+    days = load_days(args.symbols, args.interval)
+    rows = sum(len(bars) for day in days for bars in day.values())
+    cases = query_cases(model, days)
+    engine = create_engine(
+        DATABASE_URL, connect_args={"options": f"-csearch_path={SCHEMA}"}
+    )
+
+    print(
+        f"銘柄数: {args.symbols}, 時間軸: {args.interval}, "
+        f"行数: {rows}, 日数: {len(days)}"
+    )
+    print(
+        f"{'layout':>12} {'load (s)':>9} {'rows/s':>9} {'index MB':>9} "
+        + " ".join(f"{name + ' (ms)':>18}" for name in cases)
+    )
+    try:
+        for layout in LAYOUTS:
+            prepare_table(engine, model, layout, days)
+            elapsed = load(engine, table, days)
+            with engine.connect() as conn:
+                size = sum(index["size"] for index in audit(conn, table))
+            latencies = [
+                query_latency(engine, model, conditions, args.repeat)
+                for conditions in cases.values()
+            ]
+            print(
+                f"{layout:>12} {elapsed:>9.2f} {rows / elapsed:>9,.0f} "
+                f"{size / 1024 / 1024:>9.1f} "
+                + " ".join(f"{latency:>18.2f}" for latency in latencies)
+            )
+    finally:
+        with engine.begin() as conn:
+            conn.execute(text(f"DROP SCHEMA IF EXISTS {SCHEMA} CASCADE"))
+        engine.dispose()
+
+
+if __name__ == "__main__":
+    main()
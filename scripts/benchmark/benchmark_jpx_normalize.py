@@ -0,0 +1,156 @@
+"""JPX銘柄一覧の正規化・差分算出の処理時間計測スクリプト.
+
+JPXのExcel形式を模した合成の銘柄一覧（空白・欠損値・数値のコード列を
+含む）を使用し、銘柄マスタ更新API（POST /api/stock-master/）のうち
+DB書き込み以外の処理時間を計測します。
+
+- read_excel: Excelファイルの解析（参考値）
+- rows: 従来方式（iterrows と行ごとの値の取り出し）による正規化
+- frame: 列単位の文字列操作による正規化（更新APIが差分算出に渡す形式）
+- records: frame に加えて to_dict("records") で辞書リストに変換
+- diff: 正規化結果と現在の銘柄マスタ（1割が変更済み）との差分算出
+
+rows と records の結果を銘柄マスタの形式に揃えた上で一致することも
+確認します。
+
+Usage:
+    python scripts/benchmark/benchmark_jpx_normalize.py --rows 10000
+
+Note:
+    appパッケージの読み込み時にデータベース接続設定（.env）が必要です。
+"""
+
+import argparse
+from datetime import datetime
+from io import BytesIO
+import os
+import sys
+import time
+from typing import Any, Dict, List
+
+import numpy as np
+import pandas as pd
+
+
+# プロジェクトルートをパスに追加
+sys.path.insert(
+    0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..", ".."))
+)
+
+from app.services.jpx.jpx_stock_service import (  # noqa: E402
+    MASTER_FIELDS,
+    JPXStockService,
+)
+
+
+def make_excel(rows: int, seed: int = 0) -> bytes:
+    """JPXの銘柄一覧を模した合成Excelファイルを作成."""
+    rng = np.random.default_rng(seed)
+    sector = rng.integers(1, 34, rows)
+    # ETF等は業種・規模が "-"
+    fund = rng.random(rows) < 0.1
+    df = pd.DataFrame(
+        {
+            "日付": 20251001,
+            "コード": np.arange(1300, 1300 + rows),
+            "銘柄名": [f" 銘柄{i} " for i in range(rows)],
+            "市場・商品区分": np.where(
+                fund, "ETF・ETN", "プライム（内国株式）"
+            ),
+            "33業種コード": np.where(fund, "-", (sector * 50).astype(str)),
+            "33業種区分": np.where(fund, "-", "水産・農林業"),
+            "17業種コード": np.where(fund, "-", sector.astype(str)),
+            "17業種区分": np.where(fund, "-", "食品 "),
+            "規模コード": np.where(fund, "-", "7"),
+            "規模区分": np.where(fund, "-", "TOPIX Small 2"),
+        }
+    )
+    df.loc[rng.random(rows) < 0.05, "規模区分"] = np.nan
+    buffer = BytesIO()
+    df.to_excel(buffer, index=False)
+    return buffer.getvalue()
+
+
+def normalize_rows(df: pd.DataFrame) -> List[Dict[str, Any]]:
+    """従来方式（行単位）で正規化."""
+    source = df.rename(
+        columns={
+            "コード": "stock_code",
+            "銘柄名": "stock_name",
+            "市場・商品区分": "market_category",
+            "33業種コード": "sector_code_33",
+            "33業種区分": "sector_name_33",
+            "17業種コード": "sector_code_17",
+            "17業種区分": "sector_name_17",
+            "規模コード": "scale_code",
+            "規模区分": "scale_category",
+        }
+    )
+    source = source.dropna(subset=["stock_code", "stock_name"])
+    data_date = datetime.now().strftime("%Y%m%d")
+    records = []
+    for _, row in source.iterrows():
+        record = {"stock_code": str(row["stock_code"]).strip()}
+        for field in MASTER_FIELDS:
+            value = row[field]
+            record[field] = (
+                str(value).strip() if pd.notna(value) and value != "" else None
+            )
+        record["data_date"] = data_date
+        if record["stock_code"]:
+            records.append(record)
+    return records
+
+
+def _measure(function, *args):
+    """関数を実行し、(結果, 経過秒) を返す."""
+    start = time.perf_counter()
+    result = function(*args)
+    return result, time.perf_counter() - start
+
+
+def _current_master(frame: pd.DataFrame) -> pd.DataFrame:
+    """正規化結果の1割の市場区分を変えた現在の銘柄マスタ."""
+    current = frame.drop(columns="data_date").copy()
+    current.insert(0, "id", np.arange(1, len(current) + 1))
+    current["is_active"] = 1
+    current.loc[current.index % 10 == 0, "market_category"] = "スタンダード"
+    return current
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rows", type=int, nargs="+", default=[10_000])
+    args = parser.parse_args()
+
+    service = JPXStockService()
+
+    print(
+        f"{'rows':>7} {'read_excel':>11} {'rows':>7} {'frame':>7} "
+        f"{'records':>8} {'speedup':>8} {'diff':>7} {'identical':>10}"
+    )
+    for rows in args.rows:
+        raw, read_seconds = _measure(pd.read_excel, BytesIO(make_excel(rows)))
+        expected, row_seconds = _measure(normalize_rows, raw)
+        frame, frame_seconds = _measure(service._normalize_jpx_frame, raw)
+        actual, record_seconds = _measure(service._normalize_jpx_data, raw)
+
+        incoming = service._prepare_master_frame(frame)
+        identical = service._prepare_master_frame(
+            pd.DataFrame(expected)
+        ).equals(service._prepare_master_frame(pd.DataFrame(actual)))
+        diff, diff_seconds = _measure(
+            service._diff_stock_master, incoming, _current_master(incoming)
+        )
+        assert len(diff.changed) == len(incoming[::10])
+
+        print(
+            f"{rows:>7} {read_seconds:>10.3f}s {row_seconds:>6.3f}s "
+            f"{frame_seconds:>6.3f}s {record_seconds:>7.3f}s "
+            f"{row_seconds / frame_seconds:>7.1f}x {diff_seconds:>6.3f}s "
+            f"{str(identical):>10}"
+        )
+
+
+if __name__ == "__main__":
+    main()
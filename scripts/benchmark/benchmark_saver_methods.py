@@ -0,0 +1,134 @@
+"""StockDataSaver.save_batch_stock_data の保存方式ごとの書き込み速度計測.
+
+リプレイプロバイダーの合成データ（時間軸ごとの既定の取得期間）を使用し、
+以下の3つの場面について保存方式ごとの所要時間を計測します。
+
+- initial: 初回ロード（既存データなし）
+- reload: 再ロード（全件重複）
+- tail: 全履歴の保存後に末尾の数本だけを保存（日次の差分更新に相当）
+
+保存方式:
+
+- upsert: ON CONFLICT 付きの複数行 INSERT（execute_values）
+- copy: COPY による一時ステージングテーブル + INSERT ... ON CONFLICT
+- insert: 既存日付の事前取得 + INSERT（execute_values）
+
+計測用の銘柄（BENCH*.T）は計測前後に削除します。
+
+Usage:
+    python scripts/benchmark/benchmark_saver_methods.py --symbols 50 --interval 5m
+
+Note:
+    データベース接続設定（.env）が必要で、実際にデータを書き込みます。
+"""
+
+import argparse
+from datetime import datetime
+import os
+import sys
+import time
+from typing import Dict
+
+import numpy as np
+from sqlalchemy import text
+
+
+# プロジェクトルートをパスに追加
+sys.path.insert(
+    0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..", ".."))
+)
+
+from app.models import get_db_session  # noqa: E402
+from app.services.stock_data.bar_batch import BarBatch  # noqa: E402
+from app.services.stock_data.converter import (  # noqa: E402
+    StockDataConverter,
+)
+from app.services.stock_data.provider import (  # noqa: E402
+    ReplayProvider,
+    get_default_period,
+)
+from app.services.stock_data.saver import (  # noqa: E402
+    SAVE_METHODS,
+    StockDataSaver,
+)
+from app.utils.timeframe_utils import get_model_for_interval  # noqa: E402
+
+
+SYMBOL_PREFIX = "BENCH"
+
+
+def load_batches(symbols: int, interval: str) -> Dict[str, BarBatch]:
+    """合成データを銘柄数分読み込み BarBatch に変換."""
+    provider = ReplayProvider(now=datetime(2025, 1, 10, 15, 0))
+    converter = StockDataConverter()
+    batches = {}
+    for i in range(symbols):
+        symbol = f"{SYMBOL_PREFIX}{i:04d}.T"
+        df = provider.fetch_history(
+            symbol, interval, period=get_default_period(interval)
+        )
+        batches[symbol] = converter.convert_to_batch(df, interval)
+    return batches
+
+
+def delete_rows(interval: str) -> None:
+    """計測用の銘柄のデータを削除."""
+    table = get_model_for_interval(interval).__tablename__
+    with get_db_session() as session:
+        session.execute(
+            text(f"DELETE FROM {table} WHERE symbol LIKE :prefix"),
+            {"prefix": f"{SYMBOL_PREFIX}%"},
+        )
+
+
+def _measure(
+    saver: StockDataSaver,
+    batches: Dict[str, BarBatch],
+    interval: str,
+    method: str,
+) -> float:
+    """保存を実行し、経過秒を返す."""
+    start = time.perf_counter()
+    saver.save_batch_stock_data(batches, interval, method=method)
+    return time.perf_counter() - start
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--symbols", type=int, default=50)
+    parser.add_argument("--interval", default="5m")
+    parser.add_argument(
+        "--tail", type=int, default=5, help="tail で保存する末尾の本数"
+    )
+    args = parser.parse_args()
+
+    batches = load_batches(args.symbols, args.interval)
+    tails = {
+        symbol: bars.select(np.arange(len(bars)) >= len(bars) - args.tail)
+        for symbol, bars in batches.items()
+    }
+    rows = sum(len(bars) for bars in batches.values())
+    saver = StockDataSaver()
+
+    print(f"銘柄数: {args.symbols}, 時間軸: {args.interval}, 行数: {rows}")
+    print(
+        f"{'method':>7} {'initial (s)':>12} {'rows/s':>10} "
+        f"{'reload (s)':>11} {'tail (s)':>9}"
+    )
+    delete_rows(args.interval)
+    try:
+        for method in SAVE_METHODS:
+            initial = _measure(saver, batches, args.interval, method)
+            reload = _measure(saver, batches, args.interval, method)
+            tail = _measure(saver, tails, args.interval, method)
+            print(
+                f"{method:>7} {initial:>12.2f} {rows / initial:>10,.0f} "
+                f"{reload:>11.2f} {tail:>9.3f}"
+            )
+            delete_rows(args.interval)
+    finally:
+        delete_rows(args.interval)
+
+
+if __name__ == "__main__":
+    main()
@@ -63,7 +63,8 @@ CREATE TABLE IF NOT EXISTS stock_master_updates (
     added_stocks INTEGER DEFAULT 0,              -- 新規追加銘柄数
     updated_stocks INTEGER DEFAULT 0,            -- 更新銘柄数
     removed_stocks INTEGER DEFAULT 0,            -- 削除（無効化）銘柄数
-    status VARCHAR(20) NOT NULL,                 -- 'success', 'failed'
+    field_changes JSONB,                         -- 項目別の変更銘柄数
+    status VARCHAR(20) NOT NULL,                 -- 'success', 'failed', 'unchanged'
     error_message TEXT,
     started_at TIMESTAMP WITH TIME ZONE DEFAULT CURRENT_TIMESTAMP,
     completed_at TIMESTAMP WITH TIME ZONE
@@ -76,7 +77,8 @@ COMMENT ON COLUMN stock_master_updates.total_stocks IS '更新時の総銘柄数
 COMMENT ON COLUMN stock_master_updates.added_stocks IS '新規追加された銘柄数';
 COMMENT ON COLUMN stock_master_updates.updated_stocks IS '更新された銘柄数';
 COMMENT ON COLUMN stock_master_updates.removed_stocks IS '削除（無効化）された銘柄数';
-COMMENT ON COLUMN stock_master_updates.status IS '更新ステータス（success: 成功, failed: 失敗）';
+COMMENT ON COLUMN stock_master_updates.field_changes IS '項目別の変更銘柄数（例: {"market_category": 12}）';
+COMMENT ON COLUMN stock_master_updates.status IS '更新ステータス（success: 成功, failed: 失敗, unchanged: JPXのファイルが前回と同じため省略）';
 COMMENT ON COLUMN stock_master_updates.error_message IS 'エラーメッセージ（失敗時のみ）';
 
 -- ====================================
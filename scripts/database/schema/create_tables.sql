@@ -77,11 +77,8 @@ COMMENT ON COLUMN stocks_1d.volume IS '出来高';
 COMMENT ON COLUMN stocks_1d.created_at IS 'レコード作成日時';
 COMMENT ON COLUMN stocks_1d.updated_at IS 'レコード更新日時';
 
--- インデックス作成
-CREATE INDEX IF NOT EXISTS idx_stocks_1d_symbol ON stocks_1d (symbol);
-CREATE INDEX IF NOT EXISTS idx_stocks_1d_date ON stocks_1d (date);
-CREATE INDEX IF NOT EXISTS idx_stocks_1d_symbol_date_desc ON stocks_1d (symbol, date DESC);
-CREATE INDEX IF NOT EXISTS idx_stocks_1d_date_desc ON stocks_1d (date DESC);
+-- インデックス作成（銘柄・銘柄+日付の検索は一意制約のインデックスを使用）
+CREATE INDEX IF NOT EXISTS idx_stocks_1d_date_brin ON stocks_1d USING brin (date);
 
 -- トリガー作成
 DROP TRIGGER IF EXISTS trigger_update_stocks_1d_updated_at ON stocks_1d;
@@ -95,7 +92,7 @@ CREATE TRIGGER trigger_update_stocks_1d_updated_at
 -- =============================================================================
 
 CREATE TABLE IF NOT EXISTS stocks_1m (
-    id SERIAL PRIMARY KEY,
+    id SERIAL,
     symbol VARCHAR(20) NOT NULL,
     datetime TIMESTAMP WITH TIME ZONE NOT NULL,
     open DECIMAL(10,2) NOT NULL,
@@ -106,7 +103,8 @@ CREATE TABLE IF NOT EXISTS stocks_1m (
     created_at TIMESTAMP WITH TIME ZONE DEFAULT CURRENT_TIMESTAMP,
     updated_at TIMESTAMP WITH TIME ZONE DEFAULT CURRENT_TIMESTAMP,
 
-    -- 制約定義
+    -- 制約定義（パーティション化テーブルの一意制約は datetime を含む）
+    PRIMARY KEY (id, datetime),
     CONSTRAINT uk_stocks_1m_symbol_datetime UNIQUE (symbol, datetime),
     CONSTRAINT ck_stocks_1m_prices CHECK (
         open >= 0 AND high >= 0 AND low >= 0 AND close >= 0
@@ -119,16 +117,14 @@ CREATE TABLE IF NOT EXISTS stocks_1m (
         low <= open AND
         low <= close
     )
-);
+) PARTITION BY RANGE (datetime);
 
 -- テーブルコメント
 COMMENT ON TABLE stocks_1m IS '1分足株価データテーブル';
 COMMENT ON COLUMN stocks_1m.datetime IS '取引日時（精密な時刻）';
 
--- インデックス作成
-CREATE INDEX IF NOT EXISTS idx_stocks_1m_symbol ON stocks_1m (symbol);
-CREATE INDEX IF NOT EXISTS idx_stocks_1m_datetime ON stocks_1m (datetime);
-CREATE INDEX IF NOT EXISTS idx_stocks_1m_symbol_datetime_desc ON stocks_1m (symbol, datetime DESC);
+-- インデックス作成（銘柄・銘柄+日時の検索は一意制約のインデックスを使用）
+CREATE INDEX IF NOT EXISTS idx_stocks_1m_datetime_brin ON stocks_1m USING brin (datetime);
 
 -- トリガー作成
 DROP TRIGGER IF EXISTS trigger_update_stocks_1m_updated_at ON stocks_1m;
@@ -142,7 +138,7 @@ CREATE TRIGGER trigger_update_stocks_1m_updated_at
 -- =============================================================================
 
 CREATE TABLE IF NOT EXISTS stocks_5m (
-    id SERIAL PRIMARY KEY,
+    id SERIAL,
     symbol VARCHAR(20) NOT NULL,
     datetime TIMESTAMP WITH TIME ZONE NOT NULL,
     open DECIMAL(10,2) NOT NULL,
@@ -153,7 +149,8 @@ CREATE TABLE IF NOT EXISTS stocks_5m (
     created_at TIMESTAMP WITH TIME ZONE DEFAULT CURRENT_TIMESTAMP,
     updated_at TIMESTAMP WITH TIME ZONE DEFAULT CURRENT_TIMESTAMP,
 
-    -- 制約定義
+    -- 制約定義（パーティション化テーブルの一意制約は datetime を含む）
+    PRIMARY KEY (id, datetime),
     CONSTRAINT uk_stocks_5m_symbol_datetime UNIQUE (symbol, datetime),
     CONSTRAINT ck_stocks_5m_prices CHECK (
         open >= 0 AND high >= 0 AND low >= 0 AND close >= 0
@@ -166,15 +163,13 @@ CREATE TABLE IF NOT EXISTS stocks_5m (
         low <= open AND
         low <= close
     )
-);
+) PARTITION BY RANGE (datetime);
 
 -- テーブルコメント
 COMMENT ON TABLE stocks_5m IS '5分足株価データテーブル';
 
--- インデックス作成
-CREATE INDEX IF NOT EXISTS idx_stocks_5m_symbol ON stocks_5m (symbol);
-CREATE INDEX IF NOT EXISTS idx_stocks_5m_datetime ON stocks_5m (datetime);
-CREATE INDEX IF NOT EXISTS idx_stocks_5m_symbol_datetime_desc ON stocks_5m (symbol, datetime DESC);
+-- インデックス作成（銘柄・銘柄+日時の検索は一意制約のインデックスを使用）
+CREATE INDEX IF NOT EXISTS idx_stocks_5m_datetime_brin ON stocks_5m USING brin (datetime);
 
 -- トリガー作成
 DROP TRIGGER IF EXISTS trigger_update_stocks_5m_updated_at ON stocks_5m;
@@ -188,7 +183,7 @@ CREATE TRIGGER trigger_update_stocks_5m_updated_at
 -- =============================================================================
 
 CREATE TABLE IF NOT EXISTS stocks_15m (
-    id SERIAL PRIMARY KEY,
+    id SERIAL,
     symbol VARCHAR(20) NOT NULL,
     datetime TIMESTAMP WITH TIME ZONE NOT NULL,
     open DECIMAL(10,2) NOT NULL,
@@ -199,7 +194,8 @@ CREATE TABLE IF NOT EXISTS stocks_15m (
     created_at TIMESTAMP WITH TIME ZONE DEFAULT CURRENT_TIMESTAMP,
     updated_at TIMESTAMP WITH TIME ZONE DEFAULT CURRENT_TIMESTAMP,
 
-    -- 制約定義
+    -- 制約定義（パーティション化テーブルの一意制約は datetime を含む）
+    PRIMARY KEY (id, datetime),
     CONSTRAINT uk_stocks_15m_symbol_datetime UNIQUE (symbol, datetime),
     CONSTRAINT ck_stocks_15m_prices CHECK (
         open >= 0 AND high >= 0 AND low >= 0 AND close >= 0
@@ -212,15 +208,13 @@ CREATE TABLE IF NOT EXISTS stocks_15m (
         low <= open AND
         low <= close
     )
-);
+) PARTITION BY RANGE (datetime);
 
 -- テーブルコメント
 COMMENT ON TABLE stocks_15m IS '15分足株価データテーブル';
 
--- インデックス作成
-CREATE INDEX IF NOT EXISTS idx_stocks_15m_symbol ON stocks_15m (symbol);
-CREATE INDEX IF NOT EXISTS idx_stocks_15m_datetime ON stocks_15m (datetime);
-CREATE INDEX IF NOT EXISTS idx_stocks_15m_symbol_datetime_desc ON stocks_15m (symbol, datetime DESC);
+-- インデックス作成（銘柄・銘柄+日時の検索は一意制約のインデックスを使用）
+CREATE INDEX IF NOT EXISTS idx_stocks_15m_datetime_brin ON stocks_15m USING brin (datetime);
 
 -- トリガー作成
 DROP TRIGGER IF EXISTS trigger_update_stocks_15m_updated_at ON stocks_15m;
@@ -234,7 +228,7 @@ CREATE TRIGGER trigger_update_stocks_15m_updated_at
 -- =============================================================================
 
 CREATE TABLE IF NOT EXISTS stocks_30m (
-    id SERIAL PRIMARY KEY,
+    id SERIAL,
     symbol VARCHAR(20) NOT NULL,
     datetime TIMESTAMP WITH TIME ZONE NOT NULL,
     open DECIMAL(10,2) NOT NULL,
@@ -245,7 +239,8 @@ CREATE TABLE IF NOT EXISTS stocks_30m (
     created_at TIMESTAMP WITH TIME ZONE DEFAULT CURRENT_TIMESTAMP,
     updated_at TIMESTAMP WITH TIME ZONE DEFAULT CURRENT_TIMESTAMP,
 
-    -- 制約定義
+    -- 制約定義（パーティション化テーブルの一意制約は datetime を含む）
+    PRIMARY KEY (id, datetime),
     CONSTRAINT uk_stocks_30m_symbol_datetime UNIQUE (symbol, datetime),
     CONSTRAINT ck_stocks_30m_prices CHECK (
         open >= 0 AND high >= 0 AND low >= 0 AND close >= 0
@@ -258,15 +253,13 @@ CREATE TABLE IF NOT EXISTS stocks_30m (
         low <= open AND
         low <= close
     )
-);
+) PARTITION BY RANGE (datetime);
 
 -- テーブルコメント
 COMMENT ON TABLE stocks_30m IS '30分足株価データテーブル';
 
--- インデックス作成
-CREATE INDEX IF NOT EXISTS idx_stocks_30m_symbol ON stocks_30m (symbol);
-CREATE INDEX IF NOT EXISTS idx_stocks_30m_datetime ON stocks_30m (datetime);
-CREATE INDEX IF NOT EXISTS idx_stocks_30m_symbol_datetime_desc ON stocks_30m (symbol, datetime DESC);
+-- インデックス作成（銘柄・銘柄+日時の検索は一意制約のインデックスを使用）
+CREATE INDEX IF NOT EXISTS idx_stocks_30m_datetime_brin ON stocks_30m USING brin (datetime);
 
 -- トリガー作成
 DROP TRIGGER IF EXISTS trigger_update_stocks_30m_updated_at ON stocks_30m;
@@ -280,7 +273,7 @@ CREATE TRIGGER trigger_update_stocks_30m_updated_at
 -- =============================================================================
 
 CREATE TABLE IF NOT EXISTS stocks_1h (
-    id SERIAL PRIMARY KEY,
+    id SERIAL,
     symbol VARCHAR(20) NOT NULL,
     datetime TIMESTAMP WITH TIME ZONE NOT NULL,
     open DECIMAL(10,2) NOT NULL,
@@ -291,7 +284,8 @@ CREATE TABLE IF NOT EXISTS stocks_1h (
     created_at TIMESTAMP WITH TIME ZONE DEFAULT CURRENT_TIMESTAMP,
     updated_at TIMESTAMP WITH TIME ZONE DEFAULT CURRENT_TIMESTAMP,
 
-    -- 制約定義
+    -- 制約定義（パーティション化テーブルの一意制約は datetime を含む）
+    PRIMARY KEY (id, datetime),
     CONSTRAINT uk_stocks_1h_symbol_datetime UNIQUE (symbol, datetime),
     CONSTRAINT ck_stocks_1h_prices CHECK (
         open >= 0 AND high >= 0 AND low >= 0 AND close >= 0
@@ -304,15 +298,13 @@ CREATE TABLE IF NOT EXISTS stocks_1h (
         low <= open AND
         low <= close
     )
-);
+) PARTITION BY RANGE (datetime);
 
 -- テーブルコメント
 COMMENT ON TABLE stocks_1h IS '1時間足株価データテーブル';
 
--- インデックス作成
-CREATE INDEX IF NOT EXISTS idx_stocks_1h_symbol ON stocks_1h (symbol);
-CREATE INDEX IF NOT EXISTS idx_stocks_1h_datetime ON stocks_1h (datetime);
-CREATE INDEX IF NOT EXISTS idx_stocks_1h_symbol_datetime_desc ON stocks_1h (symbol, datetime DESC);
+-- インデックス作成（銘柄・銘柄+日時の検索は一意制約のインデックスを使用）
+CREATE INDEX IF NOT EXISTS idx_stocks_1h_datetime_brin ON stocks_1h USING brin (datetime);
 
 -- トリガー作成
 DROP TRIGGER IF EXISTS trigger_update_stocks_1h_updated_at ON stocks_1h;
@@ -321,6 +313,34 @@ CREATE TRIGGER trigger_update_stocks_1h_updated_at
     FOR EACH ROW
     EXECUTE FUNCTION update_updated_at_column();
 
+-- =============================================================================
+-- 分足・時間足テーブルの月単位パーティション作成
+-- 境界は Asia/Tokyo の月初、名前は <テーブル名>_pYYYYMM
+-- 以降の月と過去データの月はアプリケーションが保存時に作成する
+-- （app/services/stock_data/partitions.py）
+-- =============================================================================
+
+DO $$
+DECLARE
+    target TEXT;
+    month_start DATE;
+BEGIN
+    FOREACH target IN ARRAY ARRAY['stocks_1m', 'stocks_5m', 'stocks_15m', 'stocks_30m', 'stocks_1h']
+    LOOP
+        -- 当月から3か月先まで
+        FOR i IN 0..3 LOOP
+            month_start := (date_trunc('month', now() AT TIME ZONE 'Asia/Tokyo') + make_interval(months => i))::date;
+            EXECUTE format(
+                'CREATE TABLE IF NOT EXISTS %I PARTITION OF %I FOR VALUES FROM (%L) TO (%L)',
+                target || '_p' || to_char(month_start, 'YYYYMM'),
+                target,
+                month_start::text || ' 00:00:00+09',
+                (month_start + interval '1 month')::date::text || ' 00:00:00+09'
+            );
+        END LOOP;
+    END LOOP;
+END $$;
+
 -- =============================================================================
 -- 7. stocks_1wk テーブル作成（1週間足データ）
 -- =============================================================================
@@ -355,10 +375,8 @@ CREATE TABLE IF NOT EXISTS stocks_1wk (
 -- テーブルコメント
 COMMENT ON TABLE stocks_1wk IS '1週間足株価データテーブル';
 
--- インデックス作成
-CREATE INDEX IF NOT EXISTS idx_stocks_1wk_symbol ON stocks_1wk (symbol);
-CREATE INDEX IF NOT EXISTS idx_stocks_1wk_date ON stocks_1wk (date);
-CREATE INDEX IF NOT EXISTS idx_stocks_1wk_symbol_date_desc ON stocks_1wk (symbol, date DESC);
+-- インデックス作成（銘柄・銘柄+日付の検索は一意制約のインデックスを使用）
+CREATE INDEX IF NOT EXISTS idx_stocks_1wk_date_brin ON stocks_1wk USING brin (date);
 
 -- トリガー作成
 DROP TRIGGER IF EXISTS trigger_update_stocks_1wk_updated_at ON stocks_1wk;
@@ -401,10 +419,8 @@ CREATE TABLE IF NOT EXISTS stocks_1mo (
 -- テーブルコメント
 COMMENT ON TABLE stocks_1mo IS '1ヶ月足株価データテーブル';
 
--- インデックス作成
-CREATE INDEX IF NOT EXISTS idx_stocks_1mo_symbol ON stocks_1mo (symbol);
-CREATE INDEX IF NOT EXISTS idx_stocks_1mo_date ON stocks_1mo (date);
-CREATE INDEX IF NOT EXISTS idx_stocks_1mo_symbol_date_desc ON stocks_1mo (symbol, date DESC);
+-- インデックス作成（銘柄・銘柄+日付の検索は一意制約のインデックスを使用）
+CREATE INDEX IF NOT EXISTS idx_stocks_1mo_date_brin ON stocks_1mo USING brin (date);
 
 -- トリガー作成
 DROP TRIGGER IF EXISTS trigger_update_stocks_1mo_updated_at ON stocks_1mo;
@@ -480,6 +496,7 @@ CREATE TABLE IF NOT EXISTS stock_master_updates (
     added_stocks INTEGER DEFAULT 0,
     updated_stocks INTEGER DEFAULT 0,
     removed_stocks INTEGER DEFAULT 0,
+    field_changes JSONB,
     status VARCHAR(20) NOT NULL,
     error_message TEXT,
     started_at TIMESTAMP WITH TIME ZONE DEFAULT CURRENT_TIMESTAMP,
@@ -493,7 +510,8 @@ COMMENT ON COLUMN stock_master_updates.total_stocks IS '更新後の総銘柄数
 COMMENT ON COLUMN stock_master_updates.added_stocks IS '追加された銘柄数';
 COMMENT ON COLUMN stock_master_updates.updated_stocks IS '更新された銘柄数';
 COMMENT ON COLUMN stock_master_updates.removed_stocks IS '削除された銘柄数';
-COMMENT ON COLUMN stock_master_updates.status IS 'ステータス（success, failed）';
+COMMENT ON COLUMN stock_master_updates.field_changes IS '項目別の変更銘柄数';
+COMMENT ON COLUMN stock_master_updates.status IS 'ステータス（success, failed, unchanged）';
 COMMENT ON COLUMN stock_master_updates.error_message IS 'エラーメッセージ（失敗時）';
 
 -- =============================================================================
@@ -511,12 +529,13 @@ CREATE TABLE IF NOT EXISTS batch_executions (
     start_time TIMESTAMP WITH TIME ZONE DEFAULT CURRENT_TIMESTAMP,
     end_time TIMESTAMP WITH TIME ZONE,
     error_message TEXT,
+    summary JSONB,
     created_at TIMESTAMP WITH TIME ZONE DEFAULT CURRENT_TIMESTAMP
 );
 
 -- テーブルコメント
 COMMENT ON TABLE batch_executions IS 'バッチ実行情報テーブル - バッチ処理の実行状況を管理 (Phase 2)';
-COMMENT ON COLUMN batch_executions.batch_type IS 'バッチタイプ（all_stocks, partial, etc.）';
+COMMENT ON COLUMN batch_executions.batch_type IS 'バッチタイプ（all_stocks, partial, retention, etc.）';
 COMMENT ON COLUMN batch_executions.status IS 'ステータス（running, completed, failed, paused）';
 COMMENT ON COLUMN batch_executions.total_stocks IS '総銘柄数';
 COMMENT ON COLUMN batch_executions.processed_stocks IS '処理済み銘柄数';
@@ -525,6 +544,7 @@ COMMENT ON COLUMN batch_executions.failed_stocks IS '失敗銘柄数';
 COMMENT ON COLUMN batch_executions.start_time IS 'バッチ開始時刻';
 COMMENT ON COLUMN batch_executions.end_time IS 'バッチ終了時刻';
 COMMENT ON COLUMN batch_executions.error_message IS 'エラーメッセージ';
+COMMENT ON COLUMN batch_executions.summary IS '処理結果の集計（データ保持ジョブの削除件数など）';
 
 -- インデックス作成
 CREATE INDEX IF NOT EXISTS idx_batch_executions_status ON batch_executions (status);
@@ -569,6 +589,63 @@ CREATE INDEX IF NOT EXISTS idx_batch_execution_details_status ON batch_execution
 CREATE INDEX IF NOT EXISTS idx_batch_execution_details_stock_code ON batch_execution_details (stock_code);
 CREATE INDEX IF NOT EXISTS idx_batch_execution_details_batch_stock ON batch_execution_details (batch_execution_id, stock_code);
 
+-- =============================================================================
+-- 13. bar_coverage テーブル作成（銘柄・時間軸ごとのデータ範囲）
+-- =============================================================================
+
+CREATE TABLE IF NOT EXISTS bar_coverage (
+    symbol VARCHAR(20) NOT NULL,
+    interval VARCHAR(10) NOT NULL,
+    row_count BIGINT NOT NULL DEFAULT 0,
+    first_at TIMESTAMP WITH TIME ZONE,
+    last_at TIMESTAMP WITH TIME ZONE,
+    last_fetched_at TIMESTAMP WITH TIME ZONE,
+    updated_at TIMESTAMP WITH TIME ZONE DEFAULT CURRENT_TIMESTAMP,
+
+    PRIMARY KEY (symbol, interval),
+    CONSTRAINT ck_bar_coverage_row_count CHECK (row_count >= 0)
+);
+
+-- テーブルコメント
+COMMENT ON TABLE bar_coverage IS '銘柄・時間軸ごとの保存件数と期間（株価データの保存と同じトランザクションで更新）';
+COMMENT ON COLUMN bar_coverage.row_count IS '保存件数';
+COMMENT ON COLUMN bar_coverage.first_at IS '最初の足の日時（日足以上は Asia/Tokyo の日付の0時）';
+COMMENT ON COLUMN bar_coverage.last_at IS '最後の足の日時（日足以上は Asia/Tokyo の日付の0時）';
+COMMENT ON COLUMN bar_coverage.last_fetched_at IS '最後に取得データを保存した日時';
+
+-- インデックス作成
+CREATE INDEX IF NOT EXISTS idx_bar_coverage_interval_last_at ON bar_coverage (interval, last_at);
+
+-- =============================================================================
+-- 14. bar_chunks テーブル作成（圧縮保存した古い株価データ）
+-- =============================================================================
+
+CREATE TABLE IF NOT EXISTS bar_chunks (
+    symbol VARCHAR(20) NOT NULL,
+    interval VARCHAR(10) NOT NULL,
+    month DATE NOT NULL,
+    row_count INTEGER NOT NULL,
+    first_at TIMESTAMP WITH TIME ZONE NOT NULL,
+    last_at TIMESTAMP WITH TIME ZONE NOT NULL,
+    data BYTEA NOT NULL,
+    updated_at TIMESTAMP WITH TIME ZONE DEFAULT CURRENT_TIMESTAMP,
+
+    PRIMARY KEY (symbol, interval, month),
+    CONSTRAINT ck_bar_chunks_row_count CHECK (row_count > 0)
+);
+
+-- 圧縮済みのデータは再圧縮しない（TOAST の圧縮を行わない）
+ALTER TABLE bar_chunks ALTER COLUMN data SET STORAGE EXTERNAL;
+
+-- テーブルコメント
+COMMENT ON TABLE bar_chunks IS '古い株価データを銘柄・時間軸・月ごとに差分符号化・圧縮した列データ';
+COMMENT ON COLUMN bar_chunks.month IS '対象月（Asia/Tokyo の月初日）';
+COMMENT ON COLUMN bar_chunks.row_count IS '格納している足の数';
+COMMENT ON COLUMN bar_chunks.data IS '差分符号化・圧縮した列データ（形式は app/services/stock_data/archive.py）';
+
+-- インデックス作成
+CREATE INDEX IF NOT EXISTS idx_bar_chunks_interval_month ON bar_chunks (interval, month);
+
 -- =============================================================================
 -- 実行結果確認
 -- =============================================================================
@@ -579,7 +656,7 @@ SELECT
     tablename as "テーブル名",
     tableowner as "所有者"
 FROM pg_tables
-WHERE tablename LIKE 'stocks_%' OR tablename LIKE 'stock_master%' OR tablename LIKE 'batch_%'
+WHERE tablename LIKE 'stocks_%' OR tablename LIKE 'stock_master%' OR tablename LIKE 'batch_%' OR tablename IN ('bar_coverage', 'bar_chunks')
 ORDER BY tablename;
 
 -- テーブル作成成功メッセージ
@@ -598,6 +675,9 @@ BEGIN
     RAISE NOTICE '【銘柄マスタテーブル（2テーブル）】';
     RAISE NOTICE '  - stock_master (JPX銘柄一覧 - 全項目対応版)';
     RAISE NOTICE '  - stock_master_updates (更新履歴)';
+    RAISE NOTICE '【データ範囲・圧縮保存テーブル】';
+    RAISE NOTICE '  - bar_coverage (銘柄・時間軸ごとの件数・期間)';
+    RAISE NOTICE '  - bar_chunks (圧縮保存した古い株価データ)';
     RAISE NOTICE 'インデックス、制約、トリガーも設定完了';
     RAISE NOTICE '次は初期データの投入を行ってください';
 END $$;
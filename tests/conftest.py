@@ -48,6 +48,61 @@ def client(app):
 # 例: モックDB、テストデータ、共通セットアップ等
 
 
+@pytest.fixture(autouse=True)
+def reset_shared_fetch_state(monkeypatch):
+    """上流リクエスト制御の共有インスタンスをテストごとに初期化.
+
+    失敗系のテストで作動したサーキットブレーカーや流量制御の状態が
+    後続のテストに影響しないようにします。また、テストでは上流への
+    リクエスト間隔の待機を行わないよう、レートの初期値を引き上げます。
+    """
+    monkeypatch.setenv("FETCH_RATE_INITIAL", "1000")
+    monkeypatch.setenv("FETCH_RATE_MAX", "1000")
+    yield
+    for module_name, reset_name in (
+        ("app.services.common.circuit_breaker", "reset_circuit_breaker"),
+        ("app.services.common.fetch_gateway", "reset_fetch_gateway"),
+        ("app.services.common.rate_controller", "reset_rate_controller"),
+        ("app.services.common.single_flight", "reset_single_flight"),
+        ("app.services.stock_data.response_cache", "reset_response_cache"),
+        ("app.services.stock_data.write_spool", "reset_write_spool"),
+        ("app.services.jpx.master_cache", "reset_jpx_master_cache"),
+        ("app.services.stock_data.partitions", "reset_partition_manager"),
+    ):
+        module = sys.modules.get(module_name)
+        if module is not None:
+            getattr(module, reset_name)()
+
+
+class FakeClock:
+    """テスト用の時計（now を書き換えて時間の経過を再現）."""
+
+    def __init__(self, now: float = 1000.0):
+        """初期化."""
+        self.now = now
+
+    def __call__(self):
+        return self.now
+
+
+@pytest.fixture
+def clock():
+    """テスト用の時計.
+
+    時刻を引数で受け取るクラス（clock=...）に渡し、``clock.now`` を
+    進めて待機時間や有効期限の経過を再現します。
+    """
+    return FakeClock()
+
+
+@pytest.fixture
+def postgresql_bind(mocker):
+    """接続先が PostgreSQL のモック接続（execute の呼び出しを検証する）."""
+    bind = mocker.Mock(spec=["execute", "dialect"])
+    bind.dialect.name = "postgresql"
+    return bind
+
+
 # ===== 環境設定フィクスチャ =====
 @pytest.fixture
 def setup_test_env(monkeypatch):
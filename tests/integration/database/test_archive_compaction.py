@@ -0,0 +1,380 @@
+"""古い株価データの圧縮保存（bar_chunks）の結合テスト.
+
+PostgreSQLの一時スキーマにパーティション化した stocks_1m と stocks_1d /
+bar_coverage / bar_chunks を作成し（テスト終了時にスキーマごと削除）、
+以下を検証します:
+1. 境界より前の月の足が銘柄・月ごとの1行に移り、同じ値で読み出せること
+2. 空になった月のパーティションを削除すること
+3. 圧縮後に保存された足を次回の圧縮で統合し、時間軸テーブルの値を
+   優先すること
+4. 移動の前後で bar_coverage の件数・期間が変わらないこと
+5. 日時の降順のページは新しい月だけを復元し、件数を row_count から
+   求めること
+6. 圧縮済みの期間を再保存しても時間軸テーブル・件数に重複させないこと
+"""
+
+from datetime import date, datetime, timedelta
+import os
+
+from dotenv import load_dotenv
+import pytest
+from sqlalchemy import create_engine, text
+from sqlalchemy.exc import OperationalError
+from sqlalchemy.orm import Session
+
+from app.models import BarChunk, BarCoverage, Stocks1d, Stocks1m
+from app.services.batch.batch_service import BatchService
+from app.services.stock_data import archive, coverage
+from app.services.stock_data.bar_batch import BarBatch
+from app.services.stock_data.partitions import (
+    PARTITION_TZ,
+    PartitionConfig,
+    PartitionManager,
+    get_partition_manager,
+)
+from app.services.stock_data.saver import StockDataSaver
+
+
+load_dotenv(os.path.join(os.path.dirname(__file__), "..", "..", ".env"))
+
+pytestmark = pytest.mark.integration
+
+SCHEMA = "archive_test"
+
+NOW = datetime(2025, 6, 10, 12, 0, tzinfo=PARTITION_TZ)
+
+
+@pytest.fixture
+def engine():
+    """一時スキーマを検索パスとするエンジン（終了時にスキーマを削除）."""
+    url = (
+        f"postgresql://{os.getenv('DB_USER')}:{os.getenv('DB_PASSWORD')}@"
+        f"{os.getenv('DB_HOST')}:{os.getenv('DB_PORT')}/{os.getenv('DB_NAME')}"
+    )
+    engine = create_engine(
+        url, connect_args={"options": f"-csearch_path={SCHEMA}"}
+    )
+    try:
+        with engine.begin() as conn:
+            conn.execute(text(f"DROP SCHEMA IF EXISTS {SCHEMA} CASCADE"))
+            conn.execute(text(f"CREATE SCHEMA {SCHEMA}"))
+            Stocks1m.__table__.create(conn)
+            Stocks1d.__table__.create(conn)
+            BarCoverage.__table__.create(conn)
+            BarChunk.__table__.create(conn)
+    except OperationalError:
+        engine.dispose()
+        pytest.skip("PostgreSQLに接続できません")
+    yield engine
+    with engine.begin() as conn:
+        conn.execute(text(f"DROP SCHEMA IF EXISTS {SCHEMA} CASCADE"))
+    engine.dispose()
+
+
+@pytest.fixture(autouse=True)
+def batch_service(monkeypatch):
+    """バッチ実行履歴（BatchExecution）への記録を無効化."""
+    for name in (
+        "create_batch",
+        "create_batch_detail",
+        "update_batch_detail",
+        "update_batch_progress",
+        "complete_batch",
+    ):
+        monkeypatch.setattr(
+            BatchService, name, staticmethod(lambda *a, **k: {"id": 1})
+        )
+
+
+def _insert_minutes(conn, symbol: str, start: datetime, count: int, base=100):
+    """1分間隔で値が1ずつ増える分足を挿入."""
+    conn.execute(
+        text(
+            "INSERT INTO stocks_1m "
+            "(symbol, datetime, open, high, low, close, volume) "
+            "VALUES (:symbol, :at, :open, :high, :low, :close, :volume)"
+        ),
+        [
+            {
+                "symbol": symbol,
+                "at": start + timedelta(minutes=i),
+                "open": base + i + 0.25,
+                "high": base + i + 1,
+                "low": base + i - 1,
+                "close": base + i + 0.5,
+                "volume": 1000 + i,
+            }
+            for i in range(count)
+        ],
+    )
+
+
+def _compactor(engine, manager, intervals):
+    """180日より前の月を圧縮するジョブ."""
+    return archive.ArchiveCompactor(
+        archive.ArchiveConfig(after_days=180, intervals=intervals),
+        engine=engine,
+        partition_manager=manager,
+    )
+
+
+def test_compaction_moves_old_months_and_reads_back(engine):
+    """境界より前の月を圧縮し、時間軸テーブルと同じ値で読み出す."""
+    # Arrange (準備)
+    manager = PartitionManager(PartitionConfig())
+    october = datetime(2024, 10, 7, 9, 0, tzinfo=PARTITION_TZ)
+    november = datetime(2024, 11, 5, 9, 0, tzinfo=PARTITION_TZ)
+    recent = datetime(2025, 6, 2, 9, 0, tzinfo=PARTITION_TZ)
+    with engine.begin() as conn:
+        for at in (october, november, recent):
+            manager.ensure_range(conn, "stocks_1m", at, at)
+        _insert_minutes(conn, "7203.T", october, 30)
+        _insert_minutes(conn, "6758.T", october, 10, base=2000)
+        _insert_minutes(conn, "7203.T", november, 20)
+        _insert_minutes(conn, "7203.T", recent, 5)
+        coverage.rebuild(conn, "1m")
+        before = coverage.get_coverage(conn, intervals=["1m"])[0]
+        expected = conn.execute(
+            text(
+                "SELECT datetime, open, close, volume FROM stocks_1m "
+                "WHERE symbol = '7203.T' AND datetime < :recent "
+                "ORDER BY datetime"
+            ),
+            {"recent": recent},
+        ).all()
+
+    # Act (実行)
+    result = _compactor(engine, manager, ["1m"]).run(NOW)
+
+    # Assert (検証)
+    assert result["archived_rows"] == 60
+    assert result["chunks"] == 3
+    assert result["intervals"][0]["months"] == ["2024-10-01", "2024-11-01"]
+    assert result["intervals"][0]["dropped_partitions"] == [
+        "stocks_1m_p202410",
+        "stocks_1m_p202411",
+    ]
+    with engine.connect() as conn:
+        assert (
+            conn.execute(text("SELECT count(*) FROM stocks_1m")).scalar() == 5
+        )
+        assert [
+            p["name"] for p in manager.list_partitions(conn, "stocks_1m")
+        ] == ["stocks_1m_p202506"]
+        assert coverage.get_coverage(conn, intervals=["1m"])[0] == before
+        bars = archive.read_archived(conn, "1m", "7203.T")["7203.T"]
+    assert len(bars) == 50
+    assert [(at, float(o), float(c), v) for at, o, c, v in expected] == [
+        (at, o, c, v)
+        for at, o, c, v in zip(
+            bars.times(0, len(bars)), bars.open, bars.close, bars.volume
+        )
+    ]
+
+
+def test_late_bars_are_merged_and_override_archived_values(engine):
+    """圧縮後に保存した足は読み出し時・次回の圧縮で時間軸テーブルを優先する."""
+    # Arrange (準備)
+    manager = PartitionManager(PartitionConfig())
+    october = datetime(2024, 10, 7, 9, 0, tzinfo=PARTITION_TZ)
+    with engine.begin() as conn:
+        manager.ensure_range(conn, "stocks_1m", october, october)
+        _insert_minutes(conn, "7203.T", october, 10)
+        coverage.rebuild(conn, "1m")
+    compactor = _compactor(engine, manager, ["1m"])
+    compactor.run(NOW)
+    with engine.begin() as conn:
+        manager.ensure_range(conn, "stocks_1m", october, october)
+        _insert_minutes(
+            conn, "7203.T", october + timedelta(minutes=8), 4, base=500
+        )
+        coverage.record_saved(
+            conn,
+            "1m",
+            {
+                "7203.T": (
+                    4,
+                    (
+                        october + timedelta(minutes=8),
+                        october + timedelta(minutes=11),
+                    ),
+                )
+            },
+        )
+
+    # Act (実行)
+    with engine.connect() as conn:
+        pending = archive.read_archived(conn, "1m", "7203.T")["7203.T"]
+    result = compactor.run(NOW)
+
+    # Assert (検証)
+    assert len(pending) == 8
+    assert result["archived_rows"] == 4
+    with engine.connect() as conn:
+        bars = archive.read_archived(conn, "1m", "7203.T")["7203.T"]
+        row = coverage.get_coverage(conn, ["7203.T"], ["1m"])[0][0]
+    assert len(bars) == 12
+    assert list(bars.close[8:]) == [500.5, 501.5, 502.5, 503.5]
+    # 保存時に新規挿入として加算した重複2件は統合時に減算される
+    assert row["record_count"] == 12
+    assert row["first"] == october
+    assert row["latest"] == october + timedelta(minutes=11)
+
+
+def test_daily_read_range_and_data_ranges(engine):
+    """日足の期間指定の読み出しと、圧縮済みの足を含む件数を返す."""
+    # Arrange (準備)
+    with engine.begin() as conn:
+        conn.execute(
+            text(
+                "INSERT INTO stocks_1d "
+                "(symbol, date, open, high, low, close, volume) "
+                "VALUES ('7203.T', :day, 100, 110, 90, 105, 10)"
+            ),
+            [{"day": date(2024, 9, 2) + timedelta(days=i)} for i in range(40)],
+        )
+    _compactor(engine, PartitionManager(PartitionConfig()), ["1d"]).run(NOW)
+
+    # Act (実行)
+    with engine.connect() as conn:
+        archived = archive.read_archived(
+            conn, "1d", "7203.T", date(2024, 9, 29), date(2024, 10, 3)
+        )
+        ranges = archive.archived_ranges(conn, ["7203.T", "6758.T"], "1d")
+
+    # Assert (検証)
+    assert archived["7203.T"].times(0, 4) == [
+        date(2024, 9, 29),
+        date(2024, 9, 30),
+        date(2024, 10, 1),
+        date(2024, 10, 2),
+    ]
+    assert ranges == {
+        "7203.T": {"latest_date": date(2024, 10, 11), "record_count": 40}
+    }
+
+
+def test_page_decodes_only_newest_months_and_counts_from_row_count(
+    engine, monkeypatch
+):
+    """降順のページは新しい月だけを復元し、件数は row_count から求める."""
+    # Arrange (準備)
+    manager = PartitionManager(PartitionConfig())
+    months = [
+        datetime(2024, 9, 2, 9, 0, tzinfo=PARTITION_TZ),
+        datetime(2024, 10, 7, 9, 0, tzinfo=PARTITION_TZ),
+        datetime(2024, 11, 5, 9, 0, tzinfo=PARTITION_TZ),
+    ]
+    with engine.begin() as conn:
+        for at in months:
+            manager.ensure_range(conn, "stocks_1m", at, at)
+            _insert_minutes(conn, "7203.T", at, 10)
+            _insert_minutes(conn, "6758.T", at, 10, base=2000)
+        coverage.rebuild(conn, "1m")
+    _compactor(engine, manager, ["1m"]).run(NOW)
+    decoded = []
+    decode_chunk = archive.decode_chunk
+
+    def spy(data, interval):
+        bars = decode_chunk(data, interval)
+        decoded.append(bars.times(0, 1)[0])
+        return bars
+
+    monkeypatch.setattr(archive, "decode_chunk", spy)
+
+    # Act (実行)
+    with engine.connect() as conn:
+        chunks = archive.list_chunks(conn, "1m")
+        archived, total = archive.read_archived_page(conn, "1m", chunks, [], 5)
+        page = archive.merge_page([], archived, limit=5, offset=0)
+        decoded_first = list(decoded)
+        decoded.clear()
+        partial = archive.list_chunks(
+            conn, "1m", "7203.T", months[1] + timedelta(minutes=4)
+        )
+        _, partial_total = archive.read_archived_page(
+            conn,
+            "1m",
+            partial,
+            [],
+            5,
+            months[1] + timedelta(minutes=4),
+        )
+
+    # Assert (検証)
+    assert [chunk.month for chunk in chunks] == [
+        date(2024, 11, 1),
+        date(2024, 11, 1),
+        date(2024, 10, 1),
+        date(2024, 10, 1),
+        date(2024, 9, 1),
+        date(2024, 9, 1),
+    ]
+    assert total == 60
+    assert decoded_first == [months[2], months[2]]
+    assert [row["datetime"][5:16] for row in page] == [
+        "11-05T09:09",
+        "11-05T09:09",
+        "11-05T09:08",
+        "11-05T09:08",
+        "11-05T09:07",
+    ]
+    # 期間の境界にかかる10月だけを数えるために復元する
+    assert partial_total == 16
+    assert decoded == [months[1], months[2]]
+
+
+def test_saving_archived_period_skips_archived_bars(engine):
+    """圧縮済みの期間を再保存しても時間軸テーブルに書き戻さない."""
+    # Arrange (準備)
+    manager = get_partition_manager()
+    manager.invalidate("stocks_1m")
+    october = datetime(2024, 10, 7, 9, 0, tzinfo=PARTITION_TZ)
+    recent = datetime(2025, 6, 2, 9, 0, tzinfo=PARTITION_TZ)
+    with engine.begin() as conn:
+        manager.ensure_range(conn, "stocks_1m", october, october)
+        _insert_minutes(conn, "7203.T", october, 10)
+        coverage.rebuild(conn, "1m")
+    _compactor(engine, manager, ["1m"]).run(NOW)
+    bars = BarBatch.from_records(
+        [
+            {
+                "datetime": at + timedelta(minutes=i),
+                "open": 1,
+                "high": 1,
+                "low": 1,
+                "close": 1,
+                "volume": 1,
+            }
+            for at, count in ((october, 10), (recent, 3))
+            for i in range(count)
+        ],
+        "1m",
+    )
+
+    # Act (実行)
+    with engine.begin() as conn:
+        counts = StockDataSaver()._write_bars(
+            Session(bind=conn),
+            Stocks1m,
+            {"7203.T": bars},
+            "7203.T",
+            "1m",
+            "upsert",
+            "reconcile",
+        )
+
+    # Assert (検証)
+    # 圧縮済みの10件は除き、新しい3件だけを保存する
+    assert counts == {"7203.T": {"inserted": 3, "updated": 0}}
+    with engine.connect() as conn:
+        assert [
+            p["name"] for p in manager.list_partitions(conn, "stocks_1m")
+        ] == ["stocks_1m_p202506"]
+        assert (
+            conn.execute(text("SELECT count(*) FROM stocks_1m")).scalar() == 3
+        )
+        row = coverage.get_coverage(conn, ["7203.T"], ["1m"])[0][0]
+        ranges = archive.archived_ranges(conn, ["7203.T"], "1m")
+    assert row["record_count"] == 13
+    assert ranges["7203.T"]["record_count"] == 10
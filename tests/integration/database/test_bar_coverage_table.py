@@ -0,0 +1,145 @@
+"""bar_coverage（銘柄・時間軸ごとのデータ範囲）の結合テスト.
+
+PostgreSQLの一時スキーマに stocks_1d / stocks_1m / bar_coverage /
+bar_chunks を作成し（テスト終了時にスキーマごと削除）、以下を検証します:
+1. 保存時の更新で件数が加算され、期間が広がること
+2. 日足の日付が Asia/Tokyo の日付のまま往復すること
+3. 再構築で時間軸テーブルの集計値に戻り、取得日時は保持されること
+"""
+
+from datetime import date, datetime
+import os
+
+from dotenv import load_dotenv
+import pytest
+from sqlalchemy import create_engine, text
+from sqlalchemy.exc import OperationalError
+
+from app.models import BarChunk, BarCoverage, Stocks1d, Stocks1m
+from app.services.stock_data import coverage
+from app.services.stock_data.partitions import (
+    PARTITION_TZ,
+    PartitionConfig,
+    PartitionManager,
+)
+
+
+load_dotenv(os.path.join(os.path.dirname(__file__), "..", "..", ".env"))
+
+pytestmark = pytest.mark.integration
+
+SCHEMA = "bar_coverage_test"
+
+
+@pytest.fixture
+def engine():
+    """一時スキーマを検索パスとするエンジン（終了時にスキーマを削除）."""
+    url = (
+        f"postgresql://{os.getenv('DB_USER')}:{os.getenv('DB_PASSWORD')}@"
+        f"{os.getenv('DB_HOST')}:{os.getenv('DB_PORT')}/{os.getenv('DB_NAME')}"
+    )
+    engine = create_engine(
+        url, connect_args={"options": f"-csearch_path={SCHEMA}"}
+    )
+    try:
+        with engine.begin() as conn:
+            conn.execute(text(f"DROP SCHEMA IF EXISTS {SCHEMA} CASCADE"))
+            conn.execute(text(f"CREATE SCHEMA {SCHEMA}"))
+            Stocks1d.__table__.create(conn)
+            Stocks1m.__table__.create(conn)
+            BarCoverage.__table__.create(conn)
+            BarChunk.__table__.create(conn)
+    except OperationalError:
+        engine.dispose()
+        pytest.skip("PostgreSQLに接続できません")
+    yield engine
+    with engine.begin() as conn:
+        conn.execute(text(f"DROP SCHEMA IF EXISTS {SCHEMA} CASCADE"))
+    engine.dispose()
+
+
+def _insert_daily(conn, symbol: str, days) -> None:
+    """日足を挿入."""
+    for day in days:
+        conn.execute(
+            text(
+                "INSERT INTO stocks_1d "
+                "(symbol, date, open, high, low, close, volume) "
+                "VALUES (:symbol, :day, 100, 110, 90, 105, 10)"
+            ),
+            {"symbol": symbol, "day": day},
+        )
+
+
+def _ranges(conn, interval: str):
+    """時間軸のデータ範囲を {銘柄コード: 行} で取得."""
+    rows, _ = coverage.get_coverage(conn, intervals=[interval])
+    return {row["symbol"]: row for row in rows}
+
+
+def test_record_saved_accumulates_counts_and_widens_range(engine):
+    """保存のたびに件数を加算し、期間を保存した足の範囲まで広げる."""
+    # Act (実行)
+    with engine.begin() as conn:
+        coverage.record_saved(
+            conn, "1d", {"7203.T": (2, (date(2025, 1, 6), date(2025, 1, 7)))}
+        )
+    with engine.begin() as conn:
+        coverage.record_saved(
+            conn,
+            "1d",
+            {
+                "7203.T": (1, (date(2025, 1, 8), date(2025, 1, 8))),
+                "6758.T": (0, (None, None)),
+            },
+        )
+
+    # Assert (検証)
+    with engine.connect() as conn:
+        ranges = _ranges(conn, "1d")
+    assert ranges["7203.T"]["record_count"] == 3
+    assert ranges["7203.T"]["first"] == date(2025, 1, 6)
+    assert ranges["7203.T"]["latest"] == date(2025, 1, 8)
+    assert ranges["7203.T"]["last_fetched_at"] is not None
+    assert ranges["6758.T"]["record_count"] == 0
+    assert ranges["6758.T"]["latest"] is None
+
+
+def test_rebuild_restores_table_counts_and_keeps_fetch_time(engine):
+    """再構築で時間軸テーブルの件数・期間に戻し、取得日時は保持する."""
+    # Arrange (準備)
+    with engine.begin() as conn:
+        _insert_daily(conn, "7203.T", [date(2025, 1, 6), date(2025, 1, 7)])
+        coverage.record_saved(
+            conn, "1d", {"7203.T": (99, (date(2024, 1, 1), date(2025, 1, 7)))}
+        )
+        fetched_at = _ranges(conn, "1d")["7203.T"]["last_fetched_at"]
+        minute = datetime(2025, 1, 6, 9, 0, tzinfo=PARTITION_TZ)
+        PartitionManager(PartitionConfig()).ensure_range(
+            conn, "stocks_1m", minute, minute
+        )
+        conn.execute(
+            text(
+                "INSERT INTO stocks_1m "
+                "(symbol, datetime, open, high, low, close, volume) "
+                "VALUES ('7203.T', :at, 100, 110, 90, 105, 10)"
+            ),
+            {"at": minute},
+        )
+
+    # Act (実行)
+    with engine.begin() as conn:
+        daily = coverage.rebuild(conn, "1d")
+        coverage.rebuild(conn, "1m")
+
+    # Assert (検証)
+    assert daily == 1
+    with engine.connect() as conn:
+        ranges = _ranges(conn, "1d")
+        minutes = _ranges(conn, "1m")
+    assert ranges["7203.T"]["record_count"] == 2
+    assert ranges["7203.T"]["first"] == date(2025, 1, 6)
+    assert ranges["7203.T"]["latest"] == date(2025, 1, 7)
+    assert ranges["7203.T"]["last_fetched_at"] == fetched_at
+    assert minutes["7203.T"]["record_count"] == 1
+    assert minutes["7203.T"]["latest"] == minute
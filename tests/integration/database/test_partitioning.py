@@ -0,0 +1,166 @@
+"""分足・時間足テーブルの月単位パーティションの結合テスト.
+
+PostgreSQLの一時スキーマにパーティション化した stocks_5m を作成し、
+以下を検証します（トランザクションはテストごとにロールバック）:
+1. 保存期間に応じたパーティションの作成と行の振り分け
+2. 日付範囲の検索で対象月のパーティションだけを参照すること
+3. 保持期間を過ぎたパーティションだけを削除すること
+"""
+
+from datetime import date, datetime
+import os
+
+from dotenv import load_dotenv
+import pytest
+from sqlalchemy import create_engine, select, text
+from sqlalchemy.exc import OperationalError
+
+from app.models import Stocks5m
+from app.services.stock_data.partitions import (
+    PARTITION_TZ,
+    PartitionConfig,
+    PartitionManager,
+    day_range,
+)
+
+
+load_dotenv(os.path.join(os.path.dirname(__file__), "..", "..", ".env"))
+
+pytestmark = pytest.mark.integration
+
+
+@pytest.fixture
+def conn():
+    """一時スキーマに stocks_5m を作成した接続（終了時にロールバック）."""
+    engine = create_engine(
+        f"postgresql://{os.getenv('DB_USER')}:{os.getenv('DB_PASSWORD')}@"
+        f"{os.getenv('DB_HOST')}:{os.getenv('DB_PORT')}/{os.getenv('DB_NAME')}"
+    )
+    try:
+        connection = engine.connect()
+    except OperationalError:
+        engine.dispose()
+        pytest.skip("PostgreSQLに接続できません")
+    transaction = connection.begin()
+    connection.execute(text("CREATE SCHEMA partition_test"))
+    connection.execute(text("SET LOCAL search_path TO partition_test"))
+    Stocks5m.__table__.create(connection)
+    yield connection
+    transaction.rollback()
+    connection.close()
+    engine.dispose()
+
+
+def _insert_bar(conn, at: datetime) -> None:
+    """1本分の5分足を挿入."""
+    conn.execute(
+        text(
+            "INSERT INTO stocks_5m "
+            "(symbol, datetime, open, high, low, close, volume) "
+            "VALUES ('7203.T', :at, 100, 101, 99, 100, 1000)"
+        ),
+        {"at": at},
+    )
+
+
+def _scanned_partitions(conn, start: date, end: date):
+    """日付範囲の検索の実行計画で参照するパーティション名."""
+    start_at, end_before = day_range(start, end)
+    query = select(Stocks5m).where(
+        Stocks5m.symbol == "7203.T",
+        Stocks5m.datetime >= start_at,
+        Stocks5m.datetime < end_before,
+    )
+    plan = "\n".join(
+        row[0]
+        for row in conn.execute(
+            text(
+                "EXPLAIN "
+                + str(
+                    query.compile(
+                        dialect=conn.dialect,
+                        compile_kwargs={"literal_binds": True},
+                    )
+                )
+            )
+        )
+    )
+    return {
+        name
+        for name in ("p202412", "p202501", "p202502")
+        if f"stocks_5m_{name}" in plan
+    }
+
+
+class TestMonthlyPartitions:
+    """月単位パーティションのテスト."""
+
+    def test_ensure_range_routes_rows_to_month_partitions(self, conn):
+        """期間にかかる月のパーティションを作成し、行を月ごとに格納する."""
+        # Arrange (準備)
+        manager = PartitionManager(PartitionConfig())
+        first = datetime(2024, 12, 30, 9, 0, tzinfo=PARTITION_TZ)
+        last = datetime(2025, 2, 3, 9, 0, tzinfo=PARTITION_TZ)
+
+        # Act (実行)
+        created = manager.ensure_range(conn, "stocks_5m", first, last)
+        again = manager.ensure_range(conn, "stocks_5m", first, last)
+        _insert_bar(conn, first)
+        _insert_bar(conn, last)
+
+        # Assert (検証)
+        assert created == [
+            "stocks_5m_p202412",
+            "stocks_5m_p202501",
+            "stocks_5m_p202502",
+        ]
+        assert again == []
+        rows = conn.execute(
+            text(
+                "SELECT tableoid::regclass::text FROM stocks_5m "
+                "ORDER BY datetime"
+            )
+        ).scalars()
+        assert list(rows) == ["stocks_5m_p202412", "stocks_5m_p202502"]
+
+    def test_date_range_query_scans_only_matching_partitions(self, conn):
+        """日付範囲の検索は範囲にかかる月のパーティションだけを参照する."""
+        # Arrange (準備)
+        PartitionManager(PartitionConfig()).ensure_range(
+            conn, "stocks_5m", date(2024, 12, 1), date(2025, 2, 28)
+        )
+
+        # Act (実行)
+        one_month = _scanned_partitions(
+            conn, date(2025, 1, 6), date(2025, 1, 31)
+        )
+        two_months = _scanned_partitions(
+            conn, date(2025, 1, 31), date(2025, 2, 3)
+        )
+
+        # Assert (検証)
+        assert one_month == {"p202501"}
+        assert two_months == {"p202501", "p202502"}
+
+    def test_drop_before_removes_only_expired_partitions(self, conn):
+        """保持期間を過ぎた月のパーティションだけを削除する."""
+        # Arrange (準備)
+        manager = PartitionManager(PartitionConfig())
+        manager.ensure_range(
+            conn, "stocks_5m", date(2024, 12, 1), date(2025, 2, 28)
+        )
+        _insert_bar(conn, datetime(2024, 12, 30, 9, 0, tzinfo=PARTITION_TZ))
+        _insert_bar(conn, datetime(2025, 1, 20, 9, 0, tzinfo=PARTITION_TZ))
+
+        # Act (実行)
+        dropped = manager.drop_before(conn, "stocks_5m", date(2025, 1, 15))
+
+        # Assert (検証)
+        assert dropped == ["stocks_5m_p202412"]
+        assert [
+            partition["name"]
+            for partition in manager.list_partitions(conn, "stocks_5m")
+        ] == ["stocks_5m_p202501", "stocks_5m_p202502"]
+        assert (
+            conn.execute(text("SELECT count(*) FROM stocks_5m")).scalar() == 1
+        )
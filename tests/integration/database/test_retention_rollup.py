@@ -0,0 +1,161 @@
+"""分足データの保持ルール（集約・削除）の結合テスト.
+
+PostgreSQLの一時スキーマにパーティション化した stocks_1m / stocks_5m を
+作成し（テスト終了時にスキーマごと削除）、以下を検証します:
+1. 期間全体が保持期間外の月は5分足に集約してからパーティションごと削除
+2. 保持期間の境界を含む月は境界より前の行だけを集約・削除
+3. 集約先に既にある足は上書きしないこと
+4. 集約・削除した足の件数と期間を bar_coverage に反映すること
+"""
+
+from datetime import datetime, timedelta
+import os
+
+from dotenv import load_dotenv
+import pytest
+from sqlalchemy import create_engine, text
+from sqlalchemy.exc import OperationalError
+
+from app.models import BarChunk, BarCoverage, Stocks1m, Stocks5m
+from app.services.stock_data import coverage
+from app.services.stock_data.partitions import (
+    PARTITION_TZ,
+    PartitionConfig,
+    PartitionManager,
+)
+from app.services.stock_data.retention import (
+    RetentionConfig,
+    RetentionJob,
+    RetentionRule,
+)
+
+
+load_dotenv(os.path.join(os.path.dirname(__file__), "..", "..", ".env"))
+
+pytestmark = pytest.mark.integration
+
+SCHEMA = "retention_test"
+
+
+@pytest.fixture
+def engine():
+    """一時スキーマを検索パスとするエンジン（終了時にスキーマを削除）."""
+    url = (
+        f"postgresql://{os.getenv('DB_USER')}:{os.getenv('DB_PASSWORD')}@"
+        f"{os.getenv('DB_HOST')}:{os.getenv('DB_PORT')}/{os.getenv('DB_NAME')}"
+    )
+    engine = create_engine(
+        url, connect_args={"options": f"-csearch_path={SCHEMA}"}
+    )
+    try:
+        with engine.begin() as conn:
+            conn.execute(text(f"DROP SCHEMA IF EXISTS {SCHEMA} CASCADE"))
+            conn.execute(text(f"CREATE SCHEMA {SCHEMA}"))
+            Stocks1m.__table__.create(conn)
+            Stocks5m.__table__.create(conn)
+            BarCoverage.__table__.create(conn)
+            BarChunk.__table__.create(conn)
+    except OperationalError:
+        engine.dispose()
+        pytest.skip("PostgreSQLに接続できません")
+    yield engine
+    with engine.begin() as conn:
+        conn.execute(text(f"DROP SCHEMA IF EXISTS {SCHEMA} CASCADE"))
+    engine.dispose()
+
+
+def _insert_bars(conn, table: str, start: datetime, count: int) -> None:
+    """1分間隔で値が1ずつ増える足を挿入."""
+    for i in range(count):
+        conn.execute(
+            text(
+                f"INSERT INTO {table} "
+                "(symbol, datetime, open, high, low, close, volume) "
+                "VALUES ('7203.T', :at, :open, :high, :low, :close, 10)"
+            ),
+            {
+                "at": start + timedelta(minutes=i),
+                "open": 100 + i,
+                "high": 110 + i,
+                "low": 90 + i,
+                "close": 105 + i,
+            },
+        )
+
+
+def _bars(conn, table: str):
+    """銘柄の足を (日時, 始値, 高値, 安値, 終値, 出来高) で取得."""
+    return [
+        (
+            row.datetime.astimezone(PARTITION_TZ).replace(tzinfo=None),
+            float(row.open),
+            float(row.high),
+            float(row.low),
+            float(row.close),
+            row.volume,
+        )
+        for row in conn.execute(
+            text(
+                "SELECT datetime, open, high, low, close, volume "
+                f"FROM {table} ORDER BY datetime"
+            )
+        )
+    ]
+
+
+def test_apply_rule_rolls_up_then_drops_and_deletes(engine):
+    """保持期間外の1分足を5分足に集約してから削除する."""
+    # Arrange (準備)
+    manager = PartitionManager(PartitionConfig())
+    january = datetime(2025, 1, 6, 9, 0, tzinfo=PARTITION_TZ)
+    february = datetime(2025, 2, 7, 9, 0, tzinfo=PARTITION_TZ)
+    recent = datetime(2025, 2, 10, 9, 0, tzinfo=PARTITION_TZ)
+    with engine.begin() as conn:
+        for at in (january, february, recent):
+            manager.ensure_range(conn, "stocks_1m", at, at)
+        manager.ensure_range(conn, "stocks_5m", january, january)
+        _insert_bars(conn, "stocks_1m", january, 10)
+        _insert_bars(conn, "stocks_1m", february, 5)
+        _insert_bars(conn, "stocks_1m", recent, 1)
+        _insert_bars(conn, "stocks_5m", january + timedelta(minutes=5), 1)
+        coverage.rebuild(conn, "1m")
+        coverage.rebuild(conn, "5m")
+    job = RetentionJob(
+        RetentionConfig(rules=[RetentionRule("1m", 30, "5m")]),
+        engine=engine,
+        partition_manager=manager,
+    )
+
+    # Act (実行)
+    result = job.apply_rule(
+        job.config.rules[0], datetime(2025, 3, 10, 12, 0, tzinfo=PARTITION_TZ)
+    )
+
+    # Assert (検証)
+    assert result["cutoff"] == "2025-02-08T00:00:00+09:00"
+    assert result["rolled_up"] == 2
+    assert result["deleted_rows"] == 5
+    assert result["dropped_partitions"] == ["stocks_1m_p202501"]
+    with engine.connect() as conn:
+        assert [
+            p["name"] for p in manager.list_partitions(conn, "stocks_1m")
+        ] == ["stocks_1m_p202502"]
+        assert [bar[0] for bar in _bars(conn, "stocks_1m")] == [
+            datetime(2025, 2, 10, 9, 0)
+        ]
+        assert _bars(conn, "stocks_5m") == [
+            (datetime(2025, 1, 6, 9, 0), 100.0, 114.0, 90.0, 109.0, 50),
+            (datetime(2025, 1, 6, 9, 5), 100.0, 110.0, 90.0, 105.0, 10),
+            (datetime(2025, 2, 7, 9, 0), 100.0, 114.0, 90.0, 109.0, 50),
+        ]
+        ranges = {
+            row["interval"]: row
+            for row in coverage.get_coverage(conn, ["7203.T"])[0]
+        }
+        assert ranges["1m"]["record_count"] == 1
+        assert ranges["1m"]["first"] == recent
+        assert ranges["1m"]["latest"] == recent
+        assert ranges["5m"]["record_count"] == 3
+        assert ranges["5m"]["first"] == january
+        assert ranges["5m"]["latest"] == february
+        assert ranges["5m"]["last_fetched_at"] is None
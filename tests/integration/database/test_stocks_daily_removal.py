@@ -199,9 +199,8 @@ def session(engine):  # noqa: C901
         """stocks_1d テーブルのインデックスが存在することを確認."""
         # Arrange (準備)
         expected_indexes = [
-            "idx_stocks_1d_date",
-            "idx_stocks_1d_symbol",
-            "idx_stocks_1d_symbol_date_desc",
+            "idx_stocks_1d_date_brin",
+            "uk_stocks_1d_symbol_date",
         ]
 
         # Act (実行)
@@ -1,4 +1,6 @@
+from datetime import date
 import json
+from unittest.mock import MagicMock, patch
 
 import pytest
 
@@ -101,3 +103,51 @@ def test_fetch_data_api_with_max_period_parameter_passes_validation(client):
         if response.status_code == 400:
             error_message = data.get("message", "").lower()
             assert "period" not in error_message or "max" not in error_message
+
+
+def test_stock_coverage_api_with_invalid_interval_returns_400(client):
+    """データ範囲取得で無効な時間軸を指定した場合は400を返す."""
+    # Act (実行)
+    response = client.get("/api/stocks/coverage?interval=2d")
+
+    # Assert (検証)
+    assert response.status_code == 400
+    assert json.loads(response.data)["error"]["code"] == "VALIDATION_ERROR"
+
+
+@patch("app.app.get_db_session")
+@patch("app.app.coverage.get_coverage")
+def test_stock_coverage_api_returns_paginated_coverage(
+    mock_get_coverage, mock_get_db_session, client
+):
+    """データ範囲を bar_coverage の1回の参照でページ単位に返す."""
+    # Arrange (準備)
+    session = MagicMock()
+    mock_get_db_session.return_value.__enter__.return_value = session
+    mock_get_coverage.return_value = (
+        [
+            {
+                "symbol": "7203.T",
+                "interval": "1d",
+                "record_count": 245,
+                "first": date(2024, 1, 4),
+                "latest": date(2024, 12, 27),
+                "last_fetched_at": None,
+            }
+        ],
+        8,
+    )
+
+    # Act (実行)
+    response = client.get("/api/stocks/coverage?symbol=7203.T&limit=1")
+
+    # Assert (検証)
+    assert response.status_code == 200
+    mock_get_coverage.assert_called_once_with(
+        session, symbols=["7203.T"], intervals=None, limit=1, offset=0
+    )
+    data = json.loads(response.data)
+    assert data["data"][0]["first"] == "2024-01-04"
+    assert data["data"][0]["latest"] == "2024-12-27"
+    assert data["meta"]["pagination"]["total"] == 8
+    assert data["meta"]["pagination"]["has_next"] is True
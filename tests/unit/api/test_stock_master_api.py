@@ -63,7 +63,7 @@ class TestStockMasterAPI:
         assert response_data["data"]["total_stocks"] == 3800
         assert response_data["data"]["added_stocks"] == 50
         mock_service.update_stock_master.assert_called_once_with(
-            update_type="manual"
+            update_type="manual", force=False
         )
 
     @patch.dict("os.environ", {"API_KEY": "test_api_key"})
@@ -83,7 +83,7 @@ class TestStockMasterAPI:
             "status": "success",
         }
         mock_service_class.return_value = mock_service
-        data = {"update_type": "scheduled"}
+        data = {"update_type": "scheduled", "force": True}
 
         # Act (実行)
         response = self.client.post(
@@ -98,7 +98,7 @@ class TestStockMasterAPI:
         response_data = json.loads(response.data)
         assert response_data["data"]["update_type"] == "scheduled"
         mock_service.update_stock_master.assert_called_once_with(
-            update_type="scheduled"
+            update_type="scheduled", force=True
         )
 
     @patch.dict("os.environ", {"API_KEY": "test_api_key"})
@@ -12,7 +12,7 @@ from unittest.mock import MagicMock, patch  # noqa: E402
 
 import pytest  # noqa: E402
 
-import app as flask_app  # noqa: E402
+from app.app import app as flask_app  # noqa: E402
 
 
 # module-level marker so pytest -m unit picks these up
@@ -22,8 +22,8 @@ pytestmark = pytest.mark.unit
 @pytest.fixture
 def client():
     """テスト用のFlaskクライアントを作成."""
-    flask_app.app.config["TESTING"] = True
-    with flask_app.app.test_client() as client:
+    flask_app.config["TESTING"] = True
+    with flask_app.test_client() as client:
         yield client
 
 
@@ -230,3 +230,32 @@ class TestHealthCheck:
             data["data"]["services"]["yahoo_finance_api"]["status"]
             == "warning"
         )
+
+    @patch("app.api.system_monitoring.get_circuit_breaker")
+    @patch("app.api.system_monitoring.StockDataFetcher")
+    @patch("app.api.system_monitoring.get_db_session")
+    def test_system_monitoring_health_check_with_open_circuit_returns_breaker_state(
+        self, mock_get_session, mock_fetcher_class, mock_get_breaker, client
+    ):
+        """正常系: サーキットブレーカー作動中は接続テストを省略し状態を返す."""
+        # Arrange (準備)
+        mock_session = MagicMock()
+        mock_get_session.return_value.__enter__.return_value = mock_session
+        mock_get_session.return_value.__exit__.return_value = False
+        mock_breaker = MagicMock()
+        mock_breaker.is_open.return_value = True
+        mock_breaker.get_state.return_value = {"state": "open", "trips": 2}
+        mock_get_breaker.return_value = mock_breaker
+
+        # Act (実行)
+        response = client.get("/api/system/health")
+
+        # Assert (検証)
+        assert response.status_code == 200
+        data = response.get_json()
+        assert data["data"]["overall_status"] == "degraded"
+        assert data["data"]["services"]["circuit_breaker"] == {
+            "state": "open",
+            "trips": 2,
+        }
+        mock_fetcher_class.assert_not_called()
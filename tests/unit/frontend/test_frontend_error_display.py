@@ -34,7 +34,9 @@ class TestFrontendErrorDisplay:
         """エラーメッセージフォーマットの一貫性テスト."""
         # Arrange (準備)
         # 無効な銘柄コードでテスト
-        with patch("app.services.stock_data.fetcher.yf.Ticker") as mock_ticker:
+        with patch(
+            "app.services.stock_data.provider.yf.Ticker"
+        ) as mock_ticker:
             mock_ticker.return_value.history.return_value.empty = True
 
             # Act (実行)
@@ -88,7 +90,7 @@ class TestFrontendErrorDisplay:
                 response = client.get(case["url"])
             else:
                 with patch(
-                    "app.services.stock_data.fetcher.yf.Ticker"
+                    "app.services.stock_data.provider.yf.Ticker"
                 ) as mock_ticker:
                     mock_ticker.return_value.history.return_value.empty = True
                     response = client.post(
@@ -121,7 +123,9 @@ class TestFrontendErrorDisplay:
 
         # Act (実行)
         # INVALID_SYMBOL - Issue #68の実装により、StockDataFetcherを通じてエラーが返される
-        with patch("app.services.stock_data.fetcher.yf.Ticker") as mock_ticker:
+        with patch(
+            "app.services.stock_data.provider.yf.Ticker"
+        ) as mock_ticker:
             mock_ticker.return_value.history.return_value.empty = True
             response = client.post(
                 "/api/stocks/data",
@@ -16,8 +16,10 @@ import sys
 
 import pytest
 from sqlalchemy import create_engine, text
+from sqlalchemy.dialects import postgresql
 from sqlalchemy.exc import IntegrityError
 from sqlalchemy.orm import sessionmaker
+from sqlalchemy.schema import CreateIndex
 
 
 # プロジェクトルートをパスに追加
@@ -439,6 +441,54 @@ class TestToDict:
         assert "updated_at" in result_dict
 
 
+class TestIndexes:
+    """インデックス構成のテストクラス."""
+
+    @pytest.mark.parametrize(
+        "model",
+        [
+            Stocks1m,
+            Stocks5m,
+            Stocks15m,
+            Stocks30m,
+            Stocks1h,
+            Stocks1d,
+            Stocks1wk,
+            Stocks1mo,
+        ],
+    )
+    def test_timeframe_indexes_only_add_time_brin_to_unique_key(self, model):
+        """一意制約以外のインデックスは時間カラムのBRINのみ."""
+        # Arrange (準備)
+        column = "datetime" if hasattr(model, "datetime") else "date"
+
+        # Act (実行)
+        indexes = list(model.__table__.indexes)
+        ddl = str(
+            CreateIndex(indexes[0]).compile(dialect=postgresql.dialect())
+        )
+
+        # Assert (検証)
+        assert [index.name for index in indexes] == [
+            f"idx_{model.__tablename__}_{column}_brin"
+        ]
+        assert f"USING brin ({column})" in ddl
+
+    def test_brin_index_is_not_created_on_sqlite(self, engine):
+        """SQLiteではBRINインデックスを作成しない."""
+        # Act (実行)
+        with engine.connect() as conn:
+            names = conn.execute(
+                text(
+                    "SELECT name FROM sqlite_master "
+                    "WHERE type = 'index' AND name LIKE '%_brin'"
+                )
+            ).all()
+
+        # Assert (検証)
+        assert names == []
+
+
 class TestPerformance:
     """パフォーマンステストクラス."""
 
@@ -0,0 +1,250 @@
+"""古い株価データの圧縮保存（bar_chunks）のテスト."""
+
+from datetime import date, datetime
+from unittest.mock import Mock, patch
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from app.services.stock_data import archive
+from app.services.stock_data.archive import (
+    ArchiveCompactor,
+    ArchiveConfig,
+    ArchiveError,
+)
+from app.services.stock_data.bar_batch import BarBatch, time_keys
+from app.services.stock_data.partitions import PARTITION_TZ
+
+
+pytestmark = pytest.mark.unit
+
+
+def _minute_bars(count: int, start: str = "2024-10-07 09:00") -> BarBatch:
+    """1分間隔の分足のバッチ（値は1ずつ増える）."""
+    index = pd.date_range(start, periods=count, freq="1min", tz=PARTITION_TZ)
+    prices = 2500.0 + np.arange(count) * 0.5
+    return BarBatch(
+        interval="1m",
+        index=index,
+        open=prices,
+        high=prices + 1,
+        low=prices - 1,
+        close=prices + 0.25,
+        volume=np.arange(count, dtype=np.int64) * 100 + 1000,
+    )
+
+
+class TestChunkCodec:
+    """圧縮データの符号化・復元のテスト."""
+
+    def test_round_trip_restores_sorted_bars(self):
+        """日時の順序に関係なく、昇順の同じ値に復元する."""
+        # Arrange (準備)
+        bars = _minute_bars(50)
+        shuffled = bars.select(np.ones(50, dtype=bool))
+        order = np.random.default_rng(0).permutation(50)
+        shuffled.index = shuffled.index[order]
+        for name in ("open", "high", "low", "close", "volume"):
+            setattr(shuffled, name, getattr(shuffled, name)[order])
+
+        # Act (実行)
+        decoded = archive.decode_chunk(archive.encode_chunk(shuffled), "1m")
+
+        # Assert (検証)
+        assert decoded.index.equals(bars.index)
+        assert str(decoded.index.tz) == "Asia/Tokyo"
+        np.testing.assert_array_equal(decoded.open, bars.open)
+        np.testing.assert_array_equal(decoded.close, bars.close)
+        np.testing.assert_array_equal(decoded.volume, bars.volume)
+
+    def test_daily_round_trip_keeps_market_dates(self):
+        """日足は日付のまま復元する."""
+        # Arrange (準備)
+        bars = BarBatch.from_records(
+            [
+                {
+                    "date": date(2024, 10, day),
+                    "open": 100.1,
+                    "high": 101,
+                    "low": 99,
+                    "close": 100.5,
+                    "volume": 10,
+                }
+                for day in (1, 2, 3)
+            ],
+            "1d",
+        )
+
+        # Act (実行)
+        decoded = archive.decode_chunk(archive.encode_chunk(bars), "1d")
+
+        # Assert (検証)
+        assert decoded.times(0, 3) == [
+            date(2024, 10, 1),
+            date(2024, 10, 2),
+            date(2024, 10, 3),
+        ]
+        assert decoded.open[0] == 100.1
+
+    def test_month_of_minute_bars_compresses_well(self):
+        """1か月分の分足は8バイト×6列の数分の1に圧縮される."""
+        # Arrange (準備)
+        bars = _minute_bars(20 * 330)
+
+        # Act (実行)
+        data = archive.encode_chunk(bars)
+
+        # Assert (検証)
+        assert len(data) * 8 < len(bars) * 8 * archive.CHUNK_COLUMNS
+
+    def test_decode_rejects_unknown_format(self):
+        """形式が異なるデータはエラーにする."""
+        # Act & Assert (実行と検証)
+        with pytest.raises(ArchiveError):
+            archive.decode_chunk(b"XXXX\x01\x00\x00\x00", "1m")
+
+
+class TestMerge:
+    """圧縮済みの足と時間軸テーブルの足の統合のテスト."""
+
+    def test_merge_bars_prefers_live_values(self):
+        """同じ日時の足は時間軸テーブルの値を優先する."""
+        # Arrange (準備)
+        archived = _minute_bars(5)
+        live = _minute_bars(3, start="2024-10-07 09:03")
+        live.close = live.close + 1000
+
+        # Act (実行)
+        merged = archive.merge_bars(archived, live)
+
+        # Assert (検証)
+        assert len(merged) == 6
+        assert list(merged.close[:3]) == list(archived.close[:3])
+        assert list(merged.close[3:]) == list(live.close)
+
+    def test_merge_page_orders_by_time_descending(self):
+        """時間軸テーブルの行と圧縮済みの足を日時の降順に並べて切り出す."""
+        # Arrange (準備)
+        archived = {"7203.T": _minute_bars(3)}
+        live_at = datetime(2024, 11, 1, 9, 0, tzinfo=PARTITION_TZ)
+        live = [(time_keys([live_at])[0], {"id": 1, "datetime": "live"})]
+
+        # Act (実行)
+        page = archive.merge_page(live, archived, limit=2, offset=0)
+        rest = archive.merge_page(live, archived, limit=10, offset=2)
+
+        # Assert (検証)
+        assert page[0] == {"id": 1, "datetime": "live"}
+        assert page[1]["id"] is None
+        assert page[1]["symbol"] == "7203.T"
+        assert page[1]["datetime"] == "2024-10-07T09:02:00+09:00"
+        assert page[1]["close"] == 2501.25
+        assert [row["datetime"][11:16] for row in rest] == ["09:01", "09:00"]
+
+    def test_read_archived_is_skipped_outside_postgresql(self):
+        """接続先が PostgreSQL 以外の場合は参照しない."""
+        # Arrange (準備)
+        bind = Mock()
+
+        # Act (実行)
+        result = archive.read_archived(bind, "1d", "7203.T")
+
+        # Assert (検証)
+        assert result == {}
+        bind.execute.assert_not_called()
+
+
+class TestArchiveConfig:
+    """圧縮保存の設定のテスト."""
+
+    def test_config_from_env(self, monkeypatch):
+        """ARCHIVE_* 環境変数を反映する."""
+        # Arrange (準備)
+        monkeypatch.setenv("ARCHIVE_AFTER_DAYS", "400")
+        monkeypatch.setenv("ARCHIVE_INTERVALS", "1m, 1d")
+        monkeypatch.setenv("ARCHIVE_SYMBOL_BATCH", "50")
+        monkeypatch.setenv("ARCHIVE_HOUR", "5")
+
+        # Act (実行)
+        config = ArchiveConfig.from_env()
+
+        # Assert (検証)
+        assert config.after_days == 400
+        assert config.intervals == ["1m", "1d"]
+        assert config.symbol_batch == 50
+        assert config.hour == 5
+        assert config.minute == 0
+
+    def test_config_rejects_unknown_interval(self, monkeypatch):
+        """サポートされていない時間軸はエラーにする."""
+        # Arrange (準備)
+        monkeypatch.setenv("ARCHIVE_INTERVALS", "1m,2m")
+
+        # Act & Assert (実行と検証)
+        with pytest.raises(ArchiveError):
+            ArchiveConfig.from_env()
+
+    def test_boundary_is_month_before_after_days(self):
+        """境界は基準日から after_days 日前の日付が属する月."""
+        # Arrange (準備)
+        config = ArchiveConfig(after_days=365)
+
+        # Act (実行)
+        boundary = config.boundary(
+            datetime(2025, 6, 10, 12, 0, tzinfo=PARTITION_TZ)
+        )
+
+        # Assert (検証)
+        assert boundary == date(2024, 6, 1)
+
+
+class TestArchiveCompactor:
+    """圧縮保存ジョブのテスト."""
+
+    @patch("app.services.stock_data.archive.BatchService")
+    def test_run_records_results_and_continues_after_failure(
+        self, mock_batch_service
+    ):
+        """時間軸ごとの結果をバッチに記録し、失敗しても残りを圧縮する."""
+        # Arrange (準備)
+        mock_batch_service.create_batch.return_value = {"id": 9}
+        mock_batch_service.create_batch_detail.side_effect = [
+            {"id": 1},
+            {"id": 2},
+        ]
+        compactor = ArchiveCompactor(
+            ArchiveConfig(intervals=["1m", "1d"]),
+            engine=Mock(),
+            partition_manager=Mock(),
+        )
+        compacted = {
+            "interval": "1m",
+            "archived_rows": 6600,
+            "chunks": 1,
+            "dropped_partitions": ["stocks_1m_p202401"],
+        }
+        compactor.compact_interval = Mock(
+            side_effect=[compacted, RuntimeError("timeout")]
+        )
+
+        # Act (実行)
+        result = compactor.run(datetime(2025, 6, 10, tzinfo=PARTITION_TZ))
+
+        # Assert (検証)
+        assert result["batch_id"] == 9
+        assert result["archived_rows"] == 6600
+        assert result["chunks"] == 1
+        assert result["dropped_partitions"] == 1
+        mock_batch_service.create_batch.assert_called_once_with(
+            "archive", total_stocks=2
+        )
+        mock_batch_service.update_batch_detail.assert_any_call(
+            1, "completed", records_inserted=6600
+        )
+        mock_batch_service.update_batch_detail.assert_any_call(
+            2, "failed", error_message="timeout"
+        )
+        complete = mock_batch_service.complete_batch.call_args
+        assert complete.kwargs["status"] == "failed"
+        assert complete.kwargs["error_message"] == "1d: timeout"
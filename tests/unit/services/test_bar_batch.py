@@ -0,0 +1,122 @@
+"""BarBatchのテスト."""
+
+from datetime import date, datetime
+import pickle
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from app.services.stock_data.bar_batch import BarBatch, time_keys
+from app.services.stock_data.converter import StockDataConverter
+
+
+pytestmark = pytest.mark.unit
+
+
+def _frame(interval: str) -> pd.DataFrame:
+    """yfinance形式のDataFrame（2行目は無効な価格）."""
+    freq = "D" if interval == "1d" else "5min"
+    index = pd.date_range(
+        "2025-01-06 09:00", periods=4, freq=freq, tz="Asia/Tokyo"
+    )
+    return pd.DataFrame(
+        {
+            "Open": [100.0, 101.0, 102.0, 103.0],
+            "High": [110.0, 90.0, 112.0, 113.0],
+            "Low": [90.0, 95.0, 92.0, 93.0],
+            "Close": [105.0, 100.0, 107.0, 108.0],
+            "Volume": [1000, 2000, 3000, 4000],
+        },
+        index=index,
+    )
+
+
+class TestBarBatch:
+    """BarBatchのテスト."""
+
+    @pytest.mark.parametrize("interval", ["1d", "5m"])
+    def test_to_records_matches_convert_to_dict(self, interval):
+        """to_records() は convert_to_dict() と同一の辞書リストを返す."""
+        # Arrange (準備)
+        converter = StockDataConverter()
+        df = _frame(interval)
+
+        # Act (実行)
+        records = converter.convert_to_batch(df, interval).to_records()
+
+        # Assert (検証)
+        expected = converter.convert_to_dict(df, interval)
+        assert pickle.dumps(records) == pickle.dumps(expected)
+
+    def test_time_keys_for_daily_bars_match_stored_dates(self):
+        """日足のキーはタイムゾーンに関係なくDBの日付と一致する."""
+        # Arrange (準備)
+        bars = StockDataConverter().convert_to_batch(_frame("1d"), "1d")
+        stored = [date(2025, 1, 6), date(2025, 1, 9)]
+
+        # Act (実行)
+        mask = np.isin(bars.time_keys(), time_keys(stored))
+
+        # Assert (検証)
+        assert mask.tolist() == [True, False, True]
+
+    def test_time_keys_for_intraday_bars_compare_instants(self):
+        """分足のキーは異なるタイムゾーンでも同一時刻なら一致する."""
+        # Arrange (準備)
+        bars = StockDataConverter().convert_to_batch(_frame("5m"), "5m")
+        stored = [pd.Timestamp("2025-01-06 00:10", tz="UTC").to_pydatetime()]
+
+        # Act (実行)
+        mask = np.isin(bars.time_keys(), time_keys(stored))
+
+        # Assert (検証)
+        assert mask.tolist() == [False, True, False]
+
+    def test_iter_rows_yields_chunks_of_row_tuples(self):
+        """iter_rows() は指定行数ごとに挿入用タプルを生成する."""
+        # Arrange (準備)
+        bars = StockDataConverter().convert_to_batch(_frame("5m"), "5m")
+
+        # Act (実行)
+        chunks = list(bars.iter_rows("7203.T", chunk_size=2))
+
+        # Assert (検証)
+        assert [len(chunk) for chunk in chunks] == [2, 1]
+        assert chunks[1] == [
+            (
+                "7203.T",
+                datetime.fromisoformat("2025-01-06T09:15:00+09:00"),
+                103.0,
+                113.0,
+                93.0,
+                108.0,
+                4000,
+            )
+        ]
+
+    def test_csv_chunks_write_intraday_times_in_utc(self):
+        """csv_chunks() はタイムゾーン付きの日時をUTCオフセット付きで出力する."""
+        # Arrange (準備)
+        bars = StockDataConverter().convert_to_batch(_frame("5m"), "5m")
+
+        # Act (実行)
+        chunks = list(bars.csv_chunks("7203.T", chunk_size=2))
+
+        # Assert (検証)
+        assert len(chunks) == 2
+        assert chunks[1] == (
+            "7203.T,2025-01-06T00:15:00.000000+00,"
+            "103.0,113.0,93.0,108.0,4000\n"
+        )
+
+    def test_empty_batch_has_no_rows_or_range(self):
+        """空のバッチは0行で日付範囲を持たない."""
+        # Act (実行)
+        bars = StockDataConverter().convert_to_batch(pd.DataFrame(), "1d")
+
+        # Assert (検証)
+        assert len(bars) == 0
+        assert bars.date_range() == (None, None)
+        assert list(bars.iter_rows("7203.T")) == []
+        assert bars.to_records() == []
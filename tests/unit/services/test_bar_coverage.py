@@ -0,0 +1,182 @@
+"""銘柄・時間軸ごとのデータ範囲（bar_coverage）のテスト."""
+
+from datetime import date, datetime
+from unittest.mock import MagicMock, Mock, patch
+
+import pytest
+from sqlalchemy import create_engine
+
+from app.models import BarCoverage
+from app.services.stock_data import coverage
+from app.services.stock_data.bar_batch import BarBatch
+from app.services.stock_data.partitions import PARTITION_TZ
+from app.services.stock_data.saver import StockDataSaver
+
+
+pytestmark = pytest.mark.unit
+
+
+class TestCoverageUpdates:
+    """保存・削除時の bar_coverage の更新のテスト."""
+
+    def test_record_saved_adds_inserted_rows_in_symbol_order(
+        self, postgresql_bind
+    ):
+        """新規挿入件数を加算し、日付は Asia/Tokyo の0時で渡す."""
+        # Arrange (準備)
+        bind = postgresql_bind
+        saved = {
+            "9984.T": (3, (date(2025, 1, 6), date(2025, 1, 8))),
+            "7203.T": (0, (date(2025, 1, 7), date(2025, 1, 7))),
+        }
+
+        # Act (実行)
+        coverage.record_saved(bind, "1d", saved)
+
+        # Assert (検証)
+        query, params = bind.execute.call_args.args
+        assert "ON CONFLICT (symbol, interval) DO UPDATE" in str(query)
+        assert "bar_coverage.row_count + EXCLUDED.row_count" in str(query)
+        assert params["symbols"] == ["7203.T", "9984.T"]
+        assert params["inserted"] == [0, 3]
+        assert params["firsts"][1] == datetime(2025, 1, 6, tzinfo=PARTITION_TZ)
+        assert params["fetched"] is True
+
+    def test_record_removed_recomputes_range_from_table(self, postgresql_bind):
+        """削除件数を減算し、期間は時間軸テーブルと bar_chunks から再計算する."""
+        # Arrange (準備)
+        bind = postgresql_bind
+
+        # Act (実行)
+        coverage.record_removed(bind, "1m", {"7203.T": 5})
+
+        # Assert (検証)
+        query, params = bind.execute.call_args.args
+        assert "GREATEST(c.row_count - r.removed, 0)" in str(query)
+        assert "SELECT min(datetime) FROM stocks_1m" in str(query)
+        assert "SELECT min(first_at) FROM bar_chunks" in str(query)
+        assert params == {
+            "interval": "1m",
+            "symbols": ["7203.T"],
+            "removed": [5],
+        }
+
+    def test_updates_are_skipped_outside_postgresql(self):
+        """接続先が PostgreSQL 以外の場合は更新しない."""
+        # Arrange (準備)
+        bind = Mock()
+
+        # Act (実行)
+        coverage.record_saved(bind, "1d", {"7203.T": (1, (None, None))})
+        coverage.record_removed(bind, "1m", {"7203.T": 1})
+
+        # Assert (検証)
+        bind.execute.assert_not_called()
+
+
+class TestCoverageQueries:
+    """bar_coverage の参照のテスト."""
+
+    def test_get_coverage_filters_pages_and_counts_in_one_query(self):
+        """条件に一致する全件数とページ分の行を返し、日足は日付に戻す."""
+        # Arrange (準備)
+        engine = create_engine("sqlite://")
+        BarCoverage.__table__.create(engine)
+        with engine.begin() as conn:
+            conn.execute(
+                BarCoverage.__table__.insert(),
+                [
+                    {
+                        "symbol": symbol,
+                        "interval": "1d",
+                        "row_count": 10,
+                        "first_at": datetime(2025, 1, 6),
+                        "last_at": datetime(2025, 1, 17),
+                    }
+                    for symbol in ("6758.T", "7203.T", "9984.T")
+                ]
+                + [
+                    {
+                        "symbol": "7203.T",
+                        "interval": "1h",
+                        "row_count": 0,
+                        "first_at": None,
+                        "last_at": None,
+                    }
+                ],
+            )
+
+        # Act (実行)
+        with engine.connect() as conn:
+            rows, total = coverage.get_coverage(
+                conn, intervals=["1d"], limit=2, offset=1
+            )
+
+        # Assert (検証)
+        assert total == 3
+        assert [row["symbol"] for row in rows] == ["7203.T", "9984.T"]
+        assert rows[0]["first"] == date(2025, 1, 6)
+        assert rows[0]["latest"] == date(2025, 1, 17)
+        assert rows[0]["record_count"] == 10
+
+    def test_from_coverage_time_converts_to_market_date(self):
+        """日足の日時は Asia/Tokyo の日付に戻し、分足はそのまま返す."""
+        # Arrange (準備)
+        stored = datetime(2025, 1, 6, 9, 0, tzinfo=PARTITION_TZ)
+        utc_midnight = datetime.fromisoformat("2025-01-05T15:00:00+00:00")
+
+        # Act & Assert (実行と検証)
+        assert coverage.from_coverage_time(utc_midnight, "1d") == date(
+            2025, 1, 6
+        )
+        assert coverage.from_coverage_time(stored, "1m") == stored
+        assert coverage.from_coverage_time(None, "1d") is None
+
+
+class TestSaverCoverage:
+    """StockDataSaver の保存時の bar_coverage 更新のテスト."""
+
+    @patch("app.services.stock_data.saver.coverage.record_saved")
+    @patch("app.services.stock_data.saver.upsert_bars")
+    @patch("app.services.stock_data.saver.ensure_partitions")
+    def test_write_bars_records_inserted_rows_and_range(
+        self, mock_ensure, mock_upsert, mock_record_saved
+    ):
+        """保存した全銘柄の新規挿入件数と期間を同じセッションで記録する."""
+        # Arrange (準備)
+        session = MagicMock()
+        bars = BarBatch.from_records(
+            [
+                {
+                    "date": date(2025, 1, 6),
+                    "open": 1,
+                    "high": 1,
+                    "low": 1,
+                    "close": 1,
+                    "volume": 1,
+                },
+                {
+                    "date": date(2025, 1, 7),
+                    "open": 1,
+                    "high": 1,
+                    "low": 1,
+                    "close": 1,
+                    "volume": 1,
+                },
+            ],
+            "1d",
+        )
+        mock_upsert.return_value = {"7203.T": {"inserted": 1, "updated": 1}}
+        model = Mock(__tablename__="stocks_1d")
+
+        # Act (実行)
+        StockDataSaver()._write_bars(
+            session, model, {"7203.T": bars}, "7203.T", "1d", "upsert"
+        )
+
+        # Assert (検証)
+        mock_record_saved.assert_called_once_with(
+            session,
+            "1d",
+            {"7203.T": (1, (date(2025, 1, 6), date(2025, 1, 7)))},
+        )
@@ -0,0 +1,133 @@
+"""バッチ処理パイプラインのテスト."""
+
+import threading
+import time
+
+import pytest
+
+from app.services.bulk.pipeline import (
+    BatchPipeline,
+    PipelineConfig,
+    PipelineError,
+)
+
+
+pytestmark = pytest.mark.unit
+
+
+class TestPipelineConfig:
+    """PipelineConfigのテスト."""
+
+    def test_from_env_with_env_returns_configured_values(self, monkeypatch):
+        """環境変数の値が設定に反映される."""
+        # Arrange (準備)
+        monkeypatch.setenv("BULK_PIPELINE_QUEUE_DEPTH", "4")
+        monkeypatch.setenv("BULK_PIPELINE_SAVE_WORKERS", "2")
+
+        # Act (実行)
+        config = PipelineConfig.from_env()
+
+        # Assert (検証)
+        assert config.queue_depth == 4
+        assert config.fetch_workers == 1
+        assert config.save_workers == 2
+
+
+class TestBatchPipeline:
+    """BatchPipelineのテスト."""
+
+    def test_run_with_stages_applies_all_stages_in_order(self):
+        """全ステージが順に適用され、結果が呼び出し元に渡される."""
+        # Arrange (準備)
+        pipeline = BatchPipeline(
+            [
+                ("double", lambda x: x * 2, 1),
+                ("increment", lambda x: x + 1, 2),
+            ]
+        )
+        results = {}
+
+        # Act (実行)
+        pipeline.run(
+            range(10), lambda item: results.update({item.index: item.payload})
+        )
+
+        # Assert (検証)
+        assert results == {i: i * 2 + 1 for i in range(10)}
+        metrics = pipeline.get_metrics()
+        assert metrics["stages"]["double"]["processed"] == 10
+        assert metrics["stages"]["increment"]["workers"] == 2
+
+    def test_run_with_stage_error_skips_following_stages(self):
+        """ステージの例外は作業単位に記録され、後続ステージはスキップされる."""
+        # Arrange (準備)
+        called = []
+
+        def fail_on_two(x):
+            if x == 2:
+                raise ValueError("失敗")
+            return x
+
+        pipeline = BatchPipeline(
+            [("check", fail_on_two, 1), ("record", called.append, 1)]
+        )
+        items = []
+
+        # Act (実行)
+        pipeline.run(range(4), items.append)
+
+        # Assert (検証)
+        failed = [item for item in items if item.error is not None]
+        assert len(items) == 4
+        assert len(failed) == 1
+        assert failed[0].failed_stage == "check"
+        assert sorted(called) == [0, 1, 3]
+        assert pipeline.get_metrics()["stages"]["check"]["errors"] == 1
+
+    def test_run_with_slow_stages_overlaps_stage_execution(self):
+        """取得ステージと保存ステージが並行に実行される."""
+        # Arrange (準備)
+        running = set()
+        overlapped = threading.Event()
+        lock = threading.Lock()
+
+        def stage(name):
+            def func(x):
+                with lock:
+                    running.add(name)
+                    if len(running) > 1:
+                        overlapped.set()
+                time.sleep(0.05)
+                with lock:
+                    running.discard(name)
+                return x
+
+            return func
+
+        pipeline = BatchPipeline(
+            [("fetch", stage("fetch"), 1), ("save", stage("save"), 1)],
+            queue_depth=1,
+        )
+
+        # Act (実行)
+        pipeline.run(range(4), lambda item: None)
+
+        # Assert (検証)
+        assert overlapped.is_set()
+
+    def test_run_with_result_callback_error_propagates(self):
+        """結果処理の例外は呼び出し元に伝播する."""
+        # Arrange (準備)
+        pipeline = BatchPipeline([("noop", lambda x: x, 1)])
+
+        def on_result(item):
+            raise RuntimeError("コールバック失敗")
+
+        # Act & Assert (実行と検証)
+        with pytest.raises(RuntimeError):
+            pipeline.run(range(5), on_result)
+
+    def test_init_with_invalid_workers_raises_error(self):
+        """並列度が0の場合はエラーになる."""
+        with pytest.raises(PipelineError):
+            BatchPipeline([("fetch", lambda x: x, 0)])
@@ -96,11 +96,15 @@ def test_update_progress_and_complete(in_memory_session):
 
     # complete the batch
     completed = BatchService.complete_batch(
-        batch_id=batch_id, status="completed", session=session
+        batch_id=batch_id,
+        status="completed",
+        session=session,
+        summary={"deleted_rows": 120},
     )
     assert completed is not None
     assert completed["status"] == "completed"
     assert completed["end_time"] is not None
+    assert completed["summary"] == {"deleted_rows": 120}
 
 
 def test_list_and_details(in_memory_session):
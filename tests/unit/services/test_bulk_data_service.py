@@ -1,6 +1,6 @@
 """bulk_data_serviceのテスト."""
 
-from datetime import datetime
+from datetime import date, datetime
 from unittest.mock import MagicMock, Mock, mock_open, patch
 
 import pandas as pd
@@ -11,6 +11,12 @@ from app.services.bulk.bulk_service import (
     BulkDataServiceError,
     ProgressTracker,
 )
+from app.services.common.circuit_breaker import CIRCUIT_OPEN_MESSAGE
+from app.services.common.fetch_gateway import FetchGateway
+from app.services.common.rate_controller import (
+    AdaptiveRateController,
+    RateControlConfig,
+)
 from app.services.stock_data.fetcher import StockDataFetchError
 from app.services.stock_data.saver import StockDataSaveError
 
@@ -126,7 +132,15 @@ class TestBulkDataService:
     @pytest.fixture
     def service(self):
         """テスト用サービスインスタンス."""
-        return BulkDataService(max_workers=2, retry_count=2)
+        return BulkDataService(
+            max_workers=2,
+            retry_count=2,
+            gateway=FetchGateway(
+                AdaptiveRateController(
+                    RateControlConfig(initial_rate=1000.0, max_rate=1000.0)
+                )
+            ),
+        )
 
     @pytest.fixture
     def mock_fetcher(self):
@@ -344,3 +358,497 @@ class TestBulkDataService:
         # 検証
         assert estimation["symbol_count"] == 100
         assert "error" in estimation
+
+    def test_fetch_multiple_stocks_incremental_batch_with_stored_data_splits_download(
+        self, service
+    ):
+        """差分取得時は保存済み銘柄のみ開始日時を指定して取得."""
+        # Arrange (準備)
+        symbols = ["7203.T", "6758.T"]
+        service.saver.get_data_ranges = Mock(
+            return_value={
+                "7203.T": {
+                    "latest_date": date(2025, 1, 15),
+                    "record_count": 100,
+                }
+            }
+        )
+        service.batch_processor.fetch_batch_stock_data = Mock(
+            side_effect=lambda symbols, interval, period, start=None: {
+                symbol: {
+                    "success": True,
+                    "data": [{"date": date(2025, 1, 15)}],
+                }
+                for symbol in symbols
+            }
+        )
+        service.saver.save_batch_stock_data = Mock(
+            return_value={
+                "results_by_symbol": {
+                    "7203.T": {"saved": 0},
+                    "6758.T": {"saved": 1},
+                }
+            }
+        )
+
+        # Act (実行)
+        summary = service.fetch_multiple_stocks(
+            symbols=symbols, interval="1d", incremental=True
+        )
+
+        # Assert (検証)
+        calls = service.batch_processor.fetch_batch_stock_data.call_args_list
+        assert len(calls) == 2
+        assert calls[0].kwargs["symbols"] == ["6758.T"]
+        assert "start" not in calls[0].kwargs
+        assert calls[1].kwargs["symbols"] == ["7203.T"]
+        assert calls[1].kwargs["start"] == date(2025, 1, 8)
+        assert summary["incremental"]["incremental_symbols"] == 1
+        assert summary["incremental"]["full_symbols"] == 1
+        assert summary["incremental"]["rows_avoided"] == 99
+
+    def test_fetch_multiple_stocks_incremental_batch_groups_by_start(
+        self, service
+    ):
+        """差分取得は開始日時ごとに取得し、保存済みの足を再取得しない."""
+        # Arrange (準備)
+        service.saver.get_data_ranges = Mock(
+            return_value={
+                "7203.T": {
+                    "latest_date": date(2025, 1, 15),
+                    "record_count": 100,
+                },
+                "6758.T": {
+                    "latest_date": date(2025, 1, 10),
+                    "record_count": 90,
+                },
+                "9984.T": {
+                    "latest_date": date(2025, 1, 15),
+                    "record_count": 80,
+                },
+            }
+        )
+        service.batch_processor.fetch_batch_stock_data = Mock(
+            side_effect=lambda symbols, interval, period, start=None: {
+                symbol: {
+                    "success": True,
+                    "data": [{"date": date(2025, 1, 15)}],
+                }
+                for symbol in symbols
+            }
+        )
+        service.saver.save_batch_stock_data = Mock(
+            return_value={"results_by_symbol": {}}
+        )
+
+        # Act (実行)
+        service.fetch_multiple_stocks(
+            symbols=["7203.T", "6758.T", "9984.T"],
+            interval="1d",
+            incremental=True,
+        )
+
+        # Assert (検証)
+        calls = service.batch_processor.fetch_batch_stock_data.call_args_list
+        assert [(c.kwargs["symbols"], c.kwargs["start"]) for c in calls] == [
+            (["7203.T", "9984.T"], date(2025, 1, 8)),
+            (["6758.T"], date(2025, 1, 3)),
+        ]
+
+    def test_fetch_multiple_stocks_incremental_batch_reconciles_overlap(
+        self, service
+    ):
+        """差分取得の保存では重複期間を照合し、更新・変更なしの件数を集計する."""
+        # Arrange (準備)
+        service.saver.get_data_ranges = Mock(
+            return_value={
+                "7203.T": {
+                    "latest_date": date(2025, 1, 15),
+                    "record_count": 100,
+                }
+            }
+        )
+        service.batch_processor.fetch_batch_stock_data = Mock(
+            side_effect=lambda symbols, interval, period, start=None: {
+                symbol: {
+                    "success": True,
+                    "data": [{"date": date(2025, 1, 15)}] * 3,
+                }
+                for symbol in symbols
+            }
+        )
+        service.saver.save_batch_stock_data = Mock(
+            return_value={
+                "results_by_symbol": {
+                    "7203.T": {"saved": 0, "updated": 1, "unchanged": 2}
+                }
+            }
+        )
+
+        # Act (実行)
+        summary = service.fetch_multiple_stocks(
+            symbols=["7203.T"], interval="1d", incremental=True
+        )
+
+        # Assert (検証)
+        save_call = service.saver.save_batch_stock_data.call_args
+        assert save_call.kwargs["on_conflict"] == "reconcile"
+        assert summary["results"][0]["records_updated"] == 1
+        assert summary["results"][0]["records_unchanged"] == 2
+        assert summary["incremental"]["rows_updated"] == 1
+        assert summary["incremental"]["rows_unchanged"] == 2
+
+    def test_fetch_multiple_stocks_incremental_parallel_with_stored_data_passes_start(
+        self, service
+    ):
+        """並列処理の差分取得では銘柄ごとの開始日時を渡す."""
+        # Arrange (準備)
+        service.saver.get_data_ranges = Mock(
+            return_value={
+                "7203.T": {
+                    "latest_date": date(2025, 1, 15),
+                    "record_count": 10,
+                }
+            }
+        )
+        service.fetch_single_stock = Mock(
+            return_value={
+                "success": True,
+                "symbol": "7203.T",
+                "records_fetched": 6,
+                "records_saved": 1,
+            }
+        )
+
+        # Act (実行)
+        with patch("app.services.bulk.bulk_service.time.sleep"):
+            summary = service.fetch_multiple_stocks(
+                symbols=["7203.T"], use_batch=False, incremental=True
+            )
+
+        # Assert (検証)
+        service.fetch_single_stock.assert_called_once_with(
+            "7203.T",
+            "1d",
+            None,
+            date(2025, 1, 8),
+            max_attempts=1,
+            first_attempt=1,
+        )
+        assert summary["incremental"]["rows_fetched"] == 6
+        assert summary["incremental"]["rows_avoided"] == 5
+        assert summary["incremental"]["bytes_avoided"] == 5 * 64
+
+    def test_fetch_multiple_stocks_batch_with_pipeline_reports_stage_metrics(
+        self, service
+    ):
+        """バッチモードの進捗にステージごとの計測値が含まれる."""
+        # Arrange (準備)
+        symbols = ["7203.T", "6758.T", "9984.T"]
+        service.batch_processor.fetch_batch_stock_data = Mock(
+            side_effect=lambda symbols, interval, period: {
+                symbol: {
+                    "success": True,
+                    "data": [{"date": date(2025, 1, 15)}],
+                }
+                for symbol in symbols
+            }
+        )
+        service.saver.save_batch_stock_data = Mock(
+            side_effect=lambda symbols_data, interval, on_conflict: {
+                "results_by_symbol": {s: {"saved": 1} for s in symbols_data}
+            }
+        )
+        progress_list = []
+
+        # Act (実行)
+        summary = service._fetch_multiple_stocks_batch(
+            symbols=symbols,
+            progress_callback=progress_list.append,
+            batch_size=1,
+        )
+
+        # Assert (検証)
+        assert summary["successful"] == 3
+        assert summary["total_saved"] == 3
+        assert len(progress_list) == 3
+        stages = progress_list[-1]["pipeline"]["stages"]
+        assert set(stages) == {"fetch", "convert", "save"}
+        assert stages["fetch"]["processed"] == 3
+        assert "utilization" in stages["save"]
+        assert "queue_depth" in stages["convert"]
+        assert "rate_control" in progress_list[-1]
+        assert "backfill" in progress_list[-1]["fetch_gateway"]["classes"]
+
+    def test_fetch_multiple_stocks_batch_with_write_spool_defers_save(
+        self, service
+    ):
+        """スプール有効時は保存せずに追記し、終了時に保存完了を待つ."""
+        # Arrange (準備)
+        service.batch_processor.fetch_batch_stock_data = Mock(
+            side_effect=lambda symbols, interval, period: {
+                symbol: {
+                    "success": True,
+                    "data": [{"date": date(2025, 1, 15)}],
+                }
+                for symbol in symbols
+            }
+        )
+        service.saver.save_batch_stock_data = Mock()
+        service.write_spool = Mock(enabled=True)
+        service.write_spool.append.side_effect = (
+            lambda data, interval, on_conflict: {
+                symbol: len(rows) for symbol, rows in data.items()
+            }
+        )
+        service.write_spool.flush.return_value = True
+
+        # Act (実行)
+        summary = service._fetch_multiple_stocks_batch(
+            symbols=["7203.T", "6758.T"], batch_size=1
+        )
+
+        # Assert (検証)
+        assert summary["successful"] == 2
+        assert summary["total_spooled"] == 2
+        assert summary["total_skipped"] == 0
+        assert service.write_spool.append.call_count == 2
+        service.write_spool.flush.assert_called_once()
+        service.saver.save_batch_stock_data.assert_not_called()
+
+    def test_save_batch_with_unwritable_spool_falls_back_to_sync_save(
+        self, service
+    ):
+        """スプールへ書き出せない場合は同期保存に切り替える."""
+        # Arrange (準備)
+        service.write_spool = Mock(enabled=True)
+        service.write_spool.append.side_effect = OSError("No space left")
+        service.saver.save_batch_stock_data = Mock(
+            return_value={"results_by_symbol": {"7203.T": {"saved": 1}}}
+        )
+
+        # Act (実行)
+        result, _ = service._save_batch_if_data_exists(
+            {"7203.T": [{"date": date(2025, 1, 15)}]}, "1d", 1
+        )
+
+        # Assert (検証)
+        assert result["results_by_symbol"]["7203.T"] == {"saved": 1}
+        service.saver.save_batch_stock_data.assert_called_once()
+
+    def test_fetch_multiple_stocks_batch_with_fetch_error_marks_batch_failed(
+        self, service
+    ):
+        """取得ステージのエラーはそのバッチの全銘柄を失敗として記録する."""
+        # Arrange (準備)
+        service.batch_processor.fetch_batch_stock_data = Mock(
+            side_effect=Exception("ダウンロード失敗")
+        )
+        service.saver.save_batch_stock_data = Mock()
+
+        # Act (実行)
+        summary = service._fetch_multiple_stocks_batch(
+            symbols=["7203.T", "6758.T"], batch_size=1
+        )
+
+        # Assert (検証)
+        assert summary["failed"] == 2
+        assert all(
+            r["error"] == "ダウンロード失敗" for r in summary["results"]
+        )
+        service.saver.save_batch_stock_data.assert_not_called()
+
+    def test_fetch_multiple_stocks_parallel_with_temporary_error_defers_retry(
+        self, service, monkeypatch
+    ):
+        """一時的エラーの銘柄は他の銘柄の後にリトライされる."""
+        # Arrange (準備)
+        monkeypatch.setenv("BULK_RETRY_BASE_DELAY", "0")
+        calls = []
+
+        def fetch(symbol, interval, period, start, **kwargs):
+            calls.append((symbol, kwargs["first_attempt"]))
+            if symbol == "7203.T" and kwargs["first_attempt"] == 1:
+                return {
+                    "success": False,
+                    "symbol": symbol,
+                    "error": "429 Too Many Requests",
+                    "retryable": True,
+                }
+            return {"success": True, "symbol": symbol, "records_saved": 1}
+
+        service.max_workers = 1
+        service.rate_controller.config.max_concurrency = 1
+        service.fetch_single_stock = Mock(side_effect=fetch)
+
+        # Act (実行)
+        summary = service.fetch_multiple_stocks(
+            symbols=["7203.T", "6758.T"], use_batch=False
+        )
+
+        # Assert (検証)
+        assert calls == [("7203.T", 1), ("6758.T", 1), ("7203.T", 2)]
+        assert summary["successful"] == 2
+        assert summary["failed"] == 0
+        retried = [r for r in summary["results"] if r["symbol"] == "7203.T"]
+        assert retried[0]["attempts"] == 2
+
+    def test_fetch_multiple_stocks_parallel_with_ready_retries_groups_batch(
+        self, service, monkeypatch
+    ):
+        """実行可能なリトライが複数あれば一括ダウンロードにまとめる."""
+        # Arrange (準備)
+        monkeypatch.setenv("BULK_RETRY_BASE_DELAY", "0")
+        service.max_workers = 1
+        service.rate_controller.config.max_concurrency = 1
+        service.fetch_single_stock = Mock(
+            side_effect=lambda symbol, *args, **kwargs: {
+                "success": False,
+                "symbol": symbol,
+                "error": "タイムアウト",
+                "retryable": True,
+            }
+        )
+        service._fetch_and_save_batch = Mock(
+            return_value=[
+                {"success": True, "symbol": "7203.T", "records_saved": 1},
+                {"success": True, "symbol": "6758.T", "records_saved": 1},
+            ]
+        )
+
+        # Act (実行)
+        summary = service.fetch_multiple_stocks(
+            symbols=["7203.T", "6758.T"], use_batch=False
+        )
+
+        # Assert (検証)
+        service._fetch_and_save_batch.assert_called_once()
+        assert service._fetch_and_save_batch.call_args.args[0] == [
+            "7203.T",
+            "6758.T",
+        ]
+        assert summary["successful"] == 2
+
+    def test_fetch_multiple_stocks_incremental_parallel_retry_batch_reconciles(
+        self, service, monkeypatch
+    ):
+        """差分取得のリトライのまとめ取得でも重複期間を照合して保存する."""
+        # Arrange (準備)
+        monkeypatch.setenv("BULK_RETRY_BASE_DELAY", "0")
+        service.max_workers = 1
+        service.rate_controller.config.max_concurrency = 1
+        service.saver.get_data_ranges = Mock(
+            return_value={
+                symbol: {"latest_date": date(2025, 1, 15), "record_count": 10}
+                for symbol in ("7203.T", "6758.T")
+            }
+        )
+        service.fetch_single_stock = Mock(
+            side_effect=lambda symbol, *args, **kwargs: {
+                "success": False,
+                "symbol": symbol,
+                "error": "タイムアウト",
+                "retryable": True,
+            }
+        )
+        service.batch_processor.fetch_batch_stock_data = Mock(
+            side_effect=lambda symbols, interval, period, start=None: {
+                symbol: {
+                    "success": True,
+                    "data": [{"date": date(2025, 1, 15)}],
+                }
+                for symbol in symbols
+            }
+        )
+        service.saver.save_batch_stock_data = Mock(
+            return_value={
+                "results_by_symbol": {
+                    "7203.T": {"saved": 0, "updated": 1, "unchanged": 0},
+                    "6758.T": {"saved": 0, "updated": 0, "unchanged": 1},
+                }
+            }
+        )
+
+        # Act (実行)
+        summary = service.fetch_multiple_stocks(
+            symbols=["7203.T", "6758.T"], use_batch=False, incremental=True
+        )
+
+        # Assert (検証)
+        service.batch_processor.fetch_batch_stock_data.assert_called_once()
+        save_call = service.saver.save_batch_stock_data.call_args
+        assert save_call.kwargs["on_conflict"] == "reconcile"
+        assert summary["successful"] == 2
+
+    def test_fetch_multiple_stocks_batch_with_download_error_retries_in_batch(
+        self, service, monkeypatch
+    ):
+        """一括ダウンロード失敗の銘柄はリトライバッチで再取得される."""
+        # Arrange (準備)
+        monkeypatch.setenv("BULK_RETRY_BASE_DELAY", "0")
+        responses = [
+            {
+                "7203.T": {
+                    "success": False,
+                    "error": "一括ダウンロードエラー: 接続失敗",
+                },
+                "6758.T": {"success": False, "error": "無効な銘柄コード"},
+            },
+            {
+                "7203.T": {
+                    "success": True,
+                    "data": [{"date": date(2025, 1, 15)}],
+                }
+            },
+        ]
+        service.batch_processor.fetch_batch_stock_data = Mock(
+            side_effect=lambda symbols, interval, period: responses.pop(0)
+        )
+        service.saver.save_batch_stock_data = Mock(
+            return_value={"results_by_symbol": {"7203.T": {"saved": 1}}}
+        )
+
+        # Act (実行)
+        summary = service._fetch_multiple_stocks_batch(
+            symbols=["7203.T", "6758.T"], batch_size=2
+        )
+
+        # Assert (検証)
+        calls = service.batch_processor.fetch_batch_stock_data.call_args_list
+        assert calls[1].kwargs["symbols"] == ["7203.T"]
+        assert summary["successful"] == 1
+        assert summary["failed"] == 1
+        assert summary["retry_queue"]["scheduled_total"] == 1
+
+    def test_fetch_multiple_stocks_parallel_with_open_circuit_parks_symbol(
+        self, service, monkeypatch
+    ):
+        """ブレーカー作動中の拒否は試行回数に数えず保留して再実行する."""
+        # Arrange (準備)
+        monkeypatch.setenv("BULK_RETRY_BASE_DELAY", "0")
+        rejections = iter([True, True, True])
+
+        def fetch(symbol, interval, period, start, **kwargs):
+            if next(rejections, False):
+                return {
+                    "success": False,
+                    "symbol": symbol,
+                    "error": f"{CIRCUIT_OPEN_MESSAGE}（0.0秒後に再試行可能）",
+                    "retryable": False,
+                }
+            return {"success": True, "symbol": symbol, "records_saved": 1}
+
+        service.max_workers = 1
+        service.rate_controller.config.max_concurrency = 1
+        service.fetch_single_stock = Mock(side_effect=fetch)
+
+        # Act (実行)
+        summary = service.fetch_multiple_stocks(
+            symbols=["7203.T"], use_batch=False
+        )
+
+        # Assert (検証)
+        assert service.fetch_single_stock.call_count == 4
+        assert summary["successful"] == 1
+        assert summary["results"][0]["attempts"] == 1
+        assert summary["circuit_breaker"]["state"] == "closed"
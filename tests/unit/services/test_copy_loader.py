@@ -0,0 +1,100 @@
+"""COPYによる一括ロードのテスト."""
+
+from datetime import date
+from unittest.mock import Mock
+
+import pytest
+
+from app.services.stock_data.bar_batch import BarBatch
+from app.services.stock_data.copy_loader import (
+    STAGING_TABLE,
+    CsvStream,
+    copy_merge,
+)
+
+
+pytestmark = pytest.mark.unit
+
+
+def _bars(*days: int) -> BarBatch:
+    """指定日の日足バッチ."""
+    return BarBatch.from_records(
+        [
+            {
+                "date": date(2025, 1, day),
+                "open": 100.0,
+                "high": 110.5,
+                "low": 90.0,
+                "close": 105.0,
+                "volume": 1000,
+            }
+            for day in days
+        ],
+        "1d",
+    )
+
+
+class TestCsvStream:
+    """CsvStreamのテスト."""
+
+    def test_read_spans_chunk_boundaries(self):
+        """要求サイズごとにチャンクをまたいで読み出し、最後は空文字を返す."""
+        # Arrange (準備)
+        stream = CsvStream(iter(["abc", "", "defgh", "i"]))
+
+        # Act (実行)
+        parts = [stream.read(2), stream.read(4), stream.read(), stream.read(3)]
+
+        # Assert (検証)
+        assert parts == ["ab", "cdef", "ghi", ""]
+
+
+class TestCopyMerge:
+    """copy_mergeのテスト."""
+
+    def test_copy_merge_stages_rows_and_returns_inserted_per_symbol(self):
+        """ステージングへCOPYしてマージし、銘柄別の挿入件数を返す."""
+        # Arrange (準備)
+        cursor = Mock()
+        copied = []
+        cursor.copy_expert.side_effect = lambda sql, stream: copied.append(
+            stream.read()
+        )
+        cursor.fetchall.return_value = [("7203.T", 2, 0)]
+
+        # Act (実行)
+        inserted = copy_merge(
+            cursor,
+            "stocks_1d",
+            {"7203.T": _bars(6, 7), "9984.T": _bars(6)},
+        )
+
+        # Assert (検証)
+        assert inserted == {
+            "7203.T": {"inserted": 2, "updated": 0},
+            "9984.T": {"inserted": 0, "updated": 0},
+        }
+        assert copied == [
+            "7203.T,2025-01-06,100.0,110.5,90.0,105.0,1000\n"
+            "7203.T,2025-01-07,100.0,110.5,90.0,105.0,1000\n"
+            "9984.T,2025-01-06,100.0,110.5,90.0,105.0,1000\n"
+        ]
+        statements = [c.args[0] for c in cursor.execute.call_args_list]
+        assert statements[0] == "DROP TABLE IF EXISTS pg_temp.stocks_staging"
+        assert f"CREATE TEMP TABLE {STAGING_TABLE}" in statements[1]
+        assert "ON CONFLICT (symbol, date) DO NOTHING" in statements[2]
+        assert statements[3] == f"DROP TABLE {STAGING_TABLE}"
+
+    def test_copy_merge_with_empty_batches_skips_database(self):
+        """保存対象がない場合はDBを操作しない."""
+        # Arrange (準備)
+        cursor = Mock()
+
+        # Act (実行)
+        inserted = copy_merge(
+            cursor, "stocks_1d", {"7203.T": BarBatch.empty("1d")}
+        )
+
+        # Assert (検証)
+        assert inserted == {"7203.T": {"inserted": 0, "updated": 0}}
+        cursor.execute.assert_not_called()
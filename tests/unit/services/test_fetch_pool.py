@@ -0,0 +1,157 @@
+"""取得ワーカープールのテスト."""
+
+from datetime import datetime
+from functools import partial
+from unittest.mock import MagicMock, patch
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from app.services.bulk.stock_batch_processor import StockBatchProcessor
+from app.services.stock_data.fetch_pool import (
+    FetchWorkerPool,
+    WorkerPoolProvider,
+    decode_frame,
+    encode_frame,
+    get_fetch_pool,
+)
+from app.services.stock_data.fetcher import StockDataFetcher
+from app.services.stock_data.provider import ReplayProvider
+
+
+pytestmark = pytest.mark.unit
+
+
+@pytest.fixture
+def sample_dataframe():
+    """yfinance形式のサンプルDataFrame."""
+    index = pd.date_range(
+        "2024-01-01", periods=3, freq="D", tz="Asia/Tokyo", name="Date"
+    )
+    return pd.DataFrame(
+        {
+            "Open": [100.0, 101.0, 102.0],
+            "High": [105.0, 106.0, 107.0],
+            "Low": [99.0, 100.0, 101.0],
+            "Close": [103.0, 104.0, 105.0],
+            "Volume": np.array([1000, 1100, 1200], dtype="int64"),
+        },
+        index=index,
+    )
+
+
+class TestFramePayload:
+    """ペイロード変換のテスト."""
+
+    def test_encode_decode_with_single_symbol_frame_returns_same_frame(
+        self, sample_dataframe
+    ):
+        """単一銘柄のDataFrameが往復変換で復元される."""
+        # Act (実行)
+        payload = encode_frame(sample_dataframe)
+        restored = decode_frame(payload)
+
+        # Assert (検証)
+        assert all(isinstance(v, np.ndarray) for v in payload["data"])
+        pd.testing.assert_frame_equal(
+            restored, sample_dataframe, check_freq=False
+        )
+
+    def test_encode_decode_with_multi_symbol_frame_returns_same_frame(self):
+        """MultiIndex列（一括取得）のDataFrameが往復変換で復元される."""
+        # Arrange (準備)
+        columns = pd.MultiIndex.from_product(
+            [["Open", "Close"], ["7203.T", "6758.T"]],
+            names=["Price", "Ticker"],
+        )
+        df = pd.DataFrame(
+            np.arange(8.0).reshape(2, 4),
+            index=pd.date_range("2024-01-01", periods=2, name="Date"),
+            columns=columns,
+        )
+
+        # Act (実行)
+        restored = decode_frame(encode_frame(df))
+
+        # Assert (検証)
+        pd.testing.assert_frame_equal(restored, df, check_freq=False)
+
+
+class TestFetchPoolIntegration:
+    """ワーカープール利用時の取得処理のテスト."""
+
+    def test_get_fetch_pool_without_env_returns_none(self, monkeypatch):
+        """環境変数未設定の場合はプールを使用しない."""
+        # Arrange (準備)
+        monkeypatch.delenv("FETCH_POOL_WORKERS", raising=False)
+
+        # Act & Assert (実行と検証)
+        assert get_fetch_pool() is None
+
+    @patch("app.services.stock_data.provider.yf.Ticker")
+    def test_fetch_stock_data_with_pool_delegates_to_pool(
+        self, mock_ticker, sample_dataframe
+    ):
+        """プール指定時はyfinanceを直接呼ばずにプールへ委譲する."""
+        # Arrange (準備)
+        pool = MagicMock()
+        pool.call.return_value = sample_dataframe
+        fetcher = StockDataFetcher(provider=WorkerPoolProvider(pool))
+
+        # Act (実行)
+        df = fetcher.fetch_stock_data("7203.T", "1d")
+
+        # Assert (検証)
+        assert len(df) == 3
+        pool.call.assert_called_once_with(
+            "fetch_history", "7203.T", "1d", None, None
+        )
+        mock_ticker.assert_not_called()
+
+    @patch("app.services.stock_data.provider.yf.Tickers")
+    def test_download_batch_with_pool_delegates_to_pool(
+        self, mock_tickers, sample_dataframe
+    ):
+        """一括取得もプール指定時はプールへ委譲する."""
+        # Arrange (準備)
+        pool = MagicMock()
+        pool.call.return_value = sample_dataframe
+        processor = StockBatchProcessor(provider=WorkerPoolProvider(pool))
+
+        # Act (実行)
+        processor._download_batch_from_provider(["7203.T", "6758.T"], "1h")
+
+        # Assert (検証)
+        pool.call.assert_called_once_with(
+            "fetch_batch_history", ["7203.T", "6758.T"], "1h", None, None
+        )
+        mock_tickers.assert_not_called()
+
+    def test_call_with_spawn_pool_does_not_start_application(
+        self, monkeypatch, tmp_path
+    ):
+        """ワーカーはアプリ（DB接続・スプール）を起動せずに取得する."""
+        # Arrange (準備)
+        # 接続できないDBを指定し、ワーカーがDBに触れると失敗するようにする
+        monkeypatch.setenv("DB_HOST", "127.0.0.1")
+        monkeypatch.setenv("DB_PORT", "1")
+        monkeypatch.setenv("WRITE_SPOOL_ENABLED", "true")
+        monkeypatch.setenv("WRITE_SPOOL_DIR", str(tmp_path))
+        now = datetime(2024, 1, 31, 15, 0)
+        expected = ReplayProvider(seed=1, now=now).fetch_history(
+            "7203.T", "1d", "5d"
+        )
+        pool = FetchWorkerPool(
+            max_workers=1,
+            provider_factory=partial(ReplayProvider, seed=1, now=now),
+        )
+
+        # Act (実行)
+        try:
+            df = pool.call("fetch_history", "7203.T", "1d", "5d", None)
+        finally:
+            pool.shutdown()
+
+        # Assert (検証)
+        pd.testing.assert_frame_equal(df, expected, check_freq=False)
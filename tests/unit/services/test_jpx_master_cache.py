@@ -0,0 +1,95 @@
+"""JPX銘柄一覧キャッシュのテスト."""
+
+import pandas as pd
+import pytest
+
+from app.services.jpx.master_cache import (
+    JPXMasterCache,
+    JPXMasterCacheConfig,
+    MasterSnapshot,
+    content_hash,
+)
+
+
+pytestmark = pytest.mark.unit
+
+
+def _cache(tmp_path, enabled=True) -> JPXMasterCache:
+    """一時ディレクトリを使うキャッシュ."""
+    return JPXMasterCache(
+        JPXMasterCacheConfig(enabled=enabled, directory=str(tmp_path))
+    )
+
+
+class TestJPXMasterCache:
+    """JPXMasterCacheのテスト."""
+
+    def test_store_then_load_frame_restores_values_and_missing_values(
+        self, tmp_path
+    ):
+        """保存した銘柄一覧を欠損値を含めて復元する."""
+        # Arrange (準備)
+        cache = _cache(tmp_path)
+        frame = pd.DataFrame(
+            {
+                "stock_code": ["1301", "1332"],
+                "stock_name": ["極洋", "ニッスイ"],
+                "sector_code_33": ["50", None],
+            }
+        )
+
+        # Act (実行)
+        cache.store(MasterSnapshot(content_hash(b"v1"), frame, etag='"v1"'))
+        loaded = cache.load_frame()
+
+        # Assert (検証)
+        assert loaded.to_dict("records") == [
+            {
+                "stock_code": "1301",
+                "stock_name": "極洋",
+                "sector_code_33": "50",
+            },
+            {
+                "stock_code": "1332",
+                "stock_name": "ニッスイ",
+                "sector_code_33": None,
+            },
+        ]
+        assert cache.matches(content_hash(b"v1"))
+        assert not cache.matches(content_hash(b"v2"))
+        assert cache.conditional_headers() == {"If-None-Match": '"v1"'}
+
+    def test_disabled_cache_stores_nothing(self, tmp_path):
+        """無効化されている場合はファイルを作らず、常に未保存として扱う."""
+        # Arrange (準備)
+        cache = _cache(tmp_path, enabled=False)
+        frame = pd.DataFrame({"stock_code": ["1301"]})
+
+        # Act (実行)
+        cache.store(MasterSnapshot(content_hash(b"v1"), frame, etag='"v1"'))
+
+        # Assert (検証)
+        assert list(tmp_path.iterdir()) == []
+        assert cache.load_frame() is None
+        assert not cache.matches(content_hash(b"v1"))
+        assert cache.conditional_headers() == {}
+
+    def test_conditional_headers_without_frame_returns_empty(self, tmp_path):
+        """正規化結果が失われた場合は条件付きリクエストを送らない."""
+        # Arrange (準備)
+        cache = _cache(tmp_path)
+        frame = pd.DataFrame({"stock_code": ["1301"]})
+        cache.store(
+            MasterSnapshot(
+                content_hash(b"v1"),
+                frame,
+                last_modified="Mon, 01 Sep 2025 00:00:00 GMT",
+            )
+        )
+        (tmp_path / "master.npz").unlink()
+
+        # Act (実行)
+        headers = cache.conditional_headers()
+
+        # Assert (検証)
+        assert headers == {}
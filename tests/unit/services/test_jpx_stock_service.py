@@ -9,16 +9,41 @@ import pytest
 import requests
 
 from app.services.jpx.jpx_stock_service import (
+    MASTER_FIELDS,
     JPXDownloadError,
     JPXParseError,
     JPXStockService,
     JPXStockServiceError,
 )
+from app.services.jpx.master_cache import (
+    JPXMasterCache,
+    JPXMasterCacheConfig,
+    MasterSnapshot,
+    content_hash,
+)
 
 
 pytestmark = pytest.mark.unit
 
 
+def _response(content, status_code=200, etag=None):
+    """JPXからのレスポンスのモック."""
+    response = Mock()
+    response.content = content
+    response.status_code = status_code
+    response.headers = {"ETag": etag} if etag else {}
+    return response
+
+
+def _current_master(rows):
+    """サービスが読み込む形式の現在の銘柄マスタ."""
+    columns = ["id", "stock_code", *MASTER_FIELDS, "is_active"]
+    return pd.DataFrame(
+        [{"is_active": 1, **row} for row in rows],
+        columns=columns,
+    ).astype({column: object for column in MASTER_FIELDS})
+
+
 class TestJPXStockService:
     """JPXStockServiceのテストクラス."""
 
@@ -65,7 +90,7 @@ class TestJPXStockService:
         )
         mock_read_excel.return_value = mock_df
 
-        # _normalize_jpx_dataメソッドをモック
+        # _normalize_jpx_frameメソッドをモック
         normalized_df = pd.DataFrame(
             {
                 "stock_code": ["1301", "1332"],
@@ -77,7 +102,7 @@ class TestJPXStockService:
 
         # Act (実行)
         with patch.object(
-            self.service, "_normalize_jpx_data", return_value=normalized_df
+            self.service, "_normalize_jpx_frame", return_value=normalized_df
         ):
             result = self.service.fetch_jpx_stock_list()
 
@@ -163,6 +188,34 @@ class TestJPXStockService:
         assert result[0]["sector_name_33"] == "水産・農林業"
         assert "data_date" in result[0]
 
+    def test_normalize_jpx_data_with_untidy_values_returns_cleaned_strings(
+        self,
+    ):
+        """空白・欠損値・数値の列を文字列またはNoneに揃える."""
+        # Arrange (準備)
+        input_df = pd.DataFrame(
+            {
+                "コード": [1301, 1332, 1333, None],
+                "銘柄名": [" 極洋 ", "日本水産", "  ", "名称のみ"],
+                "市場・商品区分": ["プライム", "", "プライム", "プライム"],
+                "33業種コード": [50.0, None, 50.0, 50.0],
+                "規模区分": ["TOPIX Small 1", float("nan"), "-", "-"],
+            }
+        )
+
+        # Act (実行)
+        result = self.service._normalize_jpx_data(input_df)
+
+        # Assert (検証)
+        # 銘柄コードまたは銘柄名が空の行は除外される
+        assert [r["stock_code"] for r in result] == ["1301", "1332"]
+        assert result[0]["stock_name"] == "極洋"
+        assert result[0]["sector_code_33"] == "50"
+        assert result[0]["sector_name_33"] is None
+        assert result[1]["market_category"] is None
+        assert result[1]["sector_code_33"] is None
+        assert result[1]["scale_category"] is None
+
     def test_normalize_jpx_data_minimal_columns_with_basic_data_returns_normalized_data(
         self,
     ):
@@ -208,7 +261,7 @@ class TestJPXStockService:
         assert result[0]["stock_name"] == "極洋"
 
     @patch("app.services.jpx.jpx_stock_service.get_db_session")
-    @patch.object(JPXStockService, "fetch_jpx_stock_list")
+    @patch.object(JPXStockService, "_fetch_snapshot")
     def test_update_stock_master_success_with_valid_data_returns_update_result(
         self, mock_fetch, mock_get_db_session
     ):
@@ -222,35 +275,25 @@ class TestJPXStockService:
                 "market_category": ["プライム", "プライム"],
             }
         )
-        mock_fetch.return_value = mock_df
+        mock_fetch.return_value = MasterSnapshot("hash", mock_df)
 
         # モックセッションを設定
         mock_session = MagicMock()
         mock_get_db_session.return_value.__enter__.return_value = mock_session
 
-        # 既存銘柄コードを設定
-        mock_session.query.return_value.filter.return_value.all.return_value = [
-            ("1301",)
-        ]
-
-        # 更新履歴レコードのモック
-        mock_update = Mock()
-        mock_update.id = 1
-        mock_session.add = Mock()
-        mock_session.flush = Mock()
+        # 既存銘柄（1301は市場区分が変更される）
+        current = _current_master(
+            [{"id": 1, "stock_code": "1301", "stock_name": "極洋"}]
+        )
 
         # Act (実行)
         with patch.object(
             self.service, "_create_update_record", return_value=1
         ), patch.object(
-            self.service, "_get_existing_stock_codes", return_value={"1301"}
-        ), patch.object(
-            self.service, "_insert_stock"
-        ), patch.object(
-            self.service, "_update_stock"
-        ), patch.object(
-            self.service, "_deactivate_stocks"
+            self.service, "_load_current_master", return_value=current
         ), patch.object(
+            self.service, "_apply_master_diff"
+        ) as mock_apply, patch.object(
             self.service, "_complete_update_record"
         ):
             result = self.service.update_stock_master("manual")
@@ -261,8 +304,107 @@ class TestJPXStockService:
         assert result["added_stocks"] == 1  # 1332は新規
         assert result["updated_stocks"] == 1  # 1301は更新
         assert result["removed_stocks"] == 0
+        assert result["field_changes"] == {"market_category": 1}
+        mock_apply.assert_called_once()
 
-    @patch.object(JPXStockService, "fetch_jpx_stock_list")
+    def test_diff_stock_master_with_mixed_changes_returns_only_differences(
+        self,
+    ):
+        """新規・変更・変更なし・削除・再有効化を判定する."""
+        # Arrange (準備)
+        incoming = self.service._prepare_master_frame(
+            pd.DataFrame(
+                {
+                    "stock_code": ["1301", "1332", "1333", "1334 ", "1335"],
+                    "stock_name": ["極洋", "日本水産 ", "マルハ", "A", "B"],
+                    "market_category": [
+                        "プライム",
+                        "",
+                        "プライム",
+                        None,
+                        None,
+                    ],
+                    "sector_code_33": [50, 50, 50, None, None],
+                    "data_date": ["20251012"] * 5,
+                }
+            )
+        )
+        current = _current_master(
+            [
+                # 変更なし（data_date だけが異なる）
+                {
+                    "id": 1,
+                    "stock_code": "1301",
+                    "stock_name": "極洋",
+                    "market_category": "プライム",
+                    "sector_code_33": "50",
+                },
+                # 市場区分が空になる
+                {
+                    "id": 2,
+                    "stock_code": "1332",
+                    "stock_name": "日本水産",
+                    "market_category": "プライム",
+                    "sector_code_33": "50",
+                },
+                # 銘柄名が変わる
+                {
+                    "id": 3,
+                    "stock_code": "1333",
+                    "stock_name": "マルハニチロ",
+                    "market_category": "プライム",
+                    "sector_code_33": "50",
+                },
+                # 無効化されていた銘柄が再上場
+                {
+                    "id": 4,
+                    "stock_code": "1334",
+                    "stock_name": "A",
+                    "is_active": 0,
+                },
+                # 一覧から消えた銘柄
+                {"id": 5, "stock_code": "9999", "stock_name": "Z"},
+            ]
+        )
+
+        # Act (実行)
+        diff = self.service._diff_stock_master(incoming, current)
+
+        # Assert (検証)
+        assert [r["stock_code"] for r in diff.added] == ["1335"]
+        assert diff.added[0]["is_active"] == 1
+        assert sorted(r["id"] for r in diff.changed) == [2, 3, 4]
+        assert diff.removed_codes == {"9999"}
+        assert diff.field_changes == {
+            "stock_name": 1,
+            "market_category": 1,
+            "is_active": 1,
+        }
+        changed = {r["stock_code"]: r for r in diff.changed}
+        assert changed["1332"]["market_category"] is None
+        assert changed["1334"]["is_active"] == 1
+        assert changed["1333"]["data_date"] == "20251012"
+
+    def test_diff_stock_master_with_same_data_returns_no_changes(self):
+        """前回と同じ一覧では更新対象がない."""
+        # Arrange (準備)
+        incoming = self.service._prepare_master_frame(
+            pd.DataFrame({"stock_code": ["1301"], "stock_name": ["極洋"]})
+        )
+        current = _current_master(
+            [{"id": 1, "stock_code": "1301", "stock_name": "極洋"}]
+        )
+
+        # Act (実行)
+        diff = self.service._diff_stock_master(incoming, current)
+
+        # Assert (検証)
+        assert diff.added == []
+        assert diff.changed == []
+        assert diff.removed_codes == set()
+        assert diff.field_changes == {}
+
+    @patch.object(JPXStockService, "_fetch_snapshot")
     def test_update_stock_master_fetch_error_with_download_error_raises_jpx_service_error(
         self, mock_fetch
     ):
@@ -277,6 +419,142 @@ class TestJPXStockService:
 
         assert "銘柄マスタの更新に失敗しました" in str(exc_info.value)
 
+    @patch("app.services.jpx.jpx_stock_service.get_db_session")
+    @patch.object(JPXStockService, "_fetch_snapshot")
+    def test_update_stock_master_with_unchanged_file_records_unchanged_run(
+        self, mock_fetch, mock_get_db_session
+    ):
+        """前回と同じファイルでは差分を算出せずに変更なしとして記録する."""
+        # Arrange (準備)
+        mock_fetch.return_value = MasterSnapshot(
+            "hash",
+            pd.DataFrame({"stock_code": ["1301"], "stock_name": ["極洋"]}),
+            unchanged=True,
+        )
+
+        # Act (実行)
+        with patch.object(
+            self.service, "_create_update_record", return_value=1
+        ), patch.object(
+            self.service, "_load_current_master"
+        ) as mock_load, patch.object(
+            self.service, "_complete_update_record"
+        ) as mock_complete:
+            result = self.service.update_stock_master("scheduled")
+
+        # Assert (検証)
+        assert result["status"] == "unchanged"
+        assert result["total_stocks"] == 1
+        assert result["updated_stocks"] == 0
+        mock_load.assert_not_called()
+        assert mock_complete.call_args.args[2]["status"] == "unchanged"
+
+    @patch("app.services.jpx.jpx_stock_service.get_db_session")
+    @patch("app.services.jpx.jpx_stock_service.requests.Session.get")
+    @patch("app.services.jpx.jpx_stock_service.pd.read_excel")
+    def test_update_stock_master_with_same_content_skips_parse_and_diff(
+        self, mock_read_excel, mock_get, mock_get_db_session, tmp_path
+    ):
+        """反映済みと同じ内容のファイルはExcelを解析せず差分も算出しない."""
+        # Arrange (準備)
+        cache = JPXMasterCache(
+            JPXMasterCacheConfig(enabled=True, directory=str(tmp_path))
+        )
+        service = JPXStockService(master_cache=cache)
+        mock_get.return_value = _response(b"excel v1", etag='"v1"')
+        mock_read_excel.return_value = pd.DataFrame(
+            {"コード": ["1301"], "銘柄名": ["極洋"]}
+        )
+
+        with patch.object(
+            service, "_create_update_record", return_value=1
+        ), patch.object(
+            service, "_load_current_master", return_value=_current_master([])
+        ) as mock_load, patch.object(
+            service, "_apply_master_diff"
+        ), patch.object(
+            service, "_complete_update_record"
+        ):
+            first = service.update_stock_master()
+
+            # Act (実行)
+            mock_get.return_value = _response(b"excel v1", status_code=200)
+            second = service.update_stock_master()
+
+        # Assert (検証)
+        assert first["added_stocks"] == 1
+        assert second["status"] == "unchanged"
+        mock_read_excel.assert_called_once()
+        mock_load.assert_called_once()
+        assert mock_get.call_args.kwargs["headers"] == {
+            "If-None-Match": '"v1"'
+        }
+        assert cache.get_stats()["hash_matches"] == 1
+
+    @patch("app.services.jpx.jpx_stock_service.get_db_session")
+    @patch.object(JPXStockService, "_fetch_snapshot")
+    def test_update_stock_master_failure_does_not_store_file(
+        self, mock_fetch, mock_get_db_session, tmp_path
+    ):
+        """反映に失敗したファイルは処理済みとして保存しない."""
+        # Arrange (準備)
+        cache = JPXMasterCache(
+            JPXMasterCacheConfig(enabled=True, directory=str(tmp_path))
+        )
+        service = JPXStockService(master_cache=cache)
+        mock_fetch.return_value = MasterSnapshot(
+            content_hash(b"excel v1"),
+            pd.DataFrame({"stock_code": ["1301"], "stock_name": ["極洋"]}),
+        )
+
+        # Act (実行)
+        with patch.object(
+            service, "_create_update_record", return_value=1
+        ), patch.object(
+            service, "_load_current_master", side_effect=Exception("DB down")
+        ), patch.object(
+            service, "_complete_update_record"
+        ), pytest.raises(
+            JPXStockServiceError
+        ):
+            service.update_stock_master()
+
+        # Assert (検証)
+        assert not cache.matches(content_hash(b"excel v1"))
+
+    @patch("app.services.jpx.jpx_stock_service.requests.Session.get")
+    @patch("app.services.jpx.jpx_stock_service.pd.read_excel")
+    def test_fetch_jpx_stock_list_not_modified_returns_cached_frame(
+        self, mock_read_excel, mock_get, tmp_path
+    ):
+        """304 が返った場合はキャッシュした正規化結果を返す."""
+        # Arrange (準備)
+        cache = JPXMasterCache(
+            JPXMasterCacheConfig(enabled=True, directory=str(tmp_path))
+        )
+        frame = pd.DataFrame({"stock_code": ["1301"], "stock_name": ["極洋"]})
+        cache.store(
+            MasterSnapshot(
+                content_hash(b"excel v1"),
+                frame,
+                last_modified="Mon, 01 Sep 2025 00:00:00 GMT",
+            )
+        )
+        service = JPXStockService(master_cache=cache)
+        mock_get.return_value = _response(b"", status_code=304)
+
+        # Act (実行)
+        snapshot = service._fetch_snapshot()
+
+        # Assert (検証)
+        assert snapshot.unchanged
+        assert snapshot.frame.to_dict("records") == frame.to_dict("records")
+        assert mock_get.call_args.kwargs["headers"] == {
+            "If-Modified-Since": "Mon, 01 Sep 2025 00:00:00 GMT"
+        }
+        mock_read_excel.assert_not_called()
+        assert cache.get_stats()["not_modified"] == 1
+
     @patch("app.services.jpx.jpx_stock_service.get_db_session")
     def test_get_stock_list_success_with_valid_data_returns_stock_list(
         self, mock_get_db_session
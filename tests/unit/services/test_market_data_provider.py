@@ -0,0 +1,270 @@
+"""市場データプロバイダーのテスト."""
+
+from datetime import datetime
+import pickle
+from unittest.mock import patch
+
+import pandas as pd
+import pytest
+
+from app.exceptions import MarketDataProviderError, MarketDataRateLimitError
+from app.services.common.error_handler import ErrorHandler, ErrorType
+from app.services.stock_data.provider import (
+    ReplayProvider,
+    YahooFinanceProvider,
+    create_provider,
+    get_default_period,
+)
+
+
+pytestmark = pytest.mark.unit
+
+NOW = datetime(2025, 1, 10, 15, 0)
+
+
+class TestDefaultPeriod:
+    """デフォルト取得期間のテスト."""
+
+    def test_get_default_period_with_known_interval_returns_period(self):
+        """既知の時間軸は対応する期間を返す."""
+        assert get_default_period("1m") == "7d"
+        assert get_default_period("1h") == "730d"
+        assert get_default_period("1d") == "max"
+
+    def test_get_default_period_with_unknown_interval_returns_one_year(self):
+        """未知の時間軸は1年を返す."""
+        assert get_default_period("unknown") == "1y"
+
+
+class TestYahooFinanceProvider:
+    """YahooFinanceProviderのテスト."""
+
+    @patch("app.services.stock_data.provider.yf.Ticker")
+    def test_fetch_history_without_period_uses_default_period(
+        self, mock_ticker
+    ):
+        """期間未指定の場合はデフォルト期間で取得する."""
+        # Arrange (準備)
+        mock_ticker.return_value.history.return_value = pd.DataFrame()
+
+        # Act (実行)
+        YahooFinanceProvider().fetch_history("7203.T", "5m")
+
+        # Assert (検証)
+        mock_ticker.return_value.history.assert_called_once_with(
+            period="60d", interval="5m"
+        )
+
+    @patch("app.services.stock_data.provider.yf.Tickers")
+    def test_fetch_batch_history_with_start_uses_start(self, mock_tickers):
+        """開始日時指定の場合はstartで一括取得する."""
+        # Arrange (準備)
+        mock_tickers.return_value.history.return_value = pd.DataFrame()
+        start = datetime(2025, 1, 1)
+
+        # Act (実行)
+        YahooFinanceProvider().fetch_batch_history(
+            ["7203.T", "6758.T"], "1d", start=start
+        )
+
+        # Assert (検証)
+        mock_tickers.assert_called_once_with("7203.T 6758.T")
+        mock_tickers.return_value.history.assert_called_once_with(
+            start=start, interval="1d"
+        )
+
+
+class TestReplayProvider:
+    """ReplayProviderのテスト."""
+
+    def test_fetch_history_with_synthetic_data_is_deterministic(self):
+        """合成データは取得範囲が異なっても重複区間の値が一致する."""
+        # Arrange (準備)
+        provider = ReplayProvider(now=NOW)
+
+        # Act (実行)
+        full = provider.fetch_history("7203.T", "1d", period="1mo")
+        partial = provider.fetch_history(
+            "7203.T", "1d", start=datetime(2025, 1, 6)
+        )
+
+        # Assert (検証)
+        assert list(full.columns[:5]) == [
+            "Open",
+            "High",
+            "Low",
+            "Close",
+            "Volume",
+        ]
+        assert len(partial) == 5
+        pd.testing.assert_frame_equal(
+            full.loc[partial.index], partial, check_freq=False
+        )
+        assert (full["High"] >= full[["Open", "Close"]].max(axis=1)).all()
+        assert (full["Low"] <= full[["Open", "Close"]].min(axis=1)).all()
+
+    def test_fetch_history_with_intraday_interval_returns_trading_hours(
+        self,
+    ):
+        """分足の合成データは平日の取引時間内のみ生成される."""
+        # Arrange (準備)
+        provider = ReplayProvider(now=NOW)
+
+        # Act (実行)
+        df = provider.fetch_history("7203.T", "1h", period="7d")
+
+        # Assert (検証)
+        assert not df.empty
+        assert (df.index.dayofweek < 5).all()
+        assert df.index.hour.min() >= 9
+        assert df.index.hour.max() < 15
+
+    def test_fetch_batch_history_returns_multi_index_columns(self):
+        """一括取得は (価格項目, 銘柄コード) のMultiIndex列を返す."""
+        # Arrange (準備)
+        provider = ReplayProvider(now=NOW)
+
+        # Act (実行)
+        df = provider.fetch_batch_history(["7203.T", "6758.T"], "1d", "5d")
+
+        # Assert (検証)
+        assert df.columns.nlevels == 2
+        assert set(df.columns.get_level_values(1)) == {"7203.T", "6758.T"}
+        single = df.xs("7203.T", level=1, axis=1)
+        assert "Close" in single.columns
+        assert provider.get_stats()["requests"] == 1
+
+    def test_fetch_history_with_recorded_file_returns_recorded_data(
+        self, tmp_path
+    ):
+        """記録済みファイルがある場合はその内容を返す."""
+        # Arrange (準備)
+        provider = ReplayProvider(data_dir=str(tmp_path), now=NOW)
+        recorded = pd.DataFrame(
+            {
+                "Open": [1.0, 2.0],
+                "High": [1.5, 2.5],
+                "Low": [0.5, 1.5],
+                "Close": [1.2, 2.2],
+                "Volume": [100, 200],
+            },
+            index=pd.DatetimeIndex(
+                ["2025-01-08", "2025-01-09"], tz="Asia/Tokyo", name="Date"
+            ),
+        )
+        provider.record("7203.T", "1d", recorded)
+
+        # Act (実行)
+        df = provider.fetch_history("7203.T", "1d", period="max")
+
+        # Assert (検証)
+        assert df["Close"].tolist() == [1.2, 2.2]
+        assert (tmp_path / "1d" / "7203.T.csv.gz").exists()
+
+    def test_fetch_history_without_file_and_synthetic_returns_empty(
+        self, tmp_path
+    ):
+        """合成無効かつファイルがない場合は空のDataFrameを返す."""
+        # Arrange (準備)
+        provider = ReplayProvider(
+            data_dir=str(tmp_path), synthetic=False, now=NOW
+        )
+
+        # Act & Assert (実行と検証)
+        assert provider.fetch_history("7203.T", "1d").empty
+
+    def test_fetch_history_with_error_rate_raises_provider_error(self):
+        """エラー率1.0の場合は一時的エラーを送出する."""
+        # Arrange (準備)
+        provider = ReplayProvider(error_rate=1.0, now=NOW)
+
+        # Act & Assert (実行と検証)
+        with pytest.raises(MarketDataProviderError):
+            provider.fetch_history("7203.T", "1d")
+        assert provider.get_stats()["errors"] == 1
+
+    def test_fetch_history_over_request_limit_raises_rate_limit_error(self):
+        """1分あたりの上限超過で429（一時的エラー）を送出する."""
+        # Arrange (準備)
+        provider = ReplayProvider(max_requests_per_minute=2, now=NOW)
+        provider.fetch_history("7203.T", "1d", period="5d")
+        provider.fetch_history("7203.T", "1d", period="5d")
+
+        # Act (実行)
+        with pytest.raises(MarketDataRateLimitError) as exc_info:
+            provider.fetch_history("7203.T", "1d", period="5d")
+
+        # Assert (検証)
+        assert "429" in str(exc_info.value)
+        error_type = ErrorHandler().classify_error(exc_info.value)
+        assert error_type == ErrorType.TEMPORARY
+        assert provider.get_stats()["rate_limited"] == 1
+
+    @patch("app.services.stock_data.provider.time.sleep")
+    def test_fetch_history_with_latency_sleeps(self, mock_sleep):
+        """設定した疑似遅延だけ待機する."""
+        # Arrange (準備)
+        provider = ReplayProvider(latency_ms=250, now=NOW)
+
+        # Act (実行)
+        provider.fetch_history("7203.T", "1d", period="5d")
+
+        # Assert (検証)
+        mock_sleep.assert_called_once_with(0.25)
+
+
+class TestProviderErrors:
+    """プロバイダーエラーのテスト."""
+
+    @pytest.mark.parametrize(
+        "error_class", [MarketDataProviderError, MarketDataRateLimitError]
+    )
+    def test_error_survives_pickle_with_details(self, error_class):
+        """ワーカープロセスから戻しても詳細情報とエラーコードを保持する."""
+        # Arrange (準備)
+        error = error_class("429 Too Many Requests", {"symbol": "7203.T"})
+
+        # Act (実行)
+        restored = pickle.loads(pickle.dumps(error))
+
+        # Assert (検証)
+        assert type(restored) is error_class
+        assert str(restored) == "429 Too Many Requests"
+        assert restored.details == {"symbol": "7203.T"}
+        assert restored.error_code == error.error_code
+
+
+class TestCreateProvider:
+    """create_providerのテスト."""
+
+    def test_create_provider_with_replay_env_returns_replay_provider(
+        self, monkeypatch
+    ):
+        """環境変数でリプレイプロバイダーを選択できる."""
+        # Arrange (準備)
+        monkeypatch.setenv("MARKET_DATA_PROVIDER", "replay")
+        monkeypatch.setenv("REPLAY_LATENCY_MS", "50")
+        monkeypatch.setenv("REPLAY_MAX_REQUESTS_PER_MINUTE", "30")
+
+        # Act (実行)
+        provider = create_provider()
+
+        # Assert (検証)
+        assert isinstance(provider, ReplayProvider)
+        assert provider.latency_ms == 50.0
+        assert provider.max_requests_per_minute == 30
+
+    def test_create_provider_with_unknown_name_raises_error(self):
+        """不明なプロバイダー名はエラーになる."""
+        with pytest.raises(MarketDataProviderError):
+            create_provider("unknown")
+
+    def test_create_provider_without_env_returns_yahoo_provider(
+        self, monkeypatch
+    ):
+        """未設定の場合はYahoo Financeプロバイダーを返す."""
+        # Arrange (準備)
+        monkeypatch.delenv("MARKET_DATA_PROVIDER", raising=False)
+
+        # Act & Assert (実行と検証)
+        assert isinstance(create_provider(), YahooFinanceProvider)
@@ -0,0 +1,211 @@
+"""月単位パーティション管理のテスト."""
+
+from datetime import date, datetime, timezone
+from unittest.mock import Mock
+
+import pytest
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.schema import CreateTable
+
+from app.models import Stocks1d, Stocks5m
+from app.services.stock_data.partitions import (
+    PARTITION_TZ,
+    PartitionConfig,
+    PartitionManager,
+    create_partition_sql,
+    day_range,
+    month_of,
+    months_between,
+)
+
+
+pytestmark = pytest.mark.unit
+
+
+def _stub_catalog(manager, names):
+    """カタログ参照をパーティション化済み・指定のパーティション名に置き換える."""
+    manager._is_partitioned = Mock(return_value=True)
+    manager._partition_names = Mock(return_value=names)
+    return manager._partition_names
+
+
+def _executed_sql(bind):
+    """モックの接続で実行されたSQL文の一覧."""
+    return [str(call.args[0]) for call in bind.execute.call_args_list]
+
+
+class TestPartitionBounds:
+    """パーティション境界の計算のテスト."""
+
+    def test_month_of_uses_market_timezone(self):
+        """UTCの月末夜はAsia/Tokyoの翌月のパーティションに属する."""
+        # Arrange (準備)
+        value = datetime(2025, 1, 31, 16, 0, tzinfo=timezone.utc)
+
+        # Act (実行)
+        month = month_of(value)
+
+        # Assert (検証)
+        assert month == date(2025, 2, 1)
+
+    def test_months_between_spans_year_boundary(self):
+        """開始・終了の月を含めて年をまたぐ月を列挙する."""
+        # Act (実行)
+        months = months_between(date(2024, 11, 15), date(2025, 2, 1))
+
+        # Assert (検証)
+        assert months == [
+            date(2024, 11, 1),
+            date(2024, 12, 1),
+            date(2025, 1, 1),
+            date(2025, 2, 1),
+        ]
+
+    def test_create_partition_sql_uses_month_start_bounds(self):
+        """月初から翌月初までの範囲でパーティションを作成する."""
+        # Act (実行)
+        sql = create_partition_sql("stocks_5m", date(2024, 12, 1))
+
+        # Assert (検証)
+        assert sql == (
+            "CREATE TABLE IF NOT EXISTS stocks_5m_p202412 "
+            "PARTITION OF stocks_5m "
+            "FOR VALUES FROM ('2024-12-01 00:00:00+09:00') "
+            "TO ('2025-01-01 00:00:00+09:00')"
+        )
+
+    def test_day_range_includes_whole_end_day(self):
+        """終了日の翌日0時を上限（含まない）とする日時の範囲に変換する."""
+        # Act (実行)
+        start, end = day_range(date(2025, 1, 6), date(2025, 1, 10))
+
+        # Assert (検証)
+        assert start == datetime(2025, 1, 6, tzinfo=PARTITION_TZ)
+        assert end == datetime(2025, 1, 11, tzinfo=PARTITION_TZ)
+
+
+class TestPartitionedModels:
+    """分足・時間足モデルのDDLのテスト."""
+
+    def test_postgresql_ddl_partitions_by_datetime(self):
+        """PostgreSQLでは主キーにdatetimeを含めて月単位で分割する."""
+        # Act (実行)
+        ddl = str(
+            CreateTable(Stocks5m.__table__).compile(
+                dialect=postgresql.dialect()
+            )
+        )
+
+        # Assert (検証)
+        assert "PRIMARY KEY (id, datetime)" in ddl
+        assert ddl.strip().endswith("PARTITION BY RANGE (datetime)")
+
+    def test_other_ddl_keeps_single_column_primary_key(self):
+        """SQLiteと日足以上のテーブルは従来どおり id のみの主キー."""
+        # Act (実行)
+        sqlite_ddl = str(
+            CreateTable(Stocks5m.__table__).compile(dialect=sqlite.dialect())
+        )
+        daily_ddl = str(
+            CreateTable(Stocks1d.__table__).compile(
+                dialect=postgresql.dialect()
+            )
+        )
+
+        # Assert (検証)
+        assert "PRIMARY KEY (id)" in sqlite_ddl
+        assert "PARTITION BY" not in sqlite_ddl
+        assert "PRIMARY KEY (id)" in daily_ddl
+        assert "PARTITION BY" not in daily_ddl
+
+
+class TestPartitionManager:
+    """PartitionManagerのテスト."""
+
+    def test_ensure_range_creates_only_missing_months(self, postgresql_bind):
+        """作成済みでない月だけをロックを取得してから作成する."""
+        # Arrange (準備)
+        manager = PartitionManager(PartitionConfig())
+        _stub_catalog(manager, ["stocks_5m_p202501"])
+        bind = postgresql_bind
+
+        # Act (実行)
+        created = manager.ensure_range(
+            bind,
+            "stocks_5m",
+            datetime(2025, 1, 6, 9, 0, tzinfo=PARTITION_TZ),
+            datetime(2025, 2, 3, 15, 0, tzinfo=PARTITION_TZ),
+        )
+
+        # Assert (検証)
+        assert created == ["stocks_5m_p202502"]
+        executed = _executed_sql(bind)
+        assert "pg_advisory_xact_lock" in executed[0]
+        assert executed[1] == create_partition_sql(
+            "stocks_5m", date(2025, 2, 1)
+        )
+
+    def test_ensure_range_skips_catalog_for_known_months(
+        self, postgresql_bind
+    ):
+        """カタログで確認済みの月だけの期間ではDBを参照しない."""
+        # Arrange (準備)
+        manager = PartitionManager(PartitionConfig())
+        lookup = _stub_catalog(manager, ["stocks_5m_p202501"])
+        bind = postgresql_bind
+        manager.ensure_range(
+            bind, "stocks_5m", date(2025, 1, 6), date(2025, 1, 6)
+        )
+
+        # Act (実行)
+        created = manager.ensure_range(
+            bind, "stocks_5m", date(2025, 1, 7), date(2025, 1, 31)
+        )
+
+        # Assert (検証)
+        assert created == []
+        assert lookup.call_count == 1
+        bind.execute.assert_not_called()
+
+    @pytest.mark.parametrize(
+        "table, dialect",
+        [("stocks_5m", "sqlite"), ("stocks_1d", "postgresql")],
+    )
+    def test_ensure_range_ignores_unpartitioned_targets(self, table, dialect):
+        """PostgreSQL以外の接続先と日足以上のテーブルでは何もしない."""
+        # Arrange (準備)
+        manager = PartitionManager(PartitionConfig())
+        bind = Mock(spec=["execute", "dialect"])
+        bind.dialect.name = dialect
+
+        # Act (実行)
+        created = manager.ensure_range(
+            bind, table, date(2025, 1, 6), date(2025, 1, 6)
+        )
+
+        # Assert (検証)
+        assert created == []
+        bind.execute.assert_not_called()
+
+    def test_drop_before_drops_only_fully_expired_partitions(
+        self, postgresql_bind
+    ):
+        """範囲全体が基準日時より前のパーティションだけを削除する."""
+        # Arrange (準備)
+        manager = PartitionManager(PartitionConfig())
+        _stub_catalog(
+            manager,
+            ["stocks_5m_p202502", "stocks_5m_p202412", "stocks_5m_p202501"],
+        )
+        bind = postgresql_bind
+
+        # Act (実行)
+        dropped = manager.drop_before(bind, "stocks_5m", date(2025, 2, 15))
+
+        # Assert (検証)
+        assert dropped == ["stocks_5m_p202412", "stocks_5m_p202501"]
+        assert _executed_sql(bind)[1:] == [
+            "DROP TABLE IF EXISTS stocks_5m_p202412",
+            "DROP TABLE IF EXISTS stocks_5m_p202501",
+        ]
+        assert manager.get_stats()["dropped"] == 2
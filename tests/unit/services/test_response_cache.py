@@ -0,0 +1,223 @@
+"""プロバイダー応答キャッシュのテスト."""
+
+from datetime import date, datetime
+from unittest.mock import Mock
+
+import pandas as pd
+import pytest
+
+from app.services.bulk.stock_batch_processor import StockBatchProcessor
+from app.services.stock_data.fetcher import StockDataFetcher
+from app.services.stock_data.provider import ReplayProvider
+from app.services.stock_data.response_cache import (
+    MARKET_TZ,
+    ResponseCache,
+    ResponseCacheConfig,
+)
+
+
+pytestmark = pytest.mark.unit
+
+# 2025-01-10（金）10:00 JST
+NOW = datetime(2025, 1, 10, 10, 0, tzinfo=MARKET_TZ).timestamp()
+
+
+@pytest.fixture
+def clock(clock):
+    """NOW（取引時間中）を指すテスト用の時計."""
+    clock.now = NOW
+    return clock
+
+
+@pytest.fixture
+def cache(tmp_path, clock):
+    """一時ディレクトリを使う有効なキャッシュ."""
+    return ResponseCache(
+        ResponseCacheConfig(enabled=True, directory=str(tmp_path)),
+        clock=clock,
+    )
+
+
+@pytest.fixture
+def frame():
+    """リプレイプロバイダーの合成データ."""
+    provider = ReplayProvider(now=datetime(2025, 1, 10, 15, 0))
+    return provider.fetch_history("7203.T", "5m", period="5d")
+
+
+class TestResponseCache:
+    """ResponseCacheのテスト."""
+
+    def test_get_after_put_returns_identical_frame(self, cache, frame):
+        """保存した応答は値・型・インデックスまで同一で復元される."""
+        # Arrange (準備)
+        cache.put("7203.T", "5m", frame, period="5d")
+
+        # Act (実行)
+        result = cache.get("7203.T", "5m", period="5d")
+
+        # Assert (検証)
+        pd.testing.assert_frame_equal(result, frame)
+        stats = cache.get_stats()
+        assert stats["hits"] == 1
+        assert stats["stores"] == 1
+        assert stats["entries"] == 1
+
+    def test_get_with_different_request_misses(self, cache, frame):
+        """銘柄・時間軸・開始日時が異なるリクエストはヒットしない."""
+        # Arrange (準備)
+        cache.put("7203.T", "5m", frame, start=date(2025, 1, 6))
+
+        # Act (実行)
+        results = [
+            cache.get("6758.T", "5m", start=date(2025, 1, 6)),
+            cache.get("7203.T", "15m", start=date(2025, 1, 6)),
+            cache.get("7203.T", "5m", start=date(2025, 1, 7)),
+        ]
+
+        # Assert (検証)
+        assert results == [None, None, None]
+        assert cache.get_stats()["misses"] == 3
+
+    def test_ttl_for_depends_on_interval(self, cache):
+        """分足は足の長さ、日足は次の取引終了まで."""
+        # Act (実行)
+        minute_ttl = cache.ttl_for("1m")
+        daily_ttl = cache.ttl_for("1d")
+
+        # Assert (検証)
+        assert minute_ttl == 60
+        assert daily_ttl == 5.5 * 3600
+
+    def test_ttl_for_after_friday_close_lasts_until_monday(self, cache, clock):
+        """金曜の取引終了後は翌営業日（月曜）の取引終了まで有効."""
+        # Arrange (準備)
+        clock.now = datetime(2025, 1, 10, 16, 0, tzinfo=MARKET_TZ).timestamp()
+
+        # Act (実行)
+        ttl = cache.ttl_for("1wk")
+
+        # Assert (検証)
+        assert ttl == (3 * 24 - 0.5) * 3600
+
+    def test_get_after_ttl_returns_none_and_removes_file(
+        self, cache, clock, frame, tmp_path
+    ):
+        """有効期限を過ぎた応答は削除してミスとする."""
+        # Arrange (準備)
+        cache.put("7203.T", "1m", frame)
+        clock.now += 61
+
+        # Act (実行)
+        result = cache.get("7203.T", "1m")
+
+        # Assert (検証)
+        assert result is None
+        assert list(tmp_path.glob("*.npz")) == []
+        stats = cache.get_stats()
+        assert stats["expired"] == 1
+        assert stats["entries"] == 0
+
+    def test_put_over_size_limit_evicts_least_recently_used(
+        self, tmp_path, clock, frame
+    ):
+        """合計サイズが上限を超えると最も長く参照されていない応答を削除."""
+        # Arrange (準備)
+        probe = ResponseCache(
+            ResponseCacheConfig(enabled=True, directory=str(tmp_path / "p"))
+        )
+        probe.put("probe", "1d", frame)
+        size = probe.get_stats()["bytes"]
+        cache = ResponseCache(
+            ResponseCacheConfig(
+                enabled=True,
+                directory=str(tmp_path / "c"),
+                max_bytes=int(size * 2.5),
+            ),
+            clock=clock,
+        )
+        cache.put("A", "1d", frame)
+        cache.put("B", "1d", frame)
+        cache.get("A", "1d")
+
+        # Act (実行)
+        cache.put("C", "1d", frame)
+
+        # Assert (検証)
+        assert cache.get("A", "1d") is not None
+        assert cache.get("B", "1d") is None
+        assert cache.get("C", "1d") is not None
+        assert cache.get_stats()["evictions"] == 1
+
+    def test_init_with_existing_files_restores_index(self, cache, frame):
+        """再起動後も保存済みの応答を使用できる."""
+        # Arrange (準備)
+        cache.put("7203.T", "1d", frame)
+
+        # Act (実行)
+        restarted = ResponseCache(cache.config, clock=cache._clock)
+
+        # Assert (検証)
+        assert restarted.get_stats()["entries"] == 1
+        assert restarted.get("7203.T", "1d") is not None
+
+    def test_get_when_disabled_does_not_touch_disk(self, tmp_path, frame):
+        """無効化されている場合は保存も取得もしない."""
+        # Arrange (準備)
+        cache = ResponseCache(
+            ResponseCacheConfig(enabled=False, directory=str(tmp_path))
+        )
+
+        # Act (実行)
+        stored = cache.put("7203.T", "1d", frame)
+        result = cache.get("7203.T", "1d")
+
+        # Assert (検証)
+        assert stored is False
+        assert result is None
+        assert list(tmp_path.iterdir()) == []
+
+
+class TestResponseCacheIntegration:
+    """取得処理からのキャッシュ利用のテスト."""
+
+    def test_fetch_stock_data_with_cached_response_skips_provider(
+        self, cache, frame
+    ):
+        """2回目の取得はプロバイダーを呼び出さない."""
+        # Arrange (準備)
+        provider = Mock()
+        provider.fetch_history.return_value = frame
+        fetcher = StockDataFetcher(provider=provider, response_cache=cache)
+        fetcher.fetch_stock_data("7203.T", "5m", period="5d")
+
+        # Act (実行)
+        result = fetcher.fetch_stock_data("7203.T", "5m", period="5d")
+
+        # Assert (検証)
+        provider.fetch_history.assert_called_once()
+        pd.testing.assert_frame_equal(result, frame)
+
+    def test_fetch_batch_with_partially_cached_symbols_downloads_rest(
+        self, cache
+    ):
+        """キャッシュ済みの銘柄を除いた銘柄のみ一括ダウンロードする."""
+        # Arrange (準備)
+        replay = ReplayProvider(now=datetime(2025, 1, 10, 15, 0))
+        provider = Mock(wraps=replay)
+        processor = StockBatchProcessor(
+            provider=provider, response_cache=cache
+        )
+        processor.fetch_batch_stock_data(["7203.T"], "1d", period="1mo")
+
+        # Act (実行)
+        results = processor.fetch_batch_stock_data(
+            ["7203.T", "6758.T"], "1d", period="1mo"
+        )
+
+        # Assert (検証)
+        second_call = provider.fetch_batch_history.call_args_list[1]
+        assert second_call.args[0] == ["6758.T"]
+        assert results["7203.T"]["success"] is True
+        assert results["6758.T"]["success"] is True
+        assert cache.get_stats()["hits"] == 1
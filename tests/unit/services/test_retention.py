@@ -0,0 +1,144 @@
+"""分足・時間足データの保持ルールのテスト."""
+
+from datetime import datetime
+from unittest.mock import Mock, patch
+
+import pytest
+
+from app.services.stock_data.partitions import PARTITION_TZ
+from app.services.stock_data.retention import (
+    RetentionConfig,
+    RetentionError,
+    RetentionJob,
+    RetentionRule,
+    parse_rules,
+    rollup_sql,
+)
+
+
+pytestmark = pytest.mark.unit
+
+
+class TestRetentionRules:
+    """保持ルールの解析・検証のテスト."""
+
+    def test_parse_rules_keeps_order_and_optional_rollup(self):
+        """記載順にルールを作成し、集約先は省略できる."""
+        # Act (実行)
+        rules = parse_rules("1m:30:5m, 5m:180:1h, 1h:730")
+
+        # Assert (検証)
+        assert rules == [
+            RetentionRule("1m", 30, "5m"),
+            RetentionRule("5m", 180, "1h"),
+            RetentionRule("1h", 730),
+        ]
+
+    @pytest.mark.parametrize(
+        "spec",
+        ["1m", "1m:thirty", "1d:30", "1m:0", "5m:30:1m", "15m:30:1h:x"],
+    )
+    def test_parse_rules_rejects_invalid_rules(self, spec):
+        """形式・時間軸・保持日数が不正なルールはエラーにする."""
+        # Act & Assert (実行と検証)
+        with pytest.raises(RetentionError):
+            parse_rules(spec)
+
+    def test_rollup_target_must_be_multiple_of_source(self):
+        """集約先は元の時間軸の整数倍でなければならない."""
+        # Act & Assert (実行と検証)
+        with pytest.raises(RetentionError):
+            RetentionRule("15m", 30, "5m")
+        assert RetentionRule("15m", 30, "30m").rollup_to == "30m"
+
+    def test_cutoff_is_market_midnight(self):
+        """保持期間の境界は Asia/Tokyo の日付の0時."""
+        # Arrange (準備)
+        rule = RetentionRule("1m", 30)
+
+        # Act (実行)
+        cutoff = rule.cutoff(
+            datetime(2025, 3, 10, 23, 30, tzinfo=PARTITION_TZ)
+        )
+
+        # Assert (検証)
+        assert cutoff == datetime(2025, 2, 8, tzinfo=PARTITION_TZ)
+
+    def test_config_from_env(self, monkeypatch):
+        """RETENTION_* 環境変数から設定を作成する."""
+        # Arrange (準備)
+        monkeypatch.setenv("RETENTION_RULES", "1m:7:15m")
+        monkeypatch.setenv("RETENTION_CHUNK_DAYS", "2")
+        monkeypatch.setenv("RETENTION_HOUR", "4")
+
+        # Act (実行)
+        config = RetentionConfig.from_env()
+
+        # Assert (検証)
+        assert config.rules == [RetentionRule("1m", 7, "15m")]
+        assert config.chunk_days == 2
+        assert (config.hour, config.minute) == (4, 0)
+
+    def test_rollup_sql_aggregates_ohlcv_without_overwriting(self):
+        """始値・終値は区間の最初・最後、既存の足は上書きしない."""
+        # Act (実行)
+        sql = rollup_sql("stocks_1m", "stocks_5m")
+
+        # Assert (検証)
+        assert sql.startswith("WITH inserted AS (INSERT INTO stocks_5m ")
+        assert "(array_agg(open ORDER BY datetime))[1]" in sql
+        assert "(array_agg(close ORDER BY datetime DESC))[1]" in sql
+        assert "FROM stocks_1m WHERE datetime >= :start" in sql
+        assert "ON CONFLICT (symbol, datetime) DO NOTHING" in sql
+        assert sql.endswith("FROM inserted GROUP BY symbol")
+
+
+class TestRetentionJob:
+    """RetentionJob.run の実行記録のテスト."""
+
+    @patch("app.services.stock_data.retention.BatchService")
+    def test_run_records_results_and_continues_after_failure(
+        self, mock_batch_service
+    ):
+        """ルールごとの結果をバッチに記録し、失敗しても残りを適用する."""
+        # Arrange (準備)
+        mock_batch_service.create_batch.return_value = {"id": 7}
+        mock_batch_service.create_batch_detail.side_effect = [
+            {"id": 1},
+            {"id": 2},
+        ]
+        config = RetentionConfig(rules=parse_rules("1m:30:5m,5m:180"))
+        job = RetentionJob(config, engine=Mock(), partition_manager=Mock())
+        applied = {
+            "interval": "1m",
+            "rolled_up": 12,
+            "deleted_rows": 60,
+            "dropped_partitions": ["stocks_1m_p202501"],
+        }
+        job.apply_rule = Mock(side_effect=[applied, RuntimeError("timeout")])
+
+        # Act (実行)
+        result = job.run(datetime(2025, 3, 10, tzinfo=PARTITION_TZ))
+
+        # Assert (検証)
+        assert result["batch_id"] == 7
+        assert result["rolled_up"] == 12
+        assert result["deleted_rows"] == 60
+        assert result["dropped_partitions"] == 1
+        mock_batch_service.create_batch.assert_called_once_with(
+            "retention", total_stocks=2
+        )
+        mock_batch_service.update_batch_detail.assert_any_call(
+            1, "completed", records_inserted=12
+        )
+        mock_batch_service.update_batch_detail.assert_any_call(
+            2, "failed", error_message="timeout"
+        )
+        mock_batch_service.update_batch_progress.assert_called_with(7, 2, 1, 1)
+        complete = mock_batch_service.complete_batch.call_args
+        assert complete.kwargs["status"] == "failed"
+        assert complete.kwargs["error_message"] == "5m: timeout"
+        assert complete.kwargs["summary"]["rules"][1] == {
+            "interval": "5m",
+            "error": "timeout",
+        }
@@ -0,0 +1,84 @@
+"""遅延リトライキューのテスト."""
+
+import pytest
+
+from app.services.bulk.retry_queue import DeferredRetryQueue
+
+
+pytestmark = pytest.mark.unit
+
+
+class TestDeferredRetryQueue:
+    """DeferredRetryQueueのテスト."""
+
+    def test_pop_ready_before_not_before_returns_empty(self, clock):
+        """実行可能時刻前のエントリは取り出されない."""
+        # Arrange (準備)
+        retry_queue = DeferredRetryQueue(
+            base_delay=5.0, jitter=0.0, clock=clock
+        )
+        retry_queue.push("7203.T", attempt=2, error="429")
+
+        # Act (実行)
+        ready = retry_queue.pop_ready()
+
+        # Assert (検証)
+        assert ready == []
+        assert len(retry_queue) == 1
+        assert retry_queue.next_ready_in() == 5.0
+
+    def test_pop_ready_after_not_before_returns_entries_in_order(self, clock):
+        """実行可能時刻に達したエントリが早い順に取り出される."""
+        # Arrange (準備)
+        retry_queue = DeferredRetryQueue(
+            base_delay=1.0, jitter=0.0, clock=clock
+        )
+        retry_queue.push("6758.T", attempt=3)
+        retry_queue.push("7203.T", attempt=2)
+        clock.now += 10
+
+        # Act (実行)
+        ready = retry_queue.pop_ready(limit=1)
+
+        # Assert (検証)
+        assert [entry.symbol for entry in ready] == ["7203.T"]
+        assert retry_queue.ready_count() == 1
+
+    def test_push_with_later_attempt_grows_delay_up_to_max(self, clock):
+        """試行回数に応じて待機時間が伸び、上限で頭打ちになる."""
+        # Arrange (準備)
+        retry_queue = DeferredRetryQueue(
+            base_delay=2.0,
+            multiplier=3.0,
+            max_delay=10.0,
+            jitter=0.0,
+            clock=clock,
+        )
+
+        # Act (実行)
+        second = retry_queue.push("7203.T", attempt=2)
+        third = retry_queue.push("7203.T", attempt=3)
+        fifth = retry_queue.push("7203.T", attempt=5)
+
+        # Assert (検証)
+        assert second.not_before - clock.now == 2.0
+        assert third.not_before - clock.now == 6.0
+        assert fifth.not_before - clock.now == 10.0
+
+    def test_push_with_jitter_spreads_delay(self, clock):
+        """ジッターにより待機時間が指定範囲内でばらつく."""
+        # Arrange (準備)
+        retry_queue = DeferredRetryQueue(
+            base_delay=10.0, jitter=0.5, clock=clock
+        )
+
+        # Act (実行)
+        delays = [
+            retry_queue.push("7203.T", attempt=2).not_before - clock.now
+            for _ in range(20)
+        ]
+
+        # Assert (検証)
+        assert all(5.0 <= d <= 15.0 for d in delays)
+        assert len(set(delays)) > 1
+        assert retry_queue.get_stats()["scheduled_total"] == 20
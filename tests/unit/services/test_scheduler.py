@@ -8,6 +8,8 @@ from unittest.mock import MagicMock, Mock, patch
 
 import pytest
 
+from app.services.stock_data.archive import ArchiveConfig
+from app.services.stock_data.retention import RetentionConfig
 from app.services.stock_data.scheduler import StockDataScheduler, get_scheduler
 
 
@@ -110,6 +112,99 @@ class TestStockDataScheduler:
         # ジョブが追加されたことを確認
         mock_scheduler.add_job.assert_called_once()
 
+    @patch("app.services.stock_data.scheduler.StockDataOrchestrator")
+    @patch("app.services.stock_data.scheduler.BackgroundScheduler")
+    def test_add_retention_job_schedules_daily_run(
+        self, mock_scheduler_class, mock_orchestrator_class
+    ):
+        """データ保持ジョブを設定の時刻に毎日実行するよう追加する."""
+        # Arrange (準備)
+        mock_scheduler = Mock()
+        mock_scheduler_class.return_value = mock_scheduler
+
+        scheduler = StockDataScheduler()
+        config = RetentionConfig(hour=2, minute=30)
+
+        # Act (実行)
+        scheduler.add_retention_job(config)
+
+        # Assert (検証)
+        kwargs = mock_scheduler.add_job.call_args.kwargs
+        assert kwargs["id"] == "retention"
+        assert kwargs["args"] == [config]
+        assert str(kwargs["trigger"].fields[5]) == "2"
+        assert str(kwargs["trigger"].fields[6]) == "30"
+
+    @patch("app.services.stock_data.scheduler.get_partition_manager")
+    @patch("app.services.stock_data.scheduler.RetentionJob")
+    @patch("app.services.stock_data.scheduler.StockDataOrchestrator")
+    @patch("app.services.stock_data.scheduler.BackgroundScheduler")
+    def test_retention_job_error_still_prepares_partitions(
+        self,
+        mock_scheduler_class,
+        mock_orchestrator_class,
+        mock_retention_job_class,
+        mock_get_partition_manager,
+    ):
+        """保持ジョブが失敗しても翌月以降のパーティションを作成する."""
+        # Arrange (準備)
+        mock_retention_job_class.return_value.run.side_effect = RuntimeError(
+            "db down"
+        )
+        scheduler = StockDataScheduler()
+
+        # Act (実行)
+        scheduler._retention_job(RetentionConfig())
+
+        # Assert (検証)
+        mock_get_partition_manager.return_value.ensure_upcoming.assert_called_once()
+
+    @patch("app.services.stock_data.scheduler.StockDataOrchestrator")
+    @patch("app.services.stock_data.scheduler.BackgroundScheduler")
+    def test_add_archive_job_schedules_daily_run(
+        self, mock_scheduler_class, mock_orchestrator_class
+    ):
+        """圧縮保存ジョブを設定の時刻に毎日実行するよう追加する."""
+        # Arrange (準備)
+        mock_scheduler = Mock()
+        mock_scheduler_class.return_value = mock_scheduler
+
+        scheduler = StockDataScheduler()
+        config = ArchiveConfig(hour=4, minute=15)
+
+        # Act (実行)
+        scheduler.add_archive_job(config)
+
+        # Assert (検証)
+        kwargs = mock_scheduler.add_job.call_args.kwargs
+        assert kwargs["id"] == "archive"
+        assert kwargs["args"] == [config]
+        assert str(kwargs["trigger"].fields[5]) == "4"
+        assert str(kwargs["trigger"].fields[6]) == "15"
+
+    @patch("app.services.stock_data.scheduler.ArchiveCompactor")
+    @patch("app.services.stock_data.scheduler.StockDataOrchestrator")
+    @patch("app.services.stock_data.scheduler.BackgroundScheduler")
+    def test_archive_job_logs_error_without_raising(
+        self,
+        mock_scheduler_class,
+        mock_orchestrator_class,
+        mock_compactor_class,
+    ):
+        """圧縮保存ジョブの失敗はスケジューラーに伝播させない."""
+        # Arrange (準備)
+        mock_compactor_class.return_value.run.side_effect = RuntimeError(
+            "db down"
+        )
+        scheduler = StockDataScheduler()
+        config = ArchiveConfig()
+
+        # Act (実行)
+        scheduler._archive_job(config)
+
+        # Assert (検証)
+        mock_compactor_class.assert_called_once_with(config)
+
     @patch("app.services.stock_data.scheduler.StockDataOrchestrator")
     @patch("app.services.stock_data.scheduler.BackgroundScheduler")
     def test_remove_job_with_valid_job_id_removes_job(
@@ -340,6 +435,27 @@ class TestStockDataScheduler:
         # Assert (検証)
         mock_orchestrator.update_all_timeframes.assert_called_once()
 
+    @patch("app.services.stock_data.scheduler.StockDataOrchestrator")
+    @patch("app.services.stock_data.scheduler.BackgroundScheduler")
+    def test_update_job_with_open_circuit_skips_orchestrator(
+        self, mock_scheduler_class, mock_orchestrator_class
+    ):
+        """サーキットブレーカー作動中は更新を見送る."""
+        # Arrange (準備)
+        mock_orchestrator = Mock()
+        mock_orchestrator_class.return_value = mock_orchestrator
+
+        scheduler = StockDataScheduler()
+        scheduler.circuit_breaker = Mock()
+        scheduler.circuit_breaker.is_open.return_value = True
+        scheduler.circuit_breaker.retry_after.return_value = 30.0
+
+        # Act (実行)
+        scheduler._update_job(symbol="7203.T")
+
+        # Assert (検証)
+        mock_orchestrator.update_all_timeframes.assert_not_called()
+
     @patch("app.services.stock_data.scheduler.StockDataOrchestrator")
     @patch("app.services.stock_data.scheduler.BackgroundScheduler")
     def test_job_executed_listener_logs_info(
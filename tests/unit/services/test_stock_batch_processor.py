@@ -9,6 +9,7 @@ from app.services.bulk.stock_batch_processor import (
     StockBatchProcessingError,
     StockBatchProcessor,
 )
+from app.services.common.fetch_gateway import FetchContext, FetchPriority
 
 
 pytestmark = pytest.mark.unit
@@ -81,7 +82,7 @@ class TestStockBatchProcessor:
         assert result["1d"]["success"] is True
         assert result["1wk"]["success"] is False
 
-    @patch("app.services.bulk.stock_batch_processor.yf.Tickers")
+    @patch("app.services.stock_data.provider.yf.Tickers")
     def test_fetch_batch_stock_data_with_valid_symbols_returns_success(
         self, mock_tickers, processor
     ):
@@ -127,8 +128,8 @@ class TestStockBatchProcessor:
                 assert result[symbol]["success"] is False
                 assert "error" in result[symbol]
 
-    @patch("app.services.bulk.stock_batch_processor.yf.Tickers")
-    def test_download_batch_from_yahoo_with_valid_symbols_returns_success(
+    @patch("app.services.stock_data.provider.yf.Tickers")
+    def test_download_batch_from_provider_with_valid_symbols_returns_success(
         self, mock_tickers, processor, sample_dataframe
     ):
         """Yahoo Financeからの一括ダウンロード成功テスト."""
@@ -138,15 +139,39 @@ class TestStockBatchProcessor:
         mock_tickers.return_value = mock_tickers_instance
 
         # Act (実行)
-        result = processor._download_batch_from_yahoo(["7203.T", "AAPL"], "1d")
+        result = processor._download_batch_from_provider(
+            ["7203.T", "AAPL"], "1d"
+        )
 
         # Assert (検証)
         assert result is not None
         mock_tickers.assert_called_once_with("7203.T AAPL")
         mock_tickers_instance.history.assert_called_once()
 
-    @patch("app.services.bulk.stock_batch_processor.yf.Tickers")
-    def test_download_batch_from_yahoo_with_failure_returns_error(
+    @patch("app.services.stock_data.provider.yf.Tickers")
+    def test_download_batch_from_provider_with_start_returns_data_from_start(
+        self, mock_tickers, processor, sample_dataframe
+    ):
+        """開始日時指定時の一括ダウンロードテスト."""
+        # Arrange (準備)
+        mock_tickers_instance = MagicMock()
+        mock_tickers_instance.history.return_value = sample_dataframe
+        mock_tickers.return_value = mock_tickers_instance
+        start = pd.Timestamp("2024-01-01").date()
+
+        # Act (実行)
+        result = processor._download_batch_from_provider(
+            ["7203.T", "AAPL"], "1d", start=start
+        )
+
+        # Assert (検証)
+        assert result is not None
+        mock_tickers_instance.history.assert_called_once_with(
+            start=start, interval="1d"
+        )
+
+    @patch("app.services.stock_data.provider.yf.Tickers")
+    def test_download_batch_from_provider_with_failure_returns_error(
         self, mock_tickers, processor
     ):
         """Yahoo Financeからの一括ダウンロード失敗テスト."""
@@ -155,7 +180,27 @@ class TestStockBatchProcessor:
 
         # Act & Assert (実行と検証)
         with pytest.raises(Exception, match="API Error"):
-            processor._download_batch_from_yahoo(["7203.T", "AAPL"], "1d")
+            processor._download_batch_from_provider(["7203.T", "AAPL"], "1d")
+
+    def test_download_batch_from_provider_with_context_uses_gateway(
+        self, sample_dataframe
+    ):
+        """一括ダウンロードは銘柄数分のコストでゲートウェイを経由する."""
+        # Arrange (準備)
+        provider = MagicMock()
+        provider.fetch_batch_history.return_value = sample_dataframe
+        gateway = MagicMock()
+        context = FetchContext(FetchPriority.BACKFILL, job_id="job-1")
+        processor = StockBatchProcessor(
+            provider=provider, gateway=gateway, fetch_context=context
+        )
+
+        # Act (実行)
+        processor._download_batch_from_provider(["7203.T", "6758.T"], "1d")
+
+        # Assert (検証)
+        gateway.request.assert_called_once_with(context, cost=2)
+        provider.fetch_batch_history.assert_called_once()
 
     def test_fetch_multiple_timeframes_with_invalid_symbol_returns_error(
         self, processor
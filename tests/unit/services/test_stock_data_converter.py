@@ -1,7 +1,9 @@
 """StockDataConverterのテスト."""
 
 from datetime import date, datetime
+import pickle
 
+import numpy as np
 import pandas as pd
 import pytest
 
@@ -212,3 +214,66 @@ class TestStockDataConverter:
         assert record["close"] == 105.0
         assert record["volume"] == 1000
         assert record["date"] == date(2024, 1, 1)
+
+    @pytest.mark.parametrize("interval", ["1d", "5m"])
+    def test_converter_convert_to_dict_with_invalid_rows_matches_row_conversion(
+        self, converter, interval
+    ):
+        """一括変換の結果は行単位の変換とバイト列まで一致する."""
+        # Arrange (準備)
+        df = pd.DataFrame(
+            {
+                "Open": [100.0, np.nan, 102.0, 0.0, 104.0],
+                "High": [105.0, 106.0, 101.0, 108.0, 109.0],
+                "Low": [99.0, 100.0, 100.0, 101.0, 103.0],
+                "Close": [103.0, 104.0, 100.5, 106.0, 108.0],
+                "Volume": [1000.0, 2000.0, 3000.0, 4000.0, np.nan],
+                "Dividends": 0.0,
+            },
+            index=pd.date_range(
+                "2024-01-04 09:00", periods=5, freq="5min", tz="Asia/Tokyo"
+            ),
+        )
+
+        # Act (実行)
+        result = converter.convert_to_dict(df, interval)
+
+        # Assert (検証)
+        expected, skipped = converter._convert_rows(df, interval)
+        assert skipped == 3
+        assert pickle.dumps(result) == pickle.dumps(expected)
+        assert result[1]["volume"] == 0
+        assert type(result[0]["open"]) is float
+        assert type(result[0]["volume"]) is int
+
+    def test_converter_convert_to_dict_with_object_column_uses_row_conversion(
+        self, converter
+    ):
+        """数値以外の列を含む場合は行単位で変換する."""
+        # Arrange (準備)
+        df = pd.DataFrame(
+            {
+                "Open": ["100", "abc"],
+                "High": [105.0, 106.0],
+                "Low": [99.0, 100.0],
+                "Close": [103.0, 104.0],
+                "Volume": [1000, 2000],
+            },
+            index=pd.date_range("2024-01-01", periods=2),
+        )
+
+        # Act (実行)
+        result = converter.convert_to_dict(df, "1d")
+
+        # Assert (検証)
+        assert converter._can_vectorize(df) is False
+        assert result == [
+            {
+                "open": 100.0,
+                "high": 105.0,
+                "low": 99.0,
+                "close": 103.0,
+                "volume": 1000,
+                "date": date(2024, 1, 1),
+            }
+        ]
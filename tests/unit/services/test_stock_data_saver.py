@@ -3,15 +3,30 @@
 from datetime import date, datetime
 from unittest.mock import MagicMock, Mock, patch
 
+import psycopg2
 import pytest
 from sqlalchemy.exc import IntegrityError, SQLAlchemyError
 
+from app.services.stock_data.bar_batch import BarBatch
 from app.services.stock_data.saver import StockDataSaveError, StockDataSaver
 
 
 pytestmark = pytest.mark.unit
 
 
+def _record(day, **prices):
+    """日足の保存用レコード（未指定の価格・出来高は既定値）."""
+    return {
+        "date": day,
+        "open": 100.0,
+        "high": 130.0,
+        "low": 90.0,
+        "close": 110.0,
+        "volume": 1000,
+        **prices,
+    }
+
+
 class TestStockDataSaver:
     """StockDataSaverクラスのテストスイート."""
 
@@ -19,24 +34,31 @@ class TestStockDataSaver:
         """各テストメソッドの前に実行される初期化処理."""
         self.saver = StockDataSaver()
 
+    @patch("app.services.stock_data.upsert.execute_values")
     @patch("app.services.stock_data.saver.get_db_session")
     @patch("app.services.stock_data.saver.get_model_for_interval")
     @patch("app.services.stock_data.saver.validate_interval")
     def test_save_stock_data_with_valid_data_returns_success(
-        self, mock_validate, mock_get_model, mock_get_db_session
+        self,
+        mock_validate,
+        mock_get_model,
+        mock_get_db_session,
+        mock_execute_values,
     ):
         """正常なデータ保存のテスト."""
         # Arrange (準備)
         mock_validate.return_value = True
         mock_model = Mock()
+        mock_model.__tablename__ = "stocks_1d"
         mock_get_model.return_value = mock_model
         mock_session = MagicMock()
         mock_get_db_session.return_value.__enter__.return_value = mock_session
+        mock_execute_values.return_value = [("7203.T", 2, 0)]
         symbol = "7203.T"
         interval = "1d"
         data_list = [
-            {"date": date(2025, 1, 1), "open": 100, "close": 110},
-            {"date": date(2025, 1, 2), "open": 110, "close": 120},
+            _record(date(2025, 1, 1), open=100, close=110),
+            _record(date(2025, 1, 2), open=110, close=120),
         ]
 
         # Act (実行)
@@ -50,22 +72,29 @@ class TestStockDataSaver:
         assert result["skipped"] >= 0
         assert result["errors"] >= 0
 
+    @patch("app.services.stock_data.upsert.execute_values")
     @patch("app.services.stock_data.saver.get_db_session")
     @patch("app.services.stock_data.saver.get_model_for_interval")
     @patch("app.services.stock_data.saver.validate_interval")
     def test_save_stock_data_with_provided_session_returns_success(
-        self, mock_validate, mock_get_model, mock_get_db_session
+        self,
+        mock_validate,
+        mock_get_model,
+        mock_get_db_session,
+        mock_execute_values,
     ):
         """セッション提供時のデータ保存テスト."""
         # Arrange (準備)
         mock_validate.return_value = True
         mock_model = Mock()
+        mock_model.__tablename__ = "stocks_1d"
         mock_get_model.return_value = mock_model
         mock_session = MagicMock()
+        mock_execute_values.return_value = [("7203.T", 1, 0)]
         symbol = "7203.T"
         interval = "1d"
         data_list = [
-            {"date": date(2025, 1, 1), "open": 100, "close": 110},
+            _record(date(2025, 1, 1), open=100, close=110),
         ]
 
         # Act (実行)
@@ -76,6 +105,7 @@ class TestStockDataSaver:
         # Assert (検証)
         assert result["symbol"] == symbol
         assert result["total"] == 1
+        mock_get_db_session.assert_not_called()
 
     def test_save_stock_data_with_invalid_interval_raises_error(self):
         """無効な時間軸でのエラーテスト."""
@@ -150,6 +180,39 @@ class TestStockDataSaver:
         assert result["skipped"] == 1
         assert result["saved"] == 1
 
+    @patch("app.services.stock_data.saver.archive.archived_keys")
+    def test_save_with_session_with_archived_date_skips_it(
+        self, mock_archived_keys
+    ):
+        """圧縮保存済みの足と重複する日付は時間軸テーブルに保存しない."""
+        # Arrange (準備)
+        mock_session = MagicMock()
+        mock_model = Mock()
+        mock_model.date = Mock()
+        mock_model.symbol = Mock()
+        mock_session.query.return_value.filter.return_value.all.return_value = (
+            []
+        )
+        archived = BarBatch.from_records([_record(date(2025, 1, 1))], "1d")
+        mock_archived_keys.return_value = {"7203.T": archived.time_keys()}
+        data_list = [_record(date(2025, 1, 1)), _record(date(2025, 1, 2))]
+
+        # Act (実行)
+        result = self.saver._save_with_session(
+            mock_session, "7203.T", "1d", mock_model, data_list
+        )
+
+        # Assert (検証)
+        mock_archived_keys.assert_called_once_with(
+            mock_session,
+            "1d",
+            {"7203.T": (date(2025, 1, 1), date(2025, 1, 2))},
+        )
+        records = mock_session.bulk_insert_mappings.call_args.args[1]
+        assert [record["date"] for record in records] == [date(2025, 1, 2)]
+        assert result["saved"] == 1
+        assert result["skipped"] == 1
+
     @patch("app.services.stock_data.saver.is_intraday_interval")
     def test_save_with_session_error_handling_with_database_error_raises_exception(
         self, mock_is_intraday
@@ -198,7 +261,7 @@ class TestStockDataSaver:
         with patch.object(self.saver, "_filter_duplicate_data") as mock_filter:
             mock_filter.return_value = symbols_data
             result = self.saver.save_batch_stock_data(
-                symbols_data, interval="1d"
+                symbols_data, interval="1d", method="insert"
             )
 
         # Assert (検証)
@@ -206,6 +269,49 @@ class TestStockDataSaver:
         assert result["total_saved"] == 2
         mock_session.bulk_insert_mappings.assert_called_once()
 
+    @patch("app.services.stock_data.saver.archive.archived_keys")
+    @patch("app.services.stock_data.saver.get_db_session")
+    @patch("app.services.stock_data.saver.get_model_for_interval")
+    def test_save_batch_stock_data_insert_with_archived_dates_skips_them(
+        self, mock_get_model, mock_get_db_session, mock_archived_keys
+    ):
+        """辞書リストの insert 方式の保存も圧縮保存済みの足と重複する日付を除く."""
+        # Arrange (準備)
+        mock_model = Mock()
+        mock_model.__tablename__ = "stocks_1d"
+        mock_get_model.return_value = mock_model
+        mock_session = MagicMock()
+        mock_session.execute.return_value.all.return_value = []
+        mock_get_db_session.return_value.__enter__.return_value = mock_session
+        archived = BarBatch.from_records([_record(date(2025, 1, 6))], "1d")
+        mock_archived_keys.return_value = {"7203.T": archived.time_keys()}
+        symbols_data = {
+            "7203.T": [_record(date(2025, 1, 6)), _record(date(2025, 1, 7))],
+            "9984.T": [_record(date(2025, 1, 6))],
+        }
+
+        # Act (実行)
+        result = self.saver.save_batch_stock_data(
+            symbols_data, interval="1d", method="insert"
+        )
+
+        # Assert (検証)
+        mock_archived_keys.assert_called_once_with(
+            mock_session,
+            "1d",
+            {
+                "7203.T": (date(2025, 1, 6), date(2025, 1, 7)),
+                "9984.T": (date(2025, 1, 6), date(2025, 1, 6)),
+            },
+        )
+        records = mock_session.bulk_insert_mappings.call_args.args[1]
+        assert [(r["symbol"], r["date"]) for r in records] == [
+            ("7203.T", date(2025, 1, 7)),
+            ("9984.T", date(2025, 1, 6)),
+        ]
+        assert result["total_saved"] == 2
+        assert result["total_skipped"] == 1
+
     @patch("app.services.stock_data.saver.get_db_session")
     @patch("app.services.stock_data.saver.get_model_for_interval")
     @patch("app.services.stock_data.saver.validate_interval")
@@ -230,28 +336,273 @@ class TestStockDataSaver:
         with patch.object(self.saver, "_filter_duplicate_data") as mock_filter:
             mock_filter.return_value = symbols_data
             with pytest.raises(StockDataSaveError):
-                self.saver.save_batch_stock_data(symbols_data, interval="1d")
+                self.saver.save_batch_stock_data(
+                    symbols_data, interval="1d", method="insert"
+                )
+
+    @patch("app.services.stock_data.saver.execute_values")
+    @patch("app.services.stock_data.saver.get_db_session")
+    @patch("app.services.stock_data.saver.get_model_for_interval")
+    def test_save_batch_stock_data_with_bar_batches_inserts_new_rows_only(
+        self, mock_get_model, mock_get_db_session, mock_execute_values
+    ):
+        """列指向バッチは既存日付を除いた行をタプルのまま挿入する."""
+        # Arrange (準備)
+        mock_model = Mock()
+        mock_model.__tablename__ = "stocks_1d"
+        mock_get_model.return_value = mock_model
+        mock_session = MagicMock()
+        mock_get_db_session.return_value.__enter__.return_value = mock_session
+        bars = BarBatch.from_records(
+            [
+                {
+                    "date": date(2025, 1, day),
+                    "open": 100.0,
+                    "high": 110.0,
+                    "low": 90.0,
+                    "close": 105.0,
+                    "volume": 1000,
+                }
+                for day in (6, 7, 8)
+            ],
+            "1d",
+        )
+        existing = {"7203.T": {date(2025, 1, 6)}}
+
+        # Act (実行)
+        with patch.object(
+            self.saver, "_get_existing_keys", return_value=existing
+        ) as mock_existing:
+            result = self.saver.save_batch_stock_data(
+                {"7203.T": bars}, "1d", method="insert"
+            )
+
+        # Assert (検証)
+        assert result["total_saved"] == 2
+        assert result["total_skipped"] == 1
+        assert result["results_by_symbol"]["7203.T"] == {
+            "saved": 2,
+            "updated": 0,
+            "skipped": 1,
+            "errors": 0,
+            "total": 3,
+        }
+        _, _, time_ranges, _ = mock_existing.call_args.args
+        assert time_ranges == {"7203.T": (date(2025, 1, 6), date(2025, 1, 8))}
+        _, sql, rows = mock_execute_values.call_args.args
+        assert sql.startswith("INSERT INTO stocks_1d (symbol, date,")
+        assert rows == [
+            ("7203.T", date(2025, 1, 7), 100.0, 110.0, 90.0, 105.0, 1000),
+            ("7203.T", date(2025, 1, 8), 100.0, 110.0, 90.0, 105.0, 1000),
+        ]
+
+    @patch("app.services.stock_data.saver.get_db_session")
+    @patch("app.services.stock_data.saver.get_model_for_interval")
+    def test_save_stock_data_with_bar_batch_of_existing_rows_skips_insert(
+        self, mock_get_model, mock_get_db_session
+    ):
+        """既存データのみの BarBatch は挿入せずスキップ件数として返す."""
+        # Arrange (準備)
+        mock_get_model.return_value = Mock()
+        mock_session = MagicMock()
+        mock_get_db_session.return_value.__enter__.return_value = mock_session
+        bars = BarBatch.from_records(
+            [
+                {
+                    "datetime": datetime(2025, 1, 6, 9, 0),
+                    "open": 100.0,
+                    "high": 110.0,
+                    "low": 90.0,
+                    "close": 105.0,
+                    "volume": 1000,
+                }
+            ],
+            "5m",
+        )
+
+        # Act (実行)
+        with patch.object(
+            self.saver,
+            "_get_existing_keys",
+            return_value={"7203.T": {datetime(2025, 1, 6, 9, 0)}},
+        ):
+            result = self.saver.save_stock_data(
+                "7203.T", "5m", bars, method="insert"
+            )
+
+        # Assert (検証)
+        assert result["saved"] == 0
+        assert result["skipped"] == 1
+        assert result["date_range"] == {
+            "start": "2025-01-06",
+            "end": "2025-01-06",
+        }
+        mock_session.connection.assert_not_called()
+
+    @patch("app.services.stock_data.saver.upsert_bars")
+    def test_save_stock_data_by_default_upserts_without_existing_dates(
+        self, mock_upsert_bars
+    ):
+        """既定では既存日付を取得せず、RETURNING の集計から件数を返す."""
+        # Arrange (準備)
+        mock_upsert_bars.return_value = {
+            "7203.T": {"inserted": 1, "updated": 0}
+        }
+        data_list = [_record(date(2025, 1, 1)), _record(date(2025, 1, 2))]
+
+        # Act (実行)
+        with patch.object(self.saver, "_get_existing_dates") as mock_existing:
+            result = self.saver.save_stock_data(
+                "7203.T", "1d", data_list, session=MagicMock()
+            )
+
+        # Assert (検証)
+        mock_existing.assert_not_called()
+        assert mock_upsert_bars.call_args.args[1] == "stocks_1d"
+        assert mock_upsert_bars.call_args.args[3] == "nothing"
+        assert result["saved"] == 1
+        assert result["updated"] == 0
+        assert result["skipped"] == 1
+
+    def test_save_stock_data_with_insert_and_update_raises_error(self):
+        """事前除外方式では重複時の更新を指定できない."""
+        # Act & Assert (実行と検証)
+        with pytest.raises(ValueError):
+            self.saver.save_stock_data(
+                "7203.T",
+                "1d",
+                [_record(date(2025, 1, 1))],
+                method="insert",
+                on_conflict="update",
+            )
+
+    @patch("app.services.stock_data.saver.copy_merge")
+    @patch("app.services.stock_data.saver.get_db_session")
+    @patch("app.services.stock_data.saver.get_model_for_interval")
+    def test_save_batch_stock_data_by_default_merges_via_copy(
+        self, mock_get_model, mock_get_db_session, mock_copy_merge
+    ):
+        """既定では既存日付を取得せず COPY 経由のマージ結果を銘柄別に返す."""
+        # Arrange (準備)
+        mock_model = Mock()
+        mock_model.__tablename__ = "stocks_1d"
+        mock_get_model.return_value = mock_model
+        mock_session = MagicMock()
+        mock_get_db_session.return_value.__enter__.return_value = mock_session
+        mock_copy_merge.return_value = {
+            "7203.T": {"inserted": 1, "updated": 0},
+            "9984.T": {"inserted": 0, "updated": 0},
+        }
+        record = {
+            "date": date(2025, 1, 6),
+            "open": 100.0,
+            "high": 110.0,
+            "low": 90.0,
+            "close": 105.0,
+            "volume": 1000,
+        }
+        symbols_data = {"7203.T": [record], "9984.T": [record]}
+
+        # Act (実行)
+        with patch.object(self.saver, "_get_existing_dates") as mock_existing:
+            result = self.saver.save_batch_stock_data(symbols_data, "1d")
+
+        # Assert (検証)
+        mock_existing.assert_not_called()
+        _, table_name, bars_by_symbol, _ = mock_copy_merge.call_args.args
+        assert table_name == "stocks_1d"
+        assert bars_by_symbol["9984.T"].to_records() == [record]
+        assert result["total_saved"] == 1
+        assert result["total_skipped"] == 1
+        assert result["results_by_symbol"]["9984.T"]["skipped"] == 1
+
+    @patch("app.services.stock_data.saver.copy_merge")
+    @patch("app.services.stock_data.saver.get_db_session")
+    @patch("app.services.stock_data.saver.get_model_for_interval")
+    def test_save_batch_stock_data_with_copy_error_raises_exception(
+        self, mock_get_model, mock_get_db_session, mock_copy_merge
+    ):
+        """COPY・マージ失敗時は StockDataSaveError を送出する."""
+        # Arrange (準備)
+        mock_get_model.return_value = Mock()
+        mock_get_db_session.return_value.__enter__.return_value = MagicMock()
+        mock_copy_merge.side_effect = psycopg2.Error("COPY Error")
+        bars = BarBatch.empty("1d")
+
+        # Act & Assert (実行と検証)
+        with pytest.raises(StockDataSaveError):
+            self.saver.save_batch_stock_data({"7203.T": bars}, "1d")
+
+    @patch("app.services.stock_data.saver.copy_merge")
+    @patch("app.services.stock_data.saver.get_db_session")
+    @patch("app.services.stock_data.saver.get_model_for_interval")
+    def test_save_batch_stock_data_with_reconcile_reports_unchanged_rows(
+        self, mock_get_model, mock_get_db_session, mock_copy_merge
+    ):
+        """照合指定の場合は挿入・更新・変更なしの件数を返す."""
+        # Arrange (準備)
+        mock_model = Mock()
+        mock_model.__tablename__ = "stocks_1d"
+        mock_get_model.return_value = mock_model
+        mock_get_db_session.return_value.__enter__.return_value = MagicMock()
+        mock_copy_merge.return_value = {
+            "7203.T": {"inserted": 1, "updated": 1},
+        }
+        data_list = [_record(date(2025, 1, day)) for day in (6, 7, 8, 9)]
+
+        # Act (実行)
+        result = self.saver.save_batch_stock_data(
+            {"7203.T": data_list}, "1d", on_conflict="reconcile"
+        )
+
+        # Assert (検証)
+        assert mock_copy_merge.call_args.args[3] == "reconcile"
+        assert result["total_saved"] == 1
+        assert result["total_updated"] == 1
+        assert result["total_unchanged"] == 2
+        assert result["results_by_symbol"]["7203.T"]["unchanged"] == 2
+
+    def test_save_stock_data_with_insert_and_reconcile_raises_error(self):
+        """事前除外方式では重複期間の照合を指定できない."""
+        # Act & Assert (実行と検証)
+        with pytest.raises(ValueError):
+            self.saver.save_stock_data(
+                "7203.T",
+                "1d",
+                [_record(date(2025, 1, 1))],
+                method="insert",
+                on_conflict="reconcile",
+            )
+
+    def test_save_batch_stock_data_with_unknown_method_raises_error(self):
+        """サポートされていない保存方式は ValueError を送出する."""
+        # Act & Assert (実行と検証)
+        with pytest.raises(ValueError):
+            self.saver.save_batch_stock_data({}, "1d", method="merge")
 
     @patch("app.services.stock_data.saver.is_intraday_interval")
     def test_filter_duplicate_data_with_existing_records_returns_filtered_data(
         self, mock_is_intraday
     ):
-        """重複データフィルタリングのテスト."""
+        """重複データフィルタリングのテスト（全銘柄で1回のクエリ）."""
         # Arrange (準備)
         mock_is_intraday.return_value = False
         mock_session = MagicMock()
         mock_model = Mock()
-        mock_model.date = Mock()
-        mock_model.symbol = Mock()
+        mock_model.__tablename__ = "stocks_1d"
         existing_date = date(2025, 1, 1)
-        mock_session.query.return_value.filter.return_value.all.return_value = [
-            (existing_date,)
+        mock_session.execute.return_value.all.return_value = [
+            ("7203.T", existing_date)
         ]
         symbols_data = {
             "7203.T": [
                 {"date": existing_date, "open": 100, "close": 110},
                 {"date": date(2025, 1, 2), "open": 110, "close": 120},
-            ]
+            ],
+            "9984.T": [
+                {"date": date(2025, 1, 3), "open": 200, "close": 210},
+            ],
+            "6758.T": [],
         }
 
         # Act (実行)
@@ -262,6 +613,16 @@ class TestStockDataSaver:
         # Assert (検証)
         assert len(filtered["7203.T"]) == 1
         assert filtered["7203.T"][0]["date"] == date(2025, 1, 2)
+        assert len(filtered["9984.T"]) == 1
+        assert filtered["6758.T"] == []
+        mock_session.execute.assert_called_once()
+        query, params = mock_session.execute.call_args.args
+        assert "unnest" in str(query)
+        assert params == {
+            "symbols": ["7203.T", "9984.T"],
+            "starts": [date(2025, 1, 1), date(2025, 1, 3)],
+            "ends": [date(2025, 1, 2), date(2025, 1, 3)],
+        }
 
     @patch("app.services.stock_data.saver.get_db_session")
     @patch("app.services.stock_data.saver.get_model_for_interval")
@@ -295,6 +656,39 @@ class TestStockDataSaver:
         # Assert (検証)
         assert result == latest_date
 
+    @patch("app.services.stock_data.saver.get_db_session")
+    def test_get_data_ranges_with_existing_data_returns_ranges_by_symbol(
+        self, mock_get_db_session
+    ):
+        """複数銘柄の最新日付・件数一括取得のテスト."""
+        # Arrange (準備)
+        mock_session = MagicMock()
+        mock_get_db_session.return_value.__enter__.return_value = mock_session
+        mock_session.query.return_value.filter.return_value.group_by.return_value.all.return_value = [
+            ("7203.T", date(2025, 1, 15), 120),
+            ("6758.T", date(2025, 1, 14), 80),
+        ]
+
+        # Act (実行)
+        result = self.saver.get_data_ranges(
+            ["7203.T", "6758.T", "9984.T"], "1d"
+        )
+
+        # Assert (検証)
+        assert result == {
+            "7203.T": {"latest_date": date(2025, 1, 15), "record_count": 120},
+            "6758.T": {"latest_date": date(2025, 1, 14), "record_count": 80},
+        }
+        mock_session.query.assert_called_once()
+
+    def test_get_data_ranges_with_empty_symbols_returns_empty(self):
+        """銘柄リストが空の場合はクエリを発行しない."""
+        # Act (実行)
+        result = self.saver.get_data_ranges([], "1d")
+
+        # Assert (検証)
+        assert result == {}
+
     @patch("app.services.stock_data.saver.get_db_session")
     @patch("app.services.stock_data.saver.get_model_for_interval")
     @patch("app.services.stock_data.saver.validate_interval")
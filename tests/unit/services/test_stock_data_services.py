@@ -1,12 +1,15 @@
 """株価データサービスのテスト."""
 
 from datetime import date, datetime
+import threading
+import time
 from unittest.mock import MagicMock, Mock, patch
 
 import pandas as pd
 import pytest
 
 from app.models import Stocks1d, Stocks1h, Stocks1m
+from app.services.common.single_flight import SingleFlight
 from app.services.stock_data.converter import StockDataConverter
 from app.services.stock_data.fetcher import (
     StockDataFetcher,
@@ -16,6 +19,7 @@ from app.services.stock_data.orchestrator import StockDataOrchestrator
 from app.services.stock_data.saver import StockDataSaveError, StockDataSaver
 from app.utils.timeframe_utils import (
     get_all_intervals,
+    get_incremental_start,
     get_model_for_interval,
     validate_interval,
 )
@@ -105,6 +109,52 @@ class TestTimeframeUtils:
         assert "1wk" in intervals
         assert len(intervals) == 8
 
+    def test_get_incremental_start_with_no_latest_returns_none(self):
+        """保存済みデータなしの場合は全期間取得."""
+        # Act (実行)
+        start = get_incremental_start("1d", None)
+
+        # Assert (検証)
+        assert start is None
+
+    def test_get_incremental_start_daily_with_latest_date_returns_overlap_date(
+        self,
+    ):
+        """日足は最新日付からオーバーラップ分遡った日付を返す."""
+        # Act (実行)
+        start = get_incremental_start("1d", date(2025, 1, 15))
+
+        # Assert (検証)
+        assert start == date(2025, 1, 8)
+
+    def test_get_incremental_start_intraday_with_recent_latest_returns_datetime(
+        self,
+    ):
+        """分足は取得可能範囲内であれば日時を返す."""
+        # Arrange (準備)
+        now = datetime(2025, 1, 15, 15, 0)
+        latest = datetime(2025, 1, 15, 9, 0)
+
+        # Act (実行)
+        start = get_incremental_start("5m", latest, now=now)
+
+        # Assert (検証)
+        assert start == datetime(2025, 1, 14, 9, 0)
+
+    def test_get_incremental_start_intraday_with_stale_latest_returns_none(
+        self,
+    ):
+        """取得可能範囲外まで遡る場合は全期間取得."""
+        # Arrange (準備)
+        now = datetime(2025, 1, 15, 15, 0)
+        latest = datetime(2025, 1, 1, 9, 0)
+
+        # Act (実行)
+        start = get_incremental_start("1m", latest, now=now)
+
+        # Assert (検証)
+        assert start is None
+
 
 class TestStockDataFetcher:
     """StockDataFetcherのテスト."""
@@ -114,7 +164,7 @@ class TestStockDataFetcher:
         """フェッチャーインスタンス."""
         return StockDataFetcher()
 
-    @patch("app.services.stock_data.fetcher.yf.Ticker")
+    @patch("app.services.stock_data.provider.yf.Ticker")
     def test_fetch_stock_data_success_with_valid_symbol_returns_data(
         self, mock_ticker, fetcher, mock_yfinance_data
     ):
@@ -130,7 +180,26 @@ class TestStockDataFetcher:
         assert not df.empty
         mock_ticker.return_value.history.assert_called_once()
 
-    @patch("app.services.stock_data.fetcher.yf.Ticker")
+    @patch("app.services.stock_data.provider.yf.Ticker")
+    def test_fetch_stock_data_with_start_returns_data_from_start(
+        self, mock_ticker, fetcher, mock_yfinance_data
+    ):
+        """開始日時指定時はperiodではなくstartで取得."""
+        # Arrange (準備)
+        mock_ticker.return_value.history.return_value = mock_yfinance_data
+
+        # Act (実行)
+        df = fetcher.fetch_stock_data(
+            "7203.T", "1d", period="max", start=date(2024, 1, 1)
+        )
+
+        # Assert (検証)
+        assert len(df) == 3
+        mock_ticker.return_value.history.assert_called_once_with(
+            start=date(2024, 1, 1), interval="1d"
+        )
+
+    @patch("app.services.stock_data.provider.yf.Ticker")
     def test_fetch_stock_data_empty_with_invalid_symbol_raises_error(
         self, mock_ticker, fetcher
     ):
@@ -142,7 +211,7 @@ class TestStockDataFetcher:
         with pytest.raises(StockDataFetchError):
             fetcher.fetch_stock_data("INVALID", "1d", period="1d")
 
-    @patch("app.services.stock_data.fetcher.yf.Ticker")
+    @patch("app.services.stock_data.provider.yf.Ticker")
     def test_fetch_stock_data_invalid_interval_with_invalid_interval_raises_error(
         self, mock_ticker, fetcher
     ):
@@ -241,9 +310,10 @@ class TestStockDataSaver:
         with pytest.raises(ValueError):
             saver.save_stock_data("7203.T", "invalid", sample_data_list)
 
+    @patch("app.services.stock_data.upsert.execute_values", return_value=[])
     @patch("app.services.stock_data.saver.get_db_session")
     def test_stock_data_service_save_data_with_valid_data_returns_success(
-        self, mock_session, saver, sample_data_list
+        self, mock_session, mock_execute_values, saver, sample_data_list
     ):
         """データ保存成功."""
         # Arrange (準備)
@@ -258,9 +328,10 @@ class TestStockDataSaver:
         assert result["interval"] == "1d"
         assert result["total"] == 2
 
+    @patch("app.services.stock_data.upsert.execute_values", return_value=[])
     @patch("app.services.stock_data.saver.get_db_session")
     def test_stock_data_service_validation_with_invalid_data_raises_validation_error(
-        self, mock_session, saver, sample_data_list
+        self, mock_session, mock_execute_values, saver, sample_data_list
     ):
         """データ保存成功."""
         # Arrange (準備)
@@ -333,6 +404,55 @@ class TestStockDataOrchestrator:
         assert "save_result" in result
         assert "integrity_check" in result
 
+    @patch.object(StockDataFetcher, "fetch_stock_data")
+    @patch.object(StockDataConverter, "convert_to_dict")
+    @patch.object(StockDataSaver, "save_stock_data")
+    @patch.object(StockDataOrchestrator, "check_data_integrity")
+    def test_fetch_and_save_with_concurrent_same_request_runs_once(
+        self, mock_integrity, mock_save, mock_convert, mock_fetch
+    ):
+        """同じリクエストが同時に届いた場合は取得・保存を1回に集約."""
+        # Arrange (準備)
+        release = threading.Event()
+
+        def slow_fetch(**kwargs):
+            release.wait(timeout=5.0)
+            return pd.DataFrame()
+
+        mock_fetch.side_effect = slow_fetch
+        mock_convert.return_value = []
+        mock_save.return_value = {"saved": 0, "skipped": 0}
+        mock_integrity.return_value = {"valid": False, "record_count": 0}
+        single_flight = SingleFlight()
+        results = []
+
+        def run(symbol):
+            orchestrator = StockDataOrchestrator(single_flight=single_flight)
+            results.append(orchestrator.fetch_and_save(symbol, "1d"))
+
+        threads = [
+            threading.Thread(target=run, args=(symbol,))
+            for symbol in ("7203", "7203.T")
+        ]
+
+        # Act (実行)
+        threads[0].start()
+        while single_flight.get_stats()["in_flight"] == 0:
+            time.sleep(0.01)
+        threads[1].start()
+        while single_flight.get_stats()["coalesced"] == 0:
+            time.sleep(0.01)
+        release.set()
+        for thread in threads:
+            thread.join(timeout=5.0)
+
+        # Assert (検証)
+        assert mock_fetch.call_count == 1
+        assert mock_save.call_count == 1
+        assert sorted(r["coalesced"] for r in results) == [False, True]
+        assert results[0]["save_result"] == results[1]["save_result"]
+        assert single_flight.get_stats()["executions"] == 1
+
     def test_check_data_integrity_with_valid_data_returns_integrity_result(
         self, orchestrator
     ):
@@ -342,18 +462,38 @@ class TestStockDataOrchestrator:
 
         # Act (実行)
         with patch.object(
-            orchestrator.saver, "count_records", return_value=10
-        ), patch.object(
             orchestrator.saver,
-            "get_latest_date",
-            return_value=date(2024, 1, 1),
-        ):
+            "get_coverage",
+            return_value={
+                "1d": {"record_count": 10, "latest": date(2024, 1, 1)}
+            },
+        ) as mock_coverage:
             result = orchestrator.check_data_integrity("7203.T", "1d")
 
         # Assert (検証)
+        mock_coverage.assert_called_once_with("7203.T", ["1d"])
         assert result["valid"] is True
         assert result["record_count"] == 10
-        assert result["latest_date"] is not None
+        assert result["latest_date"] == "2024-01-01"
+
+    def test_get_status_reads_all_intervals_in_one_lookup(self, orchestrator):
+        """全時間軸のデータ状態を bar_coverage の1回の参照で返す."""
+        # Arrange (準備)
+        coverage = {"1d": {"record_count": 250, "latest": date(2024, 1, 5)}}
+
+        # Act (実行)
+        with patch.object(
+            orchestrator.saver, "get_coverage", return_value=coverage
+        ) as mock_coverage:
+            status = orchestrator.get_status("7203.T", ["1d", "1h"])
+
+        # Assert (検証)
+        mock_coverage.assert_called_once_with("7203.T", ["1d", "1h"])
+        assert status["1d"]["record_count"] == 250
+        assert status["1d"]["latest_date"] == "2024-01-05"
+        assert status["1d"]["has_data"] is True
+        assert status["1h"]["record_count"] == 0
+        assert status["1h"]["has_data"] is False
 
     def test_stock_data_service_initialization_with_valid_config_returns_service_instance(
         self,
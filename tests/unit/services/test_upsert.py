@@ -0,0 +1,155 @@
+"""集合指向アップサートのテスト."""
+
+from datetime import date
+from unittest.mock import Mock, patch
+
+import pytest
+
+from app.services.stock_data.bar_batch import BarBatch
+from app.services.stock_data.upsert import (
+    counting_insert,
+    on_conflict_clause,
+    upsert_bars,
+)
+
+
+pytestmark = pytest.mark.unit
+
+
+def _bars(*days: int) -> BarBatch:
+    """指定日の日足バッチ（出来高は日付の順に 1, 2, ...）."""
+    return BarBatch.from_records(
+        [
+            {
+                "date": date(2025, 1, day),
+                "open": 100.0,
+                "high": 110.0,
+                "low": 90.0,
+                "close": 105.0,
+                "volume": volume,
+            }
+            for volume, day in enumerate(days, start=1)
+        ],
+        "1d",
+    )
+
+
+class TestOnConflictClause:
+    """on_conflict_clauseのテスト."""
+
+    def test_on_conflict_clause_with_update_overwrites_values(self):
+        """更新指定の場合は価格・出来高と更新日時を上書きする."""
+        # Act (実行)
+        clause = on_conflict_clause("datetime", "update")
+
+        # Assert (検証)
+        assert clause.startswith("ON CONFLICT (symbol, datetime) DO UPDATE")
+        assert "volume = EXCLUDED.volume" in clause
+        assert clause.endswith("updated_at = now()")
+
+    def test_on_conflict_clause_with_reconcile_updates_changed_rows_only(
+        self,
+    ):
+        """照合指定の場合は保存済みの値と異なる行だけを上書きする."""
+        # Act (実行)
+        clause = on_conflict_clause("date", "reconcile", "stocks_1d")
+
+        # Assert (検証)
+        assert "DO UPDATE SET open = EXCLUDED.open" in clause
+        assert clause.endswith(
+            "WHERE (stocks_1d.open, stocks_1d.high, stocks_1d.low, "
+            "stocks_1d.close, stocks_1d.volume) IS DISTINCT FROM "
+            "(EXCLUDED.open, EXCLUDED.high, EXCLUDED.low, "
+            "EXCLUDED.close, EXCLUDED.volume)"
+        )
+
+    def test_on_conflict_clause_with_unknown_action_raises_error(self):
+        """サポートされていない動作は ValueError を送出する."""
+        # Act & Assert (実行と検証)
+        with pytest.raises(ValueError):
+            on_conflict_clause("date", "replace")
+
+    def test_counting_insert_returns_counts_per_symbol(self):
+        """挿入と更新を xmax で区別して銘柄別に集計する."""
+        # Act (実行)
+        sql = counting_insert("stocks_1d", "date", "VALUES %s", "nothing")
+
+        # Assert (検証)
+        assert "INSERT INTO stocks_1d (symbol, date, open" in sql
+        assert "RETURNING symbol, (xmax = 0) AS inserted" in sql
+        assert sql.endswith("GROUP BY symbol")
+
+    def test_counting_insert_for_partitioned_table_uses_created_at(self):
+        """パーティション化テーブルでは created_at で挿入を判定する."""
+        # Act (実行)
+        sql = counting_insert("stocks_5m", "datetime", "VALUES %s", "update")
+
+        # Assert (検証)
+        assert "xmax" not in sql
+        assert (
+            "RETURNING symbol, (created_at IS NOT DISTINCT FROM now()) "
+            "AS inserted" in sql
+        )
+
+
+class TestUpsertBars:
+    """upsert_barsのテスト."""
+
+    @patch("app.services.stock_data.upsert.execute_values")
+    def test_upsert_bars_sums_returned_counts_per_symbol(
+        self, mock_execute_values
+    ):
+        """各INSERTの RETURNING 集計を銘柄ごとに合算する."""
+        # Arrange (準備)
+        mock_execute_values.side_effect = [
+            [("7203.T", 1, 1)],
+            [],
+        ]
+
+        # Act (実行)
+        counts = upsert_bars(
+            Mock(),
+            "stocks_1d",
+            {"7203.T": _bars(6, 7), "9984.T": _bars(6)},
+        )
+
+        # Assert (検証)
+        assert counts == {
+            "7203.T": {"inserted": 1, "updated": 1},
+            "9984.T": {"inserted": 0, "updated": 0},
+        }
+        assert mock_execute_values.call_count == 2
+
+    @patch("app.services.stock_data.upsert.execute_values")
+    def test_upsert_bars_with_reconcile_qualifies_stored_columns(
+        self, mock_execute_values
+    ):
+        """照合指定の場合は挿入先テーブルの値と比較するSQLを送る."""
+        # Arrange (準備)
+        mock_execute_values.return_value = [("7203.T", 0, 1)]
+
+        # Act (実行)
+        counts = upsert_bars(
+            Mock(), "stocks_1d", {"7203.T": _bars(6, 6, 7)}, "reconcile"
+        )
+
+        # Assert (検証)
+        sql = mock_execute_values.call_args.args[1]
+        assert "IS DISTINCT FROM" in sql
+        assert len(mock_execute_values.call_args.args[2]) == 2
+        assert counts == {"7203.T": {"inserted": 0, "updated": 1}}
+
+    @patch("app.services.stock_data.upsert.execute_values")
+    def test_upsert_bars_with_update_keeps_last_duplicate(
+        self, mock_execute_values
+    ):
+        """更新指定の場合は同一日付の行を後の行だけに絞って送る."""
+        # Arrange (準備)
+        mock_execute_values.return_value = []
+
+        # Act (実行)
+        upsert_bars(Mock(), "stocks_1d", {"7203.T": _bars(6, 6)}, "update")
+
+        # Assert (検証)
+        rows = mock_execute_values.call_args.args[2]
+        assert [row[-1] for row in rows] == [2]
@@ -0,0 +1,305 @@
+"""書き込みスプールのテスト."""
+
+from datetime import datetime
+from unittest.mock import Mock
+
+import psycopg2
+import pytest
+from sqlalchemy.exc import OperationalError
+
+from app.exceptions import StockDataSaveError
+from app.services.stock_data.converter import StockDataConverter
+from app.services.stock_data.provider import ReplayProvider
+from app.services.stock_data.write_spool import (
+    WriteSpool,
+    WriteSpoolConfig,
+    decode_segment,
+    encode_segment,
+    is_transient_error,
+)
+
+
+pytestmark = pytest.mark.unit
+
+
+def _bars(symbol: str, interval: str):
+    """リプレイプロバイダーの合成データを変換したバッチ."""
+    provider = ReplayProvider(now=datetime(2025, 1, 10, 15, 0))
+    df = provider.fetch_history(symbol, interval, period="5d")
+    return StockDataConverter().convert_to_batch(df, interval)
+
+
+def _saver():
+    """保存した銘柄別の行数を記録するモックSaver."""
+    saver = Mock()
+    saver.commits = []
+
+    def save(symbols_data, interval, on_conflict):
+        saver.commits.append(
+            {symbol: len(bars) for symbol, bars in symbols_data.items()}
+        )
+        return {"total_saved": sum(saver.commits[-1].values())}
+
+    saver.save_batch_stock_data.side_effect = save
+    return saver
+
+
+def _save_error(cause: Exception) -> StockDataSaveError:
+    """セーバーと同様に原因の例外から変換した保存エラー."""
+    try:
+        raise cause
+    except Exception:
+        try:
+            raise StockDataSaveError(f"データ保存に失敗: {cause}")
+        except StockDataSaveError as e:
+            return e
+
+
+def _spool(tmp_path, saver, **config) -> WriteSpool:
+    """一時ディレクトリを使う有効なスプール."""
+    return WriteSpool(
+        WriteSpoolConfig(
+            enabled=True,
+            directory=str(tmp_path),
+            max_latency_ms=config.pop("max_latency_ms", 60_000),
+            retry_seconds=0.01,
+            **config,
+        ),
+        saver=saver,
+    )
+
+
+class TestSegmentFormat:
+    """セグメントファイルのテスト."""
+
+    @pytest.mark.parametrize("interval", ["1d", "5m"])
+    def test_decode_segment_restores_encoded_bars(self, tmp_path, interval):
+        """書き出したバッチを日時のタイムゾーンを含めて復元する."""
+        # Arrange (準備)
+        original = {
+            "7203.T": _bars("7203.T", interval),
+            "6758.T": _bars("6758.T", interval),
+        }
+        path = tmp_path / "segment.npz"
+
+        # Act (実行)
+        rows = encode_segment(path, original, interval, "reconcile")
+        decoded_interval, on_conflict, decoded = decode_segment(path)
+
+        # Assert (検証)
+        assert (decoded_interval, on_conflict) == (interval, "reconcile")
+        assert rows == sum(len(bars) for bars in original.values())
+        for symbol, bars in original.items():
+            assert decoded[symbol].to_records() == bars.to_records()
+
+
+class TestWriteSpool:
+    """WriteSpoolのテスト."""
+
+    def test_flush_group_commits_appended_segments(self, tmp_path):
+        """追記した複数のセグメントを時間軸ごとに1回で保存し、削除する."""
+        # Arrange (準備)
+        saver = _saver()
+        spool = _spool(tmp_path, saver)
+        spool.start()
+        spool.append({"7203.T": _bars("7203.T", "1d")}, "1d")
+        spool.append({"7203.T": _bars("7203.T", "1d")}, "1d")
+
+        # Act (実行)
+        flushed = spool.flush(timeout=5)
+        spool.stop()
+
+        # Assert (検証)
+        assert flushed
+        assert saver.commits == [{"7203.T": 2 * len(_bars("7203.T", "1d"))}]
+        assert list(tmp_path.glob("*.npz")) == []
+        stats = spool.get_stats()
+        assert stats["commits"] == 1
+        assert stats["committed_segments"] == 2
+
+    def test_append_over_max_rows_commits_without_waiting(self, tmp_path):
+        """未保存の行数が上限に達したら待ち時間を待たずに分けて保存する."""
+        # Arrange (準備)
+        saver = _saver()
+        rows = len(_bars("7203.T", "1d"))
+        spool = _spool(tmp_path, saver, max_rows=rows)
+        spool.start()
+
+        # Act (実行)
+        spool.append({"7203.T": _bars("7203.T", "1d")}, "1d")
+        spool.append({"6758.T": _bars("6758.T", "1d")}, "1d")
+        flushed = spool.flush(timeout=5)
+        spool.stop()
+
+        # Assert (検証)
+        assert flushed
+        assert saver.commits == [{"7203.T": rows}, {"6758.T": rows}]
+
+    def test_failed_commit_keeps_segments_and_retries(self, tmp_path):
+        """保存に失敗したセグメントは残し、再試行して保存する."""
+        # Arrange (準備)
+        saver = _saver()
+        save = saver.save_batch_stock_data.side_effect
+        calls = []
+
+        def flaky(symbols_data, interval, on_conflict):
+            calls.append(interval)
+            if len(calls) == 1:
+                raise Exception("connection refused")
+            return save(symbols_data, interval, on_conflict)
+
+        saver.save_batch_stock_data.side_effect = flaky
+        spool = _spool(tmp_path, saver)
+        spool.start()
+        spool.append({"7203.T": _bars("7203.T", "5m")}, "5m")
+
+        # Act (実行)
+        flushed = spool.flush(timeout=5)
+        spool.stop()
+
+        # Assert (検証)
+        assert flushed
+        assert len(calls) == 2
+        assert spool.get_stats()["failures"] == 1
+        assert list(tmp_path.glob("*.npz")) == []
+
+    def test_data_error_sets_aside_poison_segment_and_commits_rest(
+        self, tmp_path
+    ):
+        """データ起因のエラーは原因のセグメントだけを外し、他を保存する."""
+        # Arrange (準備)
+        saver = _saver()
+        save = saver.save_batch_stock_data.side_effect
+
+        def overflow(symbols_data, interval, on_conflict):
+            if "9999.T" in symbols_data:
+                raise _save_error(psycopg2.DataError("numeric field overflow"))
+            return save(symbols_data, interval, on_conflict)
+
+        saver.save_batch_stock_data.side_effect = overflow
+        spool = _spool(tmp_path, saver, max_attempts=2)
+        spool.start()
+        spool.append({"9999.T": _bars("9999.T", "1d")}, "1d")
+        spool.append({"7203.T": _bars("7203.T", "1d")}, "1d")
+
+        # Act (実行)
+        flushed = spool.flush(timeout=5)
+        spool.stop()
+
+        # Assert (検証)
+        assert flushed
+        assert saver.commits == [{"7203.T": len(_bars("7203.T", "1d"))}]
+        assert list(tmp_path.glob("*.npz")) == []
+        assert len(list(tmp_path.glob("*.npz.failed"))) == 1
+        stats = spool.get_stats()
+        assert stats["failed_segments"] == 1
+        assert stats["committed_segments"] == 1
+
+    def test_transient_error_retries_without_giving_up(self, tmp_path):
+        """接続断などの一時的なエラーは試行回数に数えず再試行する."""
+        # Arrange (準備)
+        saver = _saver()
+        save = saver.save_batch_stock_data.side_effect
+        calls = []
+
+        def unavailable(symbols_data, interval, on_conflict):
+            calls.append(interval)
+            if len(calls) <= 3:
+                raise _save_error(
+                    OperationalError("INSERT", {}, Exception("server closed"))
+                )
+            return save(symbols_data, interval, on_conflict)
+
+        saver.save_batch_stock_data.side_effect = unavailable
+        spool = _spool(tmp_path, saver, max_attempts=1)
+        spool.start()
+        spool.append({"7203.T": _bars("7203.T", "5m")}, "5m")
+
+        # Act (実行)
+        flushed = spool.flush(timeout=5)
+        spool.stop()
+
+        # Assert (検証)
+        assert flushed
+        assert len(calls) == 4
+        assert spool.get_stats()["failed_segments"] == 0
+        assert list(tmp_path.glob("*.failed")) == []
+
+    @pytest.mark.parametrize(
+        "cause, expected",
+        [
+            (psycopg2.OperationalError("server closed"), True),
+            (psycopg2.IntegrityError("check constraint"), False),
+            (ValueError("invalid value"), False),
+        ],
+    )
+    def test_is_transient_error_follows_cause(self, cause, expected):
+        """変換後の保存エラーは原因の例外で一時的なエラーか判定する."""
+        # Act (実行)
+        result = is_transient_error(_save_error(cause))
+
+        # Assert (検証)
+        assert result is expected
+
+    def test_start_replays_unacknowledged_segments(self, tmp_path):
+        """前回保存されずに残ったセグメントを起動時に保存する."""
+        # Arrange (準備)
+        stopped = _spool(tmp_path, Mock())
+        stopped.append({"7203.T": _bars("7203.T", "1d")}, "1d")
+        saver = _saver()
+        spool = _spool(tmp_path, saver)
+
+        # Act (実行)
+        spool.start()
+        flushed = spool.flush(timeout=5)
+        spool.stop()
+
+        # Assert (検証)
+        assert flushed
+        assert spool.get_stats()["replayed_segments"] == 1
+        assert saver.commits == [{"7203.T": len(_bars("7203.T", "1d"))}]
+
+    def test_start_with_locked_directory_saves_synchronously(self, tmp_path):
+        """他のスプールがディレクトリを使用中の場合は再生も起動もしない."""
+        # Arrange (準備)
+        stopped = _spool(tmp_path, Mock())
+        stopped.append({"7203.T": _bars("7203.T", "1d")}, "1d")
+        owner_saver = _saver()
+        owner = _spool(tmp_path, owner_saver)
+        owner.start()
+        other_saver = _saver()
+        other = _spool(tmp_path, other_saver)
+
+        # Act (実行)
+        other.start()
+        owner_flushed = owner.flush(timeout=5)
+        owner.stop()
+        successor = _spool(tmp_path, _saver())
+        successor.start()
+        successor.stop()
+
+        # Assert (検証)
+        assert other.enabled is False
+        assert other.get_stats()["running"] is False
+        assert other.get_stats()["replayed_segments"] == 0
+        other_saver.save_batch_stock_data.assert_not_called()
+        assert owner_flushed
+        assert owner_saver.commits == [{"7203.T": len(_bars("7203.T", "1d"))}]
+        # 停止したスプールのロックは解放され、次のプロセスが引き継げる
+        assert successor.enabled is True
+
+    def test_start_sets_aside_unreadable_segments(self, tmp_path):
+        """読み込めないセグメントは削除せず再生対象から外す."""
+        # Arrange (準備)
+        (tmp_path / "00000000000000000001-1-000001.npz").write_bytes(b"x")
+        saver = _saver()
+        spool = _spool(tmp_path, saver)
+
+        # Act (実行)
+        spool.start()
+        spool.stop()
+
+        # Assert (検証)
+        assert spool.get_stats()["corrupt_segments"] == 1
+        assert len(list(tmp_path.glob("*.corrupt"))) == 1
+        saver.save_batch_stock_data.assert_not_called()
@@ -0,0 +1,192 @@
+"""CircuitBreakerのテスト."""
+
+import pickle
+
+import pytest
+
+from app.exceptions import (
+    APIException,
+    CircuitOpenError,
+    MarketDataProviderError,
+    MarketDataRateLimitError,
+)
+from app.services.common.circuit_breaker import (
+    CircuitBreaker,
+    CircuitBreakerConfig,
+    CircuitState,
+    is_circuit_open_message,
+)
+
+
+pytestmark = pytest.mark.unit
+
+
+@pytest.fixture
+def breaker(clock):
+    """連続3回の失敗で10秒間遮断するブレーカー."""
+    return CircuitBreaker(
+        CircuitBreakerConfig(
+            failure_threshold=3, reset_timeout=10.0, max_reset_timeout=25.0
+        ),
+        clock=clock,
+    )
+
+
+def _fail(breaker, error=None):
+    """ブレーカー経由で一時的エラーを発生させる."""
+    with pytest.raises(APIException):
+        with breaker.call():
+            raise error or MarketDataProviderError("接続エラー")
+
+
+class TestCircuitBreaker:
+    """CircuitBreakerのテスト."""
+
+    def test_call_with_consecutive_failures_trips_open(self, breaker):
+        """連続失敗が閾値に達すると open になり即座に拒否する."""
+        # Arrange (準備)
+        for _ in range(3):
+            _fail(breaker)
+
+        # Act (実行)
+        with pytest.raises(CircuitOpenError) as exc_info:
+            with breaker.call():
+                pytest.fail("遮断中に上流へリクエストしてはならない")
+
+        # Assert (検証)
+        assert breaker.state == CircuitState.OPEN
+        assert is_circuit_open_message(str(exc_info.value))
+        state = breaker.get_state()
+        assert state["trips"] == 1
+        assert state["rejected"] == 1
+        assert state["retry_after_seconds"] == 10.0
+
+    def test_open_error_survives_pickle_with_retry_after(self, breaker):
+        """遮断エラーはワーカープロセスから戻しても再試行までの秒数を保持する."""
+        # Arrange (準備)
+        for _ in range(3):
+            _fail(breaker)
+        with pytest.raises(CircuitOpenError) as exc_info:
+            with breaker.call():
+                pass
+
+        # Act (実行)
+        restored = pickle.loads(pickle.dumps(exc_info.value))
+
+        # Assert (検証)
+        assert type(restored) is CircuitOpenError
+        assert str(restored) == str(exc_info.value)
+        assert restored.details == {"retry_after_seconds": 10.0}
+
+    def test_call_with_success_between_failures_stays_closed(self, breaker):
+        """成功を挟むと連続失敗回数がリセットされる."""
+        # Act (実行)
+        _fail(breaker)
+        _fail(breaker)
+        with breaker.call():
+            pass
+        _fail(breaker)
+
+        # Assert (検証)
+        assert breaker.state == CircuitState.CLOSED
+        assert breaker.get_state()["consecutive_failures"] == 1
+
+    def test_call_with_permanent_error_does_not_count_failure(self, breaker):
+        """永続的エラーは上流の劣化として数えない."""
+        # Act (実行)
+        for _ in range(5):
+            with pytest.raises(ValueError):
+                with breaker.call():
+                    raise ValueError("銘柄コードが不正です")
+
+        # Assert (検証)
+        assert breaker.state == CircuitState.CLOSED
+        assert breaker.get_state()["failures"] == 0
+
+    def test_allow_request_in_half_open_allows_single_probe(
+        self, breaker, clock
+    ):
+        """遮断時間経過後は試験リクエストを1件だけ通す."""
+        # Arrange (準備)
+        for _ in range(3):
+            _fail(breaker, MarketDataRateLimitError("429"))
+        clock.now += 10.0
+
+        # Act (実行)
+        first = breaker.allow_request()
+        second = breaker.allow_request()
+
+        # Assert (検証)
+        assert breaker.state == CircuitState.HALF_OPEN
+        assert first is True
+        assert second is False
+        assert breaker.is_open()
+        assert breaker.get_state()["probes"] == 1
+
+    def test_call_with_successful_probe_closes(self, breaker, clock):
+        """試験リクエストが成功すると closed に戻る."""
+        # Arrange (準備)
+        for _ in range(3):
+            _fail(breaker)
+        clock.now += 10.0
+
+        # Act (実行)
+        with breaker.call():
+            pass
+
+        # Assert (検証)
+        assert breaker.state == CircuitState.CLOSED
+        assert not breaker.is_open()
+        assert breaker.retry_after() == 0.0
+
+    def test_call_with_failed_probe_reopens_with_longer_timeout(
+        self, breaker, clock
+    ):
+        """試験リクエストが失敗すると遮断時間を延ばして再び open になる."""
+        # Arrange (準備)
+        for _ in range(3):
+            _fail(breaker)
+        clock.now += 10.0
+
+        # Act (実行)
+        _fail(breaker)
+        clock.now += 20.0
+        _fail(breaker)
+
+        # Assert (検証)
+        state = breaker.get_state()
+        assert state["state"] == "open"
+        assert state["trips"] == 3
+        assert state["reset_timeout_seconds"] == 25.0
+        assert breaker.retry_after() == 25.0
+
+    def test_call_with_interrupted_probe_releases_probe(self, breaker, clock):
+        """試験リクエストが中断されても試験枠を解放する."""
+        # Arrange (準備)
+        for _ in range(3):
+            _fail(breaker)
+        clock.now += 10.0
+
+        # Act (実行)
+        with pytest.raises(KeyboardInterrupt):
+            with breaker.call():
+                raise KeyboardInterrupt
+
+        # Assert (検証)
+        assert breaker.state == CircuitState.HALF_OPEN
+        assert not breaker.is_open()
+        assert breaker.allow_request() is True
+
+    def test_from_env_with_env_overrides_defaults(self, monkeypatch):
+        """環境変数で閾値と遮断時間を設定できる."""
+        # Arrange (準備)
+        monkeypatch.setenv("CIRCUIT_BREAKER_FAILURE_THRESHOLD", "8")
+        monkeypatch.setenv("CIRCUIT_BREAKER_RESET_TIMEOUT", "60")
+
+        # Act (実行)
+        config = CircuitBreakerConfig.from_env()
+
+        # Assert (検証)
+        assert config.failure_threshold == 8
+        assert config.reset_timeout == 60.0
+        assert config.max_reset_timeout == 300.0
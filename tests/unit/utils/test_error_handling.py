@@ -32,7 +32,7 @@ class TestErrorHandling:
 
         for symbol in invalid_symbols:
             with patch(
-                "app.services.stock_data.fetcher.yf.Ticker"
+                "app.services.stock_data.provider.yf.Ticker"
             ) as mock_ticker:
                 # 空のDataFrameを返すようにモック設定
                 mock_ticker.return_value.history.return_value.empty = True
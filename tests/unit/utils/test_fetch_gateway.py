@@ -0,0 +1,212 @@
+"""FetchGatewayのテスト."""
+
+import threading
+import time
+
+import pytest
+
+from app.services.common.fetch_gateway import (
+    FetchContext,
+    FetchGateway,
+    FetchGatewayConfig,
+    FetchPriority,
+)
+from app.services.common.rate_controller import (
+    AdaptiveRateController,
+    RateControlConfig,
+)
+
+
+pytestmark = pytest.mark.unit
+
+
+def _make_gateway(concurrency: int, reserved: int = 0) -> FetchGateway:
+    """同時実行数を固定したテスト用ゲートウェイを作成."""
+    controller = AdaptiveRateController(
+        RateControlConfig(
+            initial_concurrency=concurrency,
+            min_concurrency=concurrency,
+            max_concurrency=concurrency,
+            initial_rate=1000.0,
+            max_rate=1000.0,
+        )
+    )
+    return FetchGateway(
+        controller,
+        FetchGatewayConfig(reserved_interactive_slots=reserved),
+    )
+
+
+def _waiting(gateway: FetchGateway) -> int:
+    """待機中のリクエスト数."""
+    classes = gateway.get_stats()["classes"]
+    return sum(stats["waiting"] for stats in classes.values())
+
+
+def _wait_until(condition, timeout: float = 5.0) -> None:
+    """条件が満たされるまで待機."""
+    deadline = time.monotonic() + timeout
+    while not condition():
+        if time.monotonic() > deadline:
+            pytest.fail("待機がタイムアウトしました")
+        time.sleep(0.01)
+
+
+class _Holder:
+    """枠を保持し続けるリクエスト."""
+
+    def __init__(self, gateway: FetchGateway, context: FetchContext):
+        """枠を確保するまで待ってから返る."""
+        self.release = threading.Event()
+        acquired = threading.Event()
+
+        def run():
+            with gateway.request(context):
+                acquired.set()
+                self.release.wait(timeout=5.0)
+
+        self.thread = threading.Thread(target=run, daemon=True)
+        self.thread.start()
+        assert acquired.wait(timeout=5.0)
+
+    def finish(self) -> None:
+        """枠を返却する."""
+        self.release.set()
+        self.thread.join(timeout=5.0)
+
+
+def _enqueue_in_order(gateway, requests, order):
+    """リクエストを順番に待機列へ投入し、実行順を order に記録する."""
+    threads = []
+    for index, (label, context) in enumerate(requests, start=1):
+
+        def run(label=label, context=context):
+            with gateway.request(context):
+                order.append(label)
+
+        thread = threading.Thread(target=run, daemon=True)
+        thread.start()
+        threads.append(thread)
+        _wait_until(lambda index=index: _waiting(gateway) >= index)
+    return threads
+
+
+class TestFetchGateway:
+    """FetchGatewayのテスト."""
+
+    def test_request_with_mixed_priorities_serves_interactive_first(self):
+        """待機中のリクエストは interactive > scheduled > backfill の順."""
+        # Arrange (準備)
+        gateway = _make_gateway(concurrency=1)
+        holder = _Holder(gateway, FetchContext(FetchPriority.BACKFILL, "bulk"))
+        order = []
+        threads = _enqueue_in_order(
+            gateway,
+            [
+                ("backfill", FetchContext(FetchPriority.BACKFILL, "bulk")),
+                ("scheduled", FetchContext(FetchPriority.SCHEDULED, "sched")),
+                ("interactive", FetchContext()),
+            ],
+            order,
+        )
+
+        # Act (実行)
+        holder.finish()
+        for thread in threads:
+            thread.join(timeout=5.0)
+
+        # Assert (検証)
+        assert order == ["interactive", "scheduled", "backfill"]
+
+    def test_request_with_two_jobs_shares_slots_fairly(self):
+        """同じ優先度のジョブには投入順ではなく交互に枠を渡す."""
+        # Arrange (準備)
+        gateway = _make_gateway(concurrency=1)
+        holder = _Holder(gateway, FetchContext(FetchPriority.BACKFILL, "a"))
+        big = FetchContext(FetchPriority.BACKFILL, "big")
+        small = FetchContext(FetchPriority.BACKFILL, "small")
+        order = []
+        threads = _enqueue_in_order(
+            gateway,
+            [("big", big)] * 4 + [("small", small)] * 2,
+            order,
+        )
+
+        # Act (実行)
+        holder.finish()
+        for thread in threads:
+            thread.join(timeout=5.0)
+
+        # Assert (検証)
+        assert order == ["big", "small", "big", "small", "big", "big"]
+
+    def test_request_with_weighted_job_receives_larger_share(self):
+        """重みの大きいジョブほど多くの枠を受け取る."""
+        # Arrange (準備)
+        gateway = _make_gateway(concurrency=1)
+        holder = _Holder(gateway, FetchContext(FetchPriority.BACKFILL, "a"))
+        heavy = FetchContext(FetchPriority.BACKFILL, "heavy", weight=2.0)
+        light = FetchContext(FetchPriority.BACKFILL, "light")
+        order = []
+        threads = _enqueue_in_order(
+            gateway,
+            [("light", light)] * 3 + [("heavy", heavy)] * 4,
+            order,
+        )
+
+        # Act (実行)
+        holder.finish()
+        for thread in threads:
+            thread.join(timeout=5.0)
+
+        # Assert (検証)
+        assert order[:3].count("heavy") == 2
+        assert order[:6].count("heavy") == 4
+
+    def test_request_with_reserved_slot_keeps_slot_for_interactive(self):
+        """予約枠はバックフィルに渡さず interactive が即座に使える."""
+        # Arrange (準備)
+        gateway = _make_gateway(concurrency=2, reserved=1)
+        holder = _Holder(gateway, FetchContext(FetchPriority.BACKFILL, "bulk"))
+        order = []
+        threads = _enqueue_in_order(
+            gateway,
+            [("backfill", FetchContext(FetchPriority.BACKFILL, "bulk"))],
+            order,
+        )
+
+        # Act (実行)
+        with gateway.request(FetchContext()):
+            order.append("interactive")
+        holder.finish()
+        for thread in threads:
+            thread.join(timeout=5.0)
+
+        # Assert (検証)
+        assert order == ["interactive", "backfill"]
+
+    def test_get_stats_after_requests_reports_per_class_metrics(self):
+        """優先度ごとの件数・待ち時間・レイテンシを集計する."""
+        # Arrange (準備)
+        gateway = _make_gateway(concurrency=2)
+
+        # Act (実行)
+        with gateway.request(FetchContext()):
+            pass
+        with pytest.raises(RuntimeError):
+            with gateway.request(FetchContext(FetchPriority.SCHEDULED)):
+                raise RuntimeError("取得失敗")
+
+        # Assert (検証)
+        stats = gateway.get_stats()
+        assert stats["capacity"] == 2
+        assert stats["in_flight"] == 0
+        assert stats["classes"]["interactive"]["requests"] == 1
+        assert stats["classes"]["scheduled"]["errors"] == 1
+        assert stats["classes"]["backfill"]["requests"] == 0
+        assert set(stats["classes"]["interactive"]) >= {
+            "avg_queue_ms",
+            "p95_queue_ms",
+            "avg_latency_ms",
+            "p95_latency_ms",
+        }
@@ -0,0 +1,149 @@
+"""AdaptiveRateControllerのテスト."""
+
+import pytest
+
+from app.exceptions import MarketDataRateLimitError
+from app.services.common.rate_controller import (
+    AdaptiveRateController,
+    RateControlConfig,
+    is_throttle_error,
+    is_throttle_message,
+)
+
+
+pytestmark = pytest.mark.unit
+
+
+@pytest.fixture
+def controller():
+    """高速に動作するテスト用コントローラー."""
+    return AdaptiveRateController(
+        RateControlConfig(
+            initial_concurrency=2,
+            max_concurrency=4,
+            initial_rate=100.0,
+            max_rate=200.0,
+            rate_increase=10.0,
+            cooldown_seconds=0.0,
+        )
+    )
+
+
+class TestThrottleDetection:
+    """429・タイムアウト判定のテスト."""
+
+    def test_is_throttle_error_with_rate_limit_exception_returns_true(self):
+        """レート制限例外は過負荷と判定する."""
+        assert is_throttle_error(MarketDataRateLimitError("制限超過"))
+
+    def test_is_throttle_error_with_timeout_returns_true(self):
+        """タイムアウトは過負荷と判定する."""
+        assert is_throttle_error(TimeoutError())
+
+    def test_is_throttle_message_with_wrapped_429_returns_true(self):
+        """ラップされたメッセージ内の429も検知する."""
+        assert is_throttle_message(
+            "一括ダウンロードエラー: 429 Too Many Requests"
+        )
+
+    def test_is_throttle_error_with_other_error_returns_false(self):
+        """その他のエラーは過負荷と判定しない."""
+        assert not is_throttle_error(ValueError("データなし"))
+        assert not is_throttle_message(None)
+
+
+class TestAdaptiveRateController:
+    """AdaptiveRateControllerのテスト."""
+
+    def test_release_with_healthy_requests_increases_rate_and_concurrency(
+        self, controller
+    ):
+        """健全なリクエストが続くとレートと同時実行数が加算的に増える."""
+        # Act (実行)
+        for _ in range(4):
+            with controller.request():
+                pass
+
+        # Assert (検証)
+        state = controller.get_state()
+        assert controller.rate == 140.0
+        assert state["concurrency"] == 3
+        assert state["recent_throttle_ratio"] == 0.0
+        assert state["requests"] == 4
+
+    def test_release_with_slow_requests_holds_rate(self, controller):
+        """目標レイテンシを超える場合は増加しない."""
+        # Act (実行)
+        controller.acquire()
+        controller.release(latency=10.0)
+
+        # Assert (検証)
+        assert controller.rate == 100.0
+
+    def test_request_with_rate_limit_error_decreases_multiplicatively(
+        self, controller
+    ):
+        """429検知でレートと同時実行数を乗算的に減らす."""
+        # Act (実行)
+        with pytest.raises(MarketDataRateLimitError):
+            with controller.request():
+                raise MarketDataRateLimitError("429 Too Many Requests")
+
+        # Assert (検証)
+        state = controller.get_state()
+        assert controller.rate == 50.0
+        assert state["concurrency"] == 1
+        assert state["throttled"] == 1
+        assert state["recent_throttle_ratio"] == 1.0
+        assert state["in_flight"] == 0
+
+    def test_release_with_burst_of_throttles_decreases_once_per_window(
+        self, controller
+    ):
+        """同時に失敗した複数リクエストでは1回だけ減少する."""
+        # Arrange (準備)
+        controller.acquire()
+        controller.acquire()
+
+        # Act (実行)
+        controller.release(latency=0.01, throttled=True)
+        controller.release(latency=0.01, throttled=True)
+
+        # Assert (検証)
+        assert controller.rate == 50.0
+        assert controller.get_state()["decreases"] == 1
+
+    def test_request_with_mark_throttled_counts_as_throttle(self, controller):
+        """例外なしでもハンドルで429を通知できる."""
+        # Act (実行)
+        with controller.request() as handle:
+            handle.mark_throttled()
+
+        # Assert (検証)
+        assert controller.get_state()["throttled"] == 1
+
+    def test_request_with_other_error_does_not_decrease(self, controller):
+        """429・タイムアウト以外のエラーでは減少しない."""
+        # Act (実行)
+        with pytest.raises(ValueError):
+            with controller.request():
+                raise ValueError("データなし")
+
+        # Assert (検証)
+        state = controller.get_state()
+        assert controller.rate == 100.0
+        assert state["errors"] == 1
+        assert state["recent_error_ratio"] == 1.0
+
+    def test_from_env_with_env_overrides_limits(self, monkeypatch):
+        """環境変数で上限値を設定できる."""
+        # Arrange (準備)
+        monkeypatch.setenv("FETCH_RATE_MAX_CONCURRENCY", "16")
+        monkeypatch.setenv("FETCH_RATE_INITIAL", "2.5")
+
+        # Act (実行)
+        config = RateControlConfig.from_env()
+
+        # Assert (検証)
+        assert config.max_concurrency == 16
+        assert config.initial_rate == 2.5
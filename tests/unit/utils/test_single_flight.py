@@ -0,0 +1,93 @@
+"""SingleFlightのテスト."""
+
+import threading
+
+import pytest
+
+from app.services.common.single_flight import SingleFlight
+
+
+pytestmark = pytest.mark.unit
+
+
+def _start_follower(single_flight, key, outcomes):
+    """実行中の処理に合流するスレッドを開始し、合流するまで待つ."""
+
+    def run():
+        try:
+            outcomes.append(single_flight.do(key, lambda: "別の結果"))
+        except Exception as e:
+            outcomes.append(e)
+
+    coalesced = single_flight.get_stats()["coalesced"]
+    thread = threading.Thread(target=run, daemon=True)
+    thread.start()
+    while single_flight.get_stats()["coalesced"] == coalesced:
+        thread.join(timeout=0.01)
+    return thread
+
+
+class TestSingleFlight:
+    """SingleFlightのテスト."""
+
+    def test_do_with_concurrent_same_key_shares_one_execution(self):
+        """実行中の同じキーの呼び出しは同じ結果を共有する."""
+        # Arrange (準備)
+        single_flight = SingleFlight()
+        outcomes = []
+        threads = []
+
+        def leader():
+            for _ in range(2):
+                threads.append(
+                    _start_follower(single_flight, "7203.T", outcomes)
+                )
+            return "結果"
+
+        # Act (実行)
+        result, shared = single_flight.do("7203.T", leader)
+        for thread in threads:
+            thread.join(timeout=5.0)
+
+        # Assert (検証)
+        assert (result, shared) == ("結果", False)
+        assert outcomes == [("結果", True), ("結果", True)]
+        stats = single_flight.get_stats()
+        assert stats["calls"] == 3
+        assert stats["executions"] == 1
+        assert stats["coalesced"] == 2
+        assert stats["in_flight"] == 0
+
+    def test_do_with_error_raises_same_error_to_waiters(self):
+        """処理が失敗した場合は合流した呼び出しにも同じ例外を送出する."""
+        # Arrange (準備)
+        single_flight = SingleFlight()
+        outcomes = []
+        error = RuntimeError("取得失敗")
+        threads = []
+
+        def leader():
+            threads.append(_start_follower(single_flight, "key", outcomes))
+            raise error
+
+        # Act (実行)
+        with pytest.raises(RuntimeError):
+            single_flight.do("key", leader)
+        threads[0].join(timeout=5.0)
+
+        # Assert (検証)
+        assert outcomes == [error]
+
+    def test_do_after_completion_executes_again(self):
+        """完了済みのキーは結果を保持せず次の呼び出しで再実行する."""
+        # Arrange (準備)
+        single_flight = SingleFlight()
+        calls = []
+
+        # Act (実行)
+        for _ in range(2):
+            single_flight.do("key", lambda: calls.append(1))
+
+        # Assert (検証)
+        assert len(calls) == 2
+        assert single_flight.get_stats()["coalesced"] == 0